@@ -1,10 +1,19 @@
+import argparse
+import os
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+from modules.output_layout import MAX_FAN_OUT
 from modules.path_manager import PathManager
 from modules.file_handler import FileHandler
 from modules.validators import FileValidator
 from modules.input_handler import InputHandler
-from modules.text_analyzer import TextAnalyzer
 from modules.output_formatter import OutputFormatter
-from modules.exceptions import TextAnalyzerError
+from modules.exceptions import AnalysisError, FileError, TextAnalyzerError
+from modules.sentence_segmenter import LANGUAGE_RULES
+
+if TYPE_CHECKING:
+    from modules.profiler import PipelineProfiler
+    from modules.window_statistics import WindowStatistics
 
 
 class TextFileAnalyzer:
@@ -22,14 +31,159 @@ class TextFileAnalyzer:
         validator (FileValidator): Validates file operations
         file_handler (FileHandler): Handles file reading and writing
         input_handler (InputHandler): Manages user input operations
+        engine (AnalysisEngine): Analyzes files within the memory budget
+        estimate (bool): Whether to estimate statistics from a sample
+        symbol_limit (Optional[int]): Maximum number of symbols in results
+        ngrams (bool): Whether results include n-grams and collocations
+        dedupe (Optional[str]): Near-duplicate handling in batch mode
+        concordance (bool): Whether a concordance index is saved per file
+        metrics (Tuple[str, ...]): Names of the custom metrics added to results
+        windows (Optional[Tuple[str, int]]): Window mode and size of the
+            per-window statistics saved per file, None if not saved
+        language (str): Language of the sentence segmentation rules and
+            of the word normalization
+        deadline (Optional[float]): Seconds allowed for analyzing a file in
+            interactive mode, None for no time limit
+        frequency_runs (bool): Whether the full word frequencies of every
+            analyzed file are saved as a sorted run
+        normalizer (Optional[WordNormalizer]): Normalizer of the word forms
+            counted as frequencies, None to count words as written
+        storage (Optional[StorageBackend]): Backend of the input files
+            given with an input location, None for src/text-files
+        tenant_pattern (Optional[str]): Pattern naming the tenant of a file
+            for fair batch scheduling, None for a single tenant
+        tenant_weights (Dict[str, float]): Batch scheduling weights of tenants
+        result_cache (Optional[ResultCache]): Cache of analysis states that
+            serves other N values in interactive mode, None if disabled
     """
 
-    def __init__(self) -> None:
-        """Initialize TextFileAnalyzer with required components."""
-        self.path_manager = PathManager()
+    def __init__(self, estimate: bool = False, symbol_limit: Optional[int] = None,
+                 ngrams: bool = False, dedupe: Optional[str] = None,
+                 concordance: bool = False, metrics: Sequence[str] = (),
+                 windows: Optional[Tuple[str, int]] = None,
+                 language: Optional[str] = None,
+                 deadline: Optional[float] = None,
+                 frequency_runs: bool = False,
+                 stopwords: bool = False,
+                 normalize: Optional[str] = None,
+                 max_n: Optional[int] = None,
+                 input_uri: Optional[str] = None,
+                 output_dir: Optional[str] = None,
+                 output_fan_out: Optional[int] = None,
+                 tenant_pattern: Optional[str] = None,
+                 tenant_weights: Optional[Dict[str, float]] = None,
+                 cache: bool = True) -> None:
+        """Initialize TextFileAnalyzer with required components.
+
+        Args:
+            estimate (bool): Estimate statistics from random blocks instead
+                of reading whole files
+            symbol_limit (Optional[int]): Maximum number of most frequent
+                symbols in results, None for all symbols
+            ngrams (bool): Collect n-grams and collocations
+            dedupe (Optional[str]): 'report' or 'skip' near-duplicate files
+                in batch mode, None to disable
+            concordance (bool): Save a suffix-array concordance index of
+                every analyzed file
+            metrics (Sequence[str]): Names of registered metrics computed in
+                the same pass and added to results
+            windows (Optional[Tuple[str, int]]): Window mode and size, as
+                parsed by WindowStatistics.parse_spec, to stream per-window
+                statistics of every analyzed file as NDJSON
+            language (Optional[str]): Language of the sentence segmentation
+                rules and word normalization, defaults to the configured
+                SENTENCE_LANGUAGE
+            deadline (Optional[float]): Seconds allowed for analyzing a file
+                in interactive mode; the results computed by then are saved
+                marked as partial
+            frequency_runs (bool): Save the full word frequencies of every
+                analyzed file as a run sorted by word, for corpus top words
+            stopwords (bool): Leave stopwords of the language out of the
+                word frequencies
+            normalize (Optional[str]): 'stem' or 'lemma' to count word
+                frequencies over stems or lemmas, None to count word forms
+            max_n (Optional[int]): Largest accepted N, defaults to the
+                configured MAX_N
+            input_uri (Optional[str]): Directory or s3://bucket/prefix
+                location of the input files, defaults to src/text-files
+            output_dir (Optional[str]): Directory of the saved results,
+                defaults to src/text-analyzed
+            output_fan_out (Optional[int]): Number of hashed sub-directory
+                levels of the outputs of input files, defaults to the
+                configured OUTPUT_FAN_OUT
+            tenant_pattern (Optional[str]): Regular expression naming the
+                tenant of a file by its first group, so that batch mode
+                shares the analysis fairly between tenants
+            tenant_weights (Optional[Dict[str, float]]): Relative batch
+                scheduling weights of tenants, 1.0 for unlisted ones
+            cache (bool): Cache the analysis state of every file in
+                interactive mode and serve repeated analyses with another N
+                from it
+
+        Raises:
+            ValidationError: If the language has no stopwords or normalization
+                rules, the input location or the output fan-out is invalid
+        """
         self.validator = FileValidator()
         self.file_handler = FileHandler(validator=self.validator)
-        self.input_handler = InputHandler()
+        config = self.file_handler.config
+        self.storage = None
+        if input_uri:
+            # Imported here: storage backends are only needed for an input location
+            from modules.storage import open_storage
+
+            self.storage = open_storage(input_uri, config)
+            self.file_handler.storage = self.storage
+        self.path_manager = PathManager(
+            self.storage.uri() if self.storage else None, output_dir,
+            config.OUTPUT_FAN_OUT if output_fan_out is None else output_fan_out
+        )
+        self.input_handler = InputHandler(max_n or config.MAX_N)
+        self.language = language or config.SENTENCE_LANGUAGE
+        self.normalizer = None
+        if stopwords or normalize:
+            # Imported here: word normalization is only needed when requested
+            from modules.word_normalizer import WordNormalizer
+
+            self.normalizer = WordNormalizer(self.language, stopwords, normalize,
+                                             config.NORMALIZER_CACHE_SIZE)
+        # Imported here: the analysis pipeline is slow to import and not
+        # needed until a command runs
+        from modules.analysis_engine import AnalysisEngine
+        from modules.memory_budget import MemoryBudget
+
+        self.engine = AnalysisEngine(
+            self.file_handler, MemoryBudget(config.MAX_MEMORY),
+            ngram_order=config.NGRAM_ORDER if ngrams else 0,
+            minhash=dedupe is not None,
+            concordance=concordance,
+            metrics=metrics,
+            language=self.language,
+            normalizer=self.normalizer
+        )
+        self.estimate = estimate
+        self.symbol_limit = symbol_limit
+        self.ngrams = ngrams
+        self.dedupe = dedupe
+        self.concordance = concordance
+        self.metrics = tuple(metrics)
+        self.windows = windows
+        self.deadline = deadline
+        self.frequency_runs = frequency_runs
+        self.tenant_pattern = tenant_pattern
+        self.tenant_weights = dict(tenant_weights or {})
+        self.result_cache = None
+        if cache:
+            # Imported here: the result cache is only needed when enabled
+            from modules.result_cache import ResultCache
+
+            self.result_cache = ResultCache(self.path_manager.get_cache_dir(),
+                                            config.RESULT_CACHE_MAX_ENTRIES)
+
+    def close(self) -> None:
+        """Release the connections and threads of the input storage, if any."""
+        if self.storage is not None:
+            self.storage.close()
 
     def run(self) -> None:
         """Run the text file analysis process.
@@ -58,8 +212,11 @@ class TextFileAnalyzer:
             try:
                 # Get available files
                 available_files = self.file_handler.get_available_files(
-                    self.path_manager.input_dir
+                    self.path_manager.input_dir,
+                    include_oversized=self.estimate
                 )
+                for name, size in self.file_handler.oversized:
+                    print(f"Skipped {name}: {size} bytes exceed the size limit")
 
                 if not available_files:
                     print(f"No .txt files found in {self.path_manager.input_dir}")
@@ -73,21 +230,63 @@ class TextFileAnalyzer:
 
                 n = self.input_handler.get_n_value()
 
-                # Read and analyze text
-                input_path = self.path_manager.get_input_path(chosen_file)
-                text = self.file_handler.read_file(input_path)
+                if self.estimate:
+                    output_path = self.estimate_file(chosen_file, n)
+                    print(f"\nEstimate complete! Results saved to: {output_path}")
+                else:
+                    # Serve from the result cache, or stream and analyze text
+                    input_path = self.path_manager.get_input_path(chosen_file)
+                    deadline = None
+                    if self.deadline:
+                        # Imported here: deadlines are only needed when requested
+                        from modules.deadline import Deadline
 
-                # Analyze text
-                analyzer = TextAnalyzer(text, n)
-                formatter = OutputFormatter(analyzer, n)
-                results = formatter.format_results()
+                        deadline = Deadline(self.deadline)
+                    fingerprint = (self.file_handler.fingerprint(input_path)
+                                   if self.result_cache is not None else None)
+                    cache_key = self.get_cache_key(input_path, fingerprint)
+                    windows = None
+                    analyzer = self.load_cached(cache_key, n)
+                    if analyzer is not None:
+                        print("Results served from the result cache")
+                    else:
+                        windows = self.open_windows(chosen_file)
+                        try:
+                            # Unknown content is hashed while it is read for the analysis
+                            analyzer = self.engine.analyze_file(
+                                input_path, n, windows, deadline,
+                                digest=fingerprint is not None and cache_key is None
+                            )
+                        finally:
+                            if windows is not None:
+                                windows.sink.close()
+                        self.store_cached(cache_key, analyzer, input_path, fingerprint)
+                    try:
+                        formatter = OutputFormatter(analyzer, n, self.symbol_limit,
+                                                    self.ngrams, deadline)
+                        results = formatter.format_results()
+                        if windows is not None:
+                            results["windows"] = {"mode": windows.mode, "size": windows.size,
+                                                  "count": windows.count}
+                            print(f"{windows.count} window(s) saved to: {windows.sink.path}")
+                        if self.concordance:
+                            self.save_concordance(chosen_file, analyzer)
+                        if self.frequency_runs:
+                            self.save_frequency_run(chosen_file, analyzer)
+                    finally:
+                        analyzer.close()
 
-                # Save results
-                self.path_manager.ensure_output_dir_exists()
-                output_path = self.path_manager.get_output_path(chosen_file)
-                self.file_handler.save_json(results, output_path)
+                    # Save results
+                    output_path = self.path_manager.get_result_path(chosen_file, n)
+                    self.path_manager.prepare_output(chosen_file, output_path)
+                    self.file_handler.save_json(results, output_path)
 
-                print(f"\nAnalysis complete! Results saved to: {output_path}")
+                    if "partial" in results:
+                        partial = results["partial"]
+                        skipped = ", ".join(partial["skipped"]) or "none"
+                        print(f"\nDeadline reached: {partial['coverage']:.1%} of the file "
+                              f"analyzed, skipped sections: {skipped}")
+                    print(f"\nAnalysis complete! Results saved to: {output_path}")
 
             except TextAnalyzerError as e:
                 print(f"\nError: {e}")
@@ -98,7 +297,707 @@ class TextFileAnalyzer:
                 print("Goodbye!")
                 break
 
+    def get_cache_key(self, input_path: str,
+                      fingerprint: Optional[Tuple[int, Optional[str]]]) -> Optional[str]:
+        """Get the result cache key of a file analyzed with the current options.
+
+        The digest of an unchanged file comes from the index of the cache.
+        Otherwise the file is hashed only if cached content of the same
+        size may match it, or if its version is unknown.
+
+        Args:
+            input_path (str): Path to the input file
+            fingerprint (Optional[Tuple[int, Optional[str]]]): Size and
+                version of the file, None if the cache is disabled
+
+        Returns:
+            Optional[str]: Key of the file content and the options the
+                cached state depends on, None if the cache is disabled or
+                the digest is left to the analysis
+
+        Raises:
+            FileError: If the file cannot be read
+        """
+        if fingerprint is None:
+            return None
+        size, version = fingerprint
+        if version is not None:
+            digest = self.result_cache.lookup(input_path, size, version)
+            if digest is None and self.result_cache.has_content_size(size):
+                digest = self.file_handler.hash_file(input_path)
+                self.record_digest(input_path, size, version, digest)
+        else:
+            digest = self.file_handler.hash_file(input_path)
+        return self.build_cache_key(digest) if digest is not None else None
+
+    def build_cache_key(self, digest: str) -> str:
+        """Get the result cache key of a digest and the current options."""
+        # Imported here: the result cache is only needed when enabled
+        from modules.result_cache import ResultCache
+
+        normalization = self.normalizer.describe() if self.normalizer is not None else None
+        return ResultCache.key(digest, self.language, normalization)
+
+    def record_digest(self, input_path: str, size: int, version: str, digest: str,
+                      content: bool = True) -> None:
+        """Record the digest of a file in the cache index; a failure only prints a warning."""
+        try:
+            self.result_cache.record(input_path, size, version, digest, content)
+        except OSError as e:
+            print(f"Warning: could not cache results: {e}")
+
+    def load_cached(self, cache_key: Optional[str], n: int):
+        """Restore a cached analysis if it can serve the requested results.
+
+        N-grams, windows, concordances and frequency runs need a pass over
+        the text, so they are never served from the cache.
+
+        Args:
+            cache_key (Optional[str]): Key from get_cache_key
+            n (int): Number of most frequent words to return
+
+        Returns:
+            Optional[CachedAnalysis]: Cached analysis, None on a miss
+        """
+        if (cache_key is None or self.ngrams or self.windows or self.concordance or
+                self.frequency_runs):
+            return None
+        return self.result_cache.load(cache_key, n, self.metrics)
+
+    def store_cached(self, cache_key: Optional[str], analyzer, input_path: str,
+                     fingerprint: Optional[Tuple[int, Optional[str]]]) -> None:
+        """Cache the state of a complete analysis; a failure only prints a warning.
+
+        Without a key, the state is keyed by the digest computed during
+        the analysis, or by the location digest of a file read in shards,
+        and the digest is recorded in the index.
+
+        Args:
+            cache_key (Optional[str]): Key from get_cache_key
+            analyzer: TextAnalyzer over the statistics of the whole file
+            input_path (str): Path to the input file
+            fingerprint (Optional[Tuple[int, Optional[str]]]): Size and
+                version of the file before the analysis, None if the cache
+                is disabled
+        """
+        if fingerprint is None or analyzer.is_partial():
+            return
+        if cache_key is None:
+            size, version = fingerprint
+            digest = analyzer.statistics.content_digest
+            content = digest is not None
+            if not content:
+                # Imported here: the result cache is only needed when enabled
+                from modules.result_cache import ResultCache
+
+                digest = ResultCache.location_digest(input_path, size, version)
+            self.record_digest(input_path, size, version, digest, content)
+            cache_key = self.build_cache_key(digest)
+        try:
+            self.result_cache.store(cache_key, analyzer)
+        except (OSError, ValueError) as e:
+            print(f"Warning: could not cache results: {e}")
+
+    def open_windows(self, filename: str) -> Optional["WindowStatistics"]:
+        """Start the window statistics of a file, streamed next to its results.
+
+        Args:
+            filename (str): Name of the file in the input directory
+
+        Returns:
+            Optional[WindowStatistics]: Window statistics writing to the
+                NDJSON file, None if windows are disabled
+
+        Raises:
+            FileError: If the NDJSON file cannot be created
+        """
+        if self.windows is None:
+            return None
+        # Imported here: window statistics are only streamed when requested
+        from modules.window_statistics import NDJSONWriter, WindowStatistics
+
+        path = self.path_manager.get_windows_path(filename)
+        self.path_manager.prepare_output(filename, path)
+        writer = NDJSONWriter(path)
+        return WindowStatistics(*self.windows, sink=writer, language=self.language)
+
+    def estimate_file(self, filename: str, n: int) -> str:
+        """Estimate statistics of a file from random blocks and save them.
+
+        Only the configured number of blocks is read, so the runtime does
+        not depend on the file size.
+
+        Args:
+            filename (str): Name of the file in the input directory
+            n (int): Number of most frequent words to include in results
+
+        Returns:
+            str: Path to the saved estimate
+        """
+        from modules.estimate_analyzer import EstimateAnalyzer
+
+        config = self.file_handler.config
+        analyzer = EstimateAnalyzer.from_file(
+            self.file_handler,
+            self.path_manager.get_input_path(filename),
+            n,
+            sample_blocks=config.ESTIMATE_SAMPLE_BLOCKS,
+            block_size=config.ESTIMATE_BLOCK_SIZE,
+            confidence=config.ESTIMATE_CONFIDENCE
+        )
+        results = OutputFormatter(analyzer, n).format_estimate_results()
+
+        output_path = self.path_manager.get_result_path(filename, n, "estimate")
+        self.path_manager.prepare_output(filename, output_path)
+        self.file_handler.save_json(results, output_path)
+        return output_path
+
+    def save_concordance(self, filename: str, analyzer) -> Optional[str]:
+        """Save the concordance index of an analyzed file.
+
+        A text too long to index within the memory budget keeps its
+        results without a concordance, with a warning.
+
+        Args:
+            filename (str): Name of the file in the input directory
+            analyzer: Analyzer holding the token sequence of the file
+
+        Returns:
+            Optional[str]: Path to the saved index, None if it was skipped
+
+        Raises:
+            FileError: If the index cannot be written
+        """
+        path = self.path_manager.get_concordance_path(filename)
+        self.path_manager.prepare_output(filename, path)
+        try:
+            analyzer.save_concordance(path, self.engine.memory_budget.concordance_limit())
+        except AnalysisError as e:
+            print(f"Warning: concordance of {filename} skipped: {e}")
+            return None
+        except OSError as e:
+            raise FileError(f"Error saving concordance: {e}", {"path": path})
+        return path
+
+    def save_frequency_run(self, filename: str, analyzer) -> str:
+        """Save the frequency run of an analyzed file.
+
+        Args:
+            filename (str): Name of the file in the input directory
+            analyzer: Analyzer holding the word frequencies of the file
+
+        Returns:
+            str: Path to the saved run
+
+        Raises:
+            FileError: If the run cannot be written
+        """
+        path = self.path_manager.get_frequency_run_path(filename)
+        self.path_manager.prepare_output(filename, path)
+        try:
+            analyzer.save_frequency_run(path)
+        except OSError as e:
+            raise FileError(f"Error saving frequency run: {e}", {"path": path})
+        return path
+
+    def run_search(self, filename: str, phrase: str, context: int = 5,
+                   max_matches: Optional[int] = None) -> None:
+        """Search a phrase in the concordance index of an analyzed file.
+
+        Prints the number of occurrences and a keyword-in-context line for
+        each shown occurrence.
+
+        Args:
+            filename (str): Name of the file in the input directory
+            phrase (str): Phrase to search, tokenized like the analyzed text
+            context (int): Number of words shown on each side of a match
+            max_matches (Optional[int]): Maximum number of lines shown,
+                None for all
+        """
+        # Imported here: the concordance is only searched in search mode
+        from modules.concordance import ConcordanceIndex
+        from modules.text_analyzer import WORD_PATTERN
+
+        path = self.path_manager.get_concordance_path(filename)
+        words = WORD_PATTERN.findall(phrase.lower())
+        if not words:
+            print("\nError: Search phrase contains no words")
+            return
+        if not os.path.exists(path):
+            print(f"\nError: No concordance index for {filename}; "
+                  "analyze it with --concordance first")
+            return
+
+        try:
+            with ConcordanceIndex(path) as index:
+                count = index.count(words)
+                matches = index.search(words, context, max_matches)
+        except (OSError, ValueError) as e:
+            print(f"\nError: Error reading concordance: {e}")
+            return
+
+        print(f"\n{count} occurrence(s) of \"{' '.join(words)}\" in {filename}")
+        for match in matches:
+            print(f"{match['position']:>10}  {match['left']:>40} [{match['match']}] {match['right']}")
+
+    def run_compare(self, left: str, right: str, top: int = 10) -> None:
+        """Compare the frequency profiles of two results or result stores.
+
+        Each side is a saved result file, the name of an analyzed input
+        file, or a directory of results whose frequencies are summed. The
+        comparison is saved to the output directory and summarized.
+
+        Args:
+            left (str): Result compared against, such as the older version
+            right (str): Result compared with it
+            top (int): Number of top gainers and losers per distribution
+        """
+        from modules.result_comparison import FrequencyProfile, ResultComparison
+
+        profiles = []
+        try:
+            for source in (left, right):
+                path = source
+                if not os.path.exists(path):
+                    path = self.path_manager.find_output_path(source) or source
+                profile = FrequencyProfile.load(self.file_handler, path)
+                for name in profile.skipped:
+                    print(f"Skipped {name}: no word frequencies")
+                profiles.append(profile)
+            comparison = ResultComparison(*profiles).compare(top)
+
+            names = [os.path.basename(os.path.normpath(source)).removesuffix(".json")
+                     for source in (left, right)]
+            self.path_manager.ensure_output_dir_exists()
+            output_path = self.path_manager.get_output_path(f"{names[0]}-vs-{names[1]}.comparison")
+            self.file_handler.save_json({"left": left, "right": right, **comparison}, output_path)
+        except ValueError as e:
+            print(f"\nError: {e}")
+            return
+        except TextAnalyzerError as e:
+            print(f"\nError: {e}")
+            return
+
+        for name in ("words", "symbols"):
+            result = comparison[name]
+            changes = ", ".join(
+                f"{change['key']!r} {change['delta']:+d}"
+                for change in (result["gainers"] + result["losers"])[:6]
+            )
+            print(f"\n{name.capitalize()}: cosine {result['cosine']}, "
+                  f"Jensen-Shannon {result['jensen-shannon']}, "
+                  f"{result['shared']} shared, {result['only-left']} only left, "
+                  f"{result['only-right']} only right")
+            if changes:
+                print(f"  Largest changes: {changes}")
+        print(f"\nComparison saved to: {output_path}")
+
+    def run_batch(self, n: int, resume: bool = False,
+                  max_retries: Optional[int] = None) -> None:
+        """Analyze every available file without user interaction.
+
+        Progress is journaled in the output directory, so an interrupted
+        run can be continued with ``resume=True``.
+
+        Args:
+            n (int): Number of most frequent words to include in results
+            resume (bool): Skip files completed by a previous run
+            max_retries (Optional[int]): Extra attempts per failing file,
+                defaults to the configured MAX_RETRIES
+        """
+        # Imported here: batch scheduling and journaling are only needed in batch mode
+        from modules.batch_runner import BatchRunner
+        from modules.job_scheduler import JobScheduler
+        from modules.progress_journal import ProgressJournal
+
+        config = self.file_handler.config
+        if max_retries is None:
+            max_retries = config.MAX_RETRIES
+
+        journal = ProgressJournal(
+            BatchRunner.journal_path(self.path_manager, config.JOURNAL_FILENAME),
+            fsync_interval=config.JOURNAL_FSYNC_INTERVAL
+        )
+        try:
+            scheduler = JobScheduler(config.SCHEDULER_SMALL_FILE_SIZE,
+                                     config.SCHEDULER_LARGE_SHARE,
+                                     self.tenant_pattern, self.tenant_weights)
+            runner = BatchRunner(self.file_handler, self.path_manager, journal,
+                                 max_retries, engine=self.engine,
+                                 symbol_limit=self.symbol_limit, ngrams=self.ngrams,
+                                 dedupe=self.dedupe, concordance=self.concordance,
+                                 windows=self.windows, frequency_runs=self.frequency_runs,
+                                 scheduler=scheduler)
+            n = self.input_handler.validator.validate_n_value(n)
+            summary = runner.run(n, resume=resume)
+        except TextAnalyzerError as e:
+            print(f"\nError: {e}")
+            return
+
+        print(
+            f"\nBatch complete: {summary['completed']} analyzed, "
+            f"{summary['skipped']} skipped, {summary['failed']} failed"
+        )
+        for lane, lane_metrics in scheduler.metrics()["lanes"].items():
+            if lane_metrics["jobs"]:
+                print(f"  {lane} files: {lane_metrics['jobs']}, "
+                      f"p95 wait {lane_metrics['wait-seconds']['p95']:.3f}s, "
+                      f"p95 service {lane_metrics['service-seconds']['p95']:.3f}s")
+        print(f"Queue metrics saved to: {runner.schedule_path()}")
+
+    def run_corpus_vocabulary(self) -> None:
+        """Merge vocabulary sketches of all saved results.
+
+        Reads the JSON results in the output directory, not the texts, and
+        saves the corpus-level distinct word count and type/token ratio.
+        Only one result per input file counts, as chosen by
+        PathManager.select_results. Results without a vocabulary sketch,
+        such as estimates, are skipped.
+        """
+        from modules.corpus_vocabulary import CorpusVocabulary
+
+        config = self.file_handler.config
+        corpus_path = self.path_manager.get_output_path(config.CORPUS_VOCABULARY_FILENAME)
+        corpus = CorpusVocabulary()
+
+        try:
+            paths = [path for path in self.path_manager.list_results()
+                     if path != corpus_path]
+            for path in paths:
+                try:
+                    corpus.add(self.file_handler.load_json(path))
+                except ValueError as e:
+                    print(f"Skipped {os.path.relpath(path, self.path_manager.output_dir)}: {e}")
+            summary = corpus.summary()
+            output_path = self.path_manager.get_output_path(config.CORPUS_VOCABULARY_FILENAME)
+            self.file_handler.save_json(summary, output_path)
+        except OSError as e:
+            print(f"\nError: Error accessing directory: {e}")
+            return
+        except TextAnalyzerError as e:
+            print(f"\nError: {e}")
+            return
+
+        print(
+            f"\nCorpus vocabulary: {summary['distinct-word-count']} distinct words in "
+            f"{summary['files']} file(s), type/token ratio {summary['type-token-ratio']}"
+            f"{'' if summary['exact'] else ' (estimated)'}. Saved to: {output_path}"
+        )
+
+    def run_corpus_top_words(self, n: int) -> None:
+        """Find the exact N most frequent words of the corpus.
+
+        Merges the frequency runs saved next to the results with a k-way
+        merge, without reading the texts again, and saves the corpus word
+        count, distinct word count and top words.
+
+        Args:
+            n (int): Number of most frequent words to find
+        """
+        from modules.frequency_runs import RUN_SUFFIX, CorpusTopWords
+
+        config = self.file_handler.config
+        output_dir = self.path_manager.output_dir
+        try:
+            n = self.input_handler.validator.validate_n_value(n)
+            paths = self.path_manager.list_outputs(RUN_SUFFIX)
+            if not paths:
+                print(f"\nNo frequency runs in {output_dir}; analyze files with --frequency-runs")
+                return
+            summary = CorpusTopWords(n, config.RUN_MERGE_FAN_IN).merge(paths)
+            output_path = self.path_manager.get_output_path(config.CORPUS_TOP_WORDS_FILENAME)
+            self.file_handler.save_json(summary, output_path)
+        except ValueError as e:
+            print(f"\nError: {e}")
+            return
+        except OSError as e:
+            print(f"\nError: Error accessing directory: {e}")
+            return
+        except TextAnalyzerError as e:
+            print(f"\nError: {e}")
+            return
+
+        words = ", ".join(f"{word} ({count})"
+                          for word, count in summary[f"{n}-most-frequent-words"].items())
+        print(f"\nCorpus top words over {summary['files']} file(s), "
+              f"{summary['word-count']} words: {words}. Saved to: {output_path}")
+
+
+def save_profile(profiler: "PipelineProfiler", path_manager: PathManager,
+                 file_handler: FileHandler) -> None:
+    """Save the collapsed stacks and summary of a profiled run.
+
+    Both files share a name with the start time of the run, so profiles
+    of successive runs can be compared.
+
+    Args:
+        profiler (PipelineProfiler): Stopped profiler of the run
+        path_manager (PathManager): Path manager locating the output directory
+        file_handler (FileHandler): File handler used to save the summary
+    """
+    name = time.strftime("profile-%Y%m%d-%H%M%S")
+    try:
+        path_manager.ensure_output_dir_exists()
+        collapsed_path = path_manager.get_profile_path(name)
+        profiler.save(collapsed_path, path_manager.get_output_path(name), file_handler)
+    except TextAnalyzerError as e:
+        print(f"\nError saving profile: {e}")
+        return
+
+    print(f"\nProfile ({profiler.mode}) saved to: {collapsed_path}")
+    for entry in profiler.hot_functions(5):
+        cost = (f"{entry['self-seconds']:.3f}s" if profiler.mode == "cprofile"
+                else f"{entry['self-samples']} samples")
+        print(f"  {cost:>14}  {entry['function']}")
+
+
+def check_choice(parser: argparse.ArgumentParser, option: str, value: Optional[str],
+                 choices: Sequence[str]) -> None:
+    """Reject an option value outside its choices, like argparse ``choices``.
+
+    Choices defined by modules that are slow to import are checked after
+    parsing, so that only the options given load their modules.
+
+    Args:
+        parser (argparse.ArgumentParser): Parser reporting the error
+        option (str): Option name shown in the error
+        value (Optional[str]): Parsed value, None if the option was not given
+        choices (Sequence[str]): Accepted values
+    """
+    if value is not None and value not in choices:
+        parser.error(f"argument {option}: invalid choice: {value!r} "
+                     f"(choose from {', '.join(map(repr, choices))})")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments.
+
+    Args:
+        argv (Optional[List[str]]): Arguments to parse, defaults to sys.argv
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Analyze text files and save statistics as JSON.")
+    parser.add_argument("--batch", action="store_true",
+                        help="analyze every available file without prompting")
+    parser.add_argument("-n", type=int, default=10,
+                        help="number of most frequent words for batch mode and corpus top words "
+                             "(default: 10)")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted batch, retrying only unfinished files")
+    parser.add_argument("--max-retries", type=int, default=None,
+                        help="extra attempts for a failing file in batch mode")
+    parser.add_argument("--estimate", action="store_true",
+                        help="estimate statistics from random blocks (interactive mode only)")
+    parser.add_argument("--symbol-limit", type=int, default=None, metavar="K",
+                        help="keep only the K most frequent symbols in results")
+    parser.add_argument("--ngrams", action="store_true",
+                        help="add most frequent n-grams and collocations to results")
+    parser.add_argument("--dedupe", default=None, metavar="MODE",
+                        help="detect near-duplicate files in batch mode and report them "
+                             "(report) or save only a reference to the canonical file (skip)")
+    parser.add_argument("--corpus-vocabulary", action="store_true",
+                        help="merge vocabulary sketches of saved results into corpus statistics")
+    parser.add_argument("--frequency-runs", action="store_true",
+                        help="save the full word frequencies of every analyzed file as a "
+                             "sorted run for --corpus-top-words")
+    parser.add_argument("--corpus-top-words", action="store_true",
+                        help="merge saved frequency runs into the exact N most frequent "
+                             "words of the corpus")
+    parser.add_argument("--concordance", action="store_true",
+                        help="save a suffix-array concordance index next to the results")
+    parser.add_argument("--search", nargs=2, metavar=("FILE", "PHRASE"), default=None,
+                        help="search a phrase in the concordance index of an analyzed file")
+    parser.add_argument("--context", type=int, default=5, metavar="N",
+                        help="words shown on each side of a search match (default: 5)")
+    parser.add_argument("--max-matches", type=int, default=20, metavar="K",
+                        help="maximum number of search matches shown (default: 20)")
+    parser.add_argument("--compare", nargs=2, metavar=("LEFT", "RIGHT"), default=None,
+                        help="compare word and symbol frequencies of two result files, "
+                             "analyzed file names or result directories")
+    parser.add_argument("--top", type=int, default=10, metavar="K",
+                        help="top gainers and losers shown in a comparison (default: 10)")
+    parser.add_argument("--metrics", type=lambda value: [name for name in value.split(",") if name],
+                        default=[], metavar="NAME[,NAME...]",
+                        help="add registered custom metrics to results")
+    parser.add_argument("--windows", default=None, metavar="MODE[:SIZE]",
+                        help="stream statistics of every window of lines (lines:N), bytes "
+                             "(bytes:N) or paragraphs (paragraphs) to an NDJSON file")
+    parser.add_argument("--deadline", type=float, default=None, metavar="SECONDS",
+                        help="return partial results of a file after SECONDS "
+                             "(interactive mode only)")
+    parser.add_argument("--language", choices=sorted(LANGUAGE_RULES), default=None,
+                        help="language of sentence segmentation rules and stopwords "
+                             "(default: configured SENTENCE_LANGUAGE)")
+    parser.add_argument("--stopwords", action="store_true",
+                        help="leave stopwords of the language out of the word frequencies")
+    parser.add_argument("--normalize", default=None, metavar="MODE",
+                        help="count word frequencies over stems (stem) or lemmas (lemma)")
+    parser.add_argument("--max-n", type=int, default=None,
+                        help="largest accepted N (default: configured MAX_N)")
+    parser.add_argument("--input", default=None, metavar="LOCATION",
+                        help="read input files from a directory or an S3-compatible "
+                             "s3://bucket/prefix location (default: src/text-files)")
+    parser.add_argument("--output-dir", default=None, metavar="DIR",
+                        help="save results to DIR (default: src/text-analyzed)")
+    parser.add_argument("--output-fan-out", type=int, default=None, metavar="LEVELS",
+                        help="spread the outputs of input files over LEVELS levels of "
+                             "hashed sub-directories (default: configured OUTPUT_FAN_OUT)")
+    parser.add_argument("--tenant-pattern", default=None, metavar="REGEX",
+                        help="share batch mode fairly between tenants named by the first "
+                             "group of REGEX in file names")
+    parser.add_argument("--tenant-weights", default=None,
+                        metavar="NAME=WEIGHT[,...]",
+                        help="relative batch scheduling weights of tenants (default: 1)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="neither serve nor store results in the result cache")
+    parser.add_argument("--list-metrics", action="store_true",
+                        help="list the available custom metrics, including plugins")
+    parser.add_argument("--profile", nargs="?", const="cprofile", default=None, metavar="MODE",
+                        help="profile the run with cprofile (default) or a sampling "
+                             "profiler (sampling) and save collapsed stacks and a "
+                             "hot-function summary")
+    parser.add_argument("--save-config-snapshot", default=None, metavar="PATH",
+                        help="save the resolved configuration to PATH; set "
+                             "TEXT_ANALYZER_CONFIG_SNAPSHOT=PATH to start from it")
+    args = parser.parse_args(argv)
+    if args.dedupe is not None:
+        # Imported here: the batch pipeline is only needed in batch mode
+        from modules.batch_runner import BatchRunner
+
+        check_choice(parser, "--dedupe", args.dedupe, BatchRunner.DEDUPE_MODES)
+    if args.normalize is not None:
+        # Imported here: word normalization is only needed when requested
+        from modules.word_normalizer import MODES as NORMALIZATION_MODES
+
+        check_choice(parser, "--normalize", args.normalize, NORMALIZATION_MODES)
+    if args.profile is not None:
+        # Imported here: the profiler is only needed for a profiled run
+        from modules.profiler import PipelineProfiler
+
+        check_choice(parser, "--profile", args.profile, PipelineProfiler.MODES)
+    if args.symbol_limit is not None and args.symbol_limit < 1:
+        parser.error("--symbol-limit must be a positive integer")
+    if args.estimate and (args.batch or args.resume):
+        parser.error("--estimate cannot be combined with batch mode")
+    if args.estimate and args.ngrams:
+        parser.error("--ngrams cannot be combined with --estimate")
+    if args.dedupe and not (args.batch or args.resume):
+        parser.error("--dedupe requires batch mode")
+    if args.estimate and args.frequency_runs:
+        parser.error("--frequency-runs cannot be combined with --estimate")
+    if args.estimate and args.concordance:
+        parser.error("--concordance cannot be combined with --estimate")
+    if args.estimate and args.metrics:
+        parser.error("--metrics cannot be combined with --estimate")
+    if args.estimate and (args.stopwords or args.normalize):
+        parser.error("--stopwords and --normalize cannot be combined with --estimate")
+    if args.max_n is not None and args.max_n < 1:
+        parser.error("--max-n must be a positive integer")
+    if args.estimate and args.windows:
+        parser.error("--windows cannot be combined with --estimate")
+    if args.windows:
+        # Imported here: window statistics are only streamed when requested
+        from modules.window_statistics import WindowStatistics
+
+        try:
+            args.windows = WindowStatistics.parse_spec(args.windows)
+        except TextAnalyzerError as e:
+            parser.error(str(e))
+    if args.metrics:
+        # Imported here: custom metrics are only loaded when requested
+        from modules.metrics import registry as metric_registry
+
+        try:
+            metric_registry.validate(args.metrics)
+        except TextAnalyzerError as e:
+            parser.error(str(e))
+    if args.context < 0:
+        parser.error("--context must not be negative")
+    if args.max_matches < 1:
+        parser.error("--max-matches must be a positive integer")
+    if args.top < 1:
+        parser.error("--top must be a positive integer")
+    if args.deadline is not None and not args.deadline > 0:
+        parser.error("--deadline must be a positive number of seconds")
+    if args.deadline is not None and (args.batch or args.resume or args.estimate):
+        parser.error("--deadline applies to interactive analysis only")
+    if (args.tenant_pattern or args.tenant_weights) and not (args.batch or args.resume):
+        parser.error("--tenant-pattern and --tenant-weights require batch mode")
+    if args.tenant_weights and not args.tenant_pattern:
+        parser.error("--tenant-weights requires --tenant-pattern")
+    if args.tenant_pattern or args.tenant_weights:
+        # Imported here: tenant scheduling is only needed in batch mode
+        from modules.job_scheduler import JobScheduler
+    if args.tenant_weights:
+        try:
+            args.tenant_weights = JobScheduler.parse_weights(args.tenant_weights)
+        except TextAnalyzerError as e:
+            parser.error(str(e))
+    if args.tenant_pattern:
+        try:
+            JobScheduler(0, tenant_pattern=args.tenant_pattern)
+        except TextAnalyzerError as e:
+            parser.error(str(e))
+    if args.output_fan_out is not None and not 0 <= args.output_fan_out <= MAX_FAN_OUT:
+        parser.error(f"--output-fan-out must be between 0 and {MAX_FAN_OUT}")
+    if args.input is not None:
+        if args.input.startswith("s3://"):
+            if not args.input[len("s3://"):].partition("/")[0]:
+                parser.error("--input s3:// location must name a bucket")
+        elif not os.path.isdir(args.input):
+            parser.error(f"--input directory does not exist: {args.input}")
+    return args
+
 
 if __name__ == "__main__":
-    analyzer = TextFileAnalyzer()
-    analyzer.run()
+    args = parse_args()
+    if args.save_config_snapshot:
+        from config.config import ConfigFactory
+
+        ConfigFactory.save_snapshot(args.save_config_snapshot)
+        print(f"Configuration snapshot saved to: {args.save_config_snapshot}")
+    elif args.list_metrics:
+        from modules.metrics import registry as metric_registry
+
+        print("\n".join(metric_registry.names()))
+    else:
+        analyzer = TextFileAnalyzer(estimate=args.estimate, symbol_limit=args.symbol_limit,
+                                    ngrams=args.ngrams, dedupe=args.dedupe,
+                                    concordance=args.concordance, metrics=args.metrics,
+                                    windows=args.windows, language=args.language,
+                                    deadline=args.deadline,
+                                    frequency_runs=args.frequency_runs,
+                                    stopwords=args.stopwords, normalize=args.normalize,
+                                    max_n=args.max_n, input_uri=args.input,
+                                    output_dir=args.output_dir,
+                                    output_fan_out=args.output_fan_out,
+                                    tenant_pattern=args.tenant_pattern,
+                                    tenant_weights=args.tenant_weights,
+                                    cache=not args.no_cache)
+        profiler = None
+        if args.profile:
+            from modules.profiler import PipelineProfiler
+
+            profiler = PipelineProfiler(args.profile)
+            profiler.start()
+        try:
+            if args.search:
+                analyzer.run_search(*args.search, context=args.context,
+                                    max_matches=args.max_matches)
+            elif args.compare:
+                analyzer.run_compare(*args.compare, top=args.top)
+            elif args.corpus_vocabulary:
+                analyzer.run_corpus_vocabulary()
+            elif args.corpus_top_words:
+                analyzer.run_corpus_top_words(args.n)
+            elif args.batch or args.resume:
+                analyzer.run_batch(args.n, resume=args.resume, max_retries=args.max_retries)
+            else:
+                analyzer.run()
+        finally:
+            if profiler is not None:
+                profiler.stop()
+                save_profile(profiler, analyzer.path_manager, analyzer.file_handler)
+            analyzer.close()
@@ -1,12 +1,11 @@
+import json
 import os
 from pathlib import Path
-from dataclasses import dataclass, field
-from typing import List, Dict, Type, Mapping
-from functools import lru_cache
-from dotenv import load_dotenv
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Optional, Type
 
-# Load environment variables
-load_dotenv()
+# Environment variable naming a snapshot written by ConfigFactory.save_snapshot
+SNAPSHOT_ENV_VAR = 'TEXT_ANALYZER_CONFIG_SNAPSHOT'
 
 
 class BaseConfig:
@@ -23,16 +22,96 @@ class BaseConfig:
         Attributes:
             SRC_DIR (Path): Source directory path
             PROJECT_ROOT (Path): Project root directory path
-            SUPPORTED_ENCODINGS (tuple): Supported file encodings
+            SUPPORTED_ENCODINGS (tuple): Encodings detected without a byte
+                order mark, preferred in this order on ties
+            FALLBACK_ENCODING (str): Encoding of bytes that are invalid in
+                UTF-8, as in files mixing UTF-8 with a legacy encoding
+            ENCODING_SAMPLE_SIZE (int): Number of leading bytes examined to
+                detect the encoding of a file
             SUPPORTED_FILE_TYPES (tuple): Supported file extensions
             MAX_FILE_SIZE (int): Maximum allowed file size in bytes
+            MAX_OBJECT_SIZE (int): Maximum size in bytes of an object of a
+                storage backend; objects are streamed and sharded, so the
+                size only bounds the analysis time
+            MAX_MEMORY (int): Memory budget for analyzing a single file in bytes
+            MAX_N (int): Largest number of most frequent words that can be requested
+            NORMALIZER_CACHE_SIZE (int): Number of distinct word forms whose
+                normalization is memoized
+            MAX_RETRIES (int): Number of retries for a failed file in batch mode
+            JOURNAL_FILENAME (str): Name of the batch progress journal file
+            JOURNAL_FSYNC_INTERVAL (int): Number of journal entries between fsync calls
+            ESTIMATE_SAMPLE_BLOCKS (int): Number of blocks read in estimate mode
+            ESTIMATE_BLOCK_SIZE (int): Size of a sampled block in bytes
+            ESTIMATE_CONFIDENCE (float): Confidence level of estimate intervals
+            NGRAM_ORDER (int): Longest n-gram length counted when n-grams are enabled
+            CORPUS_VOCABULARY_FILENAME (str): Name of the corpus vocabulary results
+            CORPUS_TOP_WORDS_FILENAME (str): Name of the corpus top words results
+            RUN_MERGE_FAN_IN (int): Maximum number of frequency runs merged at once
+            DEDUPE_THRESHOLD (float): Minimum shingle similarity of near-duplicate files
+            LSH_BANDS (int): Number of bands of the near-duplicate LSH index
+            LSH_INDEX_FILENAME (str): Name of the persisted LSH index file
+            SENTENCE_LANGUAGE (str): Language of the sentence segmentation rules
+            SHARED_MEMORY_MIN_WORDS (int): Smallest number of distinct words
+                a worker sends back through shared memory instead of pickling
+            STORAGE_ENDPOINT_URL (str): Endpoint of s3:// input locations
+                when AWS_ENDPOINT_URL is not set
+            STORAGE_REGION (str): Region of s3:// input locations when
+                AWS_REGION is not set
+            STORAGE_POOL_SIZE (int): Maximum number of connections to an
+                object store, shared by concurrent ranged reads
+            STORAGE_READ_AHEAD (int): Number of blocks fetched ahead of a
+                streamed read from an object store
+            STORAGE_TIMEOUT (float): Socket timeout of object store requests in seconds
+            SCHEDULER_SMALL_FILE_SIZE (int): Largest file in bytes scheduled
+                shortest job first in the small lane of a batch
+            SCHEDULER_LARGE_SHARE (float): Share of batch service time
+                guaranteed to larger files while small files wait
+            SCHEDULE_METRICS_FILENAME (str): Name of the batch queue wait
+                and service time metrics file
+            RESULT_CACHE_MAX_ENTRIES (int): Number of analysis states kept
+                in the result cache for serving other N values
+            OUTPUT_FAN_OUT (int): Number of hashed sub-directory levels of
+                the outputs of input files, 0 to keep them in the output
+                directory
             ERROR_MESSAGES (Dict[str, str]): Dictionary of error message templates
         """
         SRC_DIR: Path = Path(__file__).parent.parent
         PROJECT_ROOT: Path = SRC_DIR.parent
-        SUPPORTED_ENCODINGS: tuple[str, ...] = ('utf-8', 'cp1251')
+        SUPPORTED_ENCODINGS: tuple[str, ...] = ('utf-8', 'utf-16', 'cp1251', 'koi8-r', 'latin-1')
+        FALLBACK_ENCODING: str = 'cp1251'
+        ENCODING_SAMPLE_SIZE: int = 64 * 1024  # 64KB
         SUPPORTED_FILE_TYPES: tuple[str, ...] = ('.txt',)
         MAX_FILE_SIZE: int = 1024 * 1024 * 10  # 10MB
+        MAX_OBJECT_SIZE: int = 1024 * 1024 * 1024 * 100  # 100GB
+        MAX_MEMORY: int = 1024 * 1024 * 256  # 256MB
+        MAX_N: int = 100
+        NORMALIZER_CACHE_SIZE: int = 65536
+        MAX_RETRIES: int = 2
+        JOURNAL_FILENAME: str = '.progress-journal.jsonl'
+        JOURNAL_FSYNC_INTERVAL: int = 50
+        ESTIMATE_SAMPLE_BLOCKS: int = 64
+        ESTIMATE_BLOCK_SIZE: int = 64 * 1024  # 64KB
+        ESTIMATE_CONFIDENCE: float = 0.95
+        NGRAM_ORDER: int = 3
+        CORPUS_VOCABULARY_FILENAME: str = 'corpus-vocabulary'
+        CORPUS_TOP_WORDS_FILENAME: str = 'corpus-top-words'
+        RUN_MERGE_FAN_IN: int = 256
+        DEDUPE_THRESHOLD: float = 0.8
+        LSH_BANDS: int = 16
+        LSH_INDEX_FILENAME: str = '.lsh-index.json'
+        SENTENCE_LANGUAGE: str = 'en'
+        # Measured crossover of shared_transport.benchmark_transport is 300-1000 words
+        SHARED_MEMORY_MIN_WORDS: int = 1000
+        STORAGE_ENDPOINT_URL: str = 'https://s3.amazonaws.com'
+        STORAGE_REGION: str = 'us-east-1'
+        STORAGE_POOL_SIZE: int = 8
+        STORAGE_READ_AHEAD: int = 4
+        STORAGE_TIMEOUT: float = 30.0
+        SCHEDULER_SMALL_FILE_SIZE: int = 1024 * 1024  # 1MB
+        SCHEDULER_LARGE_SHARE: float = 0.25
+        SCHEDULE_METRICS_FILENAME: str = '.batch-schedule.json'
+        RESULT_CACHE_MAX_ENTRIES: int = 256
+        OUTPUT_FAN_OUT: int = 0
         ERROR_MESSAGES: Dict[str, str] = field(default_factory=lambda: {
             'file_not_found': 'File not found: {}',
             'invalid_file': 'Invalid file: {}',
@@ -105,9 +184,22 @@ class TestingConfig(BaseConfig):
 # src/config/config.py
 
 class ConfigFactory:
-    """Factory class for creating configuration objects based on environment."""
+    """Factory class for creating configuration objects based on environment.
+
+    Configuration is resolved on first use rather than at import time: the
+    .env file is only read when settings are first requested. If the
+    environment variable named by SNAPSHOT_ENV_VAR points to a snapshot
+    written by save_snapshot, the settings are restored from it and the
+    .env file is not read at all.
+    """
 
     _config = None  # Cache for singleton pattern
+    _environment_loaded = False
+    _ENVIRONMENTS: Dict[str, Type[BaseConfig]] = {
+        'development': DevelopmentConfig,
+        'production': ProductionConfig,
+        'testing': TestingConfig,
+    }
 
     @classmethod
     def get_config(cls):
@@ -120,21 +212,94 @@ class ConfigFactory:
         if cls._config is not None:
             return cls._config
 
-        # Get environment setting
-        env = os.environ.get('ENV', 'development').lower()
-
-        # Create appropriate config based on environment
-        if env == 'production':
-            cls._config = ProductionConfig.Settings()
-        elif env == 'testing':
-            cls._config = TestingConfig.Settings()
-        else:
-            # Default to development config
-            cls._config = DevelopmentConfig.Settings()
+        snapshot = os.environ.get(SNAPSHOT_ENV_VAR)
+        if snapshot:
+            cls._config = cls.load_snapshot(snapshot)
+            if cls._config is not None:
+                return cls._config
 
+        cls.load_environment()
+        cls._config = cls._settings_class(os.environ.get('ENV', 'development')).Settings()
         return cls._config
 
+    @classmethod
+    def load_environment(cls) -> None:
+        """Load variables from the .env file once, without overriding the environment."""
+        if cls._environment_loaded:
+            return
+        cls._environment_loaded = True
+        from dotenv import load_dotenv
+
+        load_dotenv()
+
+    @classmethod
+    def save_snapshot(cls, path: str) -> None:
+        """Write the resolved configuration to a JSON snapshot.
+
+        Args:
+            path (str): Path to the snapshot file
+
+        Raises:
+            OSError: If the file cannot be written
+        """
+        config = cls.get_config()
+        environment = next(
+            name for name, config_class in cls._ENVIRONMENTS.items()
+            if type(config) is config_class.Settings
+        )
+        settings = {}
+        for setting in fields(config):
+            value = getattr(config, setting.name)
+            settings[setting.name] = str(value) if isinstance(value, Path) else value
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"environment": environment, "settings": settings}, f,
+                      ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load_snapshot(cls, path: str) -> Optional[BaseConfig.Settings]:
+        """Restore settings from a snapshot written by save_snapshot.
+
+        A snapshot that is missing, unreadable or does not match the
+        current settings fields is ignored.
+
+        Args:
+            path (str): Path to the snapshot file
+
+        Returns:
+            Optional[BaseConfig.Settings]: Restored settings, None if the
+                snapshot cannot be used
+        """
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            settings_class = cls._settings_class(data["environment"]).Settings
+            values: Dict[str, Any] = data["settings"]
+            defaults = settings_class()
+            if set(values) != {setting.name for setting in fields(defaults)}:
+                return None
+            for name, value in values.items():
+                default = getattr(defaults, name)
+                if isinstance(default, Path):
+                    values[name] = Path(value)
+                elif isinstance(default, tuple):
+                    values[name] = tuple(value)
+            return settings_class(**values)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
     @classmethod
     def reset_config(cls):
         """Reset the cached configuration instance."""
         cls._config = None
+
+    @classmethod
+    def _settings_class(cls, environment: str) -> Type[BaseConfig]:
+        """Get the configuration class of an environment.
+
+        Args:
+            environment (str): Environment name, case-insensitive
+
+        Returns:
+            Type[BaseConfig]: Configuration class, development by default
+        """
+        return cls._ENVIRONMENTS.get(environment.lower(), DevelopmentConfig)
@@ -0,0 +1,302 @@
+import hashlib
+from itertools import repeat
+from typing import TYPE_CHECKING, Iterator, Optional, Sequence
+from .encoding_detector import DetectedEncoding
+from .file_handler import FileHandler
+from .memory_budget import MemoryBudget
+from .profiler import active_profiler, profile_worker, stage
+from .sentence_segmenter import DEFAULT_LANGUAGE
+from .text_analyzer import TextAnalyzer, TextStatistics
+
+if TYPE_CHECKING:
+    from .deadline import Deadline
+    from .word_normalizer import WordNormalizer
+
+
+def scan_range(path: str, encoding: str, start: int, end: Optional[int],
+               memory_budget: MemoryBudget, ngram_order: int = 0,
+               minhash: bool = False, concordance: bool = False,
+               metrics: Sequence[str] = (), windows=None,
+               language: str = DEFAULT_LANGUAGE,
+               fallback: Optional[str] = None,
+               deadline: Optional["Deadline"] = None,
+               normalizer: Optional["WordNormalizer"] = None,
+               storage=None, digest: bool = False) -> TextStatistics:
+    """Collect statistics of a byte range of a file.
+
+    Defined at module level so it can be run in worker processes. The
+    statistics record the size of the range and of the part read before
+    the deadline, if any, expired.
+
+    Args:
+        path (str): Path to the file
+        encoding (str): Encoding of the file
+        start (int): Offset of the first byte of the range
+        end (Optional[int]): Offset after the last byte, None for end of file
+        memory_budget (MemoryBudget): Budget of the worker
+        ngram_order (int): Longest n-gram length to count, 0 to skip n-grams
+        minhash (bool): Whether to collect the MinHash shingle signature
+        concordance (bool): Whether to keep the token sequence for a concordance
+        metrics (Sequence[str]): Names of registered metrics to compute
+        windows: WindowStatistics fed the range, None to skip windows
+        language (str): Language of the sentence segmentation rules
+        fallback (Optional[str]): Encoding of bytes that are invalid in the
+            encoding, None to fail on them
+        deadline (Optional[Deadline]): Deadline checked between chunks,
+            None to read the whole range
+        normalizer (Optional[WordNormalizer]): Normalizer of the counted
+            word forms, None to count words as written
+        storage (Optional[StorageBackend]): Backend of the file, None for
+            the local filesystem
+        digest (bool): Whether to hash the file from its first byte to the
+            end of the range while reading it, into content_digest
+
+    Returns:
+        TextStatistics: Finished statistics of the range, partial if
+            stopped by the deadline
+    """
+    offsets = [start]
+    hasher = hashlib.sha256() if digest else None
+    if hasher is not None and start:
+        # Bytes before the range, such as a byte order mark, are hashed too
+        for block in FileHandler.iter_blocks(path, memory_budget.chunk_size(), 0, start, storage):
+            hasher.update(block)
+
+    def chunks() -> Iterator[str]:
+        """Yield chunks, recording the offset reached once a chunk was consumed."""
+        for text, offset in FileHandler.iter_chunk_offsets(path, encoding,
+                                                           memory_budget.chunk_size(),
+                                                           start, end, fallback,
+                                                           storage, hasher):
+            yield text
+            # Resumed only when the next chunk is requested, so a chunk
+            # fetched but left unconsumed at the deadline is not counted
+            offsets.append(offset)
+
+    statistics = TextStatistics.from_chunks(chunks(), memory_budget, ngram_order, minhash,
+                                            concordance, metrics, windows, language,
+                                            deadline, normalizer)
+    statistics.input_size = (FileHandler.get_size(path, storage) if end is None
+                             else end) - start
+    statistics.covered_size = (offsets[-1] - start if statistics.partial
+                               else statistics.input_size)
+    if hasher is not None and not statistics.partial:
+        statistics.content_digest = hasher.hexdigest()
+    return statistics
+
+
+def scan_shard(path: str, encoding: str, start: int, end: Optional[int],
+               memory_budget: MemoryBudget, shared_min_words: int,
+               *options) -> TextStatistics:
+    """Collect statistics of a file shard in a worker process.
+
+    The word table of the shard is moved to shared memory if it has at
+    least ``shared_min_words`` distinct words, so sending the statistics
+    back to the parent does not pickle every word.
+
+    Args:
+        path (str): Path to the file
+        encoding (str): Encoding of the file
+        start (int): Offset of the first byte of the shard
+        end (Optional[int]): Offset after the last byte, None for end of file
+        memory_budget (MemoryBudget): Budget of the worker
+        shared_min_words (int): Smallest word table sent through shared
+            memory, 0 to always pickle it
+        *options: Remaining arguments of scan_range
+
+    Returns:
+        TextStatistics: Finished statistics of the shard
+    """
+    with stage("scan-shard"):
+        statistics = scan_range(path, encoding, start, end, memory_budget, *options)
+    with stage("share-words"):
+        statistics.words.share(shared_min_words)
+    return statistics
+
+
+class AnalysisEngine:
+    """Runs memory-bounded analysis of text files.
+
+    Files are streamed in chunks sized by the memory budget instead of
+    being read whole. Large files are split into shards analyzed by
+    parallel workers, each with an equal share of the budget, and the
+    shard statistics are merged in file order; large shard word tables
+    come back through shared memory instead of being pickled. Window
+    statistics are emitted in file order as they close, so files analyzed
+    with windows are always scanned sequentially, as are UTF-16 and UTF-32
+    files, which cannot be split at single whitespace bytes. With a
+    deadline, every worker stops between chunks once it expires and the
+    merged statistics are partial, covering the start of every shard.
+
+    Attributes:
+        file_handler (FileHandler): File handler used to access files
+        memory_budget (MemoryBudget): Budget for analyzing a single file
+        ngram_order (int): Longest n-gram length counted, 0 if n-grams are skipped
+        minhash (bool): Whether the MinHash shingle signature is collected
+        concordance (bool): Whether the token sequence for a concordance is kept
+        metrics (Tuple[str, ...]): Names of the custom metrics computed
+        language (str): Language of the sentence segmentation rules
+        normalizer (Optional[WordNormalizer]): Normalizer of the word forms
+            counted as frequencies, None to count words as written
+    """
+
+    def __init__(self, file_handler: FileHandler, memory_budget: MemoryBudget,
+                 ngram_order: int = 0, minhash: bool = False,
+                 concordance: bool = False, metrics: Sequence[str] = (),
+                 language: str = DEFAULT_LANGUAGE,
+                 normalizer: Optional["WordNormalizer"] = None) -> None:
+        """Initialize AnalysisEngine.
+
+        Args:
+            file_handler (FileHandler): File handler used to access files
+            memory_budget (MemoryBudget): Budget for analyzing a single file
+            ngram_order (int): Longest n-gram length to count, 0 to skip n-grams
+            minhash (bool): Whether to collect the MinHash shingle signature
+            concordance (bool): Whether to keep the token sequence for a concordance
+            metrics (Sequence[str]): Names of registered metrics to compute
+            language (str): Language of the sentence segmentation rules
+            normalizer (Optional[WordNormalizer]): Normalizer dropping
+                stopwords and reducing word forms before they are counted;
+                every worker gets a copy with its own cache
+        """
+        self.file_handler = file_handler
+        self.memory_budget = memory_budget
+        self.ngram_order = ngram_order
+        self.minhash = minhash
+        self.concordance = concordance
+        self.metrics = tuple(metrics)
+        self.language = language
+        self.normalizer = normalizer
+
+    def analyze_file(self, path: str, n: int, windows=None,
+                     deadline: Optional["Deadline"] = None, digest: bool = False) -> TextAnalyzer:
+        """Analyze a file within the memory budget.
+
+        The returned analyzer may hold temporary files and should be closed
+        once its results are no longer needed.
+
+        Args:
+            path (str): Path to the file to analyze
+            n (int): Number of most frequent words to return
+            windows: WindowStatistics emitting per-window records of the
+                file, measured in its detected encoding, None to skip windows
+            deadline (Optional[Deadline]): Deadline after which every
+                worker stops reading, None for no time limit
+            digest (bool): Whether to hash the file while reading it; only
+                a file read in one pass is hashed, as its statistics'
+                content_digest
+
+        Returns:
+            TextAnalyzer: Analyzer over the collected statistics, partial
+                if the deadline stopped the analysis
+
+        Raises:
+            FileError: If file cannot be read or decoded
+            AnalysisError: If no valid words found in the file
+        """
+        with stage("detect-encoding"):
+            detected = self.file_handler.detect_encoding(path)
+        workers = 1
+        if windows is None and detected.ascii_compatible:
+            workers = self.memory_budget.worker_count(
+                FileHandler.get_size(path, self.file_handler.storage))
+        ranges = self.file_handler.shard_ranges(path, workers) if workers > 1 else [(0, None)]
+        # The byte order mark is not part of the text
+        ranges[0] = (detected.bom, ranges[0][1])
+
+        if len(ranges) == 1:
+            if windows is not None:
+                windows.encoding = detected.encoding
+            with stage("scan"):
+                statistics = scan_range(path, detected.encoding, detected.bom, None,
+                                        self.memory_budget, self.ngram_order, self.minhash,
+                                        self.concordance, self.metrics, windows,
+                                        self.language, detected.fallback, deadline,
+                                        self.normalizer, self.file_handler.storage, digest)
+        else:
+            statistics = self._scan_parallel(path, detected, ranges, deadline)
+        return TextAnalyzer.from_statistics(statistics, n, detected.encoding)
+
+    def _scan_parallel(self, path: str, detected: DetectedEncoding, ranges,
+                       deadline: Optional["Deadline"] = None) -> TextStatistics:
+        """Collect statistics of file shards in worker processes.
+
+        Args:
+            path (str): Path to the file
+            detected (DetectedEncoding): Encoding of the file
+            ranges: Consecutive (start, end) byte offsets of the shards
+            deadline (Optional[Deadline]): Deadline of every worker
+
+        Returns:
+            TextStatistics: Merged statistics of the whole file
+
+        While profiling, every worker runs under its own profiler and its
+        profile is added to the active one.
+        """
+        # Imported here: multiprocessing is slow to import and only needed for large files
+        from concurrent.futures import ProcessPoolExecutor
+
+        budget = self.memory_budget.split(len(ranges))
+        shared_min_words = self.file_handler.config.SHARED_MEMORY_MIN_WORDS
+        starts, ends = zip(*ranges)
+        arguments = (repeat(path), repeat(detected.encoding), starts, ends, repeat(budget),
+                     repeat(shared_min_words), repeat(self.ngram_order), repeat(self.minhash),
+                     repeat(self.concordance), repeat(self.metrics), repeat(None),
+                     repeat(self.language), repeat(detected.fallback), repeat(deadline),
+                     repeat(self.normalizer), repeat(self.file_handler.storage))
+        profiler = active_profiler()
+        parts = []
+        with stage("scan-shards"), ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            if profiler is None:
+                futures = [pool.submit(scan_shard, *shard) for shard in zip(*arguments)]
+            else:
+                settings = profiler.worker_settings()
+                futures = [pool.submit(profile_worker, settings, scan_shard, *shard)
+                           for shard in zip(*arguments)]
+            try:
+                for future in futures:
+                    part = future.result()
+                    if profiler is not None:
+                        part, profile = part
+                        profiler.add_worker(profile)
+                    parts.append(part)
+            except BaseException:
+                self._close_shards(futures, profiler is not None)
+                raise
+
+        statistics = parts[0]
+        try:
+            with stage("merge-shards"):
+                for part in parts[1:]:
+                    statistics.merge(part)
+        except BaseException:
+            statistics.close()
+            raise
+        finally:
+            # Removes shared memory segments of parts left unmerged by an error
+            for part in parts[1:]:
+                part.close()
+        return statistics
+
+    @staticmethod
+    def _close_shards(futures, profiled: bool) -> None:
+        """Release the statistics of every shard that finished despite a failed one.
+
+        Workers hand their shared memory segments over to this process, so
+        the segments of shards that are never merged must be removed here.
+        Shards that have not started are cancelled, running ones are
+        waited for.
+
+        Args:
+            futures: Futures of all shards, in file order
+            profiled (bool): Whether every result is a (statistics, profile) pair
+        """
+        for future in futures:
+            future.cancel()
+        for future in futures:
+            if future.cancelled() or future.exception() is not None:
+                continue
+            part = future.result()
+            if profiled:
+                part = part[0]
+            part.close()
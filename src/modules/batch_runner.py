@@ -0,0 +1,457 @@
+import os
+from typing import Any, Dict, Optional, Sequence, Tuple
+from .analysis_engine import AnalysisEngine
+from .exceptions import AnalysisError, FileError
+from .file_handler import FileHandler
+from .job_scheduler import JobScheduler
+from .memory_budget import MemoryBudget
+from .near_duplicates import LSHIndex
+from .output_formatter import OutputFormatter
+from .progress_journal import ProgressJournal
+from .window_statistics import NDJSONWriter, WindowStatistics
+
+
+class BatchRunner:
+    """Analyzes every available text file without user interaction.
+
+    Progress is recorded in a ProgressJournal so that an interrupted run
+    can be resumed: files that were already analyzed with the same size,
+    version and settings are skipped, and only unfinished, changed or
+    failed files are processed again. Only I/O errors are retried; a file
+    that cannot be analyzed, such as one without words, fails at once.
+
+    With deduplication enabled, the MinHash signature of every file is
+    collected in the same pass and looked up in an LSH index persisted in
+    the output directory. Near-duplicates are mapped to the canonical file
+    they resemble and are either reported in their results or saved only
+    as a reference to the canonical file.
+
+    With concordances enabled, the suffix-array index of every analyzed
+    file is saved next to its results.
+
+    With windows enabled, statistics of every window of lines, bytes or
+    paragraphs are streamed to an NDJSON file next to the results of each
+    file, in the same pass as the whole-file statistics.
+
+    With frequency runs enabled, the full word frequencies of every
+    analyzed file are saved next to its results as a run sorted by word,
+    for exact corpus-level top words.
+
+    Files are analyzed in the order chosen by a JobScheduler, which
+    serves small files first without starving large ones and shares the
+    batch fairly between tenants. Queue wait and service times of every
+    run are saved in the output directory.
+
+    Attributes:
+        file_handler: File handler used for listing, reading and saving files
+        path_manager: Path manager providing input and output locations
+        journal (ProgressJournal): Journal of completed and failed files
+        max_retries (int): Number of extra attempts for a file failing
+            with an I/O error
+        engine (AnalysisEngine): Engine analyzing files within the memory budget
+        symbol_limit (Optional[int]): Maximum number of symbols in results
+        ngrams (bool): Whether results include n-grams and collocations
+        dedupe (Optional[str]): Near-duplicate handling, 'report', 'skip' or None
+        concordance (bool): Whether concordance indexes are saved
+        windows (Optional[Tuple[str, int]]): Window mode and size, None if
+            window statistics are not saved
+        frequency_runs (bool): Whether frequency runs are saved
+        scheduler (JobScheduler): Scheduler ordering the files of a run
+        index (Optional[LSHIndex]): Index of file signatures during a run
+    """
+
+    DEDUPE_MODES = ("report", "skip")
+    RETRIED_ERRORS = (OSError, FileError)
+
+    def __init__(self, file_handler, path_manager, journal: ProgressJournal,
+                 max_retries: int = 2, engine: Optional[AnalysisEngine] = None,
+                 symbol_limit: Optional[int] = None, ngrams: bool = False,
+                 dedupe: Optional[str] = None, concordance: bool = False,
+                 metrics: Sequence[str] = (),
+                 windows: Optional[Tuple[str, int]] = None,
+                 frequency_runs: bool = False,
+                 scheduler: Optional[JobScheduler] = None) -> None:
+        """Initialize BatchRunner.
+
+        Args:
+            file_handler: File handler used for listing, reading and saving files
+            path_manager: Path manager providing input and output locations
+            journal (ProgressJournal): Journal of completed and failed files
+            max_retries (int): Number of extra attempts for a file failing
+                with an I/O error
+            engine (Optional[AnalysisEngine]): Engine analyzing files, defaults
+                to one bounded by the configured MAX_MEMORY
+            symbol_limit (Optional[int]): Maximum number of most frequent
+                symbols in results, None for all symbols
+            ngrams (bool): Include n-grams and collocations; a given engine
+                must be configured to collect them
+            dedupe (Optional[str]): 'report' to mark near-duplicates in their
+                results, 'skip' to save only the canonical file they map to,
+                None to disable; a given engine must collect MinHash signatures
+            concordance (bool): Save a concordance index of every file; a
+                given engine must keep token sequences
+            metrics (Sequence[str]): Names of registered metrics added to
+                the results of the default engine
+            windows (Optional[Tuple[str, int]]): Window mode and size, as
+                parsed by WindowStatistics.parse_spec, None to disable
+            frequency_runs (bool): Save the full word frequencies of every
+                file as a sorted run
+            scheduler (Optional[JobScheduler]): Scheduler ordering the
+                files, defaults to one with the configured lane settings
+
+        Raises:
+            ValueError: If dedupe is not a supported mode
+        """
+        if dedupe is not None and dedupe not in self.DEDUPE_MODES:
+            raise ValueError(f"Unsupported dedupe mode: {dedupe}")
+        self.file_handler = file_handler
+        self.path_manager = path_manager
+        self.journal = journal
+        self.max_retries = max(0, max_retries)
+        config = file_handler.config
+        self.engine = engine or AnalysisEngine(
+            file_handler, MemoryBudget(config.MAX_MEMORY),
+            ngram_order=config.NGRAM_ORDER if ngrams else 0,
+            minhash=dedupe is not None,
+            concordance=concordance,
+            metrics=metrics,
+            language=config.SENTENCE_LANGUAGE
+        )
+        self.symbol_limit = symbol_limit
+        self.ngrams = ngrams
+        self.dedupe = dedupe
+        self.concordance = concordance
+        self.windows = windows
+        self.frequency_runs = frequency_runs
+        if scheduler is None:
+            scheduler = JobScheduler(config.SCHEDULER_SMALL_FILE_SIZE,
+                                     config.SCHEDULER_LARGE_SHARE)
+        self.scheduler = scheduler
+        self.index: Optional[LSHIndex] = None
+
+    def run(self, n: int, resume: bool = False) -> Dict[str, int]:
+        """Analyze all available files.
+
+        Args:
+            n (int): Number of most frequent words to include in results
+            resume (bool): Skip files already completed in the journal
+
+        Returns:
+            Dict[str, int]: Number of 'completed', 'skipped' and 'failed' files
+
+        Raises:
+            FileError: If the input directory, the journal or the LSH index
+                cannot be accessed
+        """
+        files = self.file_handler.get_available_files(self.path_manager.input_dir)
+        for name, size in self.file_handler.oversized:
+            print(f"Skipped {name}: {size} bytes exceed the size limit")
+        if resume:
+            previous = self.journal.load()
+        else:
+            previous = {}
+            self.journal.reset()
+
+        summary = {"completed": 0, "skipped": 0, "failed": 0}
+        self.path_manager.ensure_output_dir_exists()
+        if self.dedupe is not None:
+            self.index = self._load_index(resume)
+
+        self.scheduler.reset()
+        for filename in files:
+            self.scheduler.submit(filename, self._file_size(filename))
+
+        with self.journal:
+            try:
+                while True:
+                    job = self.scheduler.next_job()
+                    if job is None:
+                        break
+                    input_path = self.path_manager.get_input_path(job.name)
+                    try:
+                        status = self._process(job.name, input_path, n, previous.get(input_path))
+                    finally:
+                        self.scheduler.finish(job)
+                    summary[status] += 1
+            finally:
+                if self.index is not None:
+                    self.file_handler.save_json(self.index.to_dict(), self._index_path())
+                self.file_handler.save_json(self.scheduler.metrics(), self.schedule_path())
+
+        return summary
+
+    def settings(self, n: int) -> Dict[str, Any]:
+        """Get the settings that results of a run depend on, for the journal.
+
+        Args:
+            n (int): Number of most frequent words to include in results
+
+        Returns:
+            Dict[str, Any]: JSON-compatible settings, equal to the ones
+                loaded back from the journal for the same run options
+        """
+        normalizer = self.engine.normalizer
+        return {
+            "n": n,
+            "symbol-limit": self.symbol_limit,
+            "ngrams": self.engine.ngram_order if self.ngrams else 0,
+            "metrics": list(self.engine.metrics),
+            "language": self.engine.language,
+            "normalization": normalizer.describe() if normalizer is not None else None,
+            "dedupe": self.dedupe,
+            "concordance": self.concordance,
+            "windows": list(self.windows) if self.windows is not None else None,
+            "frequency-runs": self.frequency_runs
+        }
+
+    def analyze_file(self, filename: str, n: int,
+                     digest: bool = False) -> Tuple[str, Optional[str]]:
+        """Analyze a single file and save its results.
+
+        Args:
+            filename (str): Name of the file in the input directory
+            n (int): Number of most frequent words to include in results
+            digest (bool): Whether to hash the file while reading it
+
+        Returns:
+            Tuple[str, Optional[str]]: Path to the saved results and the
+                content hash, None unless requested and the file was read
+                in one pass
+        """
+        input_path = self.path_manager.get_input_path(filename)
+        windows = self._open_windows(filename)
+        try:
+            analyzer = self.engine.analyze_file(input_path, n, windows, digest=digest)
+        finally:
+            if windows is not None:
+                windows.sink.close()
+        content_hash = analyzer.statistics.content_digest
+        try:
+            duplicate = self._find_duplicate(filename, analyzer)
+            if duplicate is not None and self.dedupe == "skip":
+                results = {"duplicate-of": duplicate}
+            else:
+                results = OutputFormatter(analyzer, n, self.symbol_limit,
+                                          self.ngrams).format_results()
+                if duplicate is not None:
+                    results["duplicate-of"] = duplicate
+                if self.concordance:
+                    self._save_concordance(filename, analyzer)
+                if self.frequency_runs:
+                    self._save_frequency_run(filename, analyzer)
+                if windows is not None:
+                    results["windows"] = {"mode": windows.mode, "size": windows.size,
+                                          "count": windows.count}
+        finally:
+            analyzer.close()
+
+        output_path = self.path_manager.get_result_path(filename)
+        self.path_manager.prepare_output(filename, output_path)
+        self.file_handler.save_json(results, output_path)
+        return output_path, content_hash
+
+    def _find_duplicate(self, filename: str, analyzer) -> Optional[Dict[str, Any]]:
+        """Index a file and find the canonical file it duplicates.
+
+        Args:
+            filename (str): Name of the file in the input directory
+            analyzer: Analyzer holding the MinHash signature of the file
+
+        Returns:
+            Optional[Dict[str, Any]]: Canonical 'file' and estimated
+                'similarity', None if the file is not a near-duplicate or
+                deduplication is disabled
+        """
+        if self.index is None:
+            return None
+        signature = analyzer.get_minhash_signature()
+        if analyzer.statistics.minhash.empty:
+            # Too short to form a single shingle
+            self.index.remove(filename)
+            return None
+        match = self.index.add(filename, signature)
+        if match is None:
+            return None
+        print(f"Near-duplicate {filename} -> {match[0]} (similarity {match[1]:.2f})")
+        return {"file": match[0], "similarity": round(match[1], 4)}
+
+    def _load_index(self, resume: bool) -> LSHIndex:
+        """Load the persisted LSH index, or start a new one.
+
+        Args:
+            resume (bool): Continue with the index of a previous run
+
+        Returns:
+            LSHIndex: Index using the configured threshold
+
+        Raises:
+            FileError: If a persisted index cannot be read or is malformed
+        """
+        config = self.file_handler.config
+        path = self._index_path()
+        if not resume or not os.path.exists(path):
+            return LSHIndex(config.LSH_BANDS, config.DEDUPE_THRESHOLD)
+        try:
+            index = LSHIndex.from_dict(self.file_handler.load_json(path))
+        except ValueError as e:
+            raise FileError(f"Error loading LSH index: {e}")
+        index.threshold = config.DEDUPE_THRESHOLD
+        return index
+
+    def _open_windows(self, filename: str) -> Optional[WindowStatistics]:
+        """Start the window statistics of a file, streamed next to its results.
+
+        Args:
+            filename (str): Name of the file in the input directory
+
+        Returns:
+            Optional[WindowStatistics]: Window statistics writing to the
+                NDJSON file, None if windows are disabled
+
+        Raises:
+            FileError: If the NDJSON file cannot be created
+        """
+        if self.windows is None:
+            return None
+        path = self.path_manager.get_windows_path(filename)
+        self.path_manager.prepare_output(filename, path)
+        writer = NDJSONWriter(path)
+        return WindowStatistics(*self.windows, sink=writer, language=self.engine.language)
+
+    def _save_concordance(self, filename: str, analyzer) -> None:
+        """Save the concordance index of a file next to its results.
+
+        A text too long to index within the memory budget keeps its
+        results without a concordance, with a warning.
+
+        Args:
+            filename (str): Name of the file in the input directory
+            analyzer: Analyzer holding the token sequence of the file
+
+        Raises:
+            FileError: If the index cannot be written
+        """
+        path = self.path_manager.get_concordance_path(filename)
+        self.path_manager.prepare_output(filename, path)
+        try:
+            analyzer.save_concordance(path, self.engine.memory_budget.concordance_limit())
+        except AnalysisError as e:
+            print(f"Warning: concordance of {filename} skipped: {e}")
+        except OSError as e:
+            raise FileError(f"Error saving concordance: {e}", {"path": path})
+
+    def _save_frequency_run(self, filename: str, analyzer) -> None:
+        """Save the frequency run of a file next to its results.
+
+        Args:
+            filename (str): Name of the file in the input directory
+            analyzer: Analyzer holding the word frequencies of the file
+
+        Raises:
+            FileError: If the run cannot be written
+        """
+        path = self.path_manager.get_frequency_run_path(filename)
+        self.path_manager.prepare_output(filename, path)
+        try:
+            analyzer.save_frequency_run(path)
+        except OSError as e:
+            raise FileError(f"Error saving frequency run: {e}", {"path": path})
+
+    def _file_size(self, filename: str) -> int:
+        """Get the size of an input file for scheduling.
+
+        Args:
+            filename (str): Name of the file in the input directory
+
+        Returns:
+            int: Size in bytes, 0 if it cannot be read, so the failure is
+                reported without delaying other files
+        """
+        try:
+            return FileHandler.get_size(self.path_manager.get_input_path(filename),
+                                        self.file_handler.storage)
+        except (OSError, ValueError):
+            return 0
+
+    def schedule_path(self) -> str:
+        """Get the location of the queue wait and service time metrics.
+
+        Returns:
+            str: Absolute path to the metrics file in the output directory
+        """
+        return os.path.join(self.path_manager.output_dir,
+                            self.file_handler.config.SCHEDULE_METRICS_FILENAME)
+
+    def _index_path(self) -> str:
+        """Get the LSH index location inside the output directory.
+
+        Returns:
+            str: Absolute path to the LSH index file
+        """
+        return os.path.join(self.path_manager.output_dir,
+                            self.file_handler.config.LSH_INDEX_FILENAME)
+
+    def _process(self, filename: str, input_path: str, n: int,
+                 entry: Optional[Dict]) -> str:
+        """Process one file with retries, skipping it if already done.
+
+        The journal entry is checked against the size and version of the
+        file, so an unchanged file is not read. Only files without a
+        version are hashed for the check, and the hash of a new file is
+        computed while it is analyzed.
+
+        Args:
+            filename (str): Name of the file in the input directory
+            input_path (str): Absolute path to the file
+            n (int): Number of most frequent words to include in results
+            entry (Optional[Dict]): Journal entry from a previous run
+
+        Returns:
+            str: Summary key for the outcome
+        """
+        settings = self.settings(n)
+        fingerprint = None
+        content_hash = None
+        error = None
+        attempts = 0
+
+        while attempts <= self.max_retries:
+            attempts += 1
+            try:
+                if fingerprint is None:
+                    fingerprint = self.file_handler.fingerprint(input_path)
+                    if fingerprint[1] is None and entry is not None:
+                        content_hash = self.file_handler.hash_file(input_path)
+                    if ProgressJournal.is_completed(entry, fingerprint, settings,
+                                                    content_hash):
+                        return "skipped"
+                output_path, digest = self.analyze_file(
+                    filename, n, digest=fingerprint[1] is None and content_hash is None)
+            except self.RETRIED_ERRORS as e:
+                error = e
+                continue
+            except Exception as e:
+                error = e
+                break
+
+            self.journal.record_success(input_path, fingerprint, settings, output_path,
+                                        attempts, content_hash or digest)
+            print(f"Analyzed {filename} -> {output_path}")
+            return "completed"
+
+        self.journal.record_failure(input_path, fingerprint, attempts, str(error))
+        print(f"Failed {filename} after {attempts} attempt(s): {error}")
+        return "failed"
+
+    @staticmethod
+    def journal_path(path_manager, journal_filename: str) -> str:
+        """Get the journal location inside the output directory.
+
+        Args:
+            path_manager: Path manager providing the output directory
+            journal_filename (str): Name of the journal file
+
+        Returns:
+            str: Absolute path to the journal file
+        """
+        return os.path.join(path_manager.output_dir, journal_filename)
@@ -0,0 +1,475 @@
+import mmap
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from .file_handler import atomic_write
+
+# Share of the tokens below which unsorted suffixes are sorted group by group
+GROUP_SORT_FRACTION = 8
+
+
+class TokenSequence:
+    """Token ids of a whole text, collected for building a concordance.
+
+    The sequence is fed the same word stream as the other statistics and
+    stores one 32-bit id per word. Sequences of consecutive shards can be
+    merged by remapping the ids of the following shard.
+
+    Attributes:
+        vocabulary (Dict[str, int]): Word to id mapping in first-occurrence order
+        ids (array): Id of every word of the text
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty TokenSequence."""
+        self.vocabulary: Dict[str, int] = {}
+        self.ids = array('I')
+
+    def __len__(self) -> int:
+        """Get the number of tokens."""
+        return len(self.ids)
+
+    def update(self, words: Sequence[str]) -> None:
+        """Append the next batch of words.
+
+        Args:
+            words (Sequence[str]): Next words of the text, in text order
+        """
+        vocabulary = self.vocabulary
+        self.ids.extend([vocabulary.setdefault(word, len(vocabulary)) for word in words])
+
+    def merge(self, other: "TokenSequence") -> None:
+        """Append the tokens of the text directly following this one.
+
+        Args:
+            other (TokenSequence): Tokens of the following part of the text
+        """
+        vocabulary = self.vocabulary
+        mapping = [vocabulary.setdefault(word, len(vocabulary)) for word in other.vocabulary]
+        self.ids.extend(map(mapping.__getitem__, other.ids))
+
+    def sorted_vocabulary(self) -> Tuple[List[str], array]:
+        """Renumber the tokens so that ids follow alphabetical word order.
+
+        Returns:
+            Tuple[List[str], array]: Sorted vocabulary and renumbered ids
+        """
+        words = sorted(self.vocabulary)
+        rank = [0] * len(words)
+        for new_id, word in enumerate(words):
+            rank[self.vocabulary[word]] = new_id
+        return words, array('I', map(rank.__getitem__, self.ids))
+
+
+def build_suffix_array(tokens: Sequence[int]) -> array:
+    """Sort all suffixes of a token sequence by prefix doubling.
+
+    Suffixes are kept in groups sharing their first tokens, each ranked
+    by the position of its group in the sorted order. Every round doubles
+    the number of tokens compared, refining each group by the rank of the
+    suffix that many tokens on, as in the algorithm of Larsson and
+    Sadakane.
+
+    While many suffixes are unsorted, a round is one stable counting-sort
+    pass over 32-bit arrays, about 20 bytes per token besides the tokens.
+    Once few are left, only their groups are sorted, one by one.
+
+    Args:
+        tokens (Sequence[int]): Token ids, small non-negative integers
+            such as those of TokenSequence.sorted_vocabulary
+
+    Returns:
+        array: Start positions of the suffixes in sorted order
+    """
+    size = len(tokens)
+    if not size:
+        return array('I')
+
+    # Counting sort by the first token
+    starts = array('I', bytes(4 * (max(tokens) + 2)))
+    for token in tokens:
+        starts[token + 1] += 1
+    for token in range(1, len(starts)):
+        starts[token] += starts[token - 1]
+    order = array('I', bytes(4 * size))
+    for position, token in enumerate(tokens):
+        order[starts[token]] = position
+        starts[token] += 1
+    del starts
+
+    rank = array('I', bytes(4 * size))
+    groups = array('I')
+    _rank_groups(order, 0, size, map(tokens.__getitem__, order), rank, groups)
+    step = 1
+    while groups:
+        unsorted = sum(groups[index + 1] - groups[index] for index in range(0, len(groups), 2))
+        if unsorted > size // GROUP_SORT_FRACTION:
+            order, rank, groups = _refine_by_counting(order, rank, groups, step)
+        else:
+            groups = _refine_by_sorting(order, rank, groups, step)
+        step *= 2
+    return order
+
+
+def _refine_by_counting(order: array, rank: array, groups: array,
+                        step: int) -> Tuple[array, array, array]:
+    """Refine all groups with one stable counting-sort pass over the whole order.
+
+    Walking the suffixes in the order of the suffix step tokens on, every
+    suffix is placed into the next free slot of its own group. Suffixes
+    shorter than the step have nothing to compare and come first.
+
+    Args:
+        order (array): Suffix start positions sorted by their groups
+        rank (array): Rank of every suffix
+        groups (array): Start and end of every group of several suffixes
+        step (int): Number of tokens the groups share
+
+    Returns:
+        Tuple[array, array, array]: Refined order, ranks and groups
+    """
+    size = len(order)
+    new_order = array('I', bytes(4 * size))
+    # Next free slot of every group, indexed by its rank
+    slots = array('I', range(size))
+    for position in range(max(0, size - step), size):
+        group = rank[position]
+        new_order[slots[group]] = position
+        slots[group] += 1
+    for position in order:
+        if position >= step:
+            group = rank[position - step]
+            new_order[slots[group]] = position - step
+            slots[group] += 1
+    del slots
+
+    new_rank = array('I', rank)
+    new_groups = array('I')
+    for index in range(0, len(groups), 2):
+        start, end = groups[index], groups[index + 1]
+        keys = (rank[position + step] + 1 if position + step < size else 0
+                for position in new_order[start:end])
+        _rank_groups(new_order, start, end, keys, new_rank, new_groups)
+    return new_order, new_rank, new_groups
+
+
+def _refine_by_sorting(order: array, rank: array, groups: array, step: int) -> array:
+    """Refine the groups one by one, sorting each by the rank of the suffix step tokens on.
+
+    Args:
+        order (array): Suffix start positions sorted by their groups,
+            refined in place
+        rank (array): Rank of every suffix, refined in place
+        groups (array): Start and end of every group of several suffixes
+        step (int): Number of tokens the groups share
+
+    Returns:
+        array: Start and end of every refined group of several suffixes
+    """
+    size = len(order)
+
+    def key(position: int) -> int:
+        """Get the rank of the suffix step tokens on, 0 for none."""
+        following = position + step
+        return rank[following] + 1 if following < size else 0
+
+    new_groups = array('I')
+    for index in range(0, len(groups), 2):
+        start, end = groups[index], groups[index + 1]
+        members = sorted(order[start:end], key=key)
+        # Keys are taken before the ranks of the group change
+        keys = [key(position) for position in members]
+        order[start:end] = array('I', members)
+        _rank_groups(order, start, end, keys, rank, new_groups)
+    return new_groups
+
+
+def _rank_groups(order: array, start: int, end: int, keys: Iterable[int],
+                 rank: array, groups: array) -> None:
+    """Rank a sorted range of suffixes by the position of the first suffix of their group.
+
+    Args:
+        order (array): Suffix start positions
+        start (int): First index of the range in order
+        end (int): Index after the range
+        keys (Iterable[int]): Sorted keys of the suffixes of the range,
+            equal within a group
+        rank (array): Filled with the rank of every suffix of the range
+        groups (array): Extended by the start and end of every group of
+            several suffixes
+    """
+    head = start
+    previous = None
+    for index, current in zip(range(start, end), keys):
+        if current != previous:
+            if index - head > 1:
+                groups.extend((head, index))
+            head = index
+            previous = current
+        rank[order[index]] = head
+    if end - head > 1:
+        groups.extend((head, end))
+
+
+class ConcordanceIndex:
+    """Memory-mapped suffix array over the token ids of a text.
+
+    The index file holds the token ids, their suffix array and the sorted
+    vocabulary. It is opened with mmap, so queries read only the pages
+    they touch. Phrase lookups are two binary searches over the suffix
+    array, taking O(m log n) comparisons for an m-word phrase in an n-word
+    text; keyword-in-context lines are rebuilt from neighbouring token ids.
+
+    Attributes:
+        path (str): Path to the index file
+        token_count (int): Number of tokens of the text
+        vocabulary_size (int): Number of distinct words
+    """
+
+    MAGIC = b'KWIC'
+    HEADER = struct.Struct('<4sIII')
+
+    def __init__(self, path: str) -> None:
+        """Open an index file.
+
+        Args:
+            path (str): Path to the index file
+
+        Raises:
+            OSError: If the file cannot be opened
+            ValueError: If the file is not a valid index
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Empty concordance index: {path}")
+
+        offset = self.HEADER.size
+        if len(self._map) < offset or self._map[:4] != self.MAGIC:
+            self.close()
+            raise ValueError(f"Not a concordance index: {path}")
+        _, tokens, words, blob_size = self.HEADER.unpack_from(self._map, 0)
+        if len(self._map) != offset + 4 * (2 * tokens + words + 1) + blob_size:
+            self.close()
+            raise ValueError(f"Truncated concordance index: {path}")
+
+        self.token_count = tokens
+        self.vocabulary_size = words
+        self._tokens = self._section(offset, tokens)
+        self._suffixes = self._section(offset + 4 * tokens, tokens)
+        self._offsets = self._section(offset + 8 * tokens, words + 1)
+        self._blob = offset + 4 * (2 * tokens + words + 1)
+
+    @classmethod
+    def build(cls, sequence: TokenSequence, path: str) -> None:
+        """Build the index of a token sequence and write it to a file.
+
+        The file is written with atomic_write, so an existing index is
+        replaced atomically.
+
+        Args:
+            sequence (TokenSequence): Tokens of the whole text
+            path (str): Path to the index file
+
+        Raises:
+            OSError: If the file cannot be written
+        """
+        words, tokens = sequence.sorted_vocabulary()
+        suffixes = build_suffix_array(tokens)
+        encoded = [word.encode('utf-8') for word in words]
+        offsets = array('I', [0])
+        for word in encoded:
+            offsets.append(offsets[-1] + len(word))
+        if sys.byteorder != 'little':
+            for section in (tokens, suffixes, offsets):
+                section.byteswap()
+
+        with atomic_write(path, 'wb') as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, len(tokens), len(words), offsets[-1]))
+            tokens.tofile(f)
+            suffixes.tofile(f)
+            offsets.tofile(f)
+            f.write(b''.join(encoded))
+
+    def __enter__(self) -> "ConcordanceIndex":
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the index when leaving the runtime context."""
+        self.close()
+
+    def close(self) -> None:
+        """Release the memory map and the file."""
+        for name in ('_tokens', '_suffixes', '_offsets'):
+            view = getattr(self, name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        self._map.close()
+        self._file.close()
+
+    def count(self, phrase: Sequence[str]) -> int:
+        """Count occurrences of an exact phrase.
+
+        Args:
+            phrase (Sequence[str]): Lowercase words of the phrase
+
+        Returns:
+            int: Number of occurrences
+        """
+        first, last = self._find(phrase)
+        return last - first
+
+    def search(self, phrase: Sequence[str], context: int = 5,
+               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Find occurrences of a phrase with the words around them.
+
+        Args:
+            phrase (Sequence[str]): Lowercase words of the phrase
+            context (int): Number of words shown on each side
+            limit (Optional[int]): Maximum number of occurrences, in text
+                order, None for all
+
+        Returns:
+            List[Dict[str, Any]]: For each occurrence, its word 'position'
+                and the 'left', 'match' and 'right' text
+        """
+        first, last = self._find(phrase)
+        positions = sorted(self._suffixes[first:last])
+        if limit is not None:
+            positions = positions[:limit]
+
+        size = len(phrase)
+        return [
+            {
+                "position": position,
+                "left": self._text(max(0, position - context), position),
+                "match": self._text(position, position + size),
+                "right": self._text(position + size, min(self.token_count, position + size + context))
+            }
+            for position in positions
+        ]
+
+    def _find(self, phrase: Sequence[str]) -> Tuple[int, int]:
+        """Find the range of suffixes starting with a phrase.
+
+        Args:
+            phrase (Sequence[str]): Lowercase words of the phrase
+
+        Returns:
+            Tuple[int, int]: First and past-the-end suffix array positions
+        """
+        ids = []
+        for word in phrase:
+            word_id = self._word_id(word)
+            if word_id is None:
+                return 0, 0
+            ids.append(word_id)
+        if not ids:
+            return 0, 0
+
+        suffixes = self._suffixes
+        low, high = 0, self.token_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._compare(suffixes[middle], ids) < 0:
+                low = middle + 1
+            else:
+                high = middle
+        first, high = low, self.token_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._compare(suffixes[middle], ids) <= 0:
+                low = middle + 1
+            else:
+                high = middle
+        return first, low
+
+    def _compare(self, start: int, ids: List[int]) -> int:
+        """Compare the suffix at a position with a phrase.
+
+        Args:
+            start (int): Start position of the suffix
+            ids (List[int]): Word ids of the phrase
+
+        Returns:
+            int: -1 if the suffix sorts before the phrase, 1 if after, 0 if
+                it starts with the phrase
+        """
+        tokens = self._tokens
+        for offset, word_id in enumerate(ids):
+            position = start + offset
+            if position >= self.token_count:
+                return -1
+            token = tokens[position]
+            if token != word_id:
+                return -1 if token < word_id else 1
+        return 0
+
+    def _word_id(self, word: str) -> Optional[int]:
+        """Find the id of a word by binary search in the sorted vocabulary.
+
+        Args:
+            word (str): Lowercase word
+
+        Returns:
+            Optional[int]: Id of the word, None if it does not occur
+        """
+        low, high = 0, self.vocabulary_size
+        while low < high:
+            middle = (low + high) // 2
+            if self._word(middle) < word:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.vocabulary_size and self._word(low) == word:
+            return low
+        return None
+
+    def _word(self, word_id: int) -> str:
+        """Get the word with a given id.
+
+        Args:
+            word_id (int): Id of the word
+
+        Returns:
+            str: The word
+        """
+        start = self._blob + self._offsets[word_id]
+        end = self._blob + self._offsets[word_id + 1]
+        return self._map[start:end].decode('utf-8')
+
+    def _text(self, start: int, end: int) -> str:
+        """Rebuild the words between two token positions.
+
+        Args:
+            start (int): First token position
+            end (int): Past-the-end token position
+
+        Returns:
+            str: Words separated by spaces
+        """
+        return " ".join(self._word(self._tokens[position]) for position in range(start, end))
+
+    def _section(self, offset: int, count: int):
+        """Get a zero-copy view of an array of 32-bit integers in the file.
+
+        On big-endian machines the section is copied and byte-swapped
+        instead, since the file is always little-endian.
+
+        Args:
+            offset (int): Byte offset of the section
+            count (int): Number of integers
+
+        Returns:
+            Sequence[int]: Integers of the section
+        """
+        if sys.byteorder == 'little':
+            return memoryview(self._map)[offset:offset + 4 * count].cast('I')
+        section = array('I', self._map[offset:offset + 4 * count])
+        section.byteswap()
+        return section
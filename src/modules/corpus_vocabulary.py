@@ -0,0 +1,69 @@
+from typing import Any, Dict
+from .sketches import DistinctCounter
+
+
+class CorpusVocabulary:
+    """Combines per-file vocabulary sketches into corpus-level statistics.
+
+    Each saved result carries a serialized DistinctCounter, so the number
+    of distinct words across many files is obtained by merging the
+    counters instead of reading the texts again.
+
+    Attributes:
+        distinct (DistinctCounter): Merged distinct-word counter
+        word_total (int): Total number of words of merged files
+        file_count (int): Number of merged files
+    """
+
+    SKETCH_KEY = "vocabulary-sketch"
+
+    def __init__(self) -> None:
+        """Initialize an empty CorpusVocabulary."""
+        self.distinct = DistinctCounter()
+        self.word_total = 0
+        self.file_count = 0
+
+    def add(self, results: Dict[str, Any]) -> bool:
+        """Merge the saved results of one file.
+
+        Args:
+            results (Dict[str, Any]): Results saved by OutputFormatter
+
+        Returns:
+            bool: False if the results carry no vocabulary sketch
+
+        Raises:
+            ValueError: If the sketch is malformed
+        """
+        data = results.get(self.SKETCH_KEY)
+        if data is None:
+            return False
+        self.distinct.merge(DistinctCounter.from_dict(data))
+        self.word_total += results.get("word-count", 0)
+        self.file_count += 1
+        return True
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the corpus-level vocabulary statistics.
+
+        The merged sketch is included, so the summary itself can be merged
+        with other corpora.
+
+        Returns:
+            Dict[str, Any]: Dictionary containing:
+                - 'files': Number of merged files
+                - 'word-count': Total number of words
+                - 'distinct-word-count': Number of distinct words
+                - 'type-token-ratio': Ratio of distinct words to all words
+                - 'exact': Whether the distinct count is exact
+                - 'vocabulary-sketch': Serialized merged counter
+        """
+        distinct = self.distinct.count()
+        return {
+            "files": self.file_count,
+            "word-count": self.word_total,
+            "distinct-word-count": distinct,
+            "type-token-ratio": round(distinct / self.word_total, 4) if self.word_total else 0.0,
+            "exact": self.distinct.exact,
+            self.SKETCH_KEY: self.distinct.to_dict()
+        }
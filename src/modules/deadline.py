@@ -0,0 +1,50 @@
+import time
+from typing import Union
+from .exceptions import ValidationError
+
+
+class Deadline:
+    """Point in time by which an analysis has to return.
+
+    The deadline is kept as a point on the monotonic clock, which all
+    processes of a machine share, so a deadline can be passed to worker
+    processes analyzing shards of the same file.
+
+    Attributes:
+        seconds (float): Time budget the deadline was created with
+        expires_at (float): Monotonic clock reading at which it expires
+    """
+
+    def __init__(self, seconds: Union[int, float]) -> None:
+        """Start a deadline expiring after a time budget.
+
+        Args:
+            seconds (Union[int, float]): Time budget from now, in seconds
+
+        Raises:
+            ValidationError: If the budget is not a positive number
+        """
+        if isinstance(seconds, bool) or not isinstance(seconds, (int, float)) or not seconds > 0:
+            raise ValidationError(f"Deadline must be a positive number of seconds, got {seconds!r}")
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Get the time left until the deadline.
+
+        Returns:
+            float: Seconds left, 0.0 once expired
+        """
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Check whether the deadline has passed.
+
+        Returns:
+            bool: True if no time is left
+        """
+        return time.monotonic() >= self.expires_at
+
+    def __repr__(self) -> str:
+        """Get a debugging representation of the deadline."""
+        return f"Deadline({self.seconds!r}, remaining={self.remaining():.3f})"
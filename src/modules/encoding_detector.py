@@ -0,0 +1,287 @@
+import codecs
+import re
+import unicodedata
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+# Byte order marks, longest first: the UTF-32-LE mark starts with the UTF-16-LE one
+BYTE_ORDER_MARKS: Tuple[Tuple[bytes, str], ...] = (
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be')
+)
+# Encoding of bytes that are invalid in a detected single-byte or UTF-16 encoding
+LAST_RESORT_ENCODING = 'latin-1'
+# Prefix of the codec error handlers registered by fallback_errors
+FALLBACK_ERRORS_PREFIX = 'text-analyzer-fallback-'
+LETTERS_PATTERN = re.compile(r'[^\W\d_]+')
+
+
+def fallback_errors(fallback: Optional[str]) -> str:
+    """Get a codec error handler decoding invalid bytes with another encoding.
+
+    The handler is registered in the current process on first use, so it
+    is also available in worker processes that call this function.
+
+    Args:
+        fallback (Optional[str]): Encoding of invalid bytes, None to fail on them
+
+    Returns:
+        str: Name of the error handler to pass to a decoder
+    """
+    if fallback is None:
+        return 'strict'
+    fallback = codecs.lookup(fallback).name
+    name = FALLBACK_ERRORS_PREFIX + fallback
+    try:
+        codecs.lookup_error(name)
+    except LookupError:
+        def decode_invalid(error: UnicodeError) -> Tuple[str, int]:
+            """Decode the invalid bytes of a decode error in the fallback encoding."""
+            if not isinstance(error, UnicodeDecodeError):
+                raise error
+            invalid = error.object[error.start:error.end]
+            return invalid.decode(fallback, 'replace'), error.end
+
+        codecs.register_error(name, decode_invalid)
+    return name
+
+
+class DetectedEncoding:
+    """Encoding of a file, as found by EncodingDetector.
+
+    Attributes:
+        encoding (str): Codec name, with an explicit byte order for UTF-16/32
+        bom (int): Length of the byte order mark to skip, 0 if there is none
+        source (str): 'bom' if found from the byte order mark, 'sample' if
+            from the statistics of the first bytes
+        fallback (Optional[str]): Encoding of bytes that are invalid in the
+            encoding, such as parts of a mixed-encoding file
+    """
+
+    def __init__(self, encoding: str, bom: int = 0, source: str = 'sample',
+                 fallback: Optional[str] = None) -> None:
+        """Initialize DetectedEncoding.
+
+        Args:
+            encoding (str): Codec name of the file content
+            bom (int): Length of the byte order mark to skip
+            source (str): 'bom' or 'sample'
+            fallback (Optional[str]): Encoding of bytes that are invalid in
+                the encoding, None to fail on them
+        """
+        self.encoding = codecs.lookup(encoding).name
+        self.bom = bom
+        self.source = source
+        self.fallback = fallback
+
+    @property
+    def unit(self) -> int:
+        """Size of a code unit in bytes: 4 for UTF-32, 2 for UTF-16, else 1."""
+        if self.encoding.startswith('utf-32'):
+            return 4
+        if self.encoding.startswith('utf-16'):
+            return 2
+        return 1
+
+    @property
+    def ascii_compatible(self) -> bool:
+        """Whether ASCII characters are encoded as single ASCII bytes."""
+        return self.unit == 1
+
+    @property
+    def errors(self) -> str:
+        """Name of the codec error handler applying the fallback encoding."""
+        return fallback_errors(self.fallback)
+
+    def __repr__(self) -> str:
+        """Get a debugging representation of the detected encoding."""
+        return f"DetectedEncoding({self.encoding!r}, bom={self.bom}, source={self.source!r})"
+
+
+class EncodingDetector:
+    """Detects the encoding of a file from a bounded prefix of its bytes.
+
+    A byte order mark decides the encoding on its own. Otherwise only the
+    first ``sample_size`` bytes are examined:
+
+    - UTF-16 without a mark is recognized by NUL bytes at either only odd
+      or only even offsets, as left by ASCII characters
+    - UTF-8 is taken if the sample is valid UTF-8, which is very unlikely
+      for text in a single-byte encoding that is not plain ASCII
+    - Among the remaining single-byte candidates, the one whose decoded
+      sample looks most like natural text wins: words in a single script
+      and consistently cased, few stray symbols or control characters,
+      and Latin words that are mostly ASCII
+
+    No full pass over the file is needed. Bytes later in the file that
+    are invalid in the detected encoding, as in files mixing encodings,
+    are decoded with the fallback encoding instead of failing the read.
+
+    Attributes:
+        candidates (Tuple[str, ...]): Encodings considered without a byte
+            order mark, preferred in this order on ties
+        fallback (str): Encoding of bytes that are invalid in UTF-8
+        sample_size (int): Number of leading bytes examined
+    """
+
+    def __init__(self, candidates: Sequence[str], fallback: str = 'cp1251',
+                 sample_size: int = 64 * 1024) -> None:
+        """Initialize EncodingDetector.
+
+        Args:
+            candidates (Sequence[str]): Encodings considered without a byte
+                order mark, preferred in this order on ties
+            fallback (str): Encoding of bytes that are invalid in UTF-8
+            sample_size (int): Number of leading bytes examined
+        """
+        self.candidates = tuple(codecs.lookup(name).name for name in candidates)
+        self.fallback = fallback
+        self.sample_size = sample_size
+
+    def detect(self, path: str) -> Optional[DetectedEncoding]:
+        """Detect the encoding of a file from its first bytes.
+
+        Args:
+            path (str): Path to the file
+
+        Returns:
+            Optional[DetectedEncoding]: Detected encoding, None if no
+                candidate decodes the sample
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        with Path(path).open('rb') as f:
+            sample = f.read(self.sample_size + 1)
+        complete = len(sample) <= self.sample_size
+        return self.detect_bytes(sample[:self.sample_size], complete)
+
+    def detect_bytes(self, sample: bytes, complete: bool = True) -> Optional[DetectedEncoding]:
+        """Detect the encoding of a sample of leading bytes.
+
+        Args:
+            sample (bytes): First bytes of the file
+            complete (bool): Whether the sample holds the whole file, so a
+                character cut at its end is an error
+
+        Returns:
+            Optional[DetectedEncoding]: Detected encoding, None if no
+                candidate decodes the sample
+        """
+        for mark, encoding in BYTE_ORDER_MARKS:
+            if sample.startswith(mark):
+                return self._detected(encoding, len(mark), 'bom')
+
+        utf16 = self._utf16_order(sample)
+        if (utf16 is not None and 'utf-16' in self.candidates
+                and self._decodes(sample, utf16, complete)):
+            return self._detected(utf16, 0, 'sample')
+
+        decodable = [name for name in self.candidates
+                     if DetectedEncoding(name).unit == 1
+                     and self._decodes(sample, name, complete)]
+        if 'utf-8' in decodable:
+            return self._detected('utf-8', 0, 'sample')
+        if not decodable:
+            return None
+        return self._detected(max(decodable, key=lambda name: self._score(sample, name)),
+                              0, 'sample')
+
+    def _detected(self, encoding: str, bom: int, source: str) -> DetectedEncoding:
+        """Create a detected encoding with the matching fallback.
+
+        Args:
+            encoding (str): Detected encoding
+            bom (int): Length of the byte order mark
+            source (str): 'bom' or 'sample'
+
+        Returns:
+            DetectedEncoding: Encoding decoding invalid UTF-8 bytes with the
+                fallback encoding and other invalid bytes as Latin-1
+        """
+        fallback = self.fallback if encoding == 'utf-8' else LAST_RESORT_ENCODING
+        return DetectedEncoding(encoding, bom, source, fallback)
+
+    @staticmethod
+    def _decodes(sample: bytes, encoding: str, complete: bool) -> bool:
+        """Check whether a sample is valid in an encoding.
+
+        Args:
+            sample (bytes): Bytes to decode
+            encoding (str): Encoding to try
+            complete (bool): Whether a character cut at the end is an error
+
+        Returns:
+            bool: True if the sample decodes
+        """
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=complete)
+        except UnicodeDecodeError:
+            return False
+        return True
+
+    @staticmethod
+    def _utf16_order(sample: bytes) -> Optional[str]:
+        """Recognize UTF-16 without a byte order mark by its NUL bytes.
+
+        Args:
+            sample (bytes): First bytes of the file
+
+        Returns:
+            Optional[str]: 'utf-16-le' or 'utf-16-be', None if the sample
+                does not look like UTF-16
+        """
+        units = len(sample) // 2
+        if not units:
+            return None
+        even = sample[0:units * 2:2].count(0)
+        odd = sample[1:units * 2:2].count(0)
+        if odd >= units / 10 and even <= odd / 10:
+            return 'utf-16-le'
+        if even >= units / 10 and odd <= even / 10:
+            return 'utf-16-be'
+        return None
+
+    @staticmethod
+    def _score(sample: bytes, encoding: str) -> float:
+        """Rate how much a sample decoded in an encoding looks like text.
+
+        Args:
+            sample (bytes): Bytes in a single-byte encoding
+            encoding (str): Encoding to decode with
+
+        Returns:
+            float: Higher for more plausible text
+        """
+        text = sample.decode(encoding)
+        score = 0.0
+        for char in set(text):
+            if char.isascii() or char.isalpha():
+                continue
+            category = unicodedata.category(char)
+            if category[0] in 'CS' or category == 'No':
+                # Control characters and symbols where letters are expected
+                score -= text.count(char)
+
+        for match in LETTERS_PATTERN.finditer(text):
+            word = match.group()
+            if word.isascii():
+                continue
+            cyrillic = sum('\u0400' <= char <= '\u052f' for char in word)
+            if cyrillic and cyrillic < len(word):
+                # Cyrillic and Latin letters mixed in one word
+                score -= 1
+            elif not cyrillic and len(word) > 1 and (
+                    sum(not char.isascii() for char in word) * 2 > len(word)):
+                # Latin words are mostly ASCII, even with accented letters
+                score -= 1
+            elif word.islower() or word.istitle():
+                score += 1
+            elif word.isupper():
+                score += 0.25
+            else:
+                score -= 1
+        return score
@@ -0,0 +1,263 @@
+import math
+import random
+from collections import Counter
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence, Tuple
+from .exceptions import AnalysisError, FileError, ValidationError
+from .text_analyzer import WORD_PATTERN
+
+
+class EstimateAnalyzer:
+    """Estimates text statistics from a random sample of file blocks.
+
+    The file is split into aligned blocks of equal size and only a random
+    subset of them is read, so the cost is bounded by the sample size and
+    not by the file size. Every block is passed as a (prefix, core, suffix)
+    triple: only words starting inside the core are counted, while prefix
+    and suffix provide the context needed to complete words cut by block
+    boundaries. Totals are extrapolated with the cluster sampling estimator
+    and confidence intervals use the normal approximation with finite
+    population correction.
+
+    Attributes:
+        n (int): Number of most frequent words to return
+        total_blocks (int): Number of aligned blocks in the whole file
+        sampled_blocks (int): Number of blocks in the sample
+        confidence (float): Confidence level of the reported intervals
+        encoding (Optional[str]): Detected encoding of the sampled file,
+            None if the blocks were given directly
+    """
+
+    def __init__(self, blocks: Sequence[Tuple[str, str, str]], total_blocks: int,
+                 n: int, confidence: float = 0.95) -> None:
+        """Initialize EstimateAnalyzer and collect per-block statistics.
+
+        Args:
+            blocks (Sequence[Tuple[str, str, str]]): Sampled blocks as
+                (prefix, core, suffix) text triples
+            total_blocks (int): Number of aligned blocks in the whole file
+            n (int): Number of most frequent words to return
+            confidence (float): Confidence level of the reported intervals
+
+        Raises:
+            ValidationError: If the sample is empty or parameters are invalid
+            AnalysisError: If no valid words found in the sample
+        """
+        if not blocks:
+            raise ValidationError("Sample cannot be empty")
+        if total_blocks < len(blocks):
+            raise ValidationError("Sample cannot be larger than the file")
+        if not 0 < confidence < 1:
+            raise ValidationError("Confidence must be between 0 and 1")
+
+        self.n = n
+        self.total_blocks = total_blocks
+        self.sampled_blocks = len(blocks)
+        self.confidence = confidence
+        self.encoding: Optional[str] = None
+        self.word_counts: List[int] = []
+        self.length_sums: List[int] = []
+        self.frequencies: Counter = Counter()
+
+        for prefix, core, suffix in blocks:
+            self._consume_block(prefix, core, suffix)
+
+        if not sum(self.word_counts):
+            raise AnalysisError("No valid words found in sample")
+
+    @classmethod
+    def from_file(cls, file_handler, path: str, n: int, sample_blocks: int,
+                  block_size: int, confidence: float = 0.95,
+                  seed: Optional[int] = None) -> "EstimateAnalyzer":
+        """Sample a file and create an estimator from the sampled blocks.
+
+        Args:
+            file_handler: File handler used to read the sampled blocks
+            path (str): Path to the file to sample
+            n (int): Number of most frequent words to return
+            sample_blocks (int): Number of blocks to sample
+            block_size (int): Size of a block in bytes
+            confidence (float): Confidence level of the reported intervals
+            seed (Optional[int]): Seed for reproducible sampling
+
+        Returns:
+            EstimateAnalyzer: Estimator over the sampled blocks
+
+        Raises:
+            FileError: If the file cannot be read or decoded
+            ValidationError: If sampling parameters are invalid
+            AnalysisError: If no valid words found in the sample
+        """
+        try:
+            file_size = file_handler.get_size(path, file_handler.storage)
+        except OSError as e:
+            raise FileError(f"Error reading file: {e}")
+        indices, total_blocks = cls.choose_blocks(file_size, block_size, sample_blocks, seed)
+        detected = file_handler.detect_encoding(path, limit_size=False)
+        blocks = file_handler.read_sample_blocks(path, indices, block_size, detected=detected)
+        estimator = cls(blocks, total_blocks, n, confidence)
+        estimator.encoding = detected.encoding
+        return estimator
+
+    @staticmethod
+    def choose_blocks(file_size: int, block_size: int, sample_blocks: int,
+                      seed: Optional[int] = None) -> Tuple[List[int], int]:
+        """Choose random aligned blocks to sample.
+
+        Args:
+            file_size (int): Size of the file in bytes
+            block_size (int): Size of a block in bytes
+            sample_blocks (int): Number of blocks to sample
+            seed (Optional[int]): Seed for reproducible sampling
+
+        Returns:
+            Tuple[List[int], int]: Sorted indices of sampled blocks and
+                total number of blocks in the file
+
+        Raises:
+            ValidationError: If sizes are not positive
+        """
+        if file_size <= 0 or block_size <= 0 or sample_blocks <= 0:
+            raise ValidationError("File size, block size and sample size must be positive")
+
+        total_blocks = math.ceil(file_size / block_size)
+        if sample_blocks >= total_blocks:
+            return list(range(total_blocks)), total_blocks
+        indices = random.Random(seed).sample(range(total_blocks), sample_blocks)
+        return sorted(indices), total_blocks
+
+    def get_word_count(self) -> int:
+        """Estimate the total number of words in the file.
+
+        Returns:
+            int: Extrapolated word count
+        """
+        return round(self._scale * sum(self.word_counts))
+
+    def get_average_word_length(self) -> float:
+        """Estimate the average word length.
+
+        Returns:
+            float: Ratio of sampled word lengths to sampled words,
+                rounded to 2 decimal places
+        """
+        return round(sum(self.length_sums) / sum(self.word_counts), 2)
+
+    def get_most_frequent_words(self) -> Dict[str, int]:
+        """Estimate the N most frequent words and their frequencies.
+
+        Returns:
+            Dict[str, int]: Words with their extrapolated frequencies
+        """
+        return {
+            word: round(count * self._scale)
+            for word, count in self.frequencies.most_common(self.n)
+        }
+
+    def get_confidence_intervals(self) -> Dict[str, Optional[List[float]]]:
+        """Get confidence intervals of the estimated metrics.
+
+        Intervals are None when they cannot be computed from a single
+        sampled block out of many.
+
+        Returns:
+            Dict[str, Optional[List[float]]]: Lower and upper bounds for
+                'word-count' and 'average-word-length'
+        """
+        z = NormalDist().inv_cdf(0.5 + self.confidence / 2)
+        k = self.sampled_blocks
+        fpc = 1 - k / self.total_blocks
+
+        word_count = self.get_word_count()
+        average = sum(self.length_sums) / sum(self.word_counts)
+        if fpc == 0:
+            return {
+                "word-count": [word_count, word_count],
+                "average-word-length": [round(average, 2), round(average, 2)]
+            }
+        if k < 2:
+            return {"word-count": None, "average-word-length": None}
+
+        total_error = self.total_blocks * math.sqrt(
+            fpc * self._variance(self.word_counts) / k
+        )
+        residuals = [
+            length - average * words
+            for length, words in zip(self.length_sums, self.word_counts)
+        ]
+        mean_words = sum(self.word_counts) / k
+        ratio_error = math.sqrt(fpc * self._variance(residuals) / k) / mean_words
+
+        return {
+            "word-count": [
+                max(0, round(word_count - z * total_error)),
+                round(word_count + z * total_error)
+            ],
+            "average-word-length": [
+                round(average - z * ratio_error, 2),
+                round(average + z * ratio_error, 2)
+            ]
+        }
+
+    def get_encoding(self) -> Optional[str]:
+        """Get the detected encoding of the sampled file.
+
+        Returns:
+            Optional[str]: Codec name, None if the blocks were given directly
+        """
+        return self.encoding
+
+    def get_sample_info(self) -> Dict[str, float]:
+        """Describe the sample the estimates are based on.
+
+        Returns:
+            Dict[str, float]: Number of sampled and total blocks, the
+                sampled fraction and the confidence level
+        """
+        return {
+            "sampled-blocks": self.sampled_blocks,
+            "total-blocks": self.total_blocks,
+            "coverage": round(self.sampled_blocks / self.total_blocks, 4),
+            "confidence": self.confidence
+        }
+
+    @property
+    def _scale(self) -> float:
+        """Extrapolation factor from the sample to the whole file."""
+        return self.total_blocks / self.sampled_blocks
+
+    def _consume_block(self, prefix: str, core: str, suffix: str) -> None:
+        """Collect statistics of words starting inside the block core.
+
+        Args:
+            prefix (str): Text preceding the block
+            core (str): Text of the block itself
+            suffix (str): Text following the block
+        """
+        text = prefix + core + suffix
+        start, end = len(prefix), len(prefix) + len(core)
+        words = 0
+        length = 0
+        for match in WORD_PATTERN.finditer(text, start):
+            if match.start() >= end:
+                break
+            word = match.group().lower()
+            words += 1
+            length += len(word)
+            self.frequencies[word] += 1
+
+        self.word_counts.append(words)
+        self.length_sums.append(length)
+
+    @staticmethod
+    def _variance(values: Sequence[float]) -> float:
+        """Compute the sample variance.
+
+        Args:
+            values (Sequence[float]): Observed values
+
+        Returns:
+            float: Unbiased sample variance
+        """
+        mean = sum(values) / len(values)
+        return sum((value - mean) ** 2 for value in values) / (len(values) - 1)
@@ -1,40 +1,131 @@
+import codecs
+import hashlib
 import json
+import os
+import re
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Any
-from src.config.config import ConfigFactory
+from typing import IO, List, Dict, Any, Iterator, Optional, Sequence, Tuple
+from .encoding_detector import DetectedEncoding, EncodingDetector, fallback_errors
 from .exceptions import FileError, ValidationError
 
 
+def load_config():
+    """Resolve the application configuration on first use.
+
+    The config package is a sibling of this package: it is imported as
+    ``src.config`` when the project root is on the path (tests, library
+    use) and as ``config`` when ``analyzer.py`` runs from ``src``. The
+    import is deferred so that startup does not pay for it until a
+    FileHandler is created.
+
+    Returns:
+        Settings: Configuration instance for the current environment
+    """
+    try:
+        from ..config.config import ConfigFactory
+    except ImportError:
+        from config.config import ConfigFactory
+    return ConfigFactory.get_config()
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'w') -> Iterator[IO]:
+    """Open a temporary file that replaces a file once it is written.
+
+    The temporary file is placed next to the target and named after the
+    process and thread, so concurrent writers of the same path never
+    share it, the last finished write wins whole, and readers never see a
+    partial file. If writing fails, the temporary file is removed and the
+    target is left as it was.
+
+    Args:
+        path (str): Location of the file to write
+        mode (str): 'w' for UTF-8 text or 'wb' for bytes
+
+    Yields:
+        IO: Open temporary file
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    directory, name = os.path.split(path)
+    temp_path = os.path.join(directory, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp_path, mode, encoding=None if 'b' in mode else 'utf-8') as f:
+            yield f
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
 class FileHandler:
     """Handles file operations for the text analyzer application.
 
     This class manages file operations including reading text files,
     listing available files, and saving analysis results.
 
+    Input files are read from the local filesystem by default. With a
+    storage backend, input paths are locations of the backend's objects,
+    listed, sized and read in byte ranges through it, which lets the same
+    streaming and sharded analysis run over remote object storage.
+    Objects are only ever streamed, so they are limited by
+    MAX_OBJECT_SIZE instead of MAX_FILE_SIZE, except when read whole.
+    Results are always written locally.
+
     Attributes:
         validator: File validator instance for path validation
         config: Application configuration instance
+        encoding_detector (EncodingDetector): Detector of file encodings
+        storage (Optional[StorageBackend]): Backend of the input files,
+            None for the local filesystem
+        oversized (List[Tuple[str, int]]): Names and sizes of the files left
+            out of the last listing for exceeding the size limit
     """
 
-    def __init__(self, validator) -> None:
+    STREAM_BLOCK_SIZE = 1024 * 1024
+    # Bytes a shard may start after; '\r' is excluded so '\r\n' is never split
+    SHARD_BOUNDARY_PATTERN = re.compile(rb'[ \t\n]')
+
+    def __init__(self, validator, storage=None) -> None:
         """Initialize FileHandler with validator.
 
         Args:
             validator: Validator instance for file validation
+            storage (Optional[StorageBackend]): Backend of the input files,
+                None to read them from the local filesystem
         """
         self.validator = validator
-        self.config = ConfigFactory.get_config()
+        self.storage = storage
+        self.oversized: List[Tuple[str, int]] = []
+        self.config = load_config()
+        self.encoding_detector = EncodingDetector(
+            self.config.SUPPORTED_ENCODINGS,
+            self.config.FALLBACK_ENCODING,
+            self.config.ENCODING_SAMPLE_SIZE
+        )
 
-    def get_available_files(self, directory: str) -> List[str]:
+    def get_available_files(self, directory: str,
+                            include_oversized: bool = False) -> List[str]:
         """List all valid text files in the specified directory.
 
         Lists files that:
         - Have supported extensions (defined in config)
-        - Don't exceed maximum file size
+        - Don't exceed maximum file size, unless include_oversized is set
         - Are accessible
 
+        Files left out for their size are kept in ``oversized``.
+
         Args:
-            directory (str): Path to directory to search
+            directory (str): Path to directory to search, ignored with a
+                storage backend, which lists the objects under its root
+            include_oversized (bool): Also list files above the size limit,
+                e.g. for sampling-based estimates
 
         Returns:
             List[str]: List of valid file names, sorted alphabetically
@@ -42,24 +133,33 @@ class FileHandler:
         Raises:
             FileError: If directory access fails or other file operations fail
         """
-        path = Path(directory)
         try:
-            files = [
-                f.name for f in path.iterdir()
-                if (f.is_file() and
-                    f.suffix in self.config.SUPPORTED_FILE_TYPES and
-                    f.stat().st_size <= self.config.MAX_FILE_SIZE)
-            ]
-            return sorted(files)
+            if self.storage is not None:
+                limit = self.config.MAX_OBJECT_SIZE
+                candidates = [
+                    (name, size) for name, size in self.storage.list()
+                    if os.path.splitext(name)[1] in self.config.SUPPORTED_FILE_TYPES
+                ]
+            else:
+                limit = self.config.MAX_FILE_SIZE
+                candidates = sorted(
+                    (f.name, f.stat().st_size) for f in Path(directory).iterdir()
+                    if f.is_file() and f.suffix in self.config.SUPPORTED_FILE_TYPES
+                )
         except Exception as e:
             raise FileError(
                 self.config.ERROR_MESSAGES['dir_access_error'].format(e)
             )
+        self.oversized = [] if include_oversized else [
+            (name, size) for name, size in candidates if size > limit
+        ]
+        return [name for name, size in candidates if include_oversized or size <= limit]
 
     def read_file(self, path: str) -> str:
         """Read and decode content from a text file.
 
-        Attempts to read the file using supported encodings defined in config.
+        The encoding is detected from the first bytes of the file, and the
+        file is decoded in a single pass.
 
         Args:
             path (str): Path to the file to read
@@ -71,6 +171,15 @@ class FileHandler:
             FileError: If file cannot be read or decoded
             ValidationError: If file path is invalid
         """
+        if self.storage is not None:
+            if self.get_size(path, self.storage) > self.config.MAX_FILE_SIZE:
+                raise FileError(
+                    self.config.ERROR_MESSAGES['file_size_error'].format(path)
+                )
+            detected = self.detect_encoding(path)
+            return "".join(self.iter_chunks(path, detected.encoding, self.STREAM_BLOCK_SIZE,
+                                            detected.bom, fallback=detected.fallback,
+                                            storage=self.storage))
         path = Path(path)
         try:
             self.validator.validate_file_path(path)
@@ -81,28 +190,501 @@ class FileHandler:
                     self.config.ERROR_MESSAGES['file_size_error'].format(path)
                 )
 
-            for encoding in self.config.SUPPORTED_ENCODINGS:
-                try:
-                    with path.open('r', encoding=encoding) as f:
-                        return f.read()
-                except UnicodeDecodeError:
-                    continue
+            detected = self._detect(path)
+            return "".join(self.iter_chunks(str(path), detected.encoding, self.STREAM_BLOCK_SIZE,
+                                            detected.bom, fallback=detected.fallback))
 
+        except ValidationError as e:
+            raise FileError(
+                self.config.ERROR_MESSAGES['invalid_file'].format(e)
+            )
+        except Exception as e:
+            raise FileError(f"Error reading file: {e}")
+
+    def detect_encoding(self, path: str, limit_size: bool = True) -> DetectedEncoding:
+        """Detect the encoding of a file from its first bytes.
+
+        Only a bounded prefix of the file is read, so detection takes the
+        same time for any file size. Bytes later in the file that are
+        invalid in the detected encoding are decoded with its fallback.
+
+        Args:
+            path (str): Path to the file to check
+            limit_size (bool): Reject files above the size limit, False
+                when only parts of the file are read
+
+        Returns:
+            DetectedEncoding: Encoding, byte order mark and fallback of the file
+
+        Raises:
+            FileError: If file cannot be read or no supported encoding fits
+        """
+        if self.storage is not None:
+            return self._detect_object(path, limit_size)
+        path = Path(path)
+        try:
+            self.validator.validate_file_path(path)
+
+            if limit_size and path.stat().st_size > self.config.MAX_FILE_SIZE:
+                raise FileError(
+                    self.config.ERROR_MESSAGES['file_size_error'].format(path)
+                )
+
+            return self._detect(path)
+
+        except ValidationError as e:
+            raise FileError(
+                self.config.ERROR_MESSAGES['invalid_file'].format(e)
+            )
+        except FileError:
+            raise
+        except Exception as e:
+            raise FileError(f"Error reading file: {e}")
+
+    def _detect(self, path: Path) -> DetectedEncoding:
+        """Detect the encoding of a validated file.
+
+        Args:
+            path (Path): Path to the file
+
+        Returns:
+            DetectedEncoding: Detected encoding of the file
+
+        Raises:
+            FileError: If no supported encoding fits the first bytes
+            OSError: If the file cannot be read
+        """
+        detected = self.encoding_detector.detect(str(path))
+        if detected is None:
+            raise FileError(
+                self.config.ERROR_MESSAGES['decode_error'].format(path)
+            )
+        return detected
+
+    def _detect_object(self, path: str, limit_size: bool) -> DetectedEncoding:
+        """Detect the encoding of an object of the storage backend.
+
+        Args:
+            path (str): Location of the object
+            limit_size (bool): Reject objects above MAX_OBJECT_SIZE
+
+        Returns:
+            DetectedEncoding: Encoding, byte order mark and fallback of the object
+
+        Raises:
+            FileError: If the object is missing, empty, too large or
+                cannot be decoded
+        """
+        try:
+            name = self.storage.name_of(path)
+            size = self.storage.size(name)
+            if size == 0:
+                raise FileError(
+                    self.config.ERROR_MESSAGES['invalid_file'].format(f"File is empty: {path}")
+                )
+            if limit_size and size > self.config.MAX_OBJECT_SIZE:
+                raise FileError(
+                    self.config.ERROR_MESSAGES['file_size_error'].format(path)
+                )
+            sample_size = self.encoding_detector.sample_size
+            sample = self.storage.read_range(name, 0, sample_size + 1)
+        except FileError:
+            raise
+        except Exception as e:
+            raise FileError(f"Error reading file: {e}")
+        detected = self.encoding_detector.detect_bytes(sample[:sample_size],
+                                                       len(sample) <= sample_size)
+        if detected is None:
             raise FileError(
                 self.config.ERROR_MESSAGES['decode_error'].format(path)
             )
+        return detected
+
+    @staticmethod
+    def get_size(path: str, storage=None) -> int:
+        """Get the size of a file in bytes.
+
+        Args:
+            path (str): Path to the file, or location of an object of storage
+            storage (Optional[StorageBackend]): Backend of the file, None
+                for the local filesystem
+
+        Returns:
+            int: Size of the file in bytes
+
+        Raises:
+            OSError: If the file does not exist or cannot be accessed
+        """
+        if storage is not None:
+            return storage.size(storage.name_of(path))
+        return os.path.getsize(path)
+
+    def fingerprint(self, path: str) -> Tuple[int, Optional[str]]:
+        """Get the size of a file and a version that changes with its content.
+
+        The version is the modification time of local files and the ETag
+        of objects, so both are read without reading the content.
+
+        Args:
+            path (str): Path to the file, or location of an object of storage
+
+        Returns:
+            Tuple[int, Optional[str]]: Size in bytes and version, None if
+                the storage backend cannot tell versions
+
+        Raises:
+            FileError: If the file does not exist or cannot be accessed
+        """
+        try:
+            if self.storage is not None:
+                return self.storage.stat(self.storage.name_of(path))
+            status = os.stat(path)
+        except (OSError, ValueError) as e:
+            raise FileError(f"Error reading file: {e}")
+        return status.st_size, str(status.st_mtime_ns)
+
+    @staticmethod
+    def iter_chunks(path: str, encoding: str, chunk_size: int, start: int = 0,
+                    end: Optional[int] = None,
+                    fallback: Optional[str] = None, storage=None) -> Iterator[str]:
+        """Stream decoded text of a file or of a byte range of it.
+
+        Newlines are translated the same way as in read_file, so the
+        concatenated chunks equal the text read_file would return.
+
+        Args:
+            path (str): Path to the file to read
+            encoding (str): Encoding of the file
+            chunk_size (int): Maximum number of bytes decoded per chunk
+            start (int): Offset of the first byte to read
+            end (Optional[int]): Offset after the last byte, None for end of file
+            fallback (Optional[str]): Encoding of bytes that are invalid in
+                the encoding, None to fail on them
+            storage (Optional[StorageBackend]): Backend of the file, None
+                for the local filesystem
+
+        Returns:
+            Iterator[str]: Consecutive chunks of text
+
+        Raises:
+            FileError: If file cannot be read or decoded
+        """
+        for text, _ in FileHandler.iter_chunk_offsets(path, encoding, chunk_size,
+                                                      start, end, fallback, storage):
+            yield text
+
+    @staticmethod
+    def iter_chunk_offsets(path: str, encoding: str, chunk_size: int, start: int = 0,
+                           end: Optional[int] = None,
+                           fallback: Optional[str] = None,
+                           storage=None, digest=None) -> Iterator[Tuple[str, int]]:
+        """Stream decoded text of a file with the byte offset reached by each chunk.
+
+        Args:
+            path (str): Path to the file to read
+            encoding (str): Encoding of the file
+            chunk_size (int): Maximum number of bytes decoded per chunk
+            start (int): Offset of the first byte to read
+            end (Optional[int]): Offset after the last byte, None for end of file
+            fallback (Optional[str]): Encoding of bytes that are invalid in
+                the encoding, None to fail on them
+            storage (Optional[StorageBackend]): Backend of the file, None
+                for the local filesystem
+            digest: hashlib object updated with every byte read, None to
+                skip hashing
+
+        Returns:
+            Iterator[Tuple[str, int]]: Consecutive chunks of text, each with
+                the offset after the bytes read for it
+
+        Raises:
+            FileError: If file cannot be read or decoded
+        """
+        decoder = codecs.getincrementaldecoder(encoding)(fallback_errors(fallback))
+        pending_cr = ''
+        try:
+            offset = start
+            for block in FileHandler.iter_blocks(path, chunk_size, start, end, storage):
+                if digest is not None:
+                    digest.update(block)
+                offset += len(block)
+                text = pending_cr + decoder.decode(block)
+                # Hold back a trailing '\r' in case the next chunk starts with '\n'
+                pending_cr = '\r' if text.endswith('\r') else ''
+                text = text[:len(text) - len(pending_cr)]
+                if text:
+                    yield text.replace('\r\n', '\n').replace('\r', '\n'), offset
+
+            text = pending_cr + decoder.decode(b'', final=True)
+            if text:
+                yield text.replace('\r\n', '\n').replace('\r', '\n'), offset
+        except (OSError, UnicodeDecodeError) as e:
+            raise FileError(f"Error reading file: {e}")
+
+    @staticmethod
+    def iter_blocks(path: str, block_size: int, start: int = 0, end: Optional[int] = None,
+                    storage=None) -> Iterator[bytes]:
+        """Stream raw bytes of a file or of a byte range of it.
+
+        Args:
+            path (str): Path to the file, or location of an object of storage
+            block_size (int): Maximum number of bytes per block
+            start (int): Offset of the first byte to read
+            end (Optional[int]): Offset after the last byte, None for end of file
+            storage (Optional[StorageBackend]): Backend of the file, None
+                for the local filesystem
+
+        Returns:
+            Iterator[bytes]: Consecutive blocks
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        if storage is not None:
+            return storage.iter_blocks(storage.name_of(path), block_size, start, end)
+        return FileHandler._iter_file_blocks(path, block_size, start, end)
+
+    @staticmethod
+    def _iter_file_blocks(path: str, block_size: int, start: int,
+                          end: Optional[int]) -> Iterator[bytes]:
+        """Stream raw bytes of a local file or of a byte range of it.
+
+        Args:
+            path (str): Path to the file
+            block_size (int): Maximum number of bytes per block
+            start (int): Offset of the first byte to read
+            end (Optional[int]): Offset after the last byte, None for end of file
+
+        Returns:
+            Iterator[bytes]: Consecutive blocks
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        with Path(path).open('rb') as f:
+            f.seek(start)
+            remaining = None if end is None else end - start
+            while remaining is None or remaining > 0:
+                block = f.read(block_size if remaining is None else min(block_size, remaining))
+                if not block:
+                    break
+                if remaining is not None:
+                    remaining -= len(block)
+                yield block
+
+    def shard_ranges(self, path: str, shards: int) -> List[Tuple[int, int]]:
+        """Split a file into byte ranges that can be analyzed independently.
+
+        Every range except the first starts right after a space, tab or
+        newline byte, so no word or line break is split between ranges.
+        This holds for all supported ASCII-compatible encodings. A range
+        without any such byte is merged into its predecessor.
+
+        With a storage backend, the window after every target offset is
+        fetched concurrently in ranged reads instead of seeking a file.
+
+        Args:
+            path (str): Path to the file to split
+            shards (int): Desired number of ranges
+
+        Returns:
+            List[Tuple[int, int]]: Consecutive (start, end) byte offsets
+
+        Raises:
+            FileError: If file cannot be read
+        """
+        if self.storage is not None:
+            return self._shard_object_ranges(path, shards)
+        try:
+            size = Path(path).stat().st_size
+            bounds = [0]
+            with Path(path).open('rb') as f:
+                for index in range(1, shards):
+                    target = max(size * index // shards, bounds[-1])
+                    limit = size * (index + 1) // shards
+                    f.seek(target)
+                    position = target
+                    while position < limit:
+                        block = f.read(min(self.STREAM_BLOCK_SIZE, limit - position))
+                        if not block:
+                            break
+                        match = self.SHARD_BOUNDARY_PATTERN.search(block)
+                        if match:
+                            if position + match.end() < size:
+                                bounds.append(position + match.end())
+                            break
+                        position += len(block)
+        except OSError as e:
+            raise FileError(f"Error reading file: {e}")
+
+        bounds.append(size)
+        return list(zip(bounds, bounds[1:]))
+
+    def _shard_object_ranges(self, path: str, shards: int) -> List[Tuple[int, int]]:
+        """Split an object of the storage backend into independent byte ranges.
+
+        Args:
+            path (str): Location of the object
+            shards (int): Desired number of ranges
+
+        Returns:
+            List[Tuple[int, int]]: Consecutive (start, end) byte offsets
+
+        Raises:
+            FileError: If the object cannot be read
+        """
+        try:
+            name = self.storage.name_of(path)
+            size = self.storage.size(name)
+            windows = [(size * index // shards,
+                        min(size * index // shards + self.STREAM_BLOCK_SIZE,
+                            size * (index + 1) // shards))
+                       for index in range(1, shards)]
+            blocks = self.storage.read_ranges(name, windows)
+        except OSError as e:
+            raise FileError(f"Error reading file: {e}")
+
+        bounds = [0]
+        for (target, _), block in zip(windows, blocks):
+            match = self.SHARD_BOUNDARY_PATTERN.search(block)
+            if match and bounds[-1] < target + match.end() < size:
+                bounds.append(target + match.end())
+        bounds.append(size)
+        return list(zip(bounds, bounds[1:]))
+
+    def read_sample_blocks(self, path: str, indices: Sequence[int], block_size: int,
+                           context: int = 256,
+                           detected: Optional[DetectedEncoding] = None) -> List[Tuple[str, str, str]]:
+        """Read selected aligned blocks of a file without reading the rest.
+
+        Every block is returned as a (prefix, core, suffix) triple, where
+        prefix and suffix are up to ``context`` bytes surrounding the block.
+        Block boundaries are moved to the nearest character start so that
+        multibyte characters are never split between blocks, and a byte
+        order mark is skipped. The file size limit does not apply because
+        only the sampled blocks are read.
+
+        Args:
+            path (str): Path to the file to sample
+            indices (Sequence[int]): Indices of blocks to read
+            block_size (int): Size of a block in bytes
+            context (int): Number of surrounding bytes to read on each side
+            detected (Optional[DetectedEncoding]): Encoding of the file,
+                detected from its first bytes if None
+
+        Returns:
+            List[Tuple[str, str, str]]: Decoded blocks in the order of indices
+
+        Raises:
+            FileError: If file cannot be read or decoded
+        """
+        try:
+            if self.storage is None:
+                self.validator.validate_file_path(Path(path))
+            if detected is None:
+                detected = (self._detect_object(path, limit_size=False)
+                            if self.storage is not None else self._detect(Path(path)))
+
+            def align(offset: int) -> int:
+                """Move an offset back to the start of a code unit, after the mark."""
+                offset = max(offset, detected.bom)
+                return offset - (offset - detected.bom) % detected.unit
+
+            spans = []
+            for index in indices:
+                start = align(index * block_size)
+                end = align((index + 1) * block_size)
+                spans.append((align(start - context), start, end))
+            ranges = [(head, end + context) for head, _, end in spans]
+
+            if self.storage is not None:
+                datas = self.storage.read_ranges(self.storage.name_of(path), ranges)
+            else:
+                datas = []
+                with Path(path).open('rb') as f:
+                    for head, stop in ranges:
+                        f.seek(head)
+                        datas.append(f.read(stop - head))
+            return [self._split_block(data, start - head, min(len(data), end - head), detected)
+                    for (head, start, end), data in zip(spans, datas)]
 
         except ValidationError as e:
             raise FileError(
                 self.config.ERROR_MESSAGES['invalid_file'].format(e)
             )
+        except FileError:
+            raise
         except Exception as e:
             raise FileError(f"Error reading file: {e}")
 
+    @staticmethod
+    def _split_block(data: bytes, start: int, end: int,
+                     detected: DetectedEncoding) -> Tuple[str, str, str]:
+        """Decode a block read with surrounding context.
+
+        Args:
+            data (bytes): Block bytes including context, starting at a code unit
+            start (int): Offset of the block start within data
+            end (int): Offset of the block end within data
+            detected (DetectedEncoding): Encoding to decode with
+
+        Returns:
+            Tuple[str, str, str]: Decoded prefix, core and suffix
+        """
+        encoding = detected.encoding
+        if encoding == 'utf-8':
+            # Skip continuation bytes so boundaries fall on character starts
+            while start < len(data) and data[start] & 0xC0 == 0x80:
+                start += 1
+            while end < len(data) and data[end] & 0xC0 == 0x80:
+                end += 1
+            end = max(start, end)
+        elif detected.unit == 2:
+            # Skip low surrogates so surrogate pairs are never split
+            high = 1 if encoding == 'utf-16-le' else 0
+            while start + 1 < len(data) and 0xDC <= data[start + high] <= 0xDF:
+                start += 2
+            while end + 1 < len(data) and 0xDC <= data[end + high] <= 0xDF:
+                end += 2
+            end = max(start, end)
+
+        return (
+            data[:start].decode(encoding, errors='ignore'),
+            data[start:end].decode(encoding, detected.errors),
+            data[end:].decode(encoding, errors='ignore')
+        )
+
+    def hash_file(self, path: str, chunk_size: int = 1024 * 1024) -> str:
+        """Compute SHA-256 hash of the file content.
+
+        Reads the file in binary chunks so the whole content is never
+        held in memory.
+
+        Args:
+            path (str): Path to the file to hash
+            chunk_size (int): Number of bytes read per iteration
+
+        Returns:
+            str: Hex digest of the file content
+
+        Raises:
+            FileError: If file cannot be read
+        """
+        digest = hashlib.sha256()
+        try:
+            for block in self.iter_blocks(path, chunk_size, storage=self.storage):
+                digest.update(block)
+        except OSError as e:
+            raise FileError(f"Error reading file: {e}")
+        return digest.hexdigest()
+
     def save_json(self, data: Dict[str, Any], path: str) -> None:
         """Save analysis results to a JSON file.
 
-        Creates necessary directories if they don't exist.
+        Creates necessary directories if they don't exist. The results are
+        written with atomic_write, so concurrent writers of the same path
+        never leave a mix of both results and readers never see a partial
+        file.
 
         Args:
             data (Dict[str, Any]): Data to save
@@ -111,12 +693,29 @@ class FileHandler:
         Raises:
             FileError: If saving fails due to permissions or other IO errors
         """
-        path = Path(path)
         try:
-            path.parent.mkdir(parents=True, exist_ok=True)
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
 
-            with path.open('w', encoding='utf-8') as f:
+            with atomic_write(str(path)) as f:
                 json.dump(data, f, indent=4, ensure_ascii=False)
 
         except Exception as e:
             raise FileError(f"Error saving results: {e}")
+
+    def load_json(self, path: str) -> Dict[str, Any]:
+        """Load previously saved results from a JSON file.
+
+        Args:
+            path (str): Path to the JSON file
+
+        Returns:
+            Dict[str, Any]: Loaded data
+
+        Raises:
+            FileError: If the file cannot be read or is not valid JSON
+        """
+        try:
+            with Path(path).open('r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise FileError(f"Error loading results: {e}")
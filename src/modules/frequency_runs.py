@@ -0,0 +1,213 @@
+import heapq
+import os
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from .file_handler import atomic_write
+
+# Extension of frequency run files saved next to the results
+RUN_SUFFIX = ".freq"
+
+
+def write_frequency_run(items: Iterable[Tuple[str, int]], path: str) -> int:
+    """Write the full word frequencies of a file as a run sorted by word.
+
+    Every line holds a word and its count separated by a tab. The run is
+    written with atomic_write, so an interrupted write never leaves a
+    truncated run to be merged.
+
+    Args:
+        items (Iterable[Tuple[str, int]]): (word, count) pairs in word order
+        path (str): Location of the run file
+
+    Returns:
+        int: Number of words written
+
+    Raises:
+        ValueError: If the words are not strictly increasing
+        OSError: If the run cannot be written
+    """
+    written = 0
+    previous = None
+    with atomic_write(path) as f:
+        for word, count in items:
+            if previous is not None and word <= previous:
+                raise ValueError(f"Run words must be strictly increasing: {previous!r}, {word!r}")
+            f.write(f"{word}\t{count}\n")
+            previous = word
+            written += 1
+    return written
+
+
+def read_frequency_run(path: str) -> Iterator[Tuple[str, int]]:
+    """Stream the entries of a frequency run.
+
+    Args:
+        path (str): Location of the run file
+
+    Returns:
+        Iterator[Tuple[str, int]]: (word, count) pairs in word order
+
+    Raises:
+        ValueError: If a line is malformed or out of order
+        OSError: If the run cannot be read
+    """
+    previous = None
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            word, separator, count = line.rstrip('\n').partition('\t')
+            if not separator or not word or not count.isdigit():
+                raise ValueError(f"Malformed frequency run line {number} in {path}")
+            if previous is not None and word <= previous:
+                raise ValueError(f"Frequency run {path} is not sorted at line {number}")
+            previous = word
+            yield word, int(count)
+
+
+def merge_frequency_runs(runs: Sequence[Iterable[Tuple[str, int]]]) -> Iterator[Tuple[str, int]]:
+    """Merge word-sorted frequency runs into one run of summed counts.
+
+    The runs are merged with a heap holding one entry per run, so memory
+    use depends on the number of runs, not on their size.
+
+    Args:
+        runs (Sequence[Iterable[Tuple[str, int]]]): (word, count) pairs
+            sorted by word, one sequence per run
+
+    Returns:
+        Iterator[Tuple[str, int]]: Every word of any run with its total
+            count, in word order
+    """
+    merged = heapq.merge(*runs, key=itemgetter(0))
+    for word, entries in groupby(merged, key=itemgetter(0)):
+        yield word, sum(count for _, count in entries)
+
+
+class CorpusTopWords:
+    """Exact most frequent words of a corpus from per-file frequency runs.
+
+    Saved results hold only the N most frequent words of each file, and a
+    word just outside the top N of many files can still be among the most
+    frequent words of the corpus. Frequency runs hold the full counts of a
+    file sorted by word, so a k-way merge of all runs sees every word once
+    with its corpus count, and a bounded heap keeps the top N of the
+    merged stream. Memory use is bounded by the number of open runs and
+    N; with more runs than ``fan_in``, groups of runs are first merged
+    into temporary runs, as in an external merge sort.
+
+    Attributes:
+        n (int): Number of most frequent words to find
+        fan_in (int): Maximum number of runs merged at once
+        temp_dir (Optional[str]): Directory of intermediate runs
+    """
+
+    def __init__(self, n: int, fan_in: int = 256, temp_dir: Optional[str] = None) -> None:
+        """Initialize CorpusTopWords.
+
+        Args:
+            n (int): Number of most frequent words to find
+            fan_in (int): Maximum number of runs merged at once, bounding
+                the number of open files
+            temp_dir (Optional[str]): Directory of intermediate runs,
+                defaults to the system temporary directory
+
+        Raises:
+            ValueError: If N or the fan-in is too small
+        """
+        if n < 1:
+            raise ValueError("N must be a positive integer")
+        if fan_in < 2:
+            raise ValueError("Fan-in must be at least 2")
+        self.n = n
+        self.fan_in = fan_in
+        self.temp_dir = temp_dir
+
+    def merge(self, paths: Sequence[str]) -> Dict[str, Any]:
+        """Merge frequency runs and select the most frequent words.
+
+        Args:
+            paths (Sequence[str]): Locations of the run files, one per file
+
+        Returns:
+            Dict[str, Any]: Dictionary containing:
+                - 'files': Number of merged runs
+                - 'word-count': Total number of words
+                - 'distinct-word-count': Exact number of distinct words
+                - 'merge-passes': Number of merge passes over the runs
+                - 'N-most-frequent-words': Most frequent words with their
+                  corpus counts, ties broken alphabetically
+
+        Raises:
+            ValueError: If no runs are given, or a run is malformed
+            OSError: If a run cannot be read or an intermediate run written
+        """
+        if not paths:
+            raise ValueError("No frequency runs to merge")
+        temporary: List[str] = []
+        passes = 1
+        try:
+            current = list(paths)
+            while len(current) > self.fan_in:
+                current = [self._merge_group(current[start:start + self.fan_in], temporary)
+                           for start in range(0, len(current), self.fan_in)]
+                passes += 1
+            summary = self._select(merge_frequency_runs(
+                [read_frequency_run(path) for path in current]
+            ))
+        finally:
+            for path in temporary:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        top = summary.pop("top")
+        return {"files": len(paths), **summary, "merge-passes": passes,
+                f"{self.n}-most-frequent-words": top}
+
+    def _merge_group(self, paths: Sequence[str], temporary: List[str]) -> str:
+        """Merge a group of runs into an intermediate run.
+
+        Args:
+            paths (Sequence[str]): Runs to merge, at most fan_in
+            temporary (List[str]): Intermediate runs to remove afterwards,
+                extended with the new run
+
+        Returns:
+            str: Location of the intermediate run
+        """
+        if len(paths) == 1:
+            return paths[0]
+        # Imported here: tempfile is slow to import and only needed for large corpora
+        import tempfile
+
+        fd, path = tempfile.mkstemp(prefix="corpus-", suffix=RUN_SUFFIX, dir=self.temp_dir)
+        os.close(fd)
+        temporary.append(path)
+        write_frequency_run(merge_frequency_runs([read_frequency_run(run) for run in paths]),
+                            path)
+        return path
+
+    def _select(self, merged: Iterable[Tuple[str, int]]) -> Dict[str, Any]:
+        """Select the most frequent words of a merged run in one pass.
+
+        Args:
+            merged (Iterable[Tuple[str, int]]): (word, count) pairs in word order
+
+        Returns:
+            Dict[str, Any]: 'word-count', 'distinct-word-count' and the
+                'top' words with their counts
+        """
+        # Min-heap of the best entries so far; among equal counts the later
+        # word in word order is evicted first
+        heap: List[Tuple[int, int, str]] = []
+        total = distinct = 0
+        for index, (word, count) in enumerate(merged):
+            total += count
+            distinct += 1
+            entry = (count, -index, word)
+            if len(heap) < self.n:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+        top = {word: count for count, _, word in sorted(heap, reverse=True)}
+        return {"word-count": total, "distinct-word-count": distinct, "top": top}
@@ -14,9 +14,13 @@ class InputHandler:
         validator (InputValidator): Validator instance for input validation
     """
 
-    def __init__(self) -> None:
-        """Initialize InputHandler with a new InputValidator instance."""
-        self.validator = InputValidator()
+    def __init__(self, max_n: int = 100) -> None:
+        """Initialize InputHandler with a new InputValidator instance.
+
+        Args:
+            max_n (int): Largest accepted number of most frequent words
+        """
+        self.validator = InputValidator(max_n)
 
     def get_file_choice(self, files: List[str]) -> Optional[str]:
         """Get user's file choice from available files.
@@ -46,18 +50,19 @@ class InputHandler:
     def get_n_value(self) -> int:
         """Get N value from user for word frequency analysis.
 
-        Prompts user to enter a number between 1 and 100 for the
-        number of most frequent words to analyze. Continues prompting
-        until a valid value is entered.
+        Prompts user to enter a number between 1 and the validator's
+        limit for the number of most frequent words to analyze. Continues
+        prompting until a valid value is entered.
 
         Returns:
-            int: Validated N value between 1 and 100
+            int: Validated N value between 1 and the limit
 
         Raises:
             ValidationError: If input validation fails
         """
         while True:
-            print("\nEnter N for the number of most frequent words to analyze (1-100):")
+            print("\nEnter N for the number of most frequent words to analyze "
+                  f"(1-{self.validator.max_n}):")
             n = input().strip()
 
             try:
@@ -0,0 +1,291 @@
+import heapq
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional
+from .exceptions import ValidationError
+
+SMALL_LANE = "small"
+LARGE_LANE = "large"
+DEFAULT_TENANT = ""
+
+
+class Job:
+    """A file waiting for or taking its turn in a batch.
+
+    Attributes:
+        name (str): Name of the file
+        size (int): Size of the file in bytes
+        tenant (str): Tenant owning the file, empty for the default tenant
+        lane (str): Lane of the job, 'small' or 'large'
+        enqueued_at (float): Clock time the job was submitted
+        started_at (Optional[float]): Clock time the job was started
+        finished_at (Optional[float]): Clock time the job was finished
+    """
+
+    def __init__(self, name: str, size: int, tenant: str, lane: str,
+                 enqueued_at: float) -> None:
+        """Initialize Job.
+
+        Args:
+            name (str): Name of the file
+            size (int): Size of the file in bytes
+            tenant (str): Tenant owning the file
+            lane (str): Lane of the job
+            enqueued_at (float): Clock time the job was submitted
+        """
+        self.name = name
+        self.size = size
+        self.tenant = tenant
+        self.lane = lane
+        self.enqueued_at = enqueued_at
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def wait_time(self) -> Optional[float]:
+        """Seconds spent in the queue, None until started."""
+        return None if self.started_at is None else self.started_at - self.enqueued_at
+
+    @property
+    def service_time(self) -> Optional[float]:
+        """Seconds spent being processed, None until finished."""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+
+class JobScheduler:
+    """Size-aware queue deciding which file of a batch is analyzed next.
+
+    Files up to ``small_file_size`` bytes go to the small lane and are
+    served shortest job first, so small files are not stuck behind large
+    ones. Larger files go to the large lane and are served in submission
+    order; the analysis engine splits each of them into shards analyzed
+    in parallel. Analysis time grows linearly with file size, so lanes
+    are charged by bytes: while small files wait, a large file starts
+    only once its lane's bytes, including its own, stay within
+    ``large_share`` of all bytes served. Large files are thus neither
+    starved nor allowed to hold up every small file.
+
+    Within a lane, tenants are served in proportion to their weights:
+    the next job belongs to the tenant with the least service time per
+    unit of weight. Tenants are taken from file names with a regular
+    expression; without one, all files belong to the default tenant.
+
+    Attributes:
+        small_file_size (int): Largest size of a small-lane file in bytes
+        large_share (float): Share of served bytes guaranteed to the large lane
+        tenant_pattern (Optional[re.Pattern]): Pattern whose first group,
+            or whole match, names the tenant of a file
+        tenant_weights (Dict[str, float]): Weights of tenants, 1.0 by default
+        clock (Callable[[], float]): Source of clock times in seconds
+        finished (List[Job]): Jobs finished since the last reset
+    """
+
+    LANES = (SMALL_LANE, LARGE_LANE)
+
+    def __init__(self, small_file_size: int, large_share: float = 0.25,
+                 tenant_pattern: Optional[str] = None,
+                 tenant_weights: Optional[Dict[str, float]] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize JobScheduler.
+
+        Args:
+            small_file_size (int): Largest size of a small-lane file in bytes
+            large_share (float): Share of served bytes guaranteed to the
+                large lane while small files wait, between 0 and 1
+            tenant_pattern (Optional[str]): Regular expression naming the
+                tenant of a file by its first group or whole match, None
+                for a single tenant
+            tenant_weights (Optional[Dict[str, float]]): Relative weights
+                of tenants; unlisted tenants have weight 1.0
+            clock (Callable[[], float]): Source of clock times in seconds
+
+        Raises:
+            ValidationError: If a setting is out of range or the pattern is invalid
+        """
+        if small_file_size < 0:
+            raise ValidationError("Small file size must not be negative")
+        if not 0 < large_share < 1:
+            raise ValidationError("Large lane share must be between 0 and 1")
+        if any(not weight > 0 for weight in (tenant_weights or {}).values()):
+            raise ValidationError("Tenant weights must be positive numbers")
+        try:
+            self.tenant_pattern = re.compile(tenant_pattern) if tenant_pattern else None
+        except re.error as e:
+            raise ValidationError(f"Invalid tenant pattern: {e}")
+        self.small_file_size = small_file_size
+        self.large_share = large_share
+        self.tenant_weights = dict(tenant_weights or {})
+        self.clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all queued and finished jobs and the served bytes and time."""
+        self._queues: Dict[str, Dict[str, List]] = {lane: {} for lane in self.LANES}
+        self._lane_bytes = dict.fromkeys(self.LANES, 0)
+        self._tenant_service: Dict[str, float] = {}
+        self._sequence = 0
+        self.finished: List[Job] = []
+
+    def __len__(self) -> int:
+        """Number of queued jobs."""
+        return sum(len(queue) for queues in self._queues.values() for queue in queues.values())
+
+    def tenant_of(self, name: str) -> str:
+        """Get the tenant owning a file.
+
+        Args:
+            name (str): Name of the file
+
+        Returns:
+            str: Tenant named by the pattern, empty for the default tenant
+        """
+        if self.tenant_pattern is None:
+            return DEFAULT_TENANT
+        match = self.tenant_pattern.search(name)
+        if match is None:
+            return DEFAULT_TENANT
+        return match.group(1) if self.tenant_pattern.groups else match.group(0)
+
+    def submit(self, name: str, size: int) -> Job:
+        """Queue a file.
+
+        Args:
+            name (str): Name of the file
+            size (int): Size of the file in bytes
+
+        Returns:
+            Job: Queued job of the file
+        """
+        lane = SMALL_LANE if size <= self.small_file_size else LARGE_LANE
+        job = Job(name, size, self.tenant_of(name), lane, self.clock())
+        # Shortest job first in the small lane, submission order in the large one
+        key = (size if lane == SMALL_LANE else 0, self._sequence)
+        self._sequence += 1
+        heapq.heappush(self._queues[lane].setdefault(job.tenant, []), (key, job))
+        self._tenant_service.setdefault(job.tenant, 0.0)
+        return job
+
+    def next_job(self) -> Optional[Job]:
+        """Take the job to run next and mark it started.
+
+        Returns:
+            Optional[Job]: Next job, None if the queue is empty
+        """
+        lanes = [lane for lane in self.LANES if self._queues[lane]]
+        if not lanes:
+            return None
+        lane = lanes[0]
+        if len(lanes) > 1:
+            large = self._queues[LARGE_LANE][self._next_tenant(LARGE_LANE)][0][1]
+            served = sum(self._lane_bytes.values()) + large.size
+            if self._lane_bytes[LARGE_LANE] + large.size > self.large_share * served:
+                lane = SMALL_LANE
+            else:
+                lane = LARGE_LANE
+
+        queues = self._queues[lane]
+        tenant = self._next_tenant(lane)
+        _, job = heapq.heappop(queues[tenant])
+        if not queues[tenant]:
+            del queues[tenant]
+        self._lane_bytes[lane] += job.size
+        job.started_at = self.clock()
+        return job
+
+    def _next_tenant(self, lane: str) -> str:
+        """Choose the tenant with the least weighted service time among those queued in a lane.
+
+        Args:
+            lane (str): Lane with queued jobs
+
+        Returns:
+            str: Tenant whose job runs next in the lane
+        """
+        queues = self._queues[lane]
+        return min(queues, key=lambda name: (
+            self._tenant_service[name] / self.tenant_weights.get(name, 1.0), queues[name][0][0]
+        ))
+
+    def finish(self, job: Job) -> None:
+        """Mark a started job finished and charge its service time to its tenant.
+
+        Args:
+            job (Job): Job returned by next_job
+        """
+        job.finished_at = self.clock()
+        self._tenant_service[job.tenant] += job.service_time
+        self.finished.append(job)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Summarize queue wait and service times of the finished jobs.
+
+        Returns:
+            Dict[str, Any]: Number of 'jobs', and per lane and per tenant
+                the number of jobs with their 'wait-seconds' and
+                'service-seconds' as mean, median, 95th percentile and maximum
+        """
+        def summary(jobs: List[Job]) -> Dict[str, Any]:
+            """Summarize the wait and service times of jobs."""
+            return {"jobs": len(jobs),
+                    "wait-seconds": percentiles([job.wait_time for job in jobs]),
+                    "service-seconds": percentiles([job.service_time for job in jobs])}
+
+        tenants = sorted({job.tenant for job in self.finished})
+        return {
+            "jobs": len(self.finished),
+            "lanes": {lane: summary([job for job in self.finished if job.lane == lane])
+                      for lane in self.LANES},
+            "tenants": {tenant or "default": summary([job for job in self.finished
+                                                      if job.tenant == tenant])
+                        for tenant in tenants},
+        }
+
+    @staticmethod
+    def parse_weights(spec: str) -> Dict[str, float]:
+        """Parse tenant weights given as NAME=WEIGHT[,NAME=WEIGHT...].
+
+        Args:
+            spec (str): Weights specification
+
+        Returns:
+            Dict[str, float]: Weight of every listed tenant
+
+        Raises:
+            ValidationError: If an entry is malformed or a weight is not positive
+        """
+        weights = {}
+        for entry in filter(None, spec.split(",")):
+            name, separator, value = entry.partition("=")
+            try:
+                weight = float(value)
+            except ValueError:
+                weight = 0.0
+            if not separator or not name or not weight > 0:
+                raise ValidationError(f"Tenant weight must be NAME=POSITIVE_NUMBER, got {entry!r}")
+            weights[name] = weight
+        return weights
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """Summarize durations by mean, nearest-rank median and 95th percentile, and maximum.
+
+    Args:
+        values (List[float]): Durations in seconds
+
+    Returns:
+        Dict[str, float]: 'mean', 'p50', 'p95' and 'max', all 0.0 without values
+    """
+    if not values:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def rank(percent: int) -> float:
+        """Get the smallest value at or above the given percent of values."""
+        return ordered[max(0, -(-len(ordered) * percent // 100) - 1)]
+
+    return {"mean": round(sum(ordered) / len(ordered), 6),
+            "p50": round(rank(50), 6),
+            "p95": round(rank(95), 6),
+            "max": round(ordered[-1], 6)}
@@ -0,0 +1,402 @@
+import heapq
+import os
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Tuple
+from .word_table import WordTable
+
+if TYPE_CHECKING:
+    from .ngram_counter import NGramCounter
+
+
+class MemoryBudget:
+    """Derives chunk sizes, counter limits and worker counts from a memory limit.
+
+    The budget is split between the chunk currently being processed (the
+    chunk itself, its lowercased copy and its tokens) and the word frequency
+    table; the optional n-gram tables and the vocabulary of their words get
+    the remaining quarter. A concordance index is built after the analysis
+    and may use the whole budget for its token ids and suffix array. The
+    per-token, per-character and per-entry costs are deliberately
+    conservative estimates of CPython object overhead.
+
+    Attributes:
+        max_memory (int): Memory limit in bytes
+        temp_dir (Optional[str]): Directory for spilled frequency tables
+    """
+
+    CHUNK_BYTES_PER_CHAR = 16
+    COUNTER_BYTES_PER_ENTRY = 128
+    MIN_CHUNK_SIZE = 4 * 1024
+    MAX_CHUNK_SIZE = 4 * 1024 * 1024
+    MIN_COUNTER_LIMIT = 1024
+    MIN_SHARD_SIZE = 4 * 1024 * 1024
+    MIN_WORKER_MEMORY = 32 * 1024 * 1024
+    NGRAM_BYTES_PER_ENTRY = 256
+    MIN_NGRAM_LIMIT = 4096
+    NGRAM_SKETCH_WIDTH = 2 ** 16
+    NGRAM_SKETCH_DEPTH = 4
+    SUFFIX_ARRAY_BYTES_PER_TOKEN = 32
+
+    def __init__(self, max_memory: int, temp_dir: Optional[str] = None) -> None:
+        """Initialize MemoryBudget.
+
+        Args:
+            max_memory (int): Memory limit in bytes
+            temp_dir (Optional[str]): Directory for spilled frequency tables,
+                defaults to the system temporary directory
+        """
+        self.max_memory = max_memory
+        self.temp_dir = temp_dir
+
+    def chunk_size(self) -> int:
+        """Get the number of characters to process at once.
+
+        Returns:
+            int: Chunk size in characters
+        """
+        size = self.max_memory // 4 // self.CHUNK_BYTES_PER_CHAR
+        return min(self.MAX_CHUNK_SIZE, max(self.MIN_CHUNK_SIZE, size))
+
+    def counter_limit(self) -> int:
+        """Get the number of distinct words kept in memory before spilling.
+
+        Returns:
+            int: Maximum number of in-memory frequency table entries
+        """
+        return max(self.MIN_COUNTER_LIMIT,
+                   self.max_memory // 2 // self.COUNTER_BYTES_PER_ENTRY)
+
+    def worker_count(self, file_size: int) -> int:
+        """Get the number of parallel workers for a file.
+
+        Workers are limited by available CPUs, by the number of shards worth
+        splitting the file into and by how many workers fit into the budget.
+
+        Args:
+            file_size (int): Size of the file in bytes
+
+        Returns:
+            int: Number of workers, at least 1
+        """
+        by_cpu = os.cpu_count() or 1
+        by_size = file_size // self.MIN_SHARD_SIZE
+        by_memory = self.max_memory // self.MIN_WORKER_MEMORY
+        return max(1, min(by_cpu, by_size, by_memory))
+
+    def split(self, workers: int) -> "MemoryBudget":
+        """Get the budget of a single worker out of several.
+
+        Args:
+            workers (int): Number of workers sharing this budget
+
+        Returns:
+            MemoryBudget: Budget for one worker
+        """
+        return MemoryBudget(self.max_memory // max(1, workers), self.temp_dir)
+
+    def create_counter(self) -> "SpillingCounter":
+        """Create a word frequency table bounded by this budget.
+
+        Returns:
+            SpillingCounter: Counter spilling to temp_dir above counter_limit
+        """
+        return SpillingCounter(self.counter_limit(), self.temp_dir)
+
+    def ngram_limit(self) -> int:
+        """Get the number of n-gram and n-gram vocabulary entries kept before pruning.
+
+        Returns:
+            int: Maximum number of n-gram table and vocabulary entries
+        """
+        return max(self.MIN_NGRAM_LIMIT,
+                   self.max_memory // 4 // self.NGRAM_BYTES_PER_ENTRY)
+
+    def concordance_limit(self) -> int:
+        """Get the number of tokens a concordance index can be built for.
+
+        Returns:
+            int: Maximum number of tokens of an indexed text
+        """
+        return self.max_memory // self.SUFFIX_ARRAY_BYTES_PER_TOKEN
+
+    def create_ngram_counter(self, order: int) -> "NGramCounter":
+        """Create an n-gram counter bounded by this budget.
+
+        The sketch of pruned n-grams has a fixed shape, so counters of
+        workers with split budgets can still be merged.
+
+        Args:
+            order (int): Longest n-gram length counted
+
+        Returns:
+            NGramCounter: Counter pruning above ngram_limit
+        """
+        # Imported here: n-grams are only counted when requested
+        from .ngram_counter import NGramCounter
+
+        return NGramCounter(order, self.ngram_limit(),
+                            sketch_width=self.NGRAM_SKETCH_WIDTH,
+                            sketch_depth=self.NGRAM_SKETCH_DEPTH)
+
+
+class SpillingCounter:
+    """Word frequency table that spills to disk when it grows too large.
+
+    Counts are kept in a WordTable until it holds more than ``limit``
+    distinct words. The table is then written to a temporary file as a run
+    sorted by word and cleared. Runs are merged back with a streaming k-way
+    merge. Every entry remembers its run and its vocabulary id within the
+    run, so ties are broken by first occurrence exactly as on the unbounded
+    table.
+
+    Attributes:
+        limit (int): Maximum number of distinct words kept in memory
+        temp_dir (Optional[str]): Directory for run files
+        total (int): Total number of counted words
+        length_sum (int): Sum of lengths of all counted words
+    """
+
+    def __init__(self, limit: int, temp_dir: Optional[str] = None) -> None:
+        """Initialize SpillingCounter.
+
+        Args:
+            limit (int): Maximum number of distinct words kept in memory
+            temp_dir (Optional[str]): Directory for run files
+        """
+        self.limit = limit
+        self.temp_dir = temp_dir
+        self._table = WordTable()
+        self._runs: List[str] = []
+        self._spilled_total = 0
+        self._spilled_length_sum = 0
+
+    @property
+    def total(self) -> int:
+        """Total number of counted words."""
+        return self._spilled_total + self._table.total
+
+    @property
+    def length_sum(self) -> int:
+        """Sum of lengths of all counted words."""
+        return self._spilled_length_sum + self._table.length_sum
+
+    @property
+    def spilled(self) -> bool:
+        """Whether any part of the table was written to disk."""
+        return bool(self._runs)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over distinct words, merging spilled runs in word order."""
+        return (word for word, _, _ in self.items())
+
+    def update(self, words: Iterable[str]) -> None:
+        """Count words, spilling the table if it exceeds the limit.
+
+        Args:
+            words (Iterable[str]): Words to count
+        """
+        self._table.update(words)
+        if len(self._table) > self.limit:
+            self._spill()
+
+    def share(self, min_words: int) -> None:
+        """Move the in-memory table to shared memory before sending it to another process.
+
+        Only the segment name is pickled then, and the receiving process
+        merges the counts straight from the segment. Spilled runs are
+        sent as file paths either way.
+
+        Args:
+            min_words (int): Smallest number of distinct words worth a
+                shared memory segment, 0 to always pickle the table
+        """
+        # Imported here: shared memory is only needed for parallel analysis
+        from .shared_transport import share_table
+
+        self._table = share_table(self._table, min_words)
+
+    def merge(self, other: "SpillingCounter") -> None:
+        """Add counts of another table that follows this one in the text.
+
+        The other table is emptied and its run files are taken over; a
+        shared memory segment holding its counts is removed.
+
+        Args:
+            other (SpillingCounter): Table of the following part of the text
+        """
+        if not isinstance(self._table, WordTable):
+            # Counts received through shared memory are read-only
+            table = WordTable()
+            table.merge(self._table)
+            self._table.close()
+            self._table = table
+        if (not self._runs and not other._runs
+                and len(self._table) + len(other._table) <= self.limit):
+            self._table.merge(other._table)
+        else:
+            self._spill()
+            other._spill()
+            self._runs.extend(other._runs)
+            self._spilled_total += other._spilled_total
+            self._spilled_length_sum += other._spilled_length_sum
+            other._runs = []
+        other._table.close()
+        other._table = WordTable()
+        other._spilled_total = other._spilled_length_sum = 0
+
+    def items(self) -> Iterator[Tuple[str, int, Tuple[int, int]]]:
+        """Iterate over merged counts in word order.
+
+        Returns:
+            Iterator[Tuple[str, int, Tuple[int, int]]]: Word, its total count
+                and its first-occurrence key
+        """
+        if not self._runs:
+            yield from self._table.items()
+            return
+
+        self._spill()
+        streams = [self._read_run(index, path) for index, path in enumerate(self._runs)]
+        current = None
+        for word, key, count in heapq.merge(*streams):
+            if current is not None and current[0] == word:
+                current[1] += count
+                continue
+            if current is not None:
+                yield current[0], current[1], current[2]
+            current = [word, count, key]
+        if current is not None:
+            yield current[0], current[1], current[2]
+
+    def most_common(self, n: int) -> List[Tuple[str, int]]:
+        """Get the N most common words.
+
+        Args:
+            n (int): Number of words to return
+
+        Returns:
+            List[Tuple[str, int]]: Words and counts in the order
+                Counter.most_common would return them
+        """
+        if not self._runs:
+            return self._table.most_common(n)
+        top = heapq.nsmallest(n, self.items(), key=lambda item: (-item[1], item[2]))
+        return [(word, count) for word, count, _ in top]
+
+    def iter_most_common(self) -> Iterator[Tuple[str, int]]:
+        """Iterate over all words in the order of most_common.
+
+        The merged counts of a spilled table are cut into runs of at most
+        ``limit`` entries sorted by count, which are written to temporary
+        files and merged again with a streaming k-way merge, so the whole
+        vocabulary is never held in memory.
+
+        Returns:
+            Iterator[Tuple[str, int]]: Words and their counts
+        """
+        if not self._runs:
+            yield from self._table.iter_most_common()
+            return
+
+        paths: List[str] = []
+        try:
+            batch = []
+            for word, count, key in self.items():
+                batch.append((-count, key, word))
+                if len(batch) >= self.limit:
+                    paths.append(self._write_ranked(batch))
+                    batch = []
+            if not paths:
+                ranked = iter(sorted(batch))
+            else:
+                if batch:
+                    paths.append(self._write_ranked(batch))
+                batch = []
+                ranked = heapq.merge(*(self._read_ranked(path) for path in paths))
+            for negative_count, _, word in ranked:
+                yield word, -negative_count
+        finally:
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def close(self) -> None:
+        """Remove all run files and a shared memory segment of the table."""
+        self._table.close()
+        for path in self._runs:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._runs = []
+
+    def _spill(self) -> None:
+        """Write the in-memory table as a sorted run and clear it."""
+        if not len(self._table):
+            return
+        # Imported here: tempfile is slow to import and only needed once spilling starts
+        import tempfile
+
+        fd, path = tempfile.mkstemp(prefix="words-", suffix=".run", dir=self.temp_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for word, count, (_, rank) in self._table.items():
+                f.write(f"{word}\t{count}\t{rank}\n")
+        self._runs.append(path)
+        self._spilled_total += self._table.total
+        self._spilled_length_sum += self._table.length_sum
+        self._table.close()
+        self._table = WordTable()
+
+    def _write_ranked(self, batch: List[Tuple[int, Tuple[int, int], str]]) -> str:
+        """Write entries sorted by count as a temporary run.
+
+        Args:
+            batch (List[Tuple[int, Tuple[int, int], str]]): Negated count,
+                first-occurrence key and word of every entry
+
+        Returns:
+            str: Location of the run file
+        """
+        # Imported here: tempfile is slow to import and only needed once spilling starts
+        import tempfile
+
+        batch.sort()
+        fd, path = tempfile.mkstemp(prefix="ranked-", suffix=".run", dir=self.temp_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for negative_count, (run, rank), word in batch:
+                f.write(f"{word}\t{-negative_count}\t{run}\t{rank}\n")
+        return path
+
+    @staticmethod
+    def _read_ranked(path: str) -> Iterator[Tuple[int, Tuple[int, int], str]]:
+        """Stream entries of a run sorted by count.
+
+        Args:
+            path (str): Location of the run file
+
+        Returns:
+            Iterator[Tuple[int, Tuple[int, int], str]]: Negated count,
+                first-occurrence key and word
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                word, count, run, rank = line.rstrip('\n').split('\t')
+                yield -int(count), (int(run), int(rank)), word
+
+    @staticmethod
+    def _read_run(index: int, path: str) -> Iterator[Tuple[str, Tuple[int, int], int]]:
+        """Stream entries of a run file.
+
+        Args:
+            index (int): Position of the run among all runs
+            path (str): Location of the run file
+
+        Returns:
+            Iterator[Tuple[str, Tuple[int, int], int]]: Word, first-occurrence
+                key and count
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                word, count, rank = line.rstrip('\n').split('\t')
+                yield word, (index, int(rank)), int(count)
@@ -0,0 +1,323 @@
+import importlib
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Type, Union
+from .exceptions import AnalysisError, ValidationError
+
+CHARS = "chars"
+TOKENS = "tokens"
+SENTENCES = "sentences"
+STREAMS = frozenset((CHARS, TOKENS, SENTENCES))
+ENTRY_POINT_GROUP = "text_analyzer.metrics"
+
+
+class Metric(ABC):
+    """Base class of custom metrics computed in the shared analysis pass.
+
+    A metric declares the streams it consumes and only receives those:
+
+    - ``chars``: every chunk of raw text, in text order
+    - ``tokens``: every batch of lowercase words, in text order
+    - ``sentences``: the number of sentences completed by every chunk
+
+    State is kept incrementally, so the text is never held in memory.
+    Metrics of consecutive shards are merged in text order. A sentence cut
+    by a shard boundary is reported by both shards; after merging, the
+    duplicate is retracted with ``consume_sentences(-1)``.
+
+    Instances must be picklable, since shards are analyzed by worker
+    processes. Subclasses must implement ``merge`` and ``result``.
+
+    Attributes:
+        name (str): Key of the metric in the results
+        streams (FrozenSet[str]): Streams the metric consumes
+    """
+
+    name: str = ""
+    streams: FrozenSet[str] = frozenset()
+
+    def consume_chars(self, chunk: str) -> None:
+        """Add the next chunk of raw text.
+
+        Args:
+            chunk (str): Next consecutive part of the text
+        """
+
+    def consume_tokens(self, words: List[str]) -> None:
+        """Add the next batch of words.
+
+        Args:
+            words (List[str]): Next lowercase words, in text order
+        """
+
+    def consume_sentences(self, count: int) -> None:
+        """Add sentences completed by the last chunk.
+
+        Args:
+            count (int): Number of completed sentences, -1 to retract a
+                sentence counted on both sides of a shard boundary
+        """
+
+    @abstractmethod
+    def merge(self, other: "Metric") -> None:
+        """Add the state of the metric of the text following this one.
+
+        Args:
+            other (Metric): Metric of the following part of the text
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def result(self) -> Any:
+        """Get the JSON-serializable value of the metric.
+
+        Returns:
+            Any: Value stored under the metric name in the results
+        """
+        raise NotImplementedError
+
+
+MetricFactory = Union[Type[Metric], Callable[[], Metric]]
+
+
+class MetricRegistry:
+    """Registry of metrics available by name.
+
+    Metrics are registered as factories, or as ``"module:attribute"``
+    references that are imported only when the metric is first used.
+    Plugins installed as packages are found through the
+    ``text_analyzer.metrics`` entry point group, which is scanned only
+    when a name is not registered or the full list is requested, so
+    startup does not pay for plugin discovery.
+    """
+
+    def __init__(self, entry_point_group: Optional[str] = ENTRY_POINT_GROUP) -> None:
+        """Initialize an empty MetricRegistry.
+
+        Args:
+            entry_point_group (Optional[str]): Entry point group of metric
+                plugins, None to disable discovery
+        """
+        self._entries: Dict[str, Union[MetricFactory, str]] = {}
+        self._entry_point_group = entry_point_group
+        self._discovered = entry_point_group is None
+
+    def register(self, name: str, factory: Union[MetricFactory, str]) -> None:
+        """Register a metric.
+
+        Args:
+            name (str): Name of the metric
+            factory (Union[MetricFactory, str]): Metric class or factory, or
+                a ``"module:attribute"`` reference to one
+
+        Raises:
+            ValueError: If the name is already registered
+        """
+        if name in self._entries:
+            raise ValueError(f"Metric already registered: {name}")
+        self._entries[name] = factory
+
+    def names(self) -> List[str]:
+        """Get the names of all available metrics, including plugins.
+
+        Returns:
+            List[str]: Sorted metric names
+        """
+        self._discover()
+        return sorted(self._entries)
+
+    def create(self, name: str) -> Metric:
+        """Create a fresh instance of a metric.
+
+        Args:
+            name (str): Name of the metric
+
+        Returns:
+            Metric: New metric with empty state
+
+        Raises:
+            ValidationError: If no metric has this name
+            AnalysisError: If the metric cannot be loaded or created, or
+                declares unknown streams
+        """
+        if name not in self._entries:
+            self._discover()
+        if name not in self._entries:
+            raise ValidationError(f"Unknown metric: {name}")
+
+        factory = self._entries[name]
+        if isinstance(factory, str):
+            factory = self._entries[name] = self._resolve(name, factory)
+        try:
+            metric = factory()
+        except TypeError as e:
+            # Raised for metric classes missing abstract methods
+            raise AnalysisError(f"Metric {name} cannot be created: {e}")
+        unknown = set(metric.streams) - STREAMS
+        if unknown:
+            raise AnalysisError(f"Metric {name} consumes unknown streams: {sorted(unknown)}")
+        metric.name = name
+        return metric
+
+    def create_all(self, names: Sequence[str]) -> List[Metric]:
+        """Create fresh instances of several metrics.
+
+        Args:
+            names (Sequence[str]): Names of the metrics
+
+        Returns:
+            List[Metric]: New metrics in the given order
+        """
+        return [self.create(name) for name in names]
+
+    def validate(self, names: Sequence[str]) -> None:
+        """Check that all metrics can be created.
+
+        Args:
+            names (Sequence[str]): Names of the metrics
+
+        Raises:
+            ValidationError: If a name is unknown or repeated
+            AnalysisError: If a metric cannot be loaded
+        """
+        if len(set(names)) != len(names):
+            raise ValidationError("Metrics must not be repeated")
+        self.create_all(names)
+
+    @staticmethod
+    def _resolve(name: str, reference: str) -> MetricFactory:
+        """Import a ``"module:attribute"`` reference.
+
+        Args:
+            name (str): Name of the metric
+            reference (str): Module path and attribute, separated by a colon
+
+        Returns:
+            MetricFactory: Referenced factory
+
+        Raises:
+            AnalysisError: If the reference cannot be imported
+        """
+        module_name, _, attribute = reference.partition(":")
+        try:
+            factory = importlib.import_module(module_name)
+            for part in attribute.split("."):
+                factory = getattr(factory, part)
+        except (ImportError, AttributeError, ValueError) as e:
+            raise AnalysisError(f"Failed to load metric {name} from {reference}: {e}")
+        return factory
+
+    def _discover(self) -> None:
+        """Register metrics of installed plugins on first use."""
+        if self._discovered:
+            return
+        self._discovered = True
+        from importlib.metadata import entry_points
+
+        for entry_point in entry_points(group=self._entry_point_group):
+            self._entries.setdefault(entry_point.name, entry_point.value)
+
+
+registry = MetricRegistry()
+
+
+def register_metric(cls: Type[Metric]) -> Type[Metric]:
+    """Class decorator registering a metric under its name.
+
+    Args:
+        cls (Type[Metric]): Metric class with a name
+
+    Returns:
+        Type[Metric]: The class, unchanged
+    """
+    registry.register(cls.name, cls)
+    return cls
+
+
+@register_metric
+class LineCountMetric(Metric):
+    """Counts lines, including a last line without a line break."""
+
+    name = "line-count"
+    streams = frozenset((CHARS,))
+
+    def __init__(self) -> None:
+        """Initialize an empty LineCountMetric."""
+        self.breaks = 0
+        self.last_char = ""
+
+    def consume_chars(self, chunk: str) -> None:
+        """Count line breaks of a chunk."""
+        if chunk:
+            self.breaks += chunk.count("\n")
+            self.last_char = chunk[-1]
+
+    def merge(self, other: "LineCountMetric") -> None:
+        """Add line breaks of the following text."""
+        self.breaks += other.breaks
+        self.last_char = other.last_char or self.last_char
+
+    def result(self) -> int:
+        """Get the number of lines."""
+        if not self.last_char:
+            return 0
+        return self.breaks + (self.last_char != "\n")
+
+
+@register_metric
+class LongestWordMetric(Metric):
+    """Finds the longest word, the first one among equally long words."""
+
+    name = "longest-word"
+    streams = frozenset((TOKENS,))
+
+    def __init__(self) -> None:
+        """Initialize an empty LongestWordMetric."""
+        self.word = ""
+
+    def consume_tokens(self, words: List[str]) -> None:
+        """Keep the longest word of a batch."""
+        if words:
+            longest = max(words, key=len)
+            if len(longest) > len(self.word):
+                self.word = longest
+
+    def merge(self, other: "LongestWordMetric") -> None:
+        """Keep the longest word of both parts."""
+        if len(other.word) > len(self.word):
+            self.word = other.word
+
+    def result(self) -> str:
+        """Get the longest word."""
+        return self.word
+
+
+@register_metric
+class WordsPerSentenceMetric(Metric):
+    """Average number of words per sentence."""
+
+    name = "words-per-sentence"
+    streams = frozenset((TOKENS, SENTENCES))
+
+    def __init__(self) -> None:
+        """Initialize an empty WordsPerSentenceMetric."""
+        self.words = 0
+        self.sentences = 0
+
+    def consume_tokens(self, words: List[str]) -> None:
+        """Count words of a batch."""
+        self.words += len(words)
+
+    def consume_sentences(self, count: int) -> None:
+        """Count completed sentences."""
+        self.sentences += count
+
+    def merge(self, other: "WordsPerSentenceMetric") -> None:
+        """Add counts of the following text."""
+        self.words += other.words
+        self.sentences += other.sentences
+
+    def result(self) -> float:
+        """Get the average rounded to 2 places, 0.0 without sentences."""
+        if not self.sentences:
+            return 0.0
+        return round(self.words / self.sentences, 2)
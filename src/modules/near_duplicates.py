@@ -0,0 +1,332 @@
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .sketches import hash64
+
+MASK64 = (1 << 64) - 1
+EMPTY_BIN = MASK64
+SHINGLE_MULTIPLIER = 0x100000001b3
+
+
+def _mix64(value: int) -> int:
+    """Scramble a 64-bit integer so that every output bit depends on every input bit.
+
+    Args:
+        value (int): Unsigned 64-bit integer
+
+    Returns:
+        int: Mixed unsigned 64-bit integer
+    """
+    value = ((value ^ (value >> 30)) * 0xbf58476d1ce4e5b9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94d049bb133111eb) & MASK64
+    return value ^ (value >> 31)
+
+
+class MinHashSketch:
+    """MinHash signature of the word shingles of a text.
+
+    The sketch is fed the same word stream as the other statistics. Every
+    shingle of ``shingle_size`` consecutive words is hashed with a rolling
+    hash over stable per-word hashes and lands in one of ``bins`` bins,
+    each keeping its minimum (one-permutation MinHash). This costs one
+    comparison per word instead of one per word and hash function. The
+    first and last words are kept, so sketches of consecutive shards can be
+    merged into the sketch of the whole text.
+
+    Attributes:
+        shingle_size (int): Number of words per shingle
+        bins (int): Number of signature values, a power of two
+        signature (array): Minimum shingle hash per bin
+        head (List[int]): Hashes of the first ``shingle_size - 1`` words
+    """
+
+    SHINGLE_SIZE = 3
+    BINS = 128
+
+    def __init__(self, shingle_size: int = SHINGLE_SIZE, bins: int = BINS) -> None:
+        """Initialize an empty MinHashSketch.
+
+        Args:
+            shingle_size (int): Number of words per shingle
+            bins (int): Number of signature values, a power of two
+
+        Raises:
+            ValueError: If bins is not a power of two or shingle_size < 1
+        """
+        if bins < 1 or bins & (bins - 1):
+            raise ValueError("Number of bins must be a power of two")
+        if shingle_size < 1:
+            raise ValueError("Shingle size must be at least 1")
+        self.shingle_size = shingle_size
+        self.bins = bins
+        self.signature = array('Q', [EMPTY_BIN]) * bins
+        self.head: List[int] = []
+        self._tail: List[int] = []
+
+    @property
+    def empty(self) -> bool:
+        """Whether no shingle was added."""
+        return all(value == EMPTY_BIN for value in self.signature)
+
+    def update(self, words: Iterable[str]) -> None:
+        """Add the shingles ending in the next batch of words.
+
+        Args:
+            words (Iterable[str]): Next words of the stream, in text order
+        """
+        hashes = [hash64(word) for word in words]
+        if not hashes:
+            return
+
+        sequence = self._tail + hashes
+        self._add_shingles(sequence, max(0, len(self._tail) - self.shingle_size + 1),
+                           len(sequence) - self.shingle_size)
+        keep = self.shingle_size - 1
+        if len(self.head) < keep:
+            self.head.extend(hashes[:keep - len(self.head)])
+        self._tail = sequence[-keep:] if keep else []
+
+    def merge(self, other: "MinHashSketch") -> None:
+        """Add the shingles of the text directly following this one.
+
+        Args:
+            other (MinHashSketch): Sketch of the following part of the text
+
+        Raises:
+            ValueError: If the sketches have different parameters
+        """
+        if (other.shingle_size, other.bins) != (self.shingle_size, self.bins):
+            raise ValueError("Cannot merge MinHash sketches with different parameters")
+        # Shingles spanning the boundary were seen by neither side
+        sequence = self._tail + other.head
+        self._add_shingles(sequence, max(0, len(self._tail) - self.shingle_size + 1),
+                           min(len(self._tail) - 1, len(sequence) - self.shingle_size))
+
+        self.signature = array('Q', map(min, self.signature, other.signature))
+        keep = self.shingle_size - 1
+        if len(self.head) < keep:
+            self.head = (self.head + other.head)[:keep]
+        self._tail = (self._tail + other._tail)[-keep:] if keep else []
+
+    def to_list(self) -> List[int]:
+        """Get the signature as a list of integers.
+
+        Returns:
+            List[int]: Minimum shingle hash per bin
+        """
+        return list(self.signature)
+
+    @staticmethod
+    def similarity(first: List[int], second: List[int]) -> float:
+        """Estimate the Jaccard similarity of two shingle sets.
+
+        Bins empty in both signatures carry no information and are ignored.
+
+        Args:
+            first (List[int]): Signature of the first text
+            second (List[int]): Signature of the second text
+
+        Returns:
+            float: Estimated similarity between 0 and 1
+        """
+        matches = 0
+        informative = 0
+        for a, b in zip(first, second):
+            if a == EMPTY_BIN and b == EMPTY_BIN:
+                continue
+            informative += 1
+            if a == b:
+                matches += 1
+        return matches / informative if informative else 0.0
+
+    def _add_shingles(self, sequence: List[int], first: int, last: int) -> None:
+        """Add shingles of a sequence of word hashes by their start position.
+
+        Args:
+            sequence (List[int]): Word hashes
+            first (int): Start of the first shingle to add
+            last (int): Start of the last shingle to add
+        """
+        signature = self.signature
+        mask = self.bins - 1
+        size = self.shingle_size
+        for start in range(first, last + 1):
+            value = 0
+            for word_hash in sequence[start:start + size]:
+                value = (value * SHINGLE_MULTIPLIER + word_hash) & MASK64
+            value = _mix64(value)
+            index = value & mask
+            if value < signature[index]:
+                signature[index] = value
+
+
+class LSHIndex:
+    """Locality-sensitive hashing index of MinHash signatures.
+
+    Signatures are split into bands; documents sharing any band are
+    candidates and are verified with the estimated similarity, so each
+    lookup touches only a few documents and indexing a corpus is
+    near-linear in its size. Only canonical documents are indexed;
+    a near-duplicate is recorded with the canonical file it maps to.
+
+    Attributes:
+        bands (int): Number of bands a signature is split into
+        threshold (float): Minimum similarity of near-duplicates
+        bins (int): Expected signature length
+        shingle_size (int): Shingle size the signatures were built with
+        documents (Dict[str, Dict[str, Any]]): Signature and canonical
+            file of every indexed file
+    """
+
+    def __init__(self, bands: int = 16, threshold: float = 0.8,
+                 bins: int = MinHashSketch.BINS,
+                 shingle_size: int = MinHashSketch.SHINGLE_SIZE) -> None:
+        """Initialize an empty LSHIndex.
+
+        Args:
+            bands (int): Number of bands a signature is split into
+            threshold (float): Minimum similarity of near-duplicates
+            bins (int): Expected signature length
+            shingle_size (int): Shingle size the signatures were built with
+
+        Raises:
+            ValueError: If bins is not divisible by bands
+        """
+        if bands < 1 or bins % bands:
+            raise ValueError("Signature length must be divisible by the number of bands")
+        self.bands = bands
+        self.threshold = threshold
+        self.bins = bins
+        self.shingle_size = shingle_size
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+
+    def add(self, name: str, signature: List[int]) -> Optional[Tuple[str, float]]:
+        """Index a file, mapping it to a canonical file if it is a near-duplicate.
+
+        A file indexed earlier under the same name is replaced.
+
+        Args:
+            name (str): Name of the file
+            signature (List[int]): MinHash signature of the file
+
+        Returns:
+            Optional[Tuple[str, float]]: Canonical file and similarity if the
+                file is a near-duplicate, None otherwise
+
+        Raises:
+            ValueError: If the signature has the wrong length
+        """
+        if len(signature) != self.bins:
+            raise ValueError(f"Signature must have {self.bins} values")
+        self.remove(name)
+        match = self.query(signature)
+        self._insert(name, signature, match[0] if match else name)
+        return match
+
+    def query(self, signature: List[int]) -> Optional[Tuple[str, float]]:
+        """Find the most similar canonical file above the threshold.
+
+        Args:
+            signature (List[int]): MinHash signature to look up
+
+        Returns:
+            Optional[Tuple[str, float]]: Canonical file and similarity, None
+                if there is no near-duplicate
+        """
+        candidates = []
+        for key in self._band_keys(signature):
+            candidates.extend(self._buckets.get(key, ()))
+
+        best = None
+        for name in dict.fromkeys(candidates):
+            similarity = MinHashSketch.similarity(signature, self.documents[name]["signature"])
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (name, similarity)
+        return best
+
+    def remove(self, name: str) -> None:
+        """Remove a file from the index.
+
+        Files that were mapped to it keep their mapping.
+
+        Args:
+            name (str): Name of the file
+        """
+        document = self.documents.pop(name, None)
+        if document is None or document["canonical"] != name:
+            return
+        for key in self._band_keys(document["signature"]):
+            bucket = self._buckets.get(key)
+            if bucket and name in bucket:
+                bucket.remove(name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the index for JSON output.
+
+        Returns:
+            Dict[str, Any]: Parameters and documents of the index
+        """
+        return {
+            "bands": self.bands,
+            "threshold": self.threshold,
+            "bins": self.bins,
+            "shingle-size": self.shingle_size,
+            "documents": self.documents
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LSHIndex":
+        """Restore an index serialized with to_dict.
+
+        Buckets are rebuilt from the stored signatures.
+
+        Args:
+            data (Dict[str, Any]): Serialized index
+
+        Returns:
+            LSHIndex: Restored index
+
+        Raises:
+            ValueError: If the data is malformed
+        """
+        try:
+            index = cls(int(data["bands"]), float(data["threshold"]),
+                        int(data["bins"]), int(data["shingle-size"]))
+            for name, document in data["documents"].items():
+                signature = [int(value) for value in document["signature"]]
+                if len(signature) != index.bins:
+                    raise ValueError(f"signature of {name} has {len(signature)} values")
+                index._insert(name, signature, str(document["canonical"]))
+        except (KeyError, TypeError, AttributeError, ValueError) as e:
+            raise ValueError(f"Malformed LSH index: {e}")
+        return index
+
+    def _insert(self, name: str, signature: List[int], canonical: str) -> None:
+        """Store a file, adding it to the buckets if it is canonical.
+
+        Args:
+            name (str): Name of the file
+            signature (List[int]): MinHash signature of the file
+            canonical (str): Canonical file the file maps to
+        """
+        self.documents[name] = {"signature": list(signature), "canonical": canonical}
+        if canonical == name:
+            for key in self._band_keys(signature):
+                self._buckets.setdefault(key, []).append(name)
+
+    def _band_keys(self, signature: List[int]) -> List[Tuple[int, Tuple[int, ...]]]:
+        """Get the bucket keys of a signature, skipping all-empty bands.
+
+        Args:
+            signature (List[int]): MinHash signature
+
+        Returns:
+            List[Tuple[int, Tuple[int, ...]]]: Band number and band values
+        """
+        rows = self.bins // self.bands
+        keys = []
+        for band in range(self.bands):
+            values = tuple(signature[band * rows:(band + 1) * rows])
+            if any(value != EMPTY_BIN for value in values):
+                keys.append((band, values))
+        return keys
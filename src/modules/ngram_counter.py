@@ -0,0 +1,345 @@
+import heapq
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from .sketches import CountMinSketch
+from .word_table import WordTable
+
+NGram = Tuple[int, ...]
+
+
+class NGramCounter:
+    """Counts word n-grams of the tokenizer stream with bounded memory.
+
+    Words are interned into a WordTable, and n-grams are counted as tuples
+    of vocabulary ids, so no n-gram string is built while counting. The
+    last words of the stream are kept between batches, which makes n-grams
+    spanning chunk boundaries count exactly as in a single pass. The first
+    words are kept as well, so counters of consecutive shards can be
+    merged into the counter of the whole text.
+
+    When ``max_entries`` is set and the n-gram tables together with the
+    interned vocabulary grow beyond it, the least frequent n-grams are
+    pruned, and so are the words no remaining n-gram refers to. Pruned
+    occurrences of n-grams and words are remembered in an optional
+    CountMinSketch and added back to the reported counts as an upper
+    bound; without a sketch reported counts are lower bounds.
+
+    Attributes:
+        order (int): Longest n-gram length counted
+        max_entries (Optional[int]): Maximum number of n-gram table and
+            vocabulary entries
+        unigrams (WordTable): Interned vocabulary with word counts, exact
+            until words are pruned; its total stays exact
+        tables (Dict[int, Counter]): N-gram counts keyed by id tuples, per length
+        sketch (Optional[CountMinSketch]): Counts of pruned n-grams
+        pruned (bool): Whether any n-gram entry was pruned
+        head (List[str]): First ``order - 1`` words of the stream
+    """
+
+    def __init__(self, order: int = 3, max_entries: Optional[int] = None,
+                 sketch_width: int = 0, sketch_depth: int = 4) -> None:
+        """Initialize NGramCounter.
+
+        Args:
+            order (int): Longest n-gram length counted, at least 2
+            max_entries (Optional[int]): Maximum number of n-gram table and
+                vocabulary entries, unbounded if None
+            sketch_width (int): Cells per row of the sketch of pruned
+                n-grams, 0 to disable the sketch
+            sketch_depth (int): Rows of the sketch of pruned n-grams
+
+        Raises:
+            ValueError: If order is smaller than 2
+        """
+        if order < 2:
+            raise ValueError("N-gram order must be at least 2")
+        self.order = order
+        self.max_entries = max_entries
+        self.unigrams = WordTable()
+        self.tables: Dict[int, Counter] = {k: Counter() for k in range(2, order + 1)}
+        self.sketch = CountMinSketch(sketch_width, sketch_depth) if sketch_width else None
+        self.pruned = False
+        self.head: List[str] = []
+        self._tail: List[int] = []
+
+    def update(self, words: Iterable[str]) -> None:
+        """Count the n-grams ending in the next batch of words.
+
+        Args:
+            words (Iterable[str]): Next words of the stream, in text order
+        """
+        words = list(words)
+        if not words:
+            return
+        self.unigrams.update(words)
+        vocabulary = self.unigrams.vocabulary
+        sequence = self._tail + [vocabulary[word] for word in words]
+
+        self._count_spanning(sequence, len(self._tail))
+        if len(self.head) < self.order - 1:
+            self.head.extend(words[:self.order - 1 - len(self.head)])
+        self._tail = sequence[-(self.order - 1):]
+        self._enforce_limit()
+
+    def merge(self, other: "NGramCounter") -> None:
+        """Add counts of a counter built from the text following this one.
+
+        Args:
+            other (NGramCounter): Counter of the following part of the text
+
+        Raises:
+            ValueError: If the counters have different orders
+        """
+        if other.order != self.order:
+            raise ValueError("Cannot merge n-gram counters of different orders")
+        other_words = list(other.unigrams.vocabulary)
+        self.unigrams.merge(other.unigrams)
+        vocabulary = self.unigrams.vocabulary
+        mapping = [vocabulary[word] for word in other_words]
+
+        # N-grams spanning the boundary were seen by neither side
+        boundary = len(self._tail)
+        sequence = self._tail + [vocabulary[word] for word in other.head]
+        self._count_spanning(sequence, boundary, within_tail=True)
+
+        for k, table in self.tables.items():
+            for key, count in other.tables[k].items():
+                table[tuple(map(mapping.__getitem__, key))] += count
+        if self.sketch is not None and other.sketch is not None:
+            self.sketch.merge(other.sketch)
+        self.pruned = self.pruned or other.pruned
+
+        if len(self.head) < self.order - 1:
+            self.head = (self.head + other.head)[:self.order - 1]
+        self._tail = (self._tail + [mapping[i] for i in other._tail])[-(self.order - 1):]
+        self._enforce_limit()
+
+    def most_common(self, k: int, n: int) -> List[Tuple[str, int]]:
+        """Get the N most common n-grams of a given length.
+
+        Ties are broken by first occurrence. After pruning the candidates
+        are ranked by their retained counts plus the sketch estimate of
+        their pruned occurrences.
+
+        Args:
+            k (int): N-gram length
+            n (int): Number of n-grams to return
+
+        Returns:
+            List[Tuple[str, int]]: N-grams joined by spaces and their counts
+
+        Raises:
+            ValueError: If k is not a counted n-gram length
+        """
+        table = self._table(k)
+        words = list(self.unigrams.vocabulary)
+        if not self.pruned or self.sketch is None:
+            return [(self._join(words, key), count) for key, count in table.most_common(n)]
+
+        candidates = heapq.nlargest(max(4 * n, 64), table.items(), key=lambda item: item[1])
+        corrected = [
+            (text, count + self.sketch.estimate(text))
+            for text, count in ((self._join(words, key), count) for key, count in candidates)
+        ]
+        return heapq.nlargest(n, corrected, key=lambda item: item[1])
+
+    def collocations(self, n: int, min_count: int = 1) -> List[Tuple[str, int, float, float]]:
+        """Get the strongest two-word collocations.
+
+        Bigrams are ranked by Dunning's log-likelihood ratio of the
+        contingency table of both words; pointwise mutual information is
+        reported alongside. Bigrams rarer than ``min_count`` are skipped,
+        since PMI strongly favours one-off pairs.
+
+        Args:
+            n (int): Number of collocations to return
+            min_count (int): Minimum bigram count
+
+        Returns:
+            List[Tuple[str, int, float, float]]: Bigram, its count, PMI in
+                bits and log-likelihood ratio
+        """
+        total = max(1, self.unigrams.total - 1)
+        words = list(self.unigrams.vocabulary)
+        counts = self.unigrams.counts
+        if self.pruned and self.sketch is not None:
+            counts = [count + self.sketch.estimate(word) for word, count in zip(words, counts)]
+        scored = []
+        for key, count in self.tables[2].items():
+            if count < min_count:
+                continue
+            first, second = counts[key[0]], counts[key[1]]
+            scored.append((key, count, self._pmi(count, first, second, total),
+                           self._log_likelihood(count, first, second, total)))
+
+        top = heapq.nlargest(n, scored, key=lambda item: item[3])
+        return [(self._join(words, key), count, pmi, ll) for key, count, pmi, ll in top]
+
+    def _table(self, k: int) -> Counter:
+        """Get the table of n-grams of a given length.
+
+        Args:
+            k (int): N-gram length
+
+        Returns:
+            Counter: Counts keyed by id tuples
+
+        Raises:
+            ValueError: If k is not a counted n-gram length
+        """
+        if k not in self.tables:
+            raise ValueError(f"N-grams of length {k} are not counted (order {self.order})")
+        return self.tables[k]
+
+    def _count_spanning(self, sequence: List[int], boundary: int,
+                        within_tail: bool = False) -> None:
+        """Count n-grams of a sequence that end after the boundary.
+
+        Args:
+            sequence (List[int]): Word ids, already counted up to boundary
+            boundary (int): Number of leading ids whose n-grams were counted
+            within_tail (bool): Only count n-grams starting before the boundary
+        """
+        for k, table in self.tables.items():
+            first = max(0, boundary - k + 1)
+            last = len(sequence) - k
+            if within_tail:
+                last = min(last, boundary - 1)
+            if first > last:
+                continue
+            if k == 2:
+                table.update(zip(sequence[first:last + 1], sequence[first + 1:last + 2]))
+            else:
+                table.update(
+                    tuple(sequence[start:start + k]) for start in range(first, last + 1)
+                )
+
+    def _enforce_limit(self) -> None:
+        """Prune the least frequent n-grams and unused words if the tables are too large.
+
+        The most frequent n-grams are kept together with the words they
+        and the last words of the stream refer to, up to ``max_entries //
+        2`` entries in all, so pruning runs rarely. Among n-grams of equal
+        count, which are common since most n-grams occur once, the first
+        counted ones are kept. The vocabulary is then compacted and the
+        kept n-grams are renumbered.
+        """
+        if self.max_entries is None:
+            return
+        size = len(self.unigrams) + sum(len(table) for table in self.tables.values())
+        if size <= self.max_entries:
+            return
+
+        kept_words = set(self._tail)
+        kept = set()
+        room = self.max_entries // 2 - len(kept_words)
+        ranked = sorted(((count, k, key) for k, table in self.tables.items()
+                         for key, count in table.items()),
+                        key=lambda item: item[0], reverse=True)
+        for _, k, key in ranked:
+            new_words = set(key) - kept_words
+            if 1 + len(new_words) > room:
+                break
+            room -= 1 + len(new_words)
+            kept.add((k, key))
+            kept_words |= new_words
+
+        words = list(self.unigrams.vocabulary)
+        mapping = self._compact(words, kept_words)
+        for k, table in self.tables.items():
+            pruned_table = Counter()
+            for key, count in table.items():
+                if (k, key) in kept:
+                    pruned_table[tuple(map(mapping.__getitem__, key))] = count
+                elif self.sketch is not None:
+                    self.sketch.add(self._join(words, key), count)
+            self.tables[k] = pruned_table
+        self._tail = [mapping[index] for index in self._tail]
+        self.pruned = True
+
+    def _compact(self, words: List[str], kept_words: Set[int]) -> List[int]:
+        """Drop the words outside a set of ids from the vocabulary.
+
+        Counts of dropped words are added to the sketch. Totals of the
+        vocabulary are kept.
+
+        Args:
+            words (List[str]): Current vocabulary indexed by id
+            kept_words (Set[int]): Ids of the words to keep
+
+        Returns:
+            List[int]: New id of every kept word, indexed by its old id,
+                -1 for dropped words
+        """
+        old = self.unigrams
+        table = WordTable()
+        mapping = [-1] * len(words)
+        for index, (word, count) in enumerate(zip(words, old.counts)):
+            if index in kept_words:
+                mapping[index] = len(table.counts)
+                table.vocabulary[word] = mapping[index]
+                table.counts.append(count)
+            elif self.sketch is not None:
+                self.sketch.add(word, count)
+        table.total = old.total
+        table.length_sum = old.length_sum
+        self.unigrams = table
+        return mapping
+
+    @staticmethod
+    def _join(words: List[str], key: NGram) -> str:
+        """Convert an id tuple into space-separated words.
+
+        Args:
+            words (List[str]): Vocabulary indexed by id
+            key (NGram): Word ids
+
+        Returns:
+            str: N-gram text
+        """
+        return " ".join(words[index] for index in key)
+
+    @staticmethod
+    def _pmi(count: int, first: int, second: int, total: int) -> float:
+        """Calculate pointwise mutual information of a bigram in bits.
+
+        Args:
+            count (int): Bigram count
+            first (int): Count of the first word
+            second (int): Count of the second word
+            total (int): Number of bigram positions
+
+        Returns:
+            float: PMI of the bigram
+        """
+        return math.log2(count * total / (first * second))
+
+    @staticmethod
+    def _log_likelihood(count: int, first: int, second: int, total: int) -> float:
+        """Calculate Dunning's log-likelihood ratio (G-squared) of a bigram.
+
+        Args:
+            count (int): Bigram count
+            first (int): Count of the first word
+            second (int): Count of the second word
+            total (int): Number of bigram positions
+
+        Returns:
+            float: Log-likelihood ratio of the bigram
+        """
+        cells = (
+            count,
+            max(0, first - count),
+            max(0, second - count),
+            max(0, total - first - second + count),
+        )
+        size = sum(cells)
+        rows = (cells[0] + cells[1], cells[2] + cells[3])
+        columns = (cells[0] + cells[2], cells[1] + cells[3])
+        score = 0.0
+        for index, cell in enumerate(cells):
+            if cell:
+                expected = rows[index // 2] * columns[index % 2] / size
+                score += cell * math.log(cell / expected)
+        return 2 * score
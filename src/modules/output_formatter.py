@@ -1,4 +1,6 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from .deadline import Deadline
+from .exceptions import AnalysisError
 
 
 class OutputFormatter:
@@ -10,17 +12,32 @@ class OutputFormatter:
     Attributes:
         analyzer: Text analyzer instance containing analysis methods
         n (int): Number of most frequent words to include in results
+        symbol_limit (Optional[int]): Maximum number of symbols in the
+            symbol frequency distribution, None for all symbols
+        ngrams (bool): Whether to include the n-gram and collocation section
+        deadline (Optional[Deadline]): Deadline after which sections beyond
+            the counts are skipped, None if there is no time limit
     """
 
-    def __init__(self, analyzer, n: int) -> None:
+    def __init__(self, analyzer, n: int, symbol_limit: Optional[int] = None,
+                 ngrams: bool = False, deadline: Optional[Deadline] = None) -> None:
         """Initialize OutputFormatter with analyzer and N value.
 
         Args:
             analyzer: Text analyzer instance with analysis methods
             n (int): Number of most frequent words to include
+            symbol_limit (Optional[int]): Maximum number of most frequent
+                symbols to include, None for all symbols
+            ngrams (bool): Include n-grams and collocations, which requires
+                an analyzer that collected them
+            deadline (Optional[Deadline]): Deadline after which sections
+                beyond the counts are skipped, None to include all sections
         """
         self.analyzer = analyzer
         self.n = n
+        self.symbol_limit = symbol_limit
+        self.ngrams = ngrams
+        self.deadline = deadline
 
     def format_results(self) -> Dict[str, Any]:
         """Format analysis results into a structured dictionary.
@@ -29,9 +46,22 @@ class OutputFormatter:
         - Total symbol counts (with and without spaces)
         - Sentence count
         - Word count
+        - Distinct word count and type/token ratio
         - N most frequent words
         - Average word length
-        - Symbol frequency distribution
+        - Symbol frequency distribution, limited to the most frequent
+          symbols if a symbol limit is set
+        - Serialized vocabulary sketch for corpus-level merging
+        - Detected encoding of the analyzed file, if read from a file
+        - Normalization of the counted word forms, if enabled
+        - Optionally, most frequent n-grams and collocations
+        - Values of the custom metrics computed by the analyzer, each
+          under its own key
+
+        The counts are always included. The other sections are computed
+        cheapest first, and with a deadline, those still left when it
+        expires are skipped. Results of an analysis stopped by the
+        deadline, or with skipped sections, are marked partial.
 
         Returns:
             Dict[str, Any]: Dictionary containing formatted analysis results:
@@ -42,16 +72,111 @@ class OutputFormatter:
                     },
                     "sentence-count": int,
                     "word-count": int,
+                    "distinct-word-count": int,
+                    "type-token-ratio": float,
                     "N-most-frequent-words": Dict[str, int],
                     "average-word-length": float,
-                    "symbols-frequency": Dict[str, int]
+                    "symbols-frequency": Dict[str, int],
+                    "vocabulary-sketch": Dict[str, Any],
+                    "encoding": str,  # only for files
+                    "normalization": Dict[str, Any],  # only if enabled
+                    "ngrams": Dict[str, Any],  # only if enabled
+                    "partial": {  # only if partial
+                        "coverage": float,  # covered fraction of the input
+                        "skipped": List[str]  # sections left out
+                    },
+                    "<metric-name>": Any  # one per custom metric
                 }
+
+        Raises:
+            AnalysisError: If a custom metric name clashes with a built-in key
         """
-        return {
+        words_key = f"{self.n}-most-frequent-words"
+        values: Dict[str, Any] = {
             "total_symbols": self.analyzer.get_symbol_counts(),
             "sentence-count": self.analyzer.get_sentence_count(),
             "word-count": self.analyzer.get_word_count(),
+            "average-word-length": self.analyzer.get_average_word_length()
+        }
+        # Sections beyond the counts, from the cheapest to the most expensive
+        sections = [
+            ("most-frequent-words", lambda: {words_key: self.analyzer.get_most_frequent_words()}),
+            ("vocabulary", self._vocabulary_section),
+            ("metrics", lambda: {"metrics": self.analyzer.get_metric_results()}),
+            ("symbols-frequency", lambda: {
+                "symbols-frequency": self.analyzer.get_symbol_frequency(self.symbol_limit)
+            })
+        ]
+        if self.ngrams:
+            sections.append(("ngrams", lambda: {"ngrams": self.analyzer.get_ngram_statistics()}))
+        skipped = []
+        for name, section in sections:
+            if self.deadline is not None and self.deadline.expired():
+                skipped.append(name)
+            else:
+                values.update(section())
+
+        keys = ("total_symbols", "sentence-count", "word-count", "distinct-word-count",
+                "type-token-ratio", words_key, "average-word-length", "symbols-frequency",
+                "vocabulary-sketch")
+        results = {key: values[key] for key in keys if key in values}
+        encoding = self.analyzer.get_encoding()
+        if encoding is not None:
+            results["encoding"] = encoding
+        normalization = self.analyzer.get_normalization()
+        if normalization is not None:
+            results["normalization"] = normalization
+        if "ngrams" in values:
+            results["ngrams"] = values["ngrams"]
+        if skipped or self.analyzer.is_partial():
+            results["partial"] = {"coverage": self.analyzer.get_coverage(), "skipped": skipped}
+        for name, value in values.get("metrics", {}).items():
+            if name in results or name in keys:
+                raise AnalysisError(f"Metric {name} clashes with a built-in result")
+            results[name] = value
+        return results
+
+    def _vocabulary_section(self) -> Dict[str, Any]:
+        """Compute the sections derived from the vocabulary sketch.
+
+        Returns:
+            Dict[str, Any]: Distinct word count, type/token ratio and the
+                serialized vocabulary sketch
+        """
+        return {
+            "distinct-word-count": self.analyzer.get_distinct_word_count(),
+            "type-token-ratio": self.analyzer.get_type_token_ratio(),
+            "vocabulary-sketch": self.analyzer.get_vocabulary_sketch().to_dict()
+        }
+
+    def format_estimate_results(self) -> Dict[str, Any]:
+        """Format sampling-based estimates into a structured dictionary.
+
+        The result is explicitly marked as estimated and carries the
+        confidence intervals, a description of the sample and the detected
+        encoding of the file, if known.
+
+        Returns:
+            Dict[str, Any]: Dictionary containing estimated results:
+                {
+                    "estimated": True,
+                    "sample": Dict[str, float],
+                    "word-count": int,
+                    "N-most-frequent-words": Dict[str, int],
+                    "average-word-length": float,
+                    "confidence-intervals": Dict[str, List[float]],
+                    "encoding": str  # only if known
+                }
+        """
+        results = {
+            "estimated": True,
+            "sample": self.analyzer.get_sample_info(),
+            "word-count": self.analyzer.get_word_count(),
             f"{self.n}-most-frequent-words": self.analyzer.get_most_frequent_words(),
             "average-word-length": self.analyzer.get_average_word_length(),
-            "symbols-frequency": self.analyzer.get_symbol_frequency()
+            "confidence-intervals": self.analyzer.get_confidence_intervals()
         }
+        encoding = self.analyzer.get_encoding()
+        if encoding is not None:
+            results["encoding"] = encoding
+        return results
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Set, Tuple
+from .exceptions import ValidationError
+
+MANIFEST_FILENAME = ".output-manifest.jsonl"
+# Hex digits of the input digest naming each fan-out level
+LEVEL_WIDTH = 2
+MAX_FAN_OUT = 4
+# Hex digits of the input digest qualifying output names in sharded layouts
+NAME_DIGEST_LENGTH = 12
+
+
+class OutputLayout:
+    """Placement of the outputs of input files inside the output directory.
+
+    The flat layout puts every output directly into the output
+    directory under the input file's name. With ``fan_out`` levels,
+    outputs go into nested sub-directories named by the leading hex
+    digits of the SHA-256 digest of the input location, so no directory
+    grows beyond 256 entries per level times the outputs of its inputs.
+    Output names are then qualified by the digest as well, so inputs of
+    the same name from different input trees never share an output.
+
+    Directories are created once per process and remembered. Every
+    output is recorded in an append-only manifest mapping input
+    locations to outputs; each entry is one short append, so concurrent
+    writers need no lock on local file systems, and readers skip a torn
+    last line.
+
+    Attributes:
+        root (str): Output directory
+        fan_out (int): Number of hashed sub-directory levels, 0 for flat
+        manifest_path (str): Location of the manifest inside the root
+    """
+
+    def __init__(self, root: str, fan_out: int = 0) -> None:
+        """Initialize OutputLayout.
+
+        Args:
+            root (str): Output directory
+            fan_out (int): Number of hashed sub-directory levels, 0 to keep
+                all outputs in the root
+
+        Raises:
+            ValidationError: If fan_out is not between 0 and 4
+        """
+        if not isinstance(fan_out, int) or not 0 <= fan_out <= MAX_FAN_OUT:
+            raise ValidationError(
+                f"Output fan-out must be between 0 and {MAX_FAN_OUT} levels, got {fan_out!r}"
+            )
+        self.root = root
+        self.fan_out = fan_out
+        self.manifest_path = os.path.join(root, MANIFEST_FILENAME)
+        self._lock = threading.Lock()
+        self._created: Set[str] = set()
+        self._recorded: Set[Tuple[str, str]] = set()
+
+    @staticmethod
+    def digest(location: str) -> str:
+        """Get the SHA-256 hex digest of an input location."""
+        return hashlib.sha256(location.encode('utf-8')).hexdigest()
+
+    def path(self, location: str, name: str, suffix: str) -> str:
+        """Get the path of an output of an input file.
+
+        Args:
+            location (str): Path or storage location of the input file
+            name (str): Name of the input file
+            suffix (str): Suffix of the output, such as '.json' or '.kwic'
+
+        Returns:
+            str: Absolute path to the output
+        """
+        if not self.fan_out:
+            return os.path.join(self.root, name + suffix)
+        digest = self.digest(location)
+        levels = [digest[level * LEVEL_WIDTH:(level + 1) * LEVEL_WIDTH]
+                  for level in range(self.fan_out)]
+        return os.path.join(self.root, *levels,
+                            f"{name}.{digest[:NAME_DIGEST_LENGTH]}{suffix}")
+
+    def prepare(self, location: str, path: str) -> None:
+        """Create the directory of an output and record it in the manifest.
+
+        Both happen at most once per output and process.
+
+        Args:
+            location (str): Path or storage location of the input file
+            path (str): Absolute path to the output
+
+        Raises:
+            OSError: If the directory or the manifest cannot be written
+        """
+        directory = os.path.dirname(path)
+        if directory not in self._created:
+            os.makedirs(directory, exist_ok=True)
+            with self._lock:
+                self._created.add(directory)
+
+        output = os.path.relpath(path, self.root)
+        if (location, output) in self._recorded:
+            return
+        line = json.dumps({"input": location, "output": output}, ensure_ascii=False) + "\n"
+        # One write to a descriptor opened for appending lands in one piece
+        fd = os.open(self.manifest_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode('utf-8'))
+        finally:
+            os.close(fd)
+        with self._lock:
+            self._recorded.add((location, output))
+
+    def manifest(self) -> Dict[str, List[str]]:
+        """Read the outputs recorded for every input location.
+
+        Returns:
+            Dict[str, List[str]]: Output paths relative to the root by input
+                location, in order of first record, empty without a manifest
+        """
+        outputs: Dict[str, List[str]] = {}
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        location, output = entry["input"], entry["output"]
+                    except (ValueError, KeyError, TypeError):
+                        # Torn line of a writer that was interrupted
+                        continue
+                    recorded = outputs.setdefault(location, [])
+                    if output not in recorded:
+                        recorded.append(output)
+        except FileNotFoundError:
+            pass
+        return outputs
+
+    def list(self, suffix: str) -> List[str]:
+        """List the outputs with a suffix in the root and its fan-out levels.
+
+        Hidden files and directories, such as the manifest and the result
+        cache, are skipped.
+
+        Args:
+            suffix (str): Suffix of the outputs, such as '.json'
+
+        Returns:
+            List[str]: Absolute paths to the outputs, sorted
+
+        Raises:
+            OSError: If the output directory cannot be listed
+        """
+        paths = []
+        for directory, subdirectories, names in os.walk(self.root, onerror=_raise):
+            subdirectories[:] = [name for name in subdirectories if not name.startswith(".")]
+            paths.extend(os.path.join(directory, name) for name in names
+                         if name.endswith(suffix) and not name.startswith("."))
+        return sorted(paths)
+
+
+def _raise(error: OSError) -> None:
+    """Propagate an error of os.walk."""
+    raise error
@@ -1,7 +1,12 @@
 import os
+import re
 from pathlib import Path
-from typing import Union
+from typing import Iterable, List, Optional, Union
 from .exceptions import FileError
+from .output_layout import OutputLayout
+
+# Names of analysis results, grouped by input file, with optional kind and N
+RESULT_NAME_PATTERN = re.compile(r"(?P<input>.+?)(?P<estimate>\.estimate)?(?P<n>\.n\d+)?\.json")
 
 
 class PathManager:
@@ -10,10 +15,20 @@ class PathManager:
     This class manages file paths, directory creation, and path resolution
     for both input and output operations.
 
+    Input files may also be objects of a storage backend, in which case
+    the input directory is the backend's root location, like
+    s3://bucket/prefix/, and input paths are locations under it.
+
+    Outputs of input files, like results and concordance indexes, are
+    placed by an OutputLayout, which may fan them out into hashed
+    sub-directories; corpus-level outputs stay in the output directory.
+
     Attributes:
         project_root (str): Absolute path to project root directory
-        input_dir (str): Path to directory containing input text files
+        input_dir (str): Path to directory containing input text files, or
+            location of the storage root holding them
         output_dir (str): Path to directory for analysis output files
+        layout (OutputLayout): Placement of the outputs of input files
     """
 
     @staticmethod
@@ -29,14 +44,29 @@ class PathManager:
         current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         return os.path.dirname(current_dir)
 
-    def __init__(self) -> None:
+    def __init__(self, input_dir: Optional[str] = None,
+                 output_dir: Optional[str] = None, fan_out: int = 0) -> None:
         """Initialize PathManager with project directory structure.
 
         Sets up paths for project root, input, and output directories.
+
+        Args:
+            input_dir (Optional[str]): Input directory or storage root
+                location, defaults to src/text-files
+            output_dir (Optional[str]): Output directory, defaults to
+                src/text-analyzed
+            fan_out (int): Number of hashed sub-directory levels of the
+                outputs of input files, 0 to keep them in the output directory
+
+        Raises:
+            ValidationError: If fan_out is out of range
         """
         self.project_root = self.get_project_root()
-        self.input_dir = os.path.join(self.project_root, "src", "text-files")
-        self.output_dir = os.path.join(self.project_root, "src", "text-analyzed")
+        self.input_dir = input_dir or os.path.join(self.project_root, "src", "text-files")
+        self.output_dir = (os.path.abspath(output_dir) if output_dir else
+                           os.path.join(self.project_root, "src", "text-analyzed"))
+        self.layout = OutputLayout(self.output_dir, fan_out)
+        self._output_dir_ready = False
 
     def get_input_path(self, filename: str) -> str:
         """Get full absolute path for an input file.
@@ -45,33 +75,224 @@ class PathManager:
             filename (str): Name of the input file
 
         Returns:
-            str: Absolute path to the input file
+            str: Absolute path to the input file, or its location under a
+                storage root
         """
+        if "://" in self.input_dir:
+            return self.input_dir.rstrip("/") + "/" + filename
         return os.path.join(self.input_dir, filename)
 
-    def get_output_path(self, filename: str) -> str:
+    def get_output_path(self, filename: str, n: Optional[int] = None) -> str:
         """Get full absolute path for an output file.
 
-        Appends .json extension to the filename for analysis results.
+        Appends .json extension to the filename for analysis results, and
+        the number of most frequent words before it if given, so results
+        of the same file with different N are kept side by side.
 
         Args:
             filename (str): Base name for the output file (without extension)
+            n (Optional[int]): Number of most frequent words in the results
 
         Returns:
-            str: Absolute path to the output file with .json extension
+            str: Absolute path to the output file with .json extension,
+                or .nN.json with N
         """
+        if n is not None:
+            filename = f"{filename}.n{n}"
         return os.path.join(self.output_dir, filename + ".json")
 
+    def get_result_path(self, filename: str, n: Optional[int] = None,
+                        variant: Optional[str] = None) -> str:
+        """Get full absolute path for the analysis results of an input file.
+
+        Args:
+            filename (str): Name of the input file
+            n (Optional[int]): Number of most frequent words in the results
+            variant (Optional[str]): Kind of results, such as 'estimate',
+                None for the full analysis
+
+        Returns:
+            str: Absolute path to the results, named like get_output_path
+                in the flat layout
+        """
+        suffix = (f".{variant}" if variant else "") + (f".n{n}" if n is not None else "")
+        return self._layout_path(filename, suffix + ".json")
+
+    def find_output_path(self, filename: str) -> Optional[str]:
+        """Find the most recently saved results of an input file.
+
+        Args:
+            filename (str): Name of the input file
+
+        Returns:
+            Optional[str]: Absolute path to its results without N or, if
+                missing, to its newest results with any N; None if none exist
+        """
+        path = self.get_result_path(filename)
+        if os.path.exists(path):
+            return path
+        directory, name = os.path.split(path)
+        pattern = re.compile(re.escape(name[:-len(".json")]) + r"\.n\d+\.json")
+        try:
+            names = [name for name in os.listdir(directory) if pattern.fullmatch(name)]
+        except OSError:
+            return None
+        paths = [os.path.join(directory, name) for name in names]
+        return max(paths, key=os.path.getmtime, default=None)
+
+    @staticmethod
+    def select_results(paths: Iterable[str]) -> List[str]:
+        """Select one analysis result per input file.
+
+        Analyzing a file with several N, or estimating it as well, leaves
+        several results of the same input. Like find_output_path, the
+        results without N are chosen or, if missing, the newest results
+        with any N; estimates are chosen only for inputs without full
+        results. Other JSON files, such as corpus summaries, are kept.
+
+        Args:
+            paths (Iterable[str]): Paths to saved JSON results
+
+        Returns:
+            List[str]: Paths to the chosen results, sorted
+
+        Raises:
+            OSError: If the modification time of a result cannot be read
+        """
+        chosen = {}
+        for path in paths:
+            directory, name = os.path.split(path)
+            match = RESULT_NAME_PATTERN.fullmatch(name)
+            if match is None:
+                chosen[path] = ((), path)
+                continue
+            rank = (match.group("estimate") is None, match.group("n") is None,
+                    os.path.getmtime(path))
+            key = os.path.join(directory, match.group("input"))
+            if key not in chosen or rank > chosen[key][0]:
+                chosen[key] = (rank, path)
+        return sorted(path for _, path in chosen.values())
+
+    def list_results(self) -> List[str]:
+        """List the saved JSON outputs with one analysis result per input file.
+
+        Returns:
+            List[str]: Absolute paths to the outputs, sorted, as chosen by
+                select_results
+
+        Raises:
+            OSError: If the output directory cannot be listed
+        """
+        return self.select_results(self.list_outputs(".json"))
+
+    def list_outputs(self, suffix: str) -> List[str]:
+        """List the saved outputs with a suffix, in any layout.
+
+        Args:
+            suffix (str): Suffix of the outputs, such as '.json'
+
+        Returns:
+            List[str]: Absolute paths to the outputs, sorted
+
+        Raises:
+            OSError: If the output directory cannot be listed
+        """
+        return self.layout.list(suffix)
+
+    def get_concordance_path(self, filename: str) -> str:
+        """Get full absolute path for the concordance index of an input file.
+
+        The index is stored next to the analysis results.
+
+        Args:
+            filename (str): Name of the input file
+
+        Returns:
+            str: Absolute path to the index file with .kwic extension
+        """
+        return self._layout_path(filename, ".kwic")
+
+    def get_windows_path(self, filename: str) -> str:
+        """Get full absolute path for the window statistics of an input file.
+
+        The statistics are stored next to the analysis results.
+
+        Args:
+            filename (str): Name of the input file
+
+        Returns:
+            str: Absolute path to the NDJSON file with .windows.ndjson extension
+        """
+        return self._layout_path(filename, ".windows.ndjson")
+
+    def get_frequency_run_path(self, filename: str) -> str:
+        """Get full absolute path for the frequency run of an input file.
+
+        The run is stored next to the analysis results.
+
+        Args:
+            filename (str): Name of the input file
+
+        Returns:
+            str: Absolute path to the run file with .freq extension
+        """
+        return self._layout_path(filename, ".freq")
+
+    def _layout_path(self, filename: str, suffix: str) -> str:
+        """Get the path of an output of an input file from the layout."""
+        return self.layout.path(self.get_input_path(filename), filename, suffix)
+
+    def prepare_output(self, filename: str, path: str) -> None:
+        """Prepare writing an output of an input file.
+
+        Creates its directory once and records it in the manifest of the
+        output directory.
+
+        Args:
+            filename (str): Name of the input file
+            path (str): Absolute path to the output
+
+        Raises:
+            FileError: If the directory or the manifest cannot be written
+        """
+        self.ensure_output_dir_exists()
+        try:
+            self.layout.prepare(self.get_input_path(filename), path)
+        except OSError as e:
+            raise FileError(f"Failed to prepare output: {e}", {"path": path})
+
+    def get_cache_dir(self) -> str:
+        """Get full absolute path for the result cache inside the output directory.
+
+        Returns:
+            str: Absolute path to the cache directory
+        """
+        return os.path.join(self.output_dir, ".result-cache")
+
+    def get_profile_path(self, name: str) -> str:
+        """Get full absolute path for the collapsed stacks of a profiled run.
+
+        Args:
+            name (str): Base name of the profile (without extension)
+
+        Returns:
+            str: Absolute path to the collapsed stack file with .collapsed extension
+        """
+        return os.path.join(self.output_dir, name + ".collapsed")
+
     def ensure_output_dir_exists(self) -> None:
         """Ensure output directory exists, creating it if necessary.
 
         Creates the output directory and any necessary parent directories
-        if they don't exist.
+        if they don't exist. After the first success, the directory is
+        assumed to stay in place.
 
         Raises:
             FileError: If directory creation fails or if there are
                       permission issues
         """
+        if self._output_dir_ready:
+            return
         try:
             os.makedirs(self.output_dir, exist_ok=True)
 
@@ -90,3 +311,4 @@ class PathManager:
                     "error_code": e.errno
                 }
             )
+        self._output_dir_ready = True
@@ -0,0 +1,495 @@
+import contextlib
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from .exceptions import FileError
+
+# Profiler of the pipeline running in this process, None if not profiling
+_active: Optional["PipelineProfiler"] = None
+
+# cProfile function key: (file name, first line number, function name)
+FunctionKey = Tuple[str, int, str]
+
+
+def active_profiler() -> Optional["PipelineProfiler"]:
+    """Get the profiler running in this process.
+
+    Returns:
+        Optional[PipelineProfiler]: Running profiler, None if not profiling
+    """
+    return _active
+
+
+@contextlib.contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Mark a stage of the pipeline for the profiler running in this process.
+
+    Stages cost nothing beyond the context manager when not profiling.
+
+    Args:
+        name (str): Name of the stage, records of equal names are aggregated
+    """
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name):
+        yield
+
+
+def function_label(function: FunctionKey) -> str:
+    """Format a function key as a frame of a collapsed stack.
+
+    Args:
+        function (FunctionKey): File name, first line number and function name
+
+    Returns:
+        str: 'name (file:line)', or the name alone for built-in functions
+    """
+    filename, line, name = function
+    if filename == '~':
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def profile_worker(settings: Dict[str, Any], function: Callable, *args) -> Tuple[Any, Dict[str, Any]]:
+    """Run a function in a worker process under a profiler.
+
+    Defined at module level so it can be run in worker processes.
+
+    Args:
+        settings (Dict[str, Any]): Result of PipelineProfiler.worker_settings
+        function (Callable): Function to run
+        *args: Arguments of the function
+
+    Returns:
+        Tuple[Any, Dict[str, Any]]: Result of the function and the profile
+            to pass to PipelineProfiler.add_worker
+    """
+    global _active
+    # Forked workers inherit the profiler and allocation tracing of the parent
+    _active = None
+    if "tracemalloc" in sys.modules and sys.modules["tracemalloc"].is_tracing():
+        sys.modules["tracemalloc"].stop()
+    profiler = PipelineProfiler(settings["mode"], settings["interval"], memory=False)
+    with profiler:
+        result = function(*args)
+    return result, profiler.export()
+
+
+class _StatsData:
+    """Adapter letting pstats load a stats dictionary received from a worker."""
+
+    def __init__(self, stats: Dict) -> None:
+        """Wrap a stats dictionary of cProfile.Profile."""
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        """Keep the wrapped stats, as pstats expects of a profiler."""
+
+
+class PipelineProfiler:
+    """Profiles the analysis pipeline of this process and its workers.
+
+    Two modes are supported:
+
+    - ``cprofile``: deterministic profiling of every call; collapsed
+      stacks are reconstructed from the caller graph, splitting the time
+      of a function among its callers in proportion to the calls
+    - ``sampling``: a thread records the stack of the profiled thread
+      every ``interval`` seconds, with lower overhead and exact stacks
+
+    With memory tracking, tracemalloc records the time, net allocations,
+    peak memory and top allocation sites of every stage marked with
+    ``stage``. Worker processes run under their own profiler, and their
+    profiles are added to this one, so a run spanning several processes
+    yields a single profile.
+
+    Attributes:
+        mode (str): Profiling mode, one of MODES
+        interval (float): Sampling interval in seconds
+        memory (bool): Whether allocations are traced per stage
+        workers (int): Number of worker profiles added
+    """
+
+    MODES = ("cprofile", "sampling")
+    ALLOCATION_SITES = 5
+    # Sub-microsecond shares of the cProfile caller graph are not emitted
+    MIN_STACK_MICROSECONDS = 1
+
+    def __init__(self, mode: str = "cprofile", interval: float = 0.005,
+                 memory: bool = True) -> None:
+        """Initialize PipelineProfiler.
+
+        Args:
+            mode (str): Profiling mode, one of MODES
+            interval (float): Sampling interval in seconds
+            memory (bool): Trace allocations of every stage with tracemalloc
+
+        Raises:
+            ValueError: If the mode is unknown or the interval is not positive
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        if interval <= 0:
+            raise ValueError("Sampling interval must be positive")
+        self.mode = mode
+        self.interval = interval
+        self.memory = memory
+        self.workers = 0
+        self._profile = None
+        self._stats = None
+        self._samples: Counter = Counter()
+        self._stages: Dict[str, Dict[str, Any]] = {}
+        self._open_stages: List[Dict[str, int]] = []
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._pause_depth = 0
+        self._started_tracing = False
+
+    def __enter__(self) -> "PipelineProfiler":
+        """Start profiling when entering the runtime context."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Stop profiling when leaving the runtime context."""
+        self.stop()
+
+    def start(self) -> None:
+        """Start profiling the current thread and make this the active profiler.
+
+        Raises:
+            RuntimeError: If another profiler is active in this process
+        """
+        global _active
+        if _active is not None:
+            raise RuntimeError("A profiler is already active in this process")
+        _active = self
+        if self.memory:
+            import tracemalloc
+
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+        if self.mode == "cprofile":
+            import cProfile
+
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._stop.clear()
+            self._sampler = threading.Thread(target=self._sample, args=(threading.get_ident(),),
+                                             name="profile-sampler", daemon=True)
+            self._sampler.start()
+
+    def stop(self) -> None:
+        """Stop profiling and collect the profile of this process."""
+        global _active
+        if _active is not self:
+            return
+        if self._profile is not None:
+            self._profile.disable()
+            self._add_stats(self._profile)
+            self._profile = None
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+        if self._started_tracing:
+            import tracemalloc
+
+            tracemalloc.stop()
+            self._started_tracing = False
+        _active = None
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Record time and memory of a stage of the pipeline.
+
+        Args:
+            name (str): Name of the stage, records of equal names are aggregated
+        """
+        tracing = False
+        if self.memory:
+            import tracemalloc
+
+            tracing = tracemalloc.is_tracing()
+        if tracing:
+            with self._paused():
+                # The snapshot is taken first, so its own memory is not
+                # attributed to the stage
+                before = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                if self._open_stages:
+                    # Keep the peak of the enclosing stage before resetting it
+                    outer = self._open_stages[-1]
+                    outer["peak"] = max(outer["peak"], peak)
+                tracemalloc.reset_peak()
+                self._open_stages.append({"start": current, "peak": current})
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._paused():
+                record = self._stages.setdefault(name, {"count": 0, "seconds": 0.0})
+                record["count"] += 1
+                record["seconds"] += elapsed
+                if tracing:
+                    self._record_memory(record, before)
+
+    def _record_memory(self, record: Dict[str, Any], before) -> None:
+        """Add the memory use of a finished stage to its record.
+
+        Args:
+            record (Dict[str, Any]): Aggregated record of the stage
+            before (tracemalloc.Snapshot): Snapshot taken when the stage began
+        """
+        import tracemalloc
+
+        current, peak = tracemalloc.get_traced_memory()
+        opened = self._open_stages.pop()
+        peak = max(opened["peak"], peak) - opened["start"]
+        record["allocated-bytes"] = record.get("allocated-bytes", 0) + current - opened["start"]
+        if peak >= record.get("peak-bytes", -1):
+            # Allocation sites are kept for the run with the highest peak
+            record["peak-bytes"] = peak
+            record["top-allocations"] = self._allocation_sites(before)
+        if self._open_stages:
+            outer = self._open_stages[-1]
+            outer["peak"] = max(outer["peak"], opened["start"] + peak)
+
+    def worker_settings(self) -> Dict[str, Any]:
+        """Get the settings of profilers started in worker processes.
+
+        Returns:
+            Dict[str, Any]: Picklable 'mode' and 'interval' of this profiler
+        """
+        return {"mode": self.mode, "interval": self.interval}
+
+    def export(self) -> Dict[str, Any]:
+        """Get the collected profile in a picklable form.
+
+        Returns:
+            Dict[str, Any]: Profile to pass to add_worker of another profiler
+        """
+        return {
+            "mode": self.mode,
+            "stats": self._stats.stats if self._stats is not None else None,
+            "samples": dict(self._samples),
+            "stages": self._stages,
+            "workers": self.workers
+        }
+
+    def add_worker(self, profile: Dict[str, Any]) -> None:
+        """Add the profile of a worker process.
+
+        Args:
+            profile (Dict[str, Any]): Result of export in the worker
+
+        Raises:
+            ValueError: If the profile was collected in another mode
+        """
+        if profile["mode"] != self.mode:
+            raise ValueError(f"Cannot add a {profile['mode']} profile to a {self.mode} profile")
+        if profile["stats"] is not None:
+            self._add_stats(_StatsData(profile["stats"]))
+        self._samples.update(profile["samples"])
+        for name, record in profile["stages"].items():
+            total = self._stages.setdefault(name, {"count": 0, "seconds": 0.0})
+            total["count"] += record["count"]
+            total["seconds"] += record["seconds"]
+        self.workers += 1 + profile["workers"]
+
+    def collapsed(self) -> Counter:
+        """Get the profile as collapsed stacks, the input format of flame graphs.
+
+        Returns:
+            Counter: Weight of every stack of 'outer;...;inner' frames, in
+                microseconds for cprofile and in samples for sampling
+        """
+        if self.mode == "sampling":
+            return Counter(self._samples)
+        stacks: Counter = Counter()
+        if self._stats is None:
+            return stacks
+        stats = self._stats.stats
+        children: Dict[FunctionKey, List[FunctionKey]] = defaultdict(list)
+        for function, (_, _, _, _, callers) in stats.items():
+            for caller in callers:
+                children[caller].append(function)
+
+        def walk(function: FunctionKey, path: List[str], on_path: set,
+                 fraction: float, self_time: float) -> None:
+            """Emit the self time of a function and descend into its callees."""
+            path.append(function_label(function))
+            on_path.add(function)
+            weight = round(self_time * 1e6)
+            if weight >= self.MIN_STACK_MICROSECONDS:
+                stacks[";".join(path)] += weight
+            for callee in children[function]:
+                if callee in on_path:
+                    continue
+                _, _, _, callee_total, callee_callers = stats[callee]
+                _, _, own, total = callee_callers[function][:4]
+                if fraction * total * 1e6 < self.MIN_STACK_MICROSECONDS:
+                    continue
+                share = fraction * total / callee_total if callee_total else 0.0
+                walk(callee, path, on_path, share, fraction * own)
+            on_path.discard(function)
+            path.pop()
+
+        for function, (_, _, own, _, callers) in stats.items():
+            if not callers:
+                walk(function, [], set(), 1.0, own)
+        return stacks
+
+    def hot_functions(self, top: int = 20) -> List[Dict[str, Any]]:
+        """Get the functions with the most time spent in their own code.
+
+        Args:
+            top (int): Number of functions to return
+
+        Returns:
+            List[Dict[str, Any]]: Per function its 'function' label, and
+                'calls', 'self-seconds' and 'total-seconds' for cprofile, or
+                'self-samples' and 'total-samples' for sampling
+        """
+        if self.mode == "cprofile":
+            if self._stats is None:
+                return []
+            entries = sorted(self._stats.stats.items(), key=lambda item: -item[1][2])[:top]
+            return [
+                {"function": function_label(function), "calls": calls,
+                 "self-seconds": round(own, 6), "total-seconds": round(total, 6)}
+                for function, (_, calls, own, total, _) in entries
+            ]
+
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self._samples.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for frame in set(frames):
+                total[frame] += count
+        return [
+            {"function": frame, "self-samples": count, "total-samples": total[frame]}
+            for frame, count in own.most_common(top)
+        ]
+
+    def summary(self, top: int = 20) -> Dict[str, Any]:
+        """Summarize the profile.
+
+        Args:
+            top (int): Number of hot functions to include
+
+        Returns:
+            Dict[str, Any]: 'mode', 'interval' for sampling, number of
+                'workers', 'hot-functions' and 'stages' with time, and with
+                memory tracking net allocations, peak and top allocation sites
+        """
+        summary: Dict[str, Any] = {"mode": self.mode}
+        if self.mode == "sampling":
+            summary["interval"] = self.interval
+        summary["workers"] = self.workers
+        summary["hot-functions"] = self.hot_functions(top)
+        summary["stages"] = {
+            name: {**record, "seconds": round(record["seconds"], 6)}
+            for name, record in self._stages.items()
+        }
+        return summary
+
+    def save(self, collapsed_path: str, summary_path: str, file_handler, top: int = 20) -> None:
+        """Write the collapsed stacks and the summary.
+
+        Args:
+            collapsed_path (str): Path of the collapsed stack file, one
+                'stack weight' line per stack, for flamegraph.pl or speedscope
+            summary_path (str): Path of the JSON summary
+            file_handler: File handler used to save the summary
+            top (int): Number of hot functions in the summary
+
+        Raises:
+            FileError: If a file cannot be written
+        """
+        try:
+            with open(collapsed_path, 'w', encoding='utf-8') as f:
+                for stack, weight in sorted(self.collapsed().items()):
+                    f.write(f"{stack} {weight}\n")
+        except OSError as e:
+            raise FileError(f"Error saving profile: {e}", {"path": collapsed_path})
+        file_handler.save_json(self.summary(top), summary_path)
+
+    def _add_stats(self, source) -> None:
+        """Add cProfile statistics to the aggregated statistics.
+
+        Args:
+            source: cProfile.Profile or _StatsData to add
+        """
+        import pstats
+
+        if self._stats is None:
+            self._stats = pstats.Stats(source)
+        else:
+            self._stats.add(source)
+
+    @contextlib.contextmanager
+    def _paused(self) -> Iterator[None]:
+        """Leave the bookkeeping of the profiler itself out of the profile."""
+        self._pause_depth += 1
+        if self._profile is not None:
+            self._profile.disable()
+        try:
+            yield
+        finally:
+            self._pause_depth -= 1
+            if self._profile is not None and not self._pause_depth:
+                self._profile.enable()
+
+    def _sample(self, thread_id: int) -> None:
+        """Record the stack of a thread until stopped.
+
+        Args:
+            thread_id (int): Identifier of the profiled thread
+        """
+        while not self._stop.wait(self.interval):
+            if self._pause_depth:
+                continue
+            frame = sys._current_frames().get(thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(function_label((code.co_filename, code.co_firstlineno, code.co_name)))
+                frame = frame.f_back
+            if frames:
+                self._samples[";".join(reversed(frames))] += 1
+
+    def _allocation_sites(self, before) -> List[Dict[str, Any]]:
+        """Get the lines that allocated the most memory since a snapshot.
+
+        Args:
+            before (tracemalloc.Snapshot): Snapshot taken when the stage began
+
+        Returns:
+            List[Dict[str, Any]]: 'site' and net 'bytes' of the top lines,
+                largest first
+        """
+        import tracemalloc
+
+        # Allocations of the profiler and of the stage context manager are left out
+        ignored = [tracemalloc.Filter(False, path)
+                   for path in (tracemalloc.__file__, __file__, contextlib.__file__)]
+        after = tracemalloc.take_snapshot().filter_traces(ignored)
+        differences = after.compare_to(before.filter_traces(ignored), 'lineno')
+        sites = []
+        for difference in sorted(differences, key=lambda item: -item.size_diff):
+            if difference.size_diff <= 0 or len(sites) == self.ALLOCATION_SITES:
+                break
+            frame = difference.traceback[0]
+            sites.append({"site": f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                          "bytes": difference.size_diff})
+        return sites
@@ -0,0 +1,222 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from .exceptions import FileError
+
+# Size and version of a file, as returned by FileHandler.fingerprint
+Fingerprint = Tuple[int, Optional[str]]
+
+
+class ProgressJournal:
+    """Append-only journal of batch progress.
+
+    Every processed file is recorded as one JSON line containing the input
+    path, its size and version, the settings it was analyzed with, the
+    output location and the status of the attempt. The content hash is
+    recorded only for files whose storage cannot tell versions. Lines are
+    flushed on every write so a killed process loses nothing, while fsync is
+    only issued every ``fsync_interval`` entries to keep the journal from
+    becoming a bottleneck.
+
+    Attributes:
+        path (Path): Location of the journal file
+        fsync_interval (int): Number of entries written between fsync calls
+    """
+
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    def __init__(self, path: str, fsync_interval: int = 50) -> None:
+        """Initialize ProgressJournal.
+
+        Args:
+            path (str): Location of the journal file
+            fsync_interval (int): Number of entries written between fsync calls
+        """
+        self.path = Path(path)
+        self.fsync_interval = max(1, fsync_interval)
+        self._file = None
+        self._pending = 0
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Load the latest journal entry for every recorded path.
+
+        A truncated last line (e.g. after the process was killed mid-write)
+        is ignored.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Latest entry keyed by input path
+
+        Raises:
+            FileError: If the journal exists but cannot be read
+        """
+        entries: Dict[str, Dict[str, Any]] = {}
+        if not self.path.exists():
+            return entries
+        try:
+            with self.path.open('r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(entry, dict) and "path" in entry:
+                        entries[entry["path"]] = entry
+        except OSError as e:
+            raise FileError(f"Error accessing progress journal: {e}")
+        return entries
+
+    def reset(self) -> None:
+        """Remove the journal so the next run starts from scratch.
+
+        Raises:
+            FileError: If the journal cannot be removed
+        """
+        self.close()
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError as e:
+            raise FileError(f"Error accessing progress journal: {e}")
+
+    def open(self) -> None:
+        """Open the journal for appending.
+
+        Raises:
+            FileError: If the journal cannot be opened
+        """
+        if self._file is not None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open('a', encoding='utf-8')
+        except OSError as e:
+            raise FileError(f"Error accessing progress journal: {e}")
+
+    def close(self) -> None:
+        """Flush, fsync and close the journal if it is open."""
+        if self._file is None:
+            return
+        try:
+            self._sync()
+        finally:
+            self._file.close()
+            self._file = None
+
+    def record_success(self, path: str, fingerprint: Fingerprint,
+                       settings: Dict[str, Any], output_path: str, attempts: int = 1,
+                       content_hash: Optional[str] = None) -> None:
+        """Record a successfully analyzed file.
+
+        Args:
+            path (str): Input file path
+            fingerprint (Tuple[int, Optional[str]]): Size and version of the
+                file, as returned by FileHandler.fingerprint
+            settings (Dict[str, Any]): JSON-compatible settings of the analysis
+            output_path (str): Location of the saved results
+            attempts (int): Number of attempts it took
+            content_hash (Optional[str]): Hash of the analyzed content, if known
+        """
+        size, version = fingerprint
+        self._write({
+            "path": path,
+            "size": size,
+            "version": version,
+            "sha256": content_hash,
+            "settings": settings,
+            "output": output_path,
+            "status": self.STATUS_DONE,
+            "attempts": attempts
+        })
+
+    def record_failure(self, path: str, fingerprint: Optional[Fingerprint],
+                       attempts: int, error: str) -> None:
+        """Record a file whose analysis failed.
+
+        Args:
+            path (str): Input file path
+            fingerprint (Optional[Tuple[int, Optional[str]]]): Size and
+                version of the file, None if it could not be read
+            attempts (int): Number of attempts made
+            error (str): Last error message
+        """
+        size, version = fingerprint if fingerprint is not None else (None, None)
+        self._write({
+            "path": path,
+            "size": size,
+            "version": version,
+            "sha256": None,
+            "settings": None,
+            "output": None,
+            "status": self.STATUS_FAILED,
+            "attempts": attempts,
+            "error": error
+        })
+
+    @classmethod
+    def is_completed(cls, entry: Optional[Dict[str, Any]], fingerprint: Fingerprint,
+                     settings: Dict[str, Any], content_hash: Optional[str] = None) -> bool:
+        """Check whether a journal entry covers the given file and settings.
+
+        An entry is complete only if it succeeded with the same settings
+        for a file of the same size and version, and its output file still
+        exists. Without a version, the content hash must match instead.
+
+        Args:
+            entry (Optional[Dict[str, Any]]): Journal entry for the path
+            fingerprint (Tuple[int, Optional[str]]): Current size and
+                version of the file
+            settings (Dict[str, Any]): JSON-compatible settings of the
+                current analysis
+            content_hash (Optional[str]): Current hash of the file content,
+                needed only if the file has no version
+
+        Returns:
+            bool: True if the file does not need to be analyzed again
+        """
+        size, version = fingerprint
+        if version is not None:
+            same_content = entry is not None and entry.get("version") == version
+        else:
+            same_content = (entry is not None and content_hash is not None
+                            and entry.get("sha256") == content_hash)
+        return bool(
+            same_content
+            and entry.get("status") == cls.STATUS_DONE
+            and entry.get("size") == size
+            and entry.get("settings") == settings
+            and entry.get("output")
+            and os.path.exists(entry["output"])
+        )
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        """Append a single entry and fsync periodically.
+
+        Args:
+            entry (Dict[str, Any]): Entry to append
+
+        Raises:
+            FileError: If writing fails
+        """
+        self.open()
+        try:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+            self._pending += 1
+            if self._pending >= self.fsync_interval:
+                self._sync()
+        except OSError as e:
+            raise FileError(f"Error accessing progress journal: {e}")
+
+    def _sync(self) -> None:
+        """Force buffered entries to disk."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def __enter__(self) -> "ProgressJournal":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,382 @@
+import hashlib
+import json
+import os
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from .exceptions import AnalysisError, ValidationError
+from .file_handler import atomic_write
+from .sketches import DistinctCounter
+
+# Layout version of cached states, part of every key
+CACHE_VERSION = 1
+STATE_SUFFIX = ".json"
+WORDS_SUFFIX = ".words"
+# Content digests of input files by location, size and version
+INDEX_FILENAME = "fingerprints.index"
+
+
+class CachedAnalysis:
+    """Analysis results of a file restored from the result cache.
+
+    Provides the analyzer methods used by OutputFormatter over a cached
+    state that does not depend on N. The word frequencies are cached in
+    frequency order, so the N most frequent words are the first N lines
+    of the word list and any N is served without reading the text.
+
+    Attributes:
+        n (int): Number of most frequent words to return
+        state (Dict[str, Any]): Cached results independent of N
+        words_path (str): Location of the word list in frequency order
+        metrics (Tuple[str, ...]): Names of the custom metrics returned
+    """
+
+    def __init__(self, state: Dict[str, Any], words_path: str, n: int,
+                 metrics: Sequence[str] = ()) -> None:
+        """Initialize CachedAnalysis.
+
+        Args:
+            state (Dict[str, Any]): Cached results independent of N
+            words_path (str): Location of the word list in frequency order
+            n (int): Number of most frequent words to return
+            metrics (Sequence[str]): Names of cached custom metrics to return
+        """
+        self.n = n
+        self.state = state
+        self.words_path = words_path
+        self.metrics = tuple(metrics)
+
+    def get_symbol_counts(self) -> Dict[str, int]:
+        """Get total symbol counts with and without spaces."""
+        return dict(self.state["total_symbols"])
+
+    def get_sentence_count(self) -> int:
+        """Get the number of sentences."""
+        return self.state["sentence-count"]
+
+    def get_word_count(self) -> int:
+        """Get the total number of words."""
+        return self.state["word-count"]
+
+    def get_distinct_word_count(self) -> int:
+        """Get the number of distinct words."""
+        return self.state["distinct-word-count"]
+
+    def get_type_token_ratio(self) -> float:
+        """Get the ratio of distinct words to all words."""
+        return self.state["type-token-ratio"]
+
+    def get_vocabulary_sketch(self) -> DistinctCounter:
+        """Get the distinct-word counter."""
+        return DistinctCounter.from_dict(self.state["vocabulary-sketch"])
+
+    def get_average_word_length(self) -> float:
+        """Get the average word length."""
+        return self.state["average-word-length"]
+
+    def get_most_frequent_words(self) -> Dict[str, int]:
+        """Read the N most frequent words from the start of the cached word list.
+
+        Returns:
+            Dict[str, int]: Dictionary of words and their frequencies
+
+        Raises:
+            ValidationError: If N is larger than available words
+            AnalysisError: If the word list cannot be read
+        """
+        word_total = self.state["word-count"]
+        if self.n > word_total:
+            raise ValidationError(f"N ({self.n}) is larger than available words ({word_total})")
+        try:
+            with open(self.words_path, encoding='utf-8') as f:
+                pairs = (line.rstrip("\n").split("\t") for line in islice(f, self.n))
+                return {word: int(count) for word, count in pairs}
+        except (OSError, ValueError) as e:
+            raise AnalysisError(f"Error reading cached word frequencies: {e}")
+
+    def get_symbol_frequency(self, limit: Optional[int] = None) -> Dict[str, int]:
+        """Get the most frequent symbols from the cached symbol frequencies.
+
+        Args:
+            limit (Optional[int]): Maximum number of symbols to return,
+                None for all symbols
+
+        Returns:
+            Dict[str, int]: Symbols and their frequencies, sorted by
+                frequency (descending) and then by symbol
+
+        Raises:
+            ValidationError: If limit is not a positive integer
+        """
+        if limit is not None and (not isinstance(limit, int) or limit < 1):
+            raise ValidationError(f"Symbol limit must be a positive integer, got {limit!r}")
+        return dict(islice(self.state["symbols-frequency"].items(), limit))
+
+    def get_ngram_statistics(self) -> Dict[str, Any]:
+        """N-grams depend on N and are not cached.
+
+        Raises:
+            AnalysisError: Always
+        """
+        raise AnalysisError("N-gram statistics are not cached")
+
+    def get_metric_results(self) -> Dict[str, Any]:
+        """Get the values of the requested custom metrics."""
+        metrics = self.state["metrics"]
+        return {name: metrics[name] for name in self.metrics}
+
+    def is_partial(self) -> bool:
+        """Cached results always cover the whole file."""
+        return False
+
+    def get_coverage(self) -> float:
+        """Cached results always cover the whole file."""
+        return 1.0
+
+    def get_normalization(self) -> Optional[Dict[str, Any]]:
+        """Get the normalization of the counted word forms."""
+        return self.state["normalization"]
+
+    def get_encoding(self) -> Optional[str]:
+        """Get the detected encoding of the analyzed file."""
+        return self.state["encoding"]
+
+    def close(self) -> None:
+        """Release nothing; the cached state holds no temporary files."""
+
+
+class ResultCache:
+    """Directory of analysis states keyed by file content and options.
+
+    A state holds every result that does not depend on N: counts, the
+    vocabulary sketch, the full symbol frequencies, the computed custom
+    metrics and, in a separate list, all word frequencies in the order
+    of most_common. Analyzing the same content again with another N,
+    symbol limit or subset of the cached metrics is then served from the
+    state instead of reading the file. Least recently used states are
+    evicted beyond ``max_entries``.
+
+    States are keyed by the content digest of a file, which takes a full
+    read to compute. An index maps the location, size and version (the
+    modification time or ETag) of every analyzed file to its digest, so
+    an unchanged file is looked up without reading it. Files read in
+    shards are not hashed; their states are keyed by a digest of the
+    location, size and version instead, and found only at that location.
+
+    Attributes:
+        directory (str): Directory holding the cached states
+        max_entries (int): Maximum number of cached states
+    """
+
+    def __init__(self, directory: str, max_entries: int = 256) -> None:
+        """Initialize ResultCache.
+
+        Args:
+            directory (str): Directory holding the cached states, created
+                on the first store
+            max_entries (int): Maximum number of cached states
+
+        Raises:
+            ValidationError: If max_entries is not a positive integer
+        """
+        if not isinstance(max_entries, int) or max_entries < 1:
+            raise ValidationError(
+                f"Result cache size must be a positive integer, got {max_entries!r}"
+            )
+        self.directory = directory
+        self.max_entries = max_entries
+
+    @staticmethod
+    def key(content_hash: str, language: str,
+            normalization: Optional[Dict[str, Any]] = None) -> str:
+        """Build the cache key of a file analyzed with the given options.
+
+        Args:
+            content_hash (str): SHA-256 hex digest of the file content
+            language (str): Language of the sentence segmentation rules
+            normalization (Optional[Dict[str, Any]]): Description of the word
+                normalizer, None if words are counted as written
+
+        Returns:
+            str: Key naming the cached state
+        """
+        options = json.dumps([CACHE_VERSION, language, normalization], sort_keys=True)
+        return f"{content_hash}-{hashlib.sha256(options.encode('utf-8')).hexdigest()[:16]}"
+
+    @staticmethod
+    def location_digest(location: str, size: int, version: str) -> str:
+        """Get the digest standing in for the content of a file that was not hashed.
+
+        Args:
+            location (str): Path or storage location of the file
+            size (int): Size of the file in bytes
+            version (str): Modification time or ETag of the file
+
+        Returns:
+            str: SHA-256 hex digest of the location, size and version
+        """
+        fingerprint = json.dumps([location, size, version])
+        return hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()
+
+    def lookup(self, location: str, size: int, version: str) -> Optional[str]:
+        """Get the digest recorded for a file if it has not changed since.
+
+        Args:
+            location (str): Path or storage location of the file
+            size (int): Size of the file in bytes
+            version (str): Modification time or ETag of the file
+
+        Returns:
+            Optional[str]: Recorded digest, None if the file is unknown or
+                its size or version differ
+        """
+        entry = self._load_index().get(location)
+        if entry is None or entry["size"] != size or entry["version"] != version:
+            return None
+        return entry["digest"]
+
+    def has_content_size(self, size: int) -> bool:
+        """Check whether the content of any recorded file has the given size.
+
+        Only then can a file missing from the index share a cached state
+        by its content, so it is worth hashing.
+
+        Args:
+            size (int): Size of the file in bytes
+
+        Returns:
+            bool: True if a hashed file of this size is recorded
+        """
+        return any(entry["content"] and entry["size"] == size
+                   for entry in self._load_index().values())
+
+    def record(self, location: str, size: int, version: str, digest: str,
+               content: bool = True) -> None:
+        """Record the digest of a file in the index.
+
+        The most recently recorded ``max_entries`` locations are kept.
+
+        Args:
+            location (str): Path or storage location of the file
+            size (int): Size of the file in bytes
+            version (str): Modification time or ETag of the file
+            digest (str): Content digest, or location digest if not hashed
+            content (bool): Whether digest is the digest of the content
+
+        Raises:
+            OSError: If the index cannot be written
+        """
+        index = self._load_index()
+        index.pop(location, None)
+        index[location] = {"size": size, "version": version, "digest": digest,
+                           "content": content}
+        os.makedirs(self.directory, exist_ok=True)
+        self._write(os.path.join(self.directory, INDEX_FILENAME),
+                    [json.dumps(dict(list(index.items())[-self.max_entries:]),
+                                ensure_ascii=False)])
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Read the index, empty if it is missing or unreadable."""
+        try:
+            with open(os.path.join(self.directory, INDEX_FILENAME), encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return index if isinstance(index, dict) else {}
+
+    def load(self, key: str, n: int, metrics: Sequence[str] = ()) -> Optional[CachedAnalysis]:
+        """Restore a cached analysis.
+
+        Args:
+            key (str): Cache key of the file and options
+            n (int): Number of most frequent words to return
+            metrics (Sequence[str]): Names of the custom metrics requested
+
+        Returns:
+            Optional[CachedAnalysis]: Cached analysis, None if the state is
+                missing, unreadable or lacks a requested metric
+        """
+        state_path, words_path = self._paths(key)
+        try:
+            with open(state_path, encoding='utf-8') as f:
+                state = json.load(f)
+            if not os.path.exists(words_path) or not set(metrics) <= set(state["metrics"]):
+                return None
+            # Mark the state recently used for eviction
+            os.utime(state_path)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return CachedAnalysis(state, words_path, n, metrics)
+
+    def store(self, key: str, analyzer) -> None:
+        """Cache the state of a complete analysis.
+
+        Metrics cached for the same key before are kept, so requesting
+        other metrics later extends the state.
+
+        Args:
+            key (str): Cache key of the file and options
+            analyzer: TextAnalyzer holding the statistics of the whole file
+
+        Raises:
+            ValueError: If the analysis is partial
+            OSError: If the state cannot be written
+        """
+        if analyzer.is_partial():
+            raise ValueError("Partial results cannot be cached")
+        state_path, words_path = self._paths(key)
+        metrics = {}
+        previous = self.load(key, 0)
+        if previous is not None:
+            metrics.update(previous.state["metrics"])
+        metrics.update(analyzer.get_metric_results())
+        state = {
+            "total_symbols": analyzer.get_symbol_counts(),
+            "sentence-count": analyzer.get_sentence_count(),
+            "word-count": analyzer.get_word_count(),
+            "distinct-word-count": analyzer.get_distinct_word_count(),
+            "type-token-ratio": analyzer.get_type_token_ratio(),
+            "vocabulary-sketch": analyzer.get_vocabulary_sketch().to_dict(),
+            "average-word-length": analyzer.get_average_word_length(),
+            "symbols-frequency": analyzer.get_symbol_frequency(),
+            "metrics": metrics,
+            "normalization": analyzer.get_normalization(),
+            "encoding": analyzer.get_encoding(),
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+        # Ordered like most_common, streamed from sorted runs of a spilled table
+        words = analyzer.statistics.words.iter_most_common()
+        self._write(words_path, (f"{word}\t{count}\n" for word, count in words))
+        # The state is written last, so it never refers to a missing word list
+        self._write(state_path, [json.dumps(state, ensure_ascii=False)])
+        self._evict()
+
+    def _paths(self, key: str) -> List[str]:
+        """Get the locations of the state and the word list of a key."""
+        base = os.path.join(self.directory, key)
+        return [base + STATE_SUFFIX, base + WORDS_SUFFIX]
+
+    @staticmethod
+    def _write(path: str, parts: Iterable[str]) -> None:
+        """Write a file atomically with atomic_write.
+
+        Raises:
+            OSError: If the file cannot be written
+        """
+        with atomic_write(path) as f:
+            f.writelines(parts)
+
+    def _evict(self) -> None:
+        """Remove the least recently used states beyond the size limit."""
+        with os.scandir(self.directory) as entries:
+            states = sorted(
+                ((entry.stat().st_mtime, entry.name) for entry in entries
+                 if entry.name.endswith(STATE_SUFFIX)),
+                reverse=True
+            )
+        for _, name in states[self.max_entries:]:
+            for path in self._paths(name[:-len(STATE_SUFFIX)]):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
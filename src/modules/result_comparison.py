@@ -0,0 +1,349 @@
+import heapq
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+from .corpus_vocabulary import CorpusVocabulary
+from .exceptions import FileError
+from .output_layout import OutputLayout
+from .path_manager import PathManager
+
+WORDS_KEY_PATTERN = re.compile(r'^\d+-most-frequent-words$')
+SYMBOLS_KEY = "symbols-frequency"
+SCALAR_KEYS = ("word-count", "sentence-count", "distinct-word-count", "average-word-length")
+
+
+def merge_join(left: Iterable[Tuple[str, int]],
+               right: Iterable[Tuple[str, int]]) -> Iterator[Tuple[str, int, int]]:
+    """Full outer join of two key-sorted frequency sequences.
+
+    Both sequences are walked once in step, so the join takes linear time
+    and constant memory, without building a lookup table of either side.
+
+    Args:
+        left (Iterable[Tuple[str, int]]): (key, count) pairs sorted by key
+        right (Iterable[Tuple[str, int]]): (key, count) pairs sorted by key
+
+    Returns:
+        Iterator[Tuple[str, int, int]]: (key, left count, right count) in
+            key order, with 0 for a key missing on one side
+    """
+    left, right = iter(left), iter(right)
+    left_item = next(left, None)
+    right_item = next(right, None)
+    while left_item is not None and right_item is not None:
+        if left_item[0] < right_item[0]:
+            yield left_item[0], left_item[1], 0
+            left_item = next(left, None)
+        elif right_item[0] < left_item[0]:
+            yield right_item[0], 0, right_item[1]
+            right_item = next(right, None)
+        else:
+            yield left_item[0], left_item[1], right_item[1]
+            left_item = next(left, None)
+            right_item = next(right, None)
+    while left_item is not None:
+        yield left_item[0], left_item[1], 0
+        left_item = next(left, None)
+    while right_item is not None:
+        yield right_item[0], 0, right_item[1]
+        right_item = next(right, None)
+
+
+def compare_frequencies(left: Iterable[Tuple[str, int]], right: Iterable[Tuple[str, int]],
+                        left_total: int, right_total: int, top: int = 10) -> Dict[str, Any]:
+    """Compare two frequency distributions in a single merge pass.
+
+    Args:
+        left (Iterable[Tuple[str, int]]): (key, count) pairs sorted by key
+        right (Iterable[Tuple[str, int]]): (key, count) pairs sorted by key
+        left_total (int): Sum of the left counts
+        right_total (int): Sum of the right counts
+        top (int): Number of top gainers and losers
+
+    Returns:
+        Dict[str, Any]: Dictionary containing:
+            - 'shared', 'only-left', 'only-right': Number of keys
+            - 'cosine': Cosine similarity of the count vectors
+            - 'jensen-shannon': Jensen-Shannon divergence of the
+              distributions, base 2, between 0 and 1
+            - 'gainers', 'losers': Keys with the largest increase and
+              decrease, each with its 'left', 'right' and 'delta' count
+    """
+    shared = only_left = only_right = 0
+    dot = left_norm = right_norm = 0
+    divergence = 0.0
+    gainers: List[Tuple[int, int, str, int, int]] = []
+    losers: List[Tuple[int, int, str, int, int]] = []
+
+    for index, (key, a, b) in enumerate(merge_join(left, right)):
+        if a and b:
+            shared += 1
+        elif a:
+            only_left += 1
+        else:
+            only_right += 1
+        dot += a * b
+        left_norm += a * a
+        right_norm += b * b
+
+        p = a / left_total if left_total else 0.0
+        q = b / right_total if right_total else 0.0
+        m = (p + q) / 2
+        if p:
+            divergence += p * math.log2(p / m)
+        if q:
+            divergence += q * math.log2(q / m)
+
+        # Bounded min-heaps keep the top changes; among equal changes the
+        # later key in key order is evicted first
+        delta = b - a
+        if delta:
+            heap = gainers if delta > 0 else losers
+            entry = (abs(delta), -index, key, a, b)
+            if len(heap) < top:
+                heapq.heappush(heap, entry)
+            elif top:
+                heapq.heappushpop(heap, entry)
+
+    norm = math.sqrt(left_norm) * math.sqrt(right_norm)
+    return {
+        "shared": shared,
+        "only-left": only_left,
+        "only-right": only_right,
+        "cosine": round(dot / norm, 4) if norm else 0.0,
+        "jensen-shannon": round(min(1.0, max(0.0, divergence / 2)), 4),
+        "gainers": _changes(gainers),
+        "losers": _changes(losers)
+    }
+
+
+def _changes(heap: List[Tuple[int, int, str, int, int]]) -> List[Dict[str, Any]]:
+    """Convert a heap of changes into entries sorted by size, then key.
+
+    Args:
+        heap (List[Tuple[int, int, str, int, int]]): Entries of (absolute
+            delta, negated join position, key, left count, right count)
+
+    Returns:
+        List[Dict[str, Any]]: Entries with 'key', 'left', 'right' and 'delta'
+    """
+    return [
+        {"key": key, "left": a, "right": b, "delta": b - a}
+        for _, _, key, a, b in sorted(heap, reverse=True)
+    ]
+
+
+class FrequencyProfile:
+    """Word and symbol frequencies of one result file or a result store.
+
+    Saved results hold only the N most frequent words, so words outside
+    the top N of a file count as absent. Profiles of a result store sum
+    the frequencies of all its files, and merge their vocabulary sketches
+    for the distinct word count.
+
+    Attributes:
+        words (Counter): Frequency of every listed word
+        symbols (Counter): Frequency of every listed symbol
+        vocabulary (CorpusVocabulary): Merged vocabulary sketches
+        file_count (int): Number of added result files
+        skipped (List[str]): Names of store files skipped while loading
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty FrequencyProfile."""
+        self.words: Counter = Counter()
+        self.symbols: Counter = Counter()
+        self.vocabulary = CorpusVocabulary()
+        self.file_count = 0
+        self.skipped: List[str] = []
+        self._totals: Counter = Counter()
+
+    @classmethod
+    def load(cls, file_handler, path: str) -> "FrequencyProfile":
+        """Load a result file, or every result file of a result store.
+
+        A result store is a directory of saved results, such as the output
+        directory, including the sub-directories of a fanned-out layout.
+        Only one result per input file is loaded, as chosen by
+        PathManager.select_results. Its files without word frequencies,
+        such as corpus summaries, and its malformed files are skipped.
+
+        Args:
+            file_handler: File handler used to load JSON results
+            path (str): Path to a result file or a result store directory
+
+        Returns:
+            FrequencyProfile: Profile of the file or of the whole store
+
+        Raises:
+            FileError: If the result file cannot be read or is not valid JSON
+            ValueError: If the result file has no valid word frequencies, or
+                the store has none at all
+        """
+        profile = cls()
+        if not os.path.isdir(path):
+            if not profile.add(file_handler.load_json(path)):
+                raise ValueError(f"No word frequencies in {path}")
+            return profile
+
+        for result in PathManager.select_results(OutputLayout(path).list(".json")):
+            name = os.path.relpath(result, path)
+            try:
+                if not profile.add(file_handler.load_json(result)):
+                    profile.skipped.append(name)
+            except (FileError, ValueError):
+                profile.skipped.append(name)
+        if not profile.file_count:
+            raise ValueError(f"No results with word frequencies in {path}")
+        return profile
+
+    def add(self, results: Dict[str, Any]) -> bool:
+        """Add the saved results of one file.
+
+        Args:
+            results (Dict[str, Any]): Results saved by OutputFormatter
+
+        Returns:
+            bool: False if the results carry no word frequencies
+
+        Raises:
+            ValueError: If the frequencies or the vocabulary sketch are malformed
+        """
+        words = next((value for key, value in results.items()
+                      if WORDS_KEY_PATTERN.match(key)), None)
+        if words is None:
+            return False
+        words = self._counts(words)
+        symbols = self._counts(results.get(SYMBOLS_KEY, {}))
+        self.vocabulary.add(results)
+        self.words.update(words)
+        self.symbols.update(symbols)
+
+        word_count = results.get("word-count")
+        if isinstance(word_count, int):
+            self._totals["word-count"] += word_count
+            average = results.get("average-word-length")
+            if isinstance(average, (int, float)):
+                self._totals["length-sum"] += average * word_count
+                self._totals["length-words"] += word_count
+        sentences = results.get("sentence-count")
+        if isinstance(sentences, int):
+            self._totals["sentence-count"] += sentences
+        self.file_count += 1
+        return True
+
+    def scalars(self) -> Dict[str, float]:
+        """Get the counts and averages available for all added files.
+
+        Returns:
+            Dict[str, float]: Total 'word-count' and 'sentence-count',
+                corpus 'distinct-word-count' and word-weighted
+                'average-word-length', where the results carry them
+        """
+        scalars: Dict[str, float] = {}
+        for key in ("word-count", "sentence-count"):
+            if key in self._totals:
+                scalars[key] = self._totals[key]
+        if self.vocabulary.file_count:
+            scalars["distinct-word-count"] = self.vocabulary.distinct.count()
+        if self._totals["length-words"]:
+            scalars["average-word-length"] = round(
+                self._totals["length-sum"] / self._totals["length-words"], 2
+            )
+        return scalars
+
+    def sorted_items(self, name: str) -> List[Tuple[str, int]]:
+        """Get word or symbol frequencies sorted by key, ready for merge_join.
+
+        Args:
+            name (str): 'words' or 'symbols'
+
+        Returns:
+            List[Tuple[str, int]]: (key, count) pairs in key order
+        """
+        return sorted(getattr(self, name).items())
+
+    @staticmethod
+    def _counts(frequencies: Any) -> Dict[str, int]:
+        """Validate a saved frequency mapping.
+
+        Args:
+            frequencies (Any): Mapping of keys to counts
+
+        Returns:
+            Dict[str, int]: The mapping
+
+        Raises:
+            ValueError: If it is not a mapping of strings to integers
+        """
+        if not isinstance(frequencies, dict) or not all(
+                isinstance(count, int) for count in frequencies.values()):
+            raise ValueError("Frequencies must map keys to integer counts")
+        return frequencies
+
+
+class ResultComparison:
+    """Compares the frequency profiles of two results or result stores.
+
+    Word and symbol frequencies are joined with a sorted merge, so the
+    comparison runs in linear time after sorting, and only the top
+    gainers and losers are kept in memory.
+
+    Attributes:
+        left (FrequencyProfile): Profile compared against
+        right (FrequencyProfile): Profile compared with it
+    """
+
+    def __init__(self, left: FrequencyProfile, right: FrequencyProfile) -> None:
+        """Initialize ResultComparison.
+
+        Args:
+            left (FrequencyProfile): Profile compared against, such as the
+                older version
+            right (FrequencyProfile): Profile compared with it
+        """
+        self.left = left
+        self.right = right
+
+    def compare(self, top: int = 10) -> Dict[str, Any]:
+        """Compute deltas and distribution distances of both profiles.
+
+        Args:
+            top (int): Number of top gainers and losers per distribution
+
+        Returns:
+            Dict[str, Any]: Dictionary containing:
+                - 'files': Number of result files on each side
+                - 'deltas': 'left', 'right' and 'delta' of the word,
+                  sentence and distinct word counts and average word length
+                - 'words': Comparison of the most frequent words
+                - 'symbols': Comparison of the symbol frequencies
+        """
+        deltas = {}
+        left, right = self.left.scalars(), self.right.scalars()
+        for key in SCALAR_KEYS:
+            a, b = left.get(key), right.get(key)
+            if a is not None and b is not None:
+                deltas[key] = {"left": a, "right": b, "delta": round(b - a, 4)}
+        return {
+            "files": {"left": self.left.file_count, "right": self.right.file_count},
+            "deltas": deltas,
+            "words": self._compare("words", top),
+            "symbols": self._compare("symbols", top)
+        }
+
+    def _compare(self, name: str, top: int) -> Dict[str, Any]:
+        """Compare one distribution of both profiles.
+
+        Args:
+            name (str): 'words' or 'symbols'
+            top (int): Number of top gainers and losers
+
+        Returns:
+            Dict[str, Any]: Result of compare_frequencies
+        """
+        left, right = getattr(self.left, name), getattr(self.right, name)
+        return compare_frequencies(self.left.sorted_items(name), self.right.sorted_items(name),
+                                   sum(left.values()), sum(right.values()), top)
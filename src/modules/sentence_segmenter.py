@@ -0,0 +1,406 @@
+import re
+from typing import Dict, Iterable, Optional
+from .exceptions import ValidationError
+
+NON_SPACE_PATTERN = re.compile(r'\S')
+
+# Kinds of terminator runs, in increasing strength
+PERIOD = 1
+ELLIPSIS = 2
+STRONG = 3
+
+# Scanner states between chunks
+SCAN = 0
+RUN = 1
+LOOKAHEAD = 2
+
+
+class SentenceRules:
+    """Rules of a language deciding which terminators end a sentence.
+
+    A run of terminators and closing quotes or brackets ends a sentence
+    only when it is followed by whitespace or the end of the text, so
+    decimals, URLs and inner dots of abbreviations never do. Among the
+    remaining runs:
+
+    - a single period does not end a sentence after a listed
+      abbreviation, a single capital letter if initials are enabled, or a
+      number if ordinals are enabled
+    - an ellipsis, or a '!' or '?' run closed by a quote, does not end a
+      sentence when the next word starts with a lowercase letter
+    - every other run ends the sentence
+
+    Attributes:
+        language (str): Code of the language
+        abbreviations (FrozenSet[str]): Lowercase abbreviations without the
+            final period, such as 'e.g' or 'mr'
+        terminators (str): Characters ending a sentence
+        closers (str): Closing quotes and brackets that belong to the
+            sentence they follow
+        initials (bool): Whether a single capital letter is an initial
+        ordinals (bool): Whether a number followed by a period is an ordinal
+    """
+
+    def __init__(self, language: str, abbreviations: Iterable[str] = (),
+                 terminators: str = '.!?…',
+                 closers: str = '"\')]}»”’', initials: bool = True,
+                 ordinals: bool = False) -> None:
+        """Initialize SentenceRules.
+
+        Args:
+            language (str): Code of the language
+            abbreviations (Iterable[str]): Abbreviations without the final
+                period, matched case-insensitively
+            terminators (str): Characters ending a sentence, including '.'
+            closers (str): Closing quotes and brackets
+            initials (bool): Treat a single capital letter as an initial
+            ordinals (bool): Treat a number followed by a period as an ordinal
+        """
+        self.language = language
+        self.abbreviations = frozenset(word.lower() for word in abbreviations)
+        self.terminators = terminators
+        self.closers = closers
+        self.initials = initials
+        self.ordinals = ordinals
+        self.max_abbreviation = max(map(len, self.abbreviations), default=1)
+        ends, run = re.escape(terminators), re.escape(terminators + closers)
+        # Only runs followed by whitespace or the end of the chunk can end a
+        # sentence. The lookbehind skips positions inside a run, keeping the
+        # scan linear; placed after the first character, it lets the regex
+        # engine search for that character quickly
+        self.run_pattern = re.compile(f"[{ends}](?<![{ends}][{ends}])[{run}]*+(?=\\s|\\Z)")
+        self.continuation_pattern = re.compile(f"[{run}]*")
+        self.token_pattern = re.compile(
+            f"(?:[^\\W_]|\\.){{1,{self.max_abbreviation + 1}}}\\Z"
+        )
+        self.strong = frozenset(terminators) - {'.', '…'}
+
+
+LANGUAGE_RULES: Dict[str, SentenceRules] = {
+    "en": SentenceRules("en", abbreviations=(
+        "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e",
+        "cf", "al", "approx", "fig", "vol", "ch", "pp", "a.m", "p.m", "u.s", "u.k",
+        "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec"
+    )),
+    "uk": SentenceRules("uk", abbreviations=(
+        "вул", "просп", "ім", "див", "напр", "т.д", "т.п", "тис", "млн", "млрд",
+        "грн", "проф", "доц", "акад", "ст", "с", "мал", "табл"
+    )),
+    "de": SentenceRules("de", abbreviations=(
+        "z.b", "d.h", "u.a", "usw", "bzw", "ca", "nr", "dr", "prof", "hr", "fr",
+        "vgl", "evtl", "ggf", "inkl", "str", "s", "bd", "abs"
+    ), closers='"\')]}»«“”‘’', ordinals=True),
+}
+DEFAULT_LANGUAGE = "en"
+
+
+def get_rules(language: str) -> SentenceRules:
+    """Get the sentence rules of a language.
+
+    Args:
+        language (str): Language code, a key of LANGUAGE_RULES
+
+    Returns:
+        SentenceRules: Rules of the language
+
+    Raises:
+        ValidationError: If no rules are defined for the language
+    """
+    try:
+        return LANGUAGE_RULES[language]
+    except KeyError:
+        raise ValidationError(f"Unsupported sentence language: {language}")
+
+
+class SentenceSegmenter:
+    """Streaming sentence counter driven by a state machine.
+
+    Only terminator runs followed by whitespace are visited, found by a
+    regular expression, so the text between them, including decimals and
+    URLs, is skipped in C and never copied. Whether a run ends a sentence
+    may depend on text in the next chunk: the run itself, the word it
+    follows and the next word are carried across chunks as a small state,
+    so results do not depend on chunk boundaries.
+
+    Counts of consecutive parts of a text split at whitespace can be
+    merged. The fragments around the split are tracked so that a
+    sentence spanning both parts, or an ellipsis at the end of the first
+    part that turns out not to end a sentence, is counted once.
+
+    Attributes:
+        rules (SentenceRules): Rules deciding sentence ends
+        sentence_count (int): Number of non-blank sentences
+        has_delimiter (bool): Whether a sentence end was seen
+        head_open (bool): Whether text before the first sentence end is non-blank
+        head_lower (Optional[bool]): Whether the first non-space character
+            is lowercase, None if there is none yet
+        tail_open (bool): Whether text after the last sentence end is non-blank
+        tail_pending (bool): Whether the text ends with an ellipsis or
+            quoted run whose effect depends on the text that follows
+    """
+
+    def __init__(self, rules: Optional[SentenceRules] = None) -> None:
+        """Initialize an empty SentenceSegmenter.
+
+        Args:
+            rules (Optional[SentenceRules]): Rules deciding sentence ends,
+                defaults to the rules of DEFAULT_LANGUAGE
+        """
+        self.rules = rules or LANGUAGE_RULES[DEFAULT_LANGUAGE]
+        self.sentence_count = 0
+        self.has_delimiter = False
+        self.head_open = False
+        self.head_lower: Optional[bool] = None
+        self.tail_open = False
+        self.tail_pending = False
+        self._open = False
+        self._state = SCAN
+        self._token = ''
+        self._run_kind = 0
+        self._run_token = ''
+        self._run_quoted = False
+
+    def consume(self, chunk: str) -> int:
+        """Add the next chunk of text.
+
+        Args:
+            chunk (str): Next consecutive part of the text
+
+        Returns:
+            int: Number of sentences completed within the chunk
+        """
+        before = self.sentence_count
+        length = len(chunk)
+        if self.head_lower is None:
+            first = NON_SPACE_PATTERN.search(chunk)
+            if first is not None:
+                self.head_lower = chunk[first.start()].islower()
+
+        position = 0
+        if self._state == RUN:
+            run = self.rules.continuation_pattern.match(chunk)
+            self._extend_run(run.group())
+            position = run.end()
+            if position < length:
+                self._state = SCAN
+                self._decide(chunk, position)
+        if self._state == LOOKAHEAD:
+            position = self._look_ahead(chunk, position)
+
+        if self._state == SCAN:
+            position = self._scan(chunk, position)
+            if not self._open and self._state == SCAN:
+                self._open = NON_SPACE_PATTERN.search(chunk, position) is not None
+        self._carry_token(chunk)
+        return self.sentence_count - before
+
+    def finish(self) -> int:
+        """Decide the run ending the text and close the last fragment.
+
+        Returns:
+            int: Number of sentences completed at the end of the text
+        """
+        before = self.sentence_count
+        if self._state == RUN:
+            self._state = SCAN
+            self._decide(' ', 0)
+        self.tail_pending = self._state == LOOKAHEAD
+        self._state = SCAN
+        self.tail_open = self._open
+        if not self.has_delimiter:
+            self.head_open = self.tail_open
+        if self.tail_open:
+            self.sentence_count += 1
+        self._open = False
+        return self.sentence_count - before
+
+    def merge(self, other: "SentenceSegmenter") -> int:
+        """Add finished counts of the text directly following this one.
+
+        The following text must start after whitespace.
+
+        Args:
+            other (SentenceSegmenter): Counts of the following text
+
+        Returns:
+            int: -1 if a sentence counted on both sides was retracted, else 0
+        """
+        ends = self.tail_pending and other.head_lower is False
+        retracted = -1 if self.tail_open and other.head_open and not ends else 0
+        self.sentence_count += other.sentence_count + retracted
+
+        if ends:
+            # The pending run ends the sentence before the following text
+            self.has_delimiter = True
+            self.tail_open = other.tail_open
+        else:
+            if not self.has_delimiter:
+                self.head_open = self.head_open or other.head_open
+            self.tail_open = other.tail_open if other.has_delimiter else (
+                self.tail_open or other.tail_open
+            )
+        self.has_delimiter = self.has_delimiter or other.has_delimiter
+        if other.head_lower is not None:
+            self.tail_pending = other.tail_pending
+        if self.head_lower is None:
+            self.head_lower = other.head_lower
+        return retracted
+
+    def _scan(self, chunk: str, position: int) -> int:
+        """Visit the terminator runs of a chunk.
+
+        Args:
+            chunk (str): Current chunk
+            position (int): Offset where scanning starts
+
+        Returns:
+            int: Offset after the last visited run
+        """
+        length = len(chunk)
+        rules = self.rules
+        limit = rules.max_abbreviation + 1
+        find_token = rules.token_pattern.search
+        find_content = NON_SPACE_PATTERN.search
+        for run in rules.run_pattern.finditer(chunk, position):
+            start = run.start()
+            if not self._open and start > position:
+                self._open = (not chunk[start - 1].isspace()
+                              or find_content(chunk, position, start) is not None)
+            position = run.end()
+            text = run.group()
+            if position < length and self.has_delimiter and (
+                    text == '!' or text == '?' or (text == '.' and start > limit)):
+                # Fast path for single terminators inside the chunk
+                if text == '.':
+                    token = find_token(chunk, start - limit, start)
+                    if token is not None:
+                        token = token.group()
+                        if self._is_abbreviation(token):
+                            continue
+                if self._open:
+                    self.sentence_count += 1
+                    self._open = False
+                continue
+            self._run_kind = 0
+            self._run_token = self._token_before(chunk, start)
+            self._extend_run(text)
+            if position == length:
+                self._state = RUN
+                break
+            self._decide(chunk, position)
+            if self._state == LOOKAHEAD:
+                position = self._look_ahead(chunk, position)
+                if self._state == LOOKAHEAD:
+                    break
+        return position
+
+    def _decide(self, chunk: str, position: int) -> None:
+        """Decide whether the current run ends a sentence.
+
+        Args:
+            chunk (str): Chunk holding the character after the run
+            position (int): Offset of the character after the run
+        """
+        if not chunk[position].isspace():
+            # Decimal point, URL or inner dot of an abbreviation
+            self._open = True
+            return
+        kind = self._run_kind
+        if kind == ELLIPSIS or (kind == STRONG and self._run_quoted):
+            self._state = LOOKAHEAD
+        elif kind == STRONG or not self._is_abbreviation(self._run_token):
+            self._end_sentence()
+
+    def _look_ahead(self, chunk: str, position: int) -> int:
+        """Decide a pending run by the first non-space character.
+
+        Args:
+            chunk (str): Current chunk
+            position (int): Offset where the search starts
+
+        Returns:
+            int: Offset of the deciding character, or the chunk length if
+                the run is still pending
+        """
+        following = NON_SPACE_PATTERN.search(chunk, position)
+        if following is None:
+            return len(chunk)
+        self._state = SCAN
+        if not chunk[following.start()].islower():
+            self._end_sentence()
+        return following.start()
+
+    def _end_sentence(self) -> None:
+        """Count the current fragment if non-blank and start a new one."""
+        if not self.has_delimiter:
+            self.has_delimiter = True
+            self.head_open = self._open
+        if self._open:
+            self.sentence_count += 1
+        self._open = False
+
+    def _extend_run(self, text: str) -> None:
+        """Add terminators and closers to the current run.
+
+        Args:
+            text (str): Next characters of the run
+        """
+        if not text:
+            return
+        kind = self._run_kind
+        if kind < STRONG:
+            if any(char in self.rules.strong for char in text):
+                kind = STRONG
+            elif '…' in text or (text.count('.') + (kind == PERIOD)) > 1:
+                kind = ELLIPSIS
+            elif not kind:
+                kind = PERIOD
+        self._run_kind = kind
+        self._run_quoted = text[-1] in self.rules.closers
+
+    def _is_abbreviation(self, token: str) -> bool:
+        """Check whether a period after a token is part of the token.
+
+        Args:
+            token (str): Word characters and dots preceding the period
+
+        Returns:
+            bool: True if the period does not end a sentence
+        """
+        rules = self.rules
+        if token.lower() in rules.abbreviations:
+            return True
+        if rules.initials and len(token) == 1 and token.isupper():
+            return True
+        return rules.ordinals and token.isdigit()
+
+    def _token_before(self, chunk: str, end: int) -> str:
+        """Get the word characters and dots preceding a position.
+
+        At most one character more than the longest abbreviation is
+        returned, which is enough to tell that a token is not one.
+
+        Args:
+            chunk (str): Current chunk
+            end (int): Offset after the token
+
+        Returns:
+            str: Token, continued from the previous chunk if it starts there
+        """
+        limit = self.rules.max_abbreviation + 1
+        match = self.rules.token_pattern.search(chunk, max(0, end - limit), end)
+        if match is None:
+            token, start = '', end
+        else:
+            token, start = match.group(), match.start()
+        if not start and len(token) < limit:
+            token = (self._token + token)[-limit:]
+        return token
+
+    def _carry_token(self, chunk: str) -> None:
+        """Keep the token at the end of a chunk for the next chunk.
+
+        Args:
+            chunk (str): Current chunk
+        """
+        self._token = self._token_before(chunk, len(chunk)) if chunk else self._token
@@ -0,0 +1,246 @@
+import heapq
+import pickle
+import time
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from .word_table import WordTable
+
+# Separator of words in the vocabulary blob; words never contain line breaks
+WORD_SEPARATOR = '\n'
+COUNT_TYPECODE = 'Q'
+
+
+class SharedWordTable:
+    """Read-only word frequency table in a shared memory segment.
+
+    A worker process moves its word table into a segment holding the
+    count array followed by the vocabulary blob, with words in id order
+    separated by line breaks, so word ids are implicit offsets into both.
+    Pickling the table then only transfers the segment name and sizes,
+    and the receiving process merges counts straight from the buffer
+    instead of unpickling a dictionary of every word.
+
+    The receiving process owns the segment and must close the table,
+    which unlinks it. The creating process hands the segment over by
+    unregistering it from its resource tracker, which would otherwise
+    report it as leaked, and try to remove it again, when the worker exits.
+
+    Attributes:
+        name (str): Name of the shared memory segment
+        total (int): Total number of counted words
+        length_sum (int): Sum of lengths of all counted words
+    """
+
+    def __init__(self, name: str, words: int, blob_size: int,
+                 total: int, length_sum: int) -> None:
+        """Initialize a view of an existing segment.
+
+        Args:
+            name (str): Name of the shared memory segment
+            words (int): Number of distinct words
+            blob_size (int): Size of the vocabulary blob in bytes
+            total (int): Total number of counted words
+            length_sum (int): Sum of lengths of all counted words
+        """
+        self.name = name
+        self.total = total
+        self.length_sum = length_sum
+        self._words = words
+        self._blob_size = blob_size
+        self._segment = None
+
+    @classmethod
+    def create(cls, table: WordTable) -> "SharedWordTable":
+        """Copy a word table into a new shared memory segment.
+
+        Args:
+            table (WordTable): Table to copy
+
+        Returns:
+            SharedWordTable: Table backed by the new segment
+
+        Raises:
+            OSError: If the segment cannot be created
+        """
+        # Imported here: shared memory is only needed for parallel analysis
+        from multiprocessing import resource_tracker, shared_memory
+
+        blob = WORD_SEPARATOR.join(table.vocabulary).encode('utf-8')
+        counts = table.counts
+        count_size = len(counts) * counts.itemsize
+        segment = shared_memory.SharedMemory(create=True, size=max(1, count_size + len(blob)))
+        try:
+            segment.buf[:count_size] = memoryview(counts).cast('B')
+            segment.buf[count_size:count_size + len(blob)] = blob
+        except BaseException:
+            segment.close()
+            segment.unlink()
+            raise
+        segment.close()
+        # The receiving process unlinks the segment. The tracker knows it by
+        # its POSIX name, which is the public name with a leading slash.
+        resource_tracker.unregister("/" + segment.name, "shared_memory")
+        return cls(segment.name, len(counts), len(blob), table.total, table.length_sum)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Get the picklable state, without the mapped segment."""
+        state = self.__dict__.copy()
+        state['_segment'] = None
+        return state
+
+    def __len__(self) -> int:
+        """Get the number of distinct words."""
+        return self._words
+
+    def pairs(self) -> Iterator[Tuple[str, int]]:
+        """Iterate over words and counts in first-occurrence order.
+
+        Returns:
+            Iterator[Tuple[str, int]]: Word and its count, read from the segment
+        """
+        if not self._words:
+            return iter(())
+        words, counts = self._read()
+        return zip(words, counts)
+
+    def items(self) -> Iterator[Tuple[str, int, Tuple[int, int]]]:
+        """Iterate over counts in word order.
+
+        Returns:
+            Iterator[Tuple[str, int, Tuple[int, int]]]: Word, its count and
+                its first-occurrence key
+        """
+        for index, (word, count) in sorted(enumerate(self.pairs()), key=lambda item: item[1][0]):
+            yield word, count, (0, index)
+
+    def most_common(self, n: int) -> List[Tuple[str, int]]:
+        """Get the N most common words.
+
+        Ties are broken by first occurrence, as in WordTable.most_common.
+
+        Args:
+            n (int): Number of words to return
+
+        Returns:
+            List[Tuple[str, int]]: Words and their counts
+        """
+        if not self._words:
+            return []
+        words, counts = self._read()
+        top = heapq.nlargest(n, range(len(counts)), key=counts.__getitem__)
+        return [(words[index], counts[index]) for index in top]
+
+    def close(self) -> None:
+        """Unmap and remove the segment."""
+        if self.name is None:
+            return
+        # Imported here: shared memory is only needed for parallel analysis
+        from multiprocessing import shared_memory
+
+        try:
+            segment = self._segment or shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            segment = None
+        self._segment = None
+        self.name = None
+        if segment is not None:
+            segment.close()
+            segment.unlink()
+
+    def _read(self) -> Tuple[List[str], array]:
+        """Map the segment and view its words and counts.
+
+        Returns:
+            Tuple[List[str], array]: Words in id order and their counts
+        """
+        # Imported here: shared memory is only needed for parallel analysis
+        from multiprocessing import shared_memory
+
+        if self._segment is None:
+            self._segment = shared_memory.SharedMemory(name=self.name)
+        count_size = self._words * array(COUNT_TYPECODE).itemsize
+        buffer = self._segment.buf
+        words = bytes(buffer[count_size:count_size + self._blob_size]).decode('utf-8')
+        counts = array(COUNT_TYPECODE)
+        counts.frombytes(buffer[:count_size])
+        return words.split(WORD_SEPARATOR), counts
+
+
+def share_table(table: WordTable, min_words: int):
+    """Prepare a word table for transfer to another process.
+
+    Tables below the crossover size are pickled as they are, since
+    creating a segment costs more than pickling a few words.
+
+    Args:
+        table (WordTable): Table to transfer
+        min_words (int): Smallest number of distinct words sent through
+            shared memory, 0 to never use shared memory
+
+    Returns:
+        WordTable or SharedWordTable: The table itself, or its copy in
+            shared memory if it is large enough and shared memory is available
+    """
+    if not min_words or len(table) < min_words:
+        return table
+    try:
+        return SharedWordTable.create(table)
+    except (ImportError, OSError):
+        return table
+
+
+def benchmark_transport(sizes: Sequence[int], repeat: int = 3,
+                        word_length: int = 8) -> List[Dict[str, float]]:
+    """Time transferring word tables by pickling and through shared memory.
+
+    Each transfer covers the sender packing the table, pickling and
+    unpickling the result, and the receiver merging it into a table, the
+    work a worker result goes through in the process pool apart from the
+    pipe itself.
+
+    Args:
+        sizes (Sequence[int]): Numbers of distinct words to measure
+        repeat (int): Timings per size, the best one is reported
+        word_length (int): Length of the generated words
+
+    Returns:
+        List[Dict[str, float]]: Per size, the 'words' and the best
+            'pickle' and 'shared' time in seconds
+    """
+    rows = []
+    for size in sizes:
+        table = WordTable()
+        table.update(f"{index:0{word_length}x}" for index in range(size))
+
+        def transfer(min_words: int) -> float:
+            """Best time of a full transfer with the given crossover."""
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                received = pickle.loads(pickle.dumps(share_table(table, min_words)))
+                WordTable().merge(received)
+                received.close()
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        rows.append({"words": size, "pickle": transfer(0), "shared": transfer(1)})
+    return rows
+
+
+def find_crossover(rows: Sequence[Dict[str, float]]) -> Optional[int]:
+    """Find the smallest measured size from which shared memory stays faster.
+
+    Args:
+        rows (Sequence[Dict[str, float]]): Result of benchmark_transport
+
+    Returns:
+        Optional[int]: Number of distinct words, None if pickling was
+            faster for the largest size
+    """
+    crossover = None
+    for row in sorted(rows, key=lambda row: row["words"]):
+        if row["shared"] < row["pickle"]:
+            crossover = row["words"] if crossover is None else crossover
+        else:
+            crossover = None
+    return crossover
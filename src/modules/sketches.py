@@ -0,0 +1,312 @@
+import base64
+import math
+from array import array
+from hashlib import blake2b
+from typing import Any, Dict, List, Optional, Set
+
+
+def hash64(key: str) -> int:
+    """Hash a string into a stable 64-bit integer.
+
+    Unlike the built-in hash, the value does not depend on the process, so
+    it can be persisted and compared across runs.
+
+    Args:
+        key (str): String to hash
+
+    Returns:
+        int: Unsigned 64-bit hash
+    """
+    return int.from_bytes(blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class CountMinSketch:
+    """Fixed-size frequency sketch answering count upper bounds.
+
+    Every key is hashed into one cell per row and the cells are
+    incremented. The estimate of a key is the smallest of its cells, which
+    never underestimates the true count. Sketches of equal shape can be
+    merged by adding their cells, so partial sketches built by separate
+    workers combine into the sketch of the whole input.
+
+    Attributes:
+        width (int): Number of cells per row
+        depth (int): Number of rows
+        cells (array): Row-major cell counts
+    """
+
+    def __init__(self, width: int, depth: int = 4) -> None:
+        """Initialize an empty CountMinSketch.
+
+        Args:
+            width (int): Number of cells per row
+            depth (int): Number of rows
+        """
+        self.width = width
+        self.depth = depth
+        self.cells = array('Q', bytes(8 * width * depth))
+
+    def add(self, key: str, count: int = 1) -> None:
+        """Add occurrences of a key.
+
+        Args:
+            key (str): Key to count
+            count (int): Number of occurrences
+        """
+        for index in self._indexes(key):
+            self.cells[index] += count
+
+    def estimate(self, key: str) -> int:
+        """Get an upper bound of the count of a key.
+
+        Args:
+            key (str): Key to look up
+
+        Returns:
+            int: Estimated count, never lower than the true count
+        """
+        return min(self.cells[index] for index in self._indexes(key))
+
+    def merge(self, other: "CountMinSketch") -> None:
+        """Add the counts of a sketch of the same shape.
+
+        Args:
+            other (CountMinSketch): Sketch to merge
+
+        Raises:
+            ValueError: If the sketches have different shapes
+        """
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Cannot merge sketches of different shapes")
+        cells = self.cells
+        for index, count in enumerate(other.cells):
+            if count:
+                cells[index] += count
+
+    def _indexes(self, key: str) -> List[int]:
+        """Get the cell of a key in every row.
+
+        Args:
+            key (str): Key to hash
+
+        Returns:
+            List[int]: Cell index in each row
+        """
+        digest = blake2b(key.encode('utf-8'), digest_size=4 * self.depth).digest()
+        return [
+            row * self.width + int.from_bytes(digest[4 * row:4 * row + 4], 'little') % self.width
+            for row in range(self.depth)
+        ]
+
+
+class HyperLogLog:
+    """Mergeable sketch estimating the number of distinct keys.
+
+    Each 64-bit hash selects a register by its leading ``precision`` bits
+    and records the position of the first set bit of the rest. The
+    relative standard error is about ``1.04 / sqrt(2 ** precision)``.
+
+    Attributes:
+        precision (int): Number of hash bits selecting a register
+        registers (bytearray): Highest rank seen per register
+    """
+
+    MIN_PRECISION = 4
+    MAX_PRECISION = 16
+
+    def __init__(self, precision: int = 12) -> None:
+        """Initialize an empty HyperLogLog.
+
+        Args:
+            precision (int): Number of hash bits selecting a register
+
+        Raises:
+            ValueError: If precision is out of range
+        """
+        if not self.MIN_PRECISION <= precision <= self.MAX_PRECISION:
+            raise ValueError(
+                f"Precision must be between {self.MIN_PRECISION} and {self.MAX_PRECISION}"
+            )
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add_hash(self, value: int) -> None:
+        """Add a key given by its 64-bit hash.
+
+        Args:
+            value (int): Unsigned 64-bit hash of the key
+        """
+        width = 64 - self.precision
+        index = value >> width
+        rank = width - (value & ((1 << width) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self) -> float:
+        """Estimate the number of distinct keys added.
+
+        Small cardinalities use linear counting of empty registers, which
+        is more accurate in that range.
+
+        Returns:
+            float: Estimated cardinality
+        """
+        size = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(size, 0.7213 / (1 + 1.079 / size))
+        estimate = alpha * size * size / sum(2.0 ** -rank for rank in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * math.log(size / zeros)
+        return estimate
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Add the keys of a sketch with the same precision.
+
+        Args:
+            other (HyperLogLog): Sketch to merge
+
+        Raises:
+            ValueError: If the sketches have different precisions
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precisions")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+
+class DistinctCounter:
+    """Counts distinct keys exactly up to a limit, then approximately.
+
+    Hashes of the keys are kept in a set until there are more than
+    ``exact_limit`` of them; the set is then folded into a HyperLogLog.
+    Counters can be merged and serialized, so counts of separate files can
+    be combined later without the original text.
+
+    Attributes:
+        exact_limit (int): Maximum number of hashes kept exactly
+        precision (int): Precision of the HyperLogLog used above the limit
+        hashes (Optional[Set[int]]): Exact hashes, None after switching
+        sketch (Optional[HyperLogLog]): Sketch, None while counting exactly
+    """
+
+    EXACT_LIMIT = 1024
+    PRECISION = 12
+
+    def __init__(self, exact_limit: int = EXACT_LIMIT, precision: int = PRECISION) -> None:
+        """Initialize an empty DistinctCounter.
+
+        Args:
+            exact_limit (int): Maximum number of hashes kept exactly
+            precision (int): Precision of the HyperLogLog used above the limit
+        """
+        self.exact_limit = exact_limit
+        self.precision = precision
+        self.hashes: Optional[Set[int]] = set()
+        self.sketch: Optional[HyperLogLog] = None
+
+    @property
+    def exact(self) -> bool:
+        """Whether the count is exact."""
+        return self.sketch is None
+
+    def add(self, key: str) -> None:
+        """Add a key.
+
+        Args:
+            key (str): Key to count
+        """
+        self.add_hash(hash64(key))
+
+    def add_hash(self, value: int) -> None:
+        """Add a key given by its 64-bit hash.
+
+        Args:
+            value (int): Unsigned 64-bit hash of the key
+        """
+        if self.sketch is not None:
+            self.sketch.add_hash(value)
+            return
+        self.hashes.add(value)
+        if len(self.hashes) > self.exact_limit:
+            self._switch()
+
+    def count(self) -> int:
+        """Get the number of distinct keys.
+
+        Returns:
+            int: Exact count, or the rounded estimate after switching
+        """
+        if self.sketch is None:
+            return len(self.hashes)
+        return round(self.sketch.estimate())
+
+    def merge(self, other: "DistinctCounter") -> None:
+        """Add the keys of another counter.
+
+        Args:
+            other (DistinctCounter): Counter to merge
+
+        Raises:
+            ValueError: If both counters use sketches of different precisions
+        """
+        if other.sketch is None:
+            for value in other.hashes:
+                self.add_hash(value)
+            return
+        if self.sketch is None:
+            self.precision = other.sketch.precision
+            self._switch()
+        self.sketch.merge(other.sketch)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the counter for JSON output.
+
+        Returns:
+            Dict[str, Any]: Exact hashes as hex strings, or the precision
+                and base64-encoded registers of the sketch
+        """
+        if self.sketch is None:
+            return {"exact": True, "hashes": [f"{value:016x}" for value in sorted(self.hashes)]}
+        return {
+            "exact": False,
+            "precision": self.sketch.precision,
+            "registers": base64.b64encode(bytes(self.sketch.registers)).decode('ascii')
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], exact_limit: int = EXACT_LIMIT) -> "DistinctCounter":
+        """Restore a counter serialized with to_dict.
+
+        Args:
+            data (Dict[str, Any]): Serialized counter
+            exact_limit (int): Maximum number of hashes kept exactly
+
+        Returns:
+            DistinctCounter: Restored counter
+
+        Raises:
+            ValueError: If the data is malformed
+        """
+        try:
+            if data["exact"]:
+                counter = cls(exact_limit)
+                for value in data["hashes"]:
+                    counter.add_hash(int(value, 16))
+                return counter
+            sketch = HyperLogLog(int(data["precision"]))
+            registers = base64.b64decode(data["registers"], validate=True)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Malformed distinct counter: {e}")
+        if len(registers) != len(sketch.registers):
+            raise ValueError("Malformed distinct counter: wrong number of registers")
+        sketch.registers = bytearray(registers)
+        counter = cls(exact_limit, sketch.precision)
+        counter.hashes = None
+        counter.sketch = sketch
+        return counter
+
+    def _switch(self) -> None:
+        """Fold the exact hashes into a HyperLogLog."""
+        self.sketch = HyperLogLog(self.precision)
+        for value in self.hashes:
+            self.sketch.add_hash(value)
+        self.hashes = None
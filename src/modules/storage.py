@@ -0,0 +1,665 @@
+import errno
+import hashlib
+import hmac
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import quote, urlsplit
+from .exceptions import ValidationError
+from .file_handler import atomic_write
+
+# SHA-256 of an empty payload, sent with requests without a body
+EMPTY_SHA256 = hashlib.sha256(b'').hexdigest()
+S3_SCHEME = "s3://"
+
+
+class StorageBackend(ABC):
+    """Storage of input texts and written results, addressed by object name.
+
+    A backend lists the objects under its root, reads byte ranges of them
+    and writes whole objects. Names are relative to the root and contain
+    no separators; ``uri`` turns a name into the location shown to users
+    and recorded in journals, and ``name_of`` turns it back.
+
+    Backends are handed to worker processes by pickling, so they must
+    pickle by their settings and open their resources lazily.
+    """
+
+    @abstractmethod
+    def uri(self, name: str = "") -> str:
+        """Get the location of an object, or of the root for an empty name.
+
+        Args:
+            name (str): Name of the object
+
+        Returns:
+            str: Location of the object
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def name_of(self, uri: str) -> str:
+        """Get the name of an object from its location.
+
+        Args:
+            uri (str): Location returned by uri
+
+        Returns:
+            str: Name of the object
+
+        Raises:
+            ValueError: If the location is not under the root
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def list(self) -> List[Tuple[str, int]]:
+        """List the objects directly under the root.
+
+        Returns:
+            List[Tuple[str, int]]: Names and sizes in bytes, sorted by name
+
+        Raises:
+            OSError: If the root cannot be listed
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def size(self, name: str) -> int:
+        """Get the size of an object.
+
+        Args:
+            name (str): Name of the object
+
+        Returns:
+            int: Size in bytes
+
+        Raises:
+            OSError: If the object does not exist or cannot be accessed
+        """
+        raise NotImplementedError
+
+    def stat(self, name: str) -> Tuple[int, Optional[str]]:
+        """Get the size of an object and a version that changes with its content.
+
+        Args:
+            name (str): Name of the object
+
+        Returns:
+            Tuple[int, Optional[str]]: Size in bytes and version, None if
+                the backend cannot tell versions
+
+        Raises:
+            OSError: If the object does not exist or cannot be accessed
+        """
+        return self.size(name), None
+
+    @abstractmethod
+    def read_range(self, name: str, start: int, end: int) -> bytes:
+        """Read a byte range of an object.
+
+        Args:
+            name (str): Name of the object
+            start (int): Offset of the first byte
+            end (int): Offset after the last byte
+
+        Returns:
+            bytes: Bytes of the range, shorter if the object ends before it
+
+        Raises:
+            OSError: If the object cannot be read
+        """
+        raise NotImplementedError
+
+    def read_ranges(self, name: str, ranges: Sequence[Tuple[int, int]]) -> List[bytes]:
+        """Read several byte ranges of an object.
+
+        Args:
+            name (str): Name of the object
+            ranges (Sequence[Tuple[int, int]]): (start, end) offsets
+
+        Returns:
+            List[bytes]: Bytes of every range, in the order of ranges
+
+        Raises:
+            OSError: If the object cannot be read
+        """
+        return [self.read_range(name, start, end) for start, end in ranges]
+
+    @abstractmethod
+    def iter_blocks(self, name: str, block_size: int, start: int = 0,
+                    end: Optional[int] = None) -> Iterator[bytes]:
+        """Stream an object or a byte range of it in blocks.
+
+        Args:
+            name (str): Name of the object
+            block_size (int): Maximum number of bytes per block
+            start (int): Offset of the first byte
+            end (Optional[int]): Offset after the last byte, None for the end
+
+        Returns:
+            Iterator[bytes]: Consecutive blocks
+
+        Raises:
+            OSError: If the object cannot be read
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def write(self, name: str, data: bytes) -> None:
+        """Write a whole object, replacing an existing one.
+
+        Args:
+            name (str): Name of the object
+            data (bytes): Content of the object
+
+        Raises:
+            OSError: If the object cannot be written
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release connections and threads held by the backend."""
+
+
+class LocalStorage(StorageBackend):
+    """Storage backend over a directory of the local filesystem.
+
+    Attributes:
+        root (str): Absolute path to the directory
+    """
+
+    def __init__(self, root: str) -> None:
+        """Initialize LocalStorage.
+
+        Args:
+            root (str): Path to the directory
+        """
+        self.root = os.path.abspath(root)
+
+    def uri(self, name: str = "") -> str:
+        """Get the absolute path of a file, or of the directory for an empty name."""
+        return os.path.join(self.root, name) if name else self.root
+
+    def name_of(self, uri: str) -> str:
+        """Get the name of a file from its path under the directory."""
+        path = os.path.abspath(uri)
+        if os.path.dirname(path) != self.root:
+            raise ValueError(f"{uri} is not a file in {self.root}")
+        return os.path.basename(path)
+
+    def list(self) -> List[Tuple[str, int]]:
+        """List the files in the directory, without subdirectories."""
+        with os.scandir(self.root) as entries:
+            return sorted((entry.name, entry.stat().st_size)
+                          for entry in entries if entry.is_file())
+
+    def size(self, name: str) -> int:
+        """Get the size of a file in bytes."""
+        return os.path.getsize(self.uri(name))
+
+    def stat(self, name: str) -> Tuple[int, Optional[str]]:
+        """Get the size of a file and its modification time in nanoseconds."""
+        status = os.stat(self.uri(name))
+        return status.st_size, str(status.st_mtime_ns)
+
+    def read_range(self, name: str, start: int, end: int) -> bytes:
+        """Read a byte range of a file."""
+        with open(self.uri(name), 'rb') as f:
+            f.seek(start)
+            return f.read(max(0, end - start))
+
+    def iter_blocks(self, name: str, block_size: int, start: int = 0,
+                    end: Optional[int] = None) -> Iterator[bytes]:
+        """Stream a file or a byte range of it in blocks."""
+        with open(self.uri(name), 'rb') as f:
+            f.seek(start)
+            remaining = None if end is None else end - start
+            while remaining is None or remaining > 0:
+                block = f.read(block_size if remaining is None else min(block_size, remaining))
+                if not block:
+                    break
+                if remaining is not None:
+                    remaining -= len(block)
+                yield block
+
+    def write(self, name: str, data: bytes) -> None:
+        """Write a file atomically with atomic_write."""
+        os.makedirs(self.root, exist_ok=True)
+        with atomic_write(self.uri(name), 'wb') as f:
+            f.write(data)
+
+
+def sign_v4(method: str, host: str, path: str, query: Dict[str, str],
+            headers: Dict[str, str], payload_hash: str, access_key: str,
+            secret_key: str, region: str, amz_date: str, service: str = "s3") -> str:
+    """Compute the AWS Signature Version 4 authorization of a request.
+
+    Every given header is signed, together with the host.
+
+    Args:
+        method (str): HTTP method
+        host (str): Host header, with the port if not the default one
+        path (str): Unencoded request path, such as '/bucket/key'
+        query (Dict[str, str]): Unencoded query parameters
+        headers (Dict[str, str]): Headers to sign, including x-amz-date and
+            x-amz-content-sha256
+        payload_hash (str): Hex SHA-256 of the body
+        access_key (str): Access key id
+        secret_key (str): Secret access key
+        region (str): Region of the service
+        amz_date (str): Request time as YYYYMMDDTHHMMSSZ
+        service (str): Signed service name
+
+    Returns:
+        str: Value of the Authorization header
+    """
+    canonical_query = "&".join(f"{quote(key, safe='~')}={quote(value, safe='~')}"
+                               for key, value in sorted(query.items()))
+    signed = {key.lower(): " ".join(str(value).split()) for key, value in headers.items()}
+    signed["host"] = host
+    names = sorted(signed)
+    canonical_request = "\n".join((
+        method, quote(path, safe="/~"), canonical_query,
+        "".join(f"{name}:{signed[name]}\n" for name in names),
+        ";".join(names), payload_hash
+    ))
+    scope = f"{amz_date[:8]}/{region}/{service}/aws4_request"
+    string_to_sign = "\n".join((
+        "AWS4-HMAC-SHA256", amz_date, scope,
+        hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()
+    ))
+    key = ("AWS4" + secret_key).encode('utf-8')
+    for part in (amz_date[:8], region, service, "aws4_request"):
+        key = hmac.new(key, part.encode('utf-8'), hashlib.sha256).digest()
+    signature = hmac.new(key, string_to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
+    return (f"AWS4-HMAC-SHA256 Credential={access_key}/{scope},"
+            f"SignedHeaders={';'.join(names)},Signature={signature}")
+
+
+class ConnectionPool:
+    """Bounded pool of persistent HTTP connections to one endpoint.
+
+    At most ``size`` connections are in use at once; further requests
+    wait for one to be returned. Returned connections are kept open and
+    reused, so concurrent ranged reads do not pay for a new TCP (and TLS)
+    handshake each.
+
+    Attributes:
+        scheme (str): 'http' or 'https'
+        host (str): Host name of the endpoint
+        port (Optional[int]): Port of the endpoint, None for the default
+        size (int): Maximum number of connections
+        timeout (float): Socket timeout in seconds
+        created (int): Number of connections opened so far
+    """
+
+    def __init__(self, scheme: str, host: str, port: Optional[int], size: int,
+                 timeout: float) -> None:
+        """Initialize ConnectionPool.
+
+        Args:
+            scheme (str): 'http' or 'https'
+            host (str): Host name of the endpoint
+            port (Optional[int]): Port of the endpoint, None for the default
+            size (int): Maximum number of connections
+            timeout (float): Socket timeout in seconds
+        """
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.size = size
+        self.timeout = timeout
+        self.created = 0
+        self._idle: List = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextmanager
+    def connection(self, fresh: bool = False):
+        """Borrow a connection, waiting while all of them are in use.
+
+        A connection is returned to the pool only if the block completes,
+        so one left in an unknown state by an error is closed instead.
+
+        Args:
+            fresh (bool): Open a new connection instead of reusing one
+
+        Yields:
+            HTTPConnection: Connection to the endpoint
+        """
+        self._slots.acquire()
+        try:
+            connection = None
+            if not fresh:
+                with self._lock:
+                    connection = self._idle.pop() if self._idle else None
+            if connection is None:
+                connection = self._connect()
+            try:
+                yield connection
+            except BaseException:
+                connection.close()
+                raise
+            with self._lock:
+                self._idle.append(connection)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Close the idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    def _connect(self):
+        """Open a new connection to the endpoint."""
+        # Imported here: http.client is only needed for remote storage
+        import http.client
+
+        connection_class = (http.client.HTTPSConnection if self.scheme == "https"
+                            else http.client.HTTPConnection)
+        with self._lock:
+            self.created += 1
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+
+class S3Storage(StorageBackend):
+    """Storage backend over a bucket of an S3-compatible object store.
+
+    Objects are addressed path-style, as MinIO and other S3-compatible
+    servers expect, and requests are signed with AWS Signature Version 4
+    if credentials are given. Requests share a bounded pool of persistent
+    connections. Streamed reads fetch the next blocks with concurrent
+    ranged GETs while the current one is consumed, and worker processes
+    analyzing shards of one object each read their own ranges.
+
+    Attributes:
+        endpoint (str): Base URL of the object store
+        bucket (str): Name of the bucket
+        prefix (str): Key prefix of the objects, empty or ending with '/'
+        access_key (Optional[str]): Access key id, None for anonymous access
+        secret_key (Optional[str]): Secret access key
+        session_token (Optional[str]): Temporary session token, if any
+        region (str): Region used in request signatures
+        pool_size (int): Maximum number of concurrent connections
+        read_ahead (int): Number of blocks fetched ahead of a streamed read
+        timeout (float): Socket timeout in seconds
+    """
+
+    def __init__(self, endpoint: str, bucket: str, prefix: str = "",
+                 access_key: Optional[str] = None, secret_key: Optional[str] = None,
+                 session_token: Optional[str] = None, region: str = "us-east-1",
+                 pool_size: int = 8, read_ahead: int = 4, timeout: float = 30.0) -> None:
+        """Initialize S3Storage.
+
+        Args:
+            endpoint (str): Base URL of the object store, such as
+                'http://localhost:9000'
+            bucket (str): Name of the bucket
+            prefix (str): Key prefix of the objects, like a directory
+            access_key (Optional[str]): Access key id, None for anonymous access
+            secret_key (Optional[str]): Secret access key
+            session_token (Optional[str]): Temporary session token
+            region (str): Region used in request signatures
+            pool_size (int): Maximum number of concurrent connections
+            read_ahead (int): Number of blocks fetched ahead of a streamed read
+            timeout (float): Socket timeout in seconds
+
+        Raises:
+            ValidationError: If the endpoint, bucket or pool settings are invalid
+        """
+        parts = urlsplit(endpoint)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValidationError(f"Storage endpoint must be an http(s) URL, got {endpoint!r}")
+        if not bucket or "/" in bucket:
+            raise ValidationError(f"Invalid bucket name: {bucket!r}")
+        if pool_size < 1 or read_ahead < 1:
+            raise ValidationError("Storage pool size and read-ahead must be positive integers")
+        self.endpoint = endpoint.rstrip("/")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.session_token = session_token
+        self.region = region
+        self.pool_size = pool_size
+        self.read_ahead = read_ahead
+        self.timeout = timeout
+        self._host = parts.netloc
+        self._base_path = parts.path.rstrip("/")
+        self._pool = ConnectionPool(parts.scheme, parts.hostname, parts.port, pool_size, timeout)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def __reduce__(self):
+        """Pickle the backend by its settings, without connections or threads."""
+        return S3Storage, (self.endpoint, self.bucket, self.prefix, self.access_key,
+                           self.secret_key, self.session_token, self.region,
+                           self.pool_size, self.read_ahead, self.timeout)
+
+    @property
+    def pool(self) -> ConnectionPool:
+        """Pool of connections to the endpoint."""
+        return self._pool
+
+    def uri(self, name: str = "") -> str:
+        """Get the s3:// location of an object, or of the prefix for an empty name."""
+        return f"{S3_SCHEME}{self.bucket}/{self.prefix}{name}"
+
+    def name_of(self, uri: str) -> str:
+        """Get the name of an object from its s3:// location."""
+        root = self.uri()
+        if not uri.startswith(root) or "/" in uri[len(root):] or uri == root:
+            raise ValueError(f"{uri} is not an object under {root}")
+        return uri[len(root):]
+
+    def list(self) -> List[Tuple[str, int]]:
+        """List the objects under the prefix with ListObjectsV2, following pages."""
+        # Imported here: XML parsing is only needed for listings
+        from xml.etree import ElementTree
+
+        objects = []
+        query = {"list-type": "2", "prefix": self.prefix, "delimiter": "/"}
+        while True:
+            _, _, body = self._request("GET", "", query)
+            root = ElementTree.fromstring(body)
+            for item in root.iterfind("{*}Contents"):
+                key = item.findtext("{*}Key", "")
+                if key != self.prefix:
+                    objects.append((key[len(self.prefix):], int(item.findtext("{*}Size", "0"))))
+            token = root.findtext("{*}NextContinuationToken")
+            if root.findtext("{*}IsTruncated") != "true" or not token:
+                return sorted(objects)
+            query = {**query, "continuation-token": token}
+
+    def size(self, name: str) -> int:
+        """Get the size of an object with a HEAD request."""
+        _, headers, _ = self._request("HEAD", name)
+        return int(headers["content-length"])
+
+    def stat(self, name: str) -> Tuple[int, Optional[str]]:
+        """Get the size and the ETag of an object with a HEAD request."""
+        _, headers, _ = self._request("HEAD", name)
+        return int(headers["content-length"]), headers.get("etag")
+
+    def read_range(self, name: str, start: int, end: int) -> bytes:
+        """Read a byte range of an object with a ranged GET."""
+        if end <= start:
+            return b''
+        status, _, body = self._request("GET", name, headers={"Range": f"bytes={start}-{end - 1}"},
+                                        expect=(200, 206, 416))
+        if status == 416:
+            return b''
+        # A server ignoring the range returns the whole object
+        return body[start:end] if status == 200 else body
+
+    def read_ranges(self, name: str, ranges: Sequence[Tuple[int, int]]) -> List[bytes]:
+        """Read several byte ranges of an object with concurrent ranged GETs."""
+        executor = self._get_executor()
+        return list(executor.map(lambda bounds: self.read_range(name, *bounds), ranges))
+
+    def iter_blocks(self, name: str, block_size: int, start: int = 0,
+                    end: Optional[int] = None) -> Iterator[bytes]:
+        """Stream a byte range of an object, fetching the next blocks concurrently.
+
+        Up to ``read_ahead`` ranged GETs are in flight while a block is
+        consumed. Requests of blocks not consumed when the stream is
+        closed early are cancelled if they have not started.
+        """
+        if end is None:
+            end = self.size(name)
+        executor = self._get_executor()
+        offsets = iter(range(start, end, block_size))
+        pending = deque()
+
+        def fetch_next() -> None:
+            """Start fetching the next block, if any is left."""
+            offset = next(offsets, None)
+            if offset is not None:
+                pending.append(executor.submit(self.read_range, name, offset,
+                                               min(offset + block_size, end)))
+
+        try:
+            for _ in range(self.read_ahead):
+                fetch_next()
+            while pending:
+                block = pending.popleft().result()
+                fetch_next()
+                if block:
+                    yield block
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def write(self, name: str, data: bytes) -> None:
+        """Write a whole object with a PUT request."""
+        self._request("PUT", name, body=data, expect=(200, 201, 204))
+
+    def close(self) -> None:
+        """Stop the read threads and close the pooled connections."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self._pool.close()
+
+    def _get_executor(self):
+        """Get the thread pool running concurrent reads, created on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                # Imported here: threads are only needed for remote reads
+                from concurrent.futures import ThreadPoolExecutor
+
+                self._executor = ThreadPoolExecutor(max_workers=self.pool_size,
+                                                    thread_name_prefix="s3-read")
+            return self._executor
+
+    def _request(self, method: str, name: str, query: Optional[Dict[str, str]] = None,
+                 headers: Optional[Dict[str, str]] = None, body: bytes = b'',
+                 expect: Sequence[int] = (200,)) -> Tuple[int, Dict[str, str], bytes]:
+        """Send a signed request for an object, or for the bucket if name is empty.
+
+        A request failing on a pooled connection, which the server may
+        have closed while it was idle, is retried once on a new one.
+
+        Args:
+            method (str): HTTP method
+            name (str): Name of the object, empty for the bucket
+            query (Optional[Dict[str, str]]): Query parameters
+            headers (Optional[Dict[str, str]]): Additional headers, signed too
+            body (bytes): Request body
+            expect (Sequence[int]): Successful status codes
+
+        Returns:
+            Tuple[int, Dict[str, str], bytes]: Status, lowercase response
+                headers and body
+
+        Raises:
+            FileNotFoundError: If the object or bucket does not exist
+            PermissionError: If access is denied
+            OSError: If the request fails otherwise
+        """
+        # Imported here: http.client is only needed for remote storage
+        import http.client
+
+        query = query or {}
+        key = f"/{self.bucket}/{self.prefix}{name}" if name else f"/{self.bucket}"
+        path = self._base_path + key
+        payload_hash = hashlib.sha256(body).hexdigest() if body else EMPTY_SHA256
+        request_headers = {**(headers or {}),
+                           "x-amz-date": time.strftime("%Y%m%dT%H%M%SZ", time.gmtime()),
+                           "x-amz-content-sha256": payload_hash}
+        if self.session_token:
+            request_headers["x-amz-security-token"] = self.session_token
+        if self.access_key and self.secret_key:
+            request_headers["Authorization"] = sign_v4(
+                method, self._host, path, query, request_headers, payload_hash,
+                self.access_key, self.secret_key, self.region, request_headers["x-amz-date"]
+            )
+        request_headers["Host"] = self._host
+        url = quote(path, safe="/~")
+        if query:
+            url += "?" + "&".join(f"{quote(k, safe='~')}={quote(v, safe='~')}"
+                                  for k, v in sorted(query.items()))
+
+        for attempt in range(2):
+            try:
+                with self._pool.connection(fresh=attempt > 0) as connection:
+                    connection.request(method, url, body=body or None, headers=request_headers)
+                    response = connection.getresponse()
+                    data = response.read()
+                    status = response.status
+                    response_headers = {k.lower(): v for k, v in response.getheaders()}
+                break
+            except (http.client.HTTPException, ConnectionError) as e:
+                if attempt:
+                    raise OSError(f"{method} {self.uri(name)} failed: {e}")
+
+        if status not in expect:
+            message = f"{method} {self.uri(name)} failed with HTTP {status}"
+            if status == 404:
+                raise FileNotFoundError(errno.ENOENT, message, self.uri(name))
+            if status == 403:
+                raise PermissionError(errno.EACCES, message, self.uri(name))
+            raise OSError(message)
+        return status, response_headers, data
+
+
+def open_storage(uri: str, config) -> StorageBackend:
+    """Open the storage backend of a location.
+
+    Locations starting with s3:// name a bucket and an optional key
+    prefix of an S3-compatible object store. The endpoint, region and
+    credentials are taken from the AWS_ENDPOINT_URL, AWS_REGION,
+    AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY and AWS_SESSION_TOKEN
+    environment variables, with the configured endpoint and region as
+    defaults. Any other location is a local directory.
+
+    Args:
+        uri (str): s3://bucket/prefix or a directory path
+        config: Configuration with the storage settings
+
+    Returns:
+        StorageBackend: Backend of the location
+
+    Raises:
+        ValidationError: If the location or storage settings are invalid
+    """
+    if not uri.startswith(S3_SCHEME):
+        if not os.path.isdir(uri):
+            raise ValidationError(f"Input directory does not exist: {uri}")
+        return LocalStorage(uri)
+    bucket, _, prefix = uri[len(S3_SCHEME):].partition("/")
+    return S3Storage(
+        os.environ.get("AWS_ENDPOINT_URL", config.STORAGE_ENDPOINT_URL), bucket, prefix,
+        os.environ.get("AWS_ACCESS_KEY_ID"), os.environ.get("AWS_SECRET_ACCESS_KEY"),
+        os.environ.get("AWS_SESSION_TOKEN"),
+        os.environ.get("AWS_REGION", config.STORAGE_REGION),
+        config.STORAGE_POOL_SIZE, config.STORAGE_READ_AHEAD, config.STORAGE_TIMEOUT
+    )
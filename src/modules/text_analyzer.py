@@ -1,44 +1,491 @@
+import heapq
 import re
 from collections import Counter
-from typing import Dict, List
+from typing import (TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence,
+                    Tuple)
 from .exceptions import AnalysisError, ValidationError
+from .metrics import CHARS, SENTENCES, TOKENS, Metric, registry
+from .profiler import stage
+from .sentence_segmenter import DEFAULT_LANGUAGE, SentenceSegmenter, get_rules
+from .sketches import DistinctCounter
+from .word_table import WordTable
+
+if TYPE_CHECKING:
+    from .concordance import TokenSequence
+    from .deadline import Deadline
+    from .memory_budget import MemoryBudget
+    from .near_duplicates import MinHashSketch
+    from .ngram_counter import NGramCounter
+    from .word_normalizer import WordNormalizer
+
+WORD_PATTERN = re.compile(r'\b\w+\b', re.UNICODE)
+NON_SPACE_PATTERN = re.compile(r'\S')
+
+
+def _frequency_order(item: Tuple[str, int]) -> Tuple[int, str]:
+    """Sort key ordering (symbol, count) pairs by count, then symbol."""
+    return -item[1], item[0]
+
+
+class TextStatistics:
+    """Mergeable accumulator of text statistics collected in a single pass.
+
+    Text is fed chunk by chunk. A word cut by the end of a chunk is carried
+    over to the next one, and sentences are counted by a streaming segmenter
+    that carries its own state, so only the current chunk is held in memory.
+    Words go straight from the tokenizer into a compact word table, which
+    also accumulates the word total and length sum. If an n-gram counter or
+    a MinHash sketch is given, the same token stream is fed to it as well,
+    and likewise to a token sequence kept for building a concordance.
+    Registered metrics receive the streams they declare from the same pass,
+    so custom analyses do not read the text again. Statistics of consecutive
+    parts of a text can be merged, which makes the same accumulator usable
+    for sharded and parallel analysis. Collection stopped by a deadline
+    leaves partial statistics of the consumed chunks, with the share of the
+    input they cover. With a word normalizer, the frequency table counts
+    normalized forms without stopwords, while the word total and length sum
+    still cover every word; n-grams, shingles, tokens and metrics see the
+    words as written.
+
+    Attributes:
+        char_count (int): Total number of characters
+        space_count (int): Number of space characters
+        symbols (Counter): Frequency of every character
+        words: Word frequency table (WordTable or SpillingCounter)
+        ngrams (Optional[NGramCounter]): N-gram counter, None if not collected
+        minhash (Optional[MinHashSketch]): Shingle signature, None if not collected
+        tokens (Optional[TokenSequence]): Token ids, None if not collected
+        metrics (List[Metric]): Custom metrics fed from the same pass
+        sentences (SentenceSegmenter): Sentence counter of the text
+        normalizer (Optional[WordNormalizer]): Normalizer of the counted
+            word forms, None to count words as written
+        partial (bool): Whether collection stopped before the end of the input
+        input_size (int): Size of the input, in bytes for files and in
+            characters for strings, 0 if not measured
+        covered_size (int): Size of the consumed part of the input
+        content_digest (Optional[str]): SHA-256 hex digest of the whole
+            input file if it was hashed while read, None otherwise
+    """
+
+    def __init__(self, word_counter=None,
+                 ngram_counter: Optional["NGramCounter"] = None,
+                 minhash: Optional["MinHashSketch"] = None,
+                 tokens: Optional["TokenSequence"] = None,
+                 metrics: Optional[List[Metric]] = None,
+                 sentences: Optional[SentenceSegmenter] = None,
+                 normalizer: Optional["WordNormalizer"] = None) -> None:
+        """Initialize empty statistics.
+
+        Args:
+            word_counter: Word frequency table to fill, defaults to a WordTable
+            ngram_counter (Optional[NGramCounter]): N-gram counter to fill,
+                n-grams are not collected if None
+            minhash (Optional[MinHashSketch]): Shingle signature to fill,
+                not collected if None
+            tokens (Optional[TokenSequence]): Token sequence to fill, not
+                collected if None
+            metrics (Optional[List[Metric]]): Custom metrics to feed
+            sentences (Optional[SentenceSegmenter]): Sentence counter to
+                feed, defaults to one with the default language rules
+            normalizer (Optional[WordNormalizer]): Normalizer of the word
+                forms counted in the frequency table, None to count words
+                as written
+        """
+        self.char_count = 0
+        self.space_count = 0
+        self.symbols: Counter = Counter()
+        self.words = word_counter if word_counter is not None else WordTable()
+        self.ngrams = ngram_counter
+        self.minhash = minhash
+        self.tokens = tokens
+        self.metrics: List[Metric] = metrics or []
+        self._char_metrics = [m for m in self.metrics if CHARS in m.streams]
+        self._token_metrics = [m for m in self.metrics if TOKENS in m.streams]
+        self._sentence_metrics = [m for m in self.metrics if SENTENCES in m.streams]
+        self.sentences = sentences or SentenceSegmenter()
+        self.normalizer = normalizer
+        self.partial = False
+        self.input_size = 0
+        self.covered_size = 0
+        self.content_digest: Optional[str] = None
+        self._carry = ''
+        # Totals of all words, kept apart from the table of normalized forms
+        self._word_total = 0
+        self._length_sum = 0
+
+    @property
+    def sentence_count(self) -> int:
+        """Number of non-blank sentences."""
+        return self.sentences.sentence_count
+
+    @property
+    def word_total(self) -> int:
+        """Total number of words."""
+        return self.words.total if self.normalizer is None else self._word_total
+
+    @property
+    def length_sum(self) -> int:
+        """Sum of lengths of all words."""
+        return self.words.length_sum if self.normalizer is None else self._length_sum
+
+    @property
+    def coverage(self) -> Optional[float]:
+        """Fraction of the input covered: 1.0 if complete, None if unmeasured."""
+        if not self.partial:
+            return 1.0
+        return self.covered_size / self.input_size if self.input_size else None
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[str],
+                    memory_budget: Optional["MemoryBudget"] = None,
+                    ngram_order: int = 0, minhash: bool = False,
+                    tokens: bool = False,
+                    metrics: Sequence[str] = (),
+                    windows=None,
+                    language: str = DEFAULT_LANGUAGE,
+                    deadline: Optional["Deadline"] = None,
+                    normalizer: Optional["WordNormalizer"] = None) -> "TextStatistics":
+        """Collect statistics of a text given as consecutive chunks.
+
+        With a deadline, the time left is checked between chunks. Once it
+        has expired, the chunks consumed so far are finished as partial
+        statistics, so at least the first chunk is always analyzed.
+
+        Args:
+            chunks (Iterable[str]): Consecutive parts of the text
+            memory_budget (Optional[MemoryBudget]): Budget bounding the word
+                frequency and n-gram tables, unbounded if None
+            ngram_order (int): Longest n-gram length to count, 0 to skip n-grams
+            minhash (bool): Whether to collect the MinHash shingle signature
+            tokens (bool): Whether to keep the token sequence for a concordance
+            metrics (Sequence[str]): Names of registered metrics to compute
+            windows: WindowStatistics fed the same chunks, finished with
+                the text, None to skip windows
+            language (str): Language of the sentence segmentation rules
+            deadline (Optional[Deadline]): Deadline stopping the collection,
+                None to consume every chunk
+            normalizer (Optional[WordNormalizer]): Normalizer of the counted
+                word forms, None to count words as written
+
+        Returns:
+            TextStatistics: Finished statistics, marked partial if stopped
+                by the deadline
+
+        Raises:
+            ValidationError: If no sentence rules exist for the language
+        """
+        ngrams = sketch = sequence = None
+        if ngram_order:
+            # Imported here: n-grams are only counted when requested
+            from .ngram_counter import NGramCounter
+
+            ngrams = (memory_budget.create_ngram_counter(ngram_order) if memory_budget
+                      else NGramCounter(ngram_order))
+        if minhash:
+            # Imported here: shingle signatures are only needed for deduplication
+            from .near_duplicates import MinHashSketch
+
+            sketch = MinHashSketch()
+        if tokens:
+            # Imported here: token sequences are only kept for a concordance
+            from .concordance import TokenSequence
+
+            sequence = TokenSequence()
+        statistics = cls(memory_budget.create_counter() if memory_budget else None, ngrams,
+                         sketch, sequence,
+                         registry.create_all(metrics),
+                         SentenceSegmenter(get_rules(language)), normalizer)
+        for chunk in chunks:
+            if deadline is not None and statistics.char_count and deadline.expired():
+                statistics.partial = True
+                break
+            statistics.consume(chunk)
+            if windows is not None:
+                windows.consume(chunk)
+        statistics.finish()
+        if windows is not None:
+            windows.finish()
+        return statistics
+
+    def consume(self, chunk: str) -> None:
+        """Add the next chunk of text.
+
+        Args:
+            chunk (str): Next consecutive part of the text
+        """
+        self.char_count += len(chunk)
+        self.space_count += chunk.count(' ')
+        self.symbols.update(chunk)
+        for metric in self._char_metrics:
+            metric.consume_chars(chunk)
+        completed = self.sentences.consume(chunk)
+        if completed:
+            for metric in self._sentence_metrics:
+                metric.consume_sentences(completed)
+
+        buffer = self._carry + chunk
+        cut = len(buffer)
+        while cut and (buffer[cut - 1].isalnum() or buffer[cut - 1] == '_'):
+            cut -= 1
+        self._carry = buffer[cut:]
+        if cut:
+            self._count_words(buffer[:cut])
+
+    def finish(self) -> None:
+        """Flush the carried word and close the last sentence fragment."""
+        if self._carry:
+            self._count_words(self._carry)
+            self._carry = ''
+        if self.sentences.finish():
+            for metric in self._sentence_metrics:
+                metric.consume_sentences(1)
+
+    def merge(self, other: "TextStatistics") -> "TextStatistics":
+        """Add finished statistics of the text directly following this one.
+
+        Args:
+            other (TextStatistics): Statistics of the following text
+
+        Returns:
+            TextStatistics: This instance with merged statistics
+        """
+        self.char_count += other.char_count
+        self.space_count += other.space_count
+        self.partial = self.partial or other.partial
+        self.input_size += other.input_size
+        self.covered_size += other.covered_size
+        # Each digest covers one range only
+        self.content_digest = None
+        self._word_total += other._word_total
+        self._length_sum += other._length_sum
+        self.symbols.update(other.symbols)
+        self.words.merge(other.words)
+        if self.ngrams is not None and other.ngrams is not None:
+            self.ngrams.merge(other.ngrams)
+        if self.minhash is not None and other.minhash is not None:
+            self.minhash.merge(other.minhash)
+        if self.tokens is not None and other.tokens is not None:
+            self.tokens.merge(other.tokens)
+        for metric, other_metric in zip(self.metrics, other.metrics):
+            metric.merge(other_metric)
+
+        # A sentence spanning both parts was counted on each side
+        if self.sentences.merge(other.sentences):
+            for metric in self._sentence_metrics:
+                metric.consume_sentences(-1)
+        return self
+
+    def close(self) -> None:
+        """Release temporary files held by the word frequency table."""
+        self.words.close()
+
+    def _count_words(self, text: str) -> None:
+        """Tokenize complete words and add them to the statistics.
+
+        Args:
+            text (str): Text that ends at a word boundary
+        """
+        words = WORD_PATTERN.findall(text.lower())
+        if self.normalizer is None:
+            self.words.update(words)
+        else:
+            self._word_total += len(words)
+            self._length_sum += sum(map(len, words))
+            self.words.update(self.normalizer.normalize_all(words))
+        if self.ngrams is not None:
+            self.ngrams.update(words)
+        if self.minhash is not None:
+            self.minhash.update(words)
+        if self.tokens is not None:
+            self.tokens.update(words)
+        for metric in self._token_metrics:
+            metric.consume_tokens(words)
 
 
 class TextAnalyzer:
     """Handles text analysis operations on a given text.
 
     This class provides various methods for analyzing text content including
-    word counting, sentence analysis, and frequency calculations.
+    word counting, sentence analysis, and frequency calculations. All
+    metrics are taken from TextStatistics collected in one pass over the
+    text, either lazily from an in-memory string or up front from a stream
+    of chunks.
 
     Attributes:
-        text (str): The text content to analyze
+        text (Optional[str]): The text content to analyze, None for streamed input
         n (int): Number of most frequent words to return
-        words (List[str]): List of words extracted from the text
+        memory_budget (Optional[MemoryBudget]): Budget bounding the analysis
+        ngram_order (int): Longest n-gram length counted, 0 if n-grams are skipped
+        metrics (Tuple[str, ...]): Names of the custom metrics computed
+        windows: WindowStatistics fed from the same pass, None if not collected
+        language (str): Language of the sentence segmentation rules
+        encoding (Optional[str]): Detected encoding of the analyzed file,
+            None for text given as a string
+        deadline (Optional[Deadline]): Deadline of collecting the statistics,
+            None for no time limit
+        normalizer (Optional[WordNormalizer]): Normalizer of the word forms
+            counted as frequencies, None to count words as written
     """
 
-    def __init__(self, text: str, n: int) -> None:
+    def __init__(self, text: str, n: int,
+                 memory_budget: Optional["MemoryBudget"] = None,
+                 ngram_order: int = 0, metrics: Sequence[str] = (),
+                 windows=None, language: str = DEFAULT_LANGUAGE,
+                 deadline: Optional["Deadline"] = None,
+                 normalizer: Optional["WordNormalizer"] = None) -> None:
         """Initialize TextAnalyzer with text content and N parameter.
 
         Args:
             text (str): The text content to analyze
             n (int): Number of most frequent words to return
+            memory_budget (Optional[MemoryBudget]): Budget bounding chunk
+                size and word frequency table, unbounded if None
+            ngram_order (int): Longest n-gram length to count, 0 to skip n-grams
+            metrics (Sequence[str]): Names of registered metrics to compute
+            windows: WindowStatistics emitting per-window records while the
+                statistics are collected, None to skip windows
+            language (str): Language of the sentence segmentation rules
+            deadline (Optional[Deadline]): Deadline checked between chunks
+                of the text, which requires a memory budget to split it;
+                statistics of the chunks analyzed until then are partial
+            normalizer (Optional[WordNormalizer]): Normalizer dropping
+                stopwords and reducing word forms before they are counted,
+                None to count words as written
 
         Raises:
-            ValidationError: If text is empty or not a string
+            ValidationError: If text is empty or not a string, or no
+                sentence rules exist for the language
             AnalysisError: If no valid words found in text
         """
         if not isinstance(text, str):
             raise ValidationError("Text must be a string")
         if not text.strip():
             raise ValidationError("Text cannot be empty")
+        if not WORD_PATTERN.search(text):
+            raise AnalysisError("No valid words found in text")
+        get_rules(language)
 
         self.text = text
         self.n = n
-        self.words = re.findall(r'\b\w+\b', text.lower(), re.UNICODE)
+        self.memory_budget = memory_budget
+        self.ngram_order = ngram_order
+        self.metrics = tuple(metrics)
+        self.windows = windows
+        self.language = language
+        self.encoding: Optional[str] = None
+        self.deadline = deadline
+        self.normalizer = normalizer
+        self._statistics: Optional[TextStatistics] = None
+        self._vocabulary: Optional[DistinctCounter] = None
+        self._distinct_words: Optional[int] = None
+
+    @classmethod
+    def from_statistics(cls, statistics: TextStatistics, n: int,
+                        encoding: Optional[str] = None) -> "TextAnalyzer":
+        """Create an analyzer over already collected statistics.
 
-        if not self.words:
+        Args:
+            statistics (TextStatistics): Finished statistics of the text
+            n (int): Number of most frequent words to return
+            encoding (Optional[str]): Detected encoding of the analyzed file
+
+        Returns:
+            TextAnalyzer: Analyzer without the text held in memory
+
+        Raises:
+            AnalysisError: If no valid words found in text
+        """
+        if not statistics.word_total:
+            statistics.close()
             raise AnalysisError("No valid words found in text")
 
+        analyzer = cls.__new__(cls)
+        analyzer.text = None
+        analyzer.n = n
+        analyzer.memory_budget = None
+        analyzer.ngram_order = statistics.ngrams.order if statistics.ngrams else 0
+        analyzer.metrics = tuple(metric.name for metric in statistics.metrics)
+        analyzer.windows = None
+        analyzer.language = statistics.sentences.rules.language
+        analyzer.encoding = encoding
+        analyzer.deadline = None
+        analyzer.normalizer = statistics.normalizer
+        analyzer._statistics = statistics
+        analyzer._vocabulary = None
+        analyzer._distinct_words = None
+        return analyzer
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[str], n: int,
+                    memory_budget: Optional["MemoryBudget"] = None,
+                    ngram_order: int = 0, metrics: Sequence[str] = (),
+                    windows=None, language: str = DEFAULT_LANGUAGE,
+                    deadline: Optional["Deadline"] = None,
+                    normalizer: Optional["WordNormalizer"] = None) -> "TextAnalyzer":
+        """Analyze a text streamed as consecutive chunks.
+
+        Args:
+            chunks (Iterable[str]): Consecutive parts of the text
+            n (int): Number of most frequent words to return
+            memory_budget (Optional[MemoryBudget]): Budget bounding the word
+                frequency table, unbounded if None
+            ngram_order (int): Longest n-gram length to count, 0 to skip n-grams
+            metrics (Sequence[str]): Names of registered metrics to compute
+            windows: WindowStatistics fed the same chunks, None to skip windows
+            language (str): Language of the sentence segmentation rules
+            deadline (Optional[Deadline]): Deadline checked between chunks,
+                None to consume every chunk; the size of a chunk stream is
+                unknown, so partial results have no coverage
+            normalizer (Optional[WordNormalizer]): Normalizer of the counted
+                word forms, None to count words as written
+
+        Returns:
+            TextAnalyzer: Analyzer without the text held in memory
+
+        Raises:
+            ValidationError: If no sentence rules exist for the language
+            AnalysisError: If no valid words found in text
+        """
+        return cls.from_statistics(
+            TextStatistics.from_chunks(chunks, memory_budget, ngram_order,
+                                       metrics=metrics, windows=windows,
+                                       language=language, deadline=deadline,
+                                       normalizer=normalizer), n
+        )
+
+    @property
+    def statistics(self) -> TextStatistics:
+        """Statistics of the text, collected on first access."""
+        if self._statistics is None:
+            with stage("collect-statistics"):
+                statistics = TextStatistics.from_chunks(
+                    self._chunks(), self.memory_budget, self.ngram_order,
+                    metrics=self.metrics, windows=self.windows, language=self.language,
+                    deadline=self.deadline, normalizer=self.normalizer
+                )
+            statistics.input_size = len(self.text)
+            statistics.covered_size = statistics.char_count
+            self._statistics = statistics
+        return self._statistics
+
+    def close(self) -> None:
+        """Release temporary files held by the collected statistics."""
+        if self._statistics is not None:
+            self._statistics.close()
+
+    def _chunks(self) -> Iterator[str]:
+        """Split the in-memory text into chunks sized by the memory budget.
+
+        Returns:
+            Iterator[str]: Consecutive parts of the text
+        """
+        if self.memory_budget is None:
+            yield self.text
+            return
+        size = self.memory_budget.chunk_size()
+        for start in range(0, len(self.text), size):
+            yield self.text[start:start + size]
+
     def get_symbol_counts(self) -> Dict[str, int]:
         """Calculate total symbol counts in the text.
 
@@ -47,15 +494,18 @@ class TextAnalyzer:
                 - 'with_spaces': Total character count including spaces
                 - 'without_spaces': Character count excluding spaces
         """
+        statistics = self.statistics
         return {
-            "with_spaces": len(self.text),
-            "without_spaces": len(self.text.replace(" ", ""))
+            "with_spaces": statistics.char_count,
+            "without_spaces": statistics.char_count - statistics.space_count
         }
 
     def get_sentence_count(self) -> int:
         """Count the number of sentences in the text.
 
-        A sentence is considered to end with '.', '!' or '?'.
+        A sentence ends with '.', '!' or '?' runs as decided by the
+        sentence rules of the language, so abbreviations, decimals and
+        URLs do not end sentences.
 
         Returns:
             int: Number of sentences found
@@ -64,8 +514,7 @@ class TextAnalyzer:
             AnalysisError: If error occurs during sentence counting
         """
         try:
-            sentences = [s.strip() for s in re.split('[.!?]', self.text) if s.strip()]
-            return len(sentences)
+            return self.statistics.sentence_count
         except Exception as e:
             raise AnalysisError(f"Error counting sentences: {str(e)}")
 
@@ -75,7 +524,7 @@ class TextAnalyzer:
         Returns:
             int: Total number of words
         """
-        return len(self.words)
+        return self.statistics.word_total
 
     def get_most_frequent_words(self) -> Dict[str, int]:
         """Get the N most frequently occurring words.
@@ -86,11 +535,13 @@ class TextAnalyzer:
         Raises:
             ValidationError: If N is larger than available words
         """
-        if self.n > len(self.words):
+        statistics = self.statistics
+        if self.n > statistics.word_total:
             raise ValidationError(
-                f"N ({self.n}) is larger than available words ({len(self.words)})"
+                f"N ({self.n}) is larger than available words ({statistics.word_total})"
             )
-        return dict(Counter(self.words).most_common(self.n))
+        with stage("most-frequent-words"):
+            return dict(statistics.words.most_common(self.n))
 
     def get_average_word_length(self) -> float:
         """Calculate the average word length.
@@ -99,24 +550,232 @@ class TextAnalyzer:
             float: Average length of words, rounded to 2 decimal places.
                 Returns 0.0 if no words are present.
         """
-        if not self.words:
+        statistics = self.statistics
+        if not statistics.word_total:
             return 0.0
-        return round(sum(len(word) for word in self.words) / len(self.words), 2)
+        return round(statistics.length_sum / statistics.word_total, 2)
 
-    def get_symbol_frequency(self) -> Dict[str, int]:
+    def get_symbol_frequency(self, limit: Optional[int] = None) -> Dict[str, int]:
         """Get frequency of each symbol in the text.
 
+        With a limit, only the most frequent symbols are selected with a
+        bounded heap instead of sorting the whole symbol table, which
+        matters for scripts with tens of thousands of distinct characters.
+
+        Args:
+            limit (Optional[int]): Maximum number of symbols to return,
+                None for all symbols
+
         Returns:
             Dict[str, int]: Dictionary of symbols and their frequencies,
                 sorted by frequency (descending) and then by symbol
 
         Raises:
+            ValidationError: If limit is not a positive integer
             AnalysisError: If error occurs during frequency calculation
         """
+        if limit is not None and (not isinstance(limit, int) or limit < 1):
+            raise ValidationError(f"Symbol limit must be a positive integer, got {limit!r}")
         try:
-            return dict(sorted(
-                Counter(self.text).items(),
-                key=lambda x: (-x[1], x[0])
-            ))
+            symbols = self.statistics.symbols
+            with stage("symbol-frequency"):
+                if limit is None or limit >= len(symbols):
+                    return dict(sorted(symbols.items(), key=_frequency_order))
+                return dict(heapq.nsmallest(limit, symbols.items(), key=_frequency_order))
         except Exception as e:
             raise AnalysisError(f"Error calculating symbol frequency: {str(e)}")
+
+    def get_vocabulary_sketch(self) -> DistinctCounter:
+        """Get the distinct-word counter of the text.
+
+        The counter is built once from the distinct words of the frequency
+        table. It is exact for small vocabularies and switches to a
+        HyperLogLog sketch above its limit, which keeps the serialized form
+        small enough to be saved with the results and merged per corpus.
+
+        Returns:
+            DistinctCounter: Counter of distinct words
+        """
+        if self._vocabulary is None:
+            words = self.statistics.words
+            with stage("vocabulary-sketch"):
+                counter = DistinctCounter()
+                distinct_words = 0
+                for word in words:
+                    counter.add(word)
+                    distinct_words += 1
+            self._vocabulary = counter
+            self._distinct_words = distinct_words
+        return self._vocabulary
+
+    def get_distinct_word_count(self) -> int:
+        """Get the number of distinct words (vocabulary size).
+
+        The count is exact: it is taken from the frequency table of the
+        file, while the vocabulary sketch is only kept for merging corpora.
+
+        Returns:
+            int: Number of distinct words
+        """
+        if self._distinct_words is None:
+            self.get_vocabulary_sketch()
+        return self._distinct_words
+
+    def get_type_token_ratio(self) -> float:
+        """Calculate the ratio of distinct words to all words.
+
+        Returns:
+            float: Type/token ratio, rounded to 4 decimal places.
+                Returns 0.0 if no words are present.
+        """
+        word_total = self.statistics.word_total
+        if not word_total:
+            return 0.0
+        return round(self.get_distinct_word_count() / word_total, 4)
+
+    def get_minhash_signature(self) -> List[int]:
+        """Get the MinHash signature of the word shingles of the text.
+
+        Returns:
+            List[int]: Minimum shingle hash per bin
+
+        Raises:
+            AnalysisError: If the signature was not collected
+        """
+        minhash = self.statistics.minhash
+        if minhash is None:
+            raise AnalysisError("MinHash signature was not collected")
+        return minhash.to_list()
+
+    def get_ngram_statistics(self, min_count: int = 3) -> Dict[str, Any]:
+        """Get the N most frequent n-grams and the strongest collocations.
+
+        Args:
+            min_count (int): Minimum count of a bigram to be scored as a
+                collocation
+
+        Returns:
+            Dict[str, Any]: Dictionary containing:
+                - 'approximate': Whether rare n-grams were pruned
+                - 'K-grams': N most frequent n-grams of each length K
+                - 'collocations': Bigrams with their count, PMI and
+                  log-likelihood ratio, strongest first
+
+        Raises:
+            AnalysisError: If n-grams were not collected
+        """
+        ngrams = self.statistics.ngrams
+        if ngrams is None:
+            raise AnalysisError("N-gram statistics were not collected")
+
+        with stage("ngram-statistics"):
+            results: Dict[str, Any] = {"approximate": ngrams.pruned}
+            for k in range(2, ngrams.order + 1):
+                results[f"{k}-grams"] = dict(ngrams.most_common(k, self.n))
+            results["collocations"] = {
+                bigram: {
+                    "count": count,
+                    "pmi": round(pmi, 2),
+                    "log-likelihood": round(log_likelihood, 2)
+                }
+                for bigram, count, pmi, log_likelihood in ngrams.collocations(self.n, min_count)
+            }
+        return results
+
+    def is_partial(self) -> bool:
+        """Check whether the deadline stopped the analysis before the end.
+
+        Returns:
+            bool: True if the results cover only the start of the text, or
+                of every shard for files analyzed in parallel
+        """
+        return self.statistics.partial
+
+    def get_coverage(self) -> Optional[float]:
+        """Get the fraction of the input the results cover.
+
+        Returns:
+            Optional[float]: Covered fraction of the bytes of a file, or of
+                the characters of a string, rounded to 4 decimal places;
+                1.0 if complete, None if the input size is unknown
+        """
+        coverage = self.statistics.coverage
+        return None if coverage is None else round(coverage, 4)
+
+    def get_normalization(self) -> Optional[Dict[str, Any]]:
+        """Get the normalization of the counted word forms.
+
+        Returns:
+            Optional[Dict[str, Any]]: Language, stopword removal and mode of
+                the normalizer, None if words are counted as written
+        """
+        return self.normalizer.describe() if self.normalizer is not None else None
+
+    def get_encoding(self) -> Optional[str]:
+        """Get the detected encoding of the analyzed file.
+
+        Returns:
+            Optional[str]: Codec name, None for text given as a string
+        """
+        return self.encoding
+
+    def get_metric_results(self) -> Dict[str, Any]:
+        """Get the values of the custom metrics.
+
+        Returns:
+            Dict[str, Any]: Value of every custom metric by name, in the
+                order the metrics were requested
+        """
+        metrics = self.statistics.metrics
+        with stage("metrics"):
+            return {metric.name: metric.result() for metric in metrics}
+
+    def save_frequency_run(self, path: str) -> int:
+        """Write the full word frequencies of the text as a run sorted by word.
+
+        Spilled frequency tables are merged while writing, so the run is
+        streamed without loading every word into memory.
+
+        Args:
+            path (str): Path to the run file
+
+        Returns:
+            int: Number of distinct words written
+
+        Raises:
+            OSError: If the run cannot be written
+        """
+        # Imported here: runs are only written when requested
+        from .frequency_runs import write_frequency_run
+
+        words = self.statistics.words
+        with stage("frequency-run"):
+            return write_frequency_run(((word, count) for word, count, _ in words.items()), path)
+
+    def save_concordance(self, path: str, max_tokens: Optional[int] = None) -> None:
+        """Build the concordance index of the text and write it to a file.
+
+        Args:
+            path (str): Path to the index file
+            max_tokens (Optional[int]): Largest number of tokens an index is
+                built for, such as MemoryBudget.concordance_limit, None for
+                no limit
+
+        Raises:
+            AnalysisError: If the token sequence was not collected, or is
+                longer than max_tokens
+            OSError: If the index cannot be written
+        """
+        tokens = self.statistics.tokens
+        if tokens is None:
+            raise AnalysisError("Token sequence for the concordance was not collected")
+        if max_tokens is not None and len(tokens) > max_tokens:
+            raise AnalysisError(
+                f"Concordance of {len(tokens)} tokens exceeds the memory budget "
+                f"of {max_tokens} tokens"
+            )
+        # Imported here: the concordance index is only built when requested
+        from .concordance import ConcordanceIndex
+
+        with stage("concordance"):
+            ConcordanceIndex.build(tokens, path)
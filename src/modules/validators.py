@@ -67,28 +67,43 @@ class InputValidator:
 
     Provides methods to validate various types of user input including
     numeric values, file selections, and yes/no responses.
+
+    Attributes:
+        max_n (int): Largest accepted number of most frequent words
     """
 
-    @staticmethod
-    def validate_n_value(n: Any) -> int:
+    def __init__(self, max_n: int = 100) -> None:
+        """Initialize InputValidator.
+
+        Args:
+            max_n (int): Largest accepted number of most frequent words
+
+        Raises:
+            ValidationError: If the limit is not a positive integer
+        """
+        if isinstance(max_n, bool) or not isinstance(max_n, int) or max_n < 1:
+            raise ValidationError(f"N limit must be a positive integer, got {max_n!r}")
+        self.max_n = max_n
+
+    def validate_n_value(self, n: Any) -> int:
         """Validate N value for word frequency analysis.
 
         Validates that the input can be converted to an integer and
-        falls within the acceptable range (1-100).
+        falls within the acceptable range (1 to max_n).
 
         Args:
             n (Any): Value to validate, typically a string from user input
 
         Returns:
-            int: Validated integer value between 1 and 100
+            int: Validated integer value between 1 and max_n
 
         Raises:
             ValidationError: If value isn't numeric or is out of range
         """
         try:
             n = int(n)
-            if not 1 <= n <= 100:
-                raise ValidationError("N must be between 1 and 100")
+            if not 1 <= n <= self.max_n:
+                raise ValidationError(f"N must be between 1 and {self.max_n}")
             return n
         except ValueError:
             raise ValidationError("N must be an integer")
@@ -0,0 +1,254 @@
+import json
+from typing import Any, Callable, Dict, Optional, Tuple
+from .exceptions import FileError, ValidationError
+from .sentence_segmenter import DEFAULT_LANGUAGE, SentenceSegmenter, get_rules
+from .text_analyzer import NON_SPACE_PATTERN, TextStatistics
+
+WindowRecord = Dict[str, Any]
+
+
+class WindowStatistics:
+    """Statistics of consecutive windows of a text, emitted as they close.
+
+    The text is fed chunk by chunk, alongside the whole-text statistics,
+    and cut into windows of whole lines:
+
+    - ``lines``: every ``size`` lines
+    - ``bytes``: as soon as a window holds at least ``size`` bytes of text
+      in the given encoding, at the end of the current line (line breaks
+      count as one byte, as the text is read with translated newlines)
+    - ``paragraphs``: runs of non-blank lines separated by blank lines,
+      which belong to no window
+
+    Each window is collected in its own TextStatistics and handed to the
+    sink as a record as soon as it closes, so memory is bounded by a
+    single window regardless of the text length. A sentence continuing
+    into the next window is counted in both. Windows are emitted in text
+    order, which requires a sequential scan.
+
+    Attributes:
+        mode (str): Window mode, one of MODES
+        size (int): Lines or bytes per window, unused for paragraphs
+        encoding (str): Encoding used to measure bytes
+        sink (Callable[[WindowRecord], None]): Receiver of closed windows
+        rules (SentenceRules): Sentence rules of the language of the text
+        count (int): Number of windows emitted
+    """
+
+    MODES = ("lines", "bytes", "paragraphs")
+
+    def __init__(self, mode: str, size: int = 1,
+                 sink: Optional[Callable[[WindowRecord], None]] = None,
+                 encoding: str = 'utf-8', language: str = DEFAULT_LANGUAGE) -> None:
+        """Initialize WindowStatistics.
+
+        Args:
+            mode (str): Window mode, one of MODES
+            size (int): Lines or bytes per window, unused for paragraphs
+            sink (Optional[Callable[[WindowRecord], None]]): Receiver of
+                closed windows, records are discarded if None
+            encoding (str): Encoding used to measure bytes
+            language (str): Language of the sentence segmentation rules
+
+        Raises:
+            ValidationError: If mode is unknown, size is not positive or no
+                sentence rules exist for the language
+        """
+        if mode not in self.MODES:
+            raise ValidationError(f"Unknown window mode: {mode}")
+        if not isinstance(size, int) or size < 1:
+            raise ValidationError("Window size must be a positive integer")
+        self.mode = mode
+        self.size = size
+        self.encoding = encoding
+        self.sink = sink or (lambda record: None)
+        self.rules = get_rules(language)
+        self.count = 0
+        self._paragraphs = mode == "paragraphs"
+        self._window: Optional[TextStatistics] = None
+        self._line = 1
+        self._line_blank = True
+        self._line_started = False
+        self._pending = ''
+        self._start_line = 0
+        self._lines = 0
+        self._bytes = 0
+
+    @classmethod
+    def parse_spec(cls, spec: str) -> Tuple[str, int]:
+        """Parse a window specification such as 'lines:100' or 'paragraphs'.
+
+        Args:
+            spec (str): Mode, optionally followed by ':' and the size
+
+        Returns:
+            Tuple[str, int]: Window mode and size
+
+        Raises:
+            ValidationError: If the specification is invalid
+        """
+        mode, _, size = spec.partition(':')
+        if mode not in cls.MODES:
+            raise ValidationError(f"Unknown window mode: {mode}")
+        if mode == "paragraphs":
+            if size:
+                raise ValidationError("Paragraph windows take no size")
+            return mode, 1
+        try:
+            value = int(size)
+        except ValueError:
+            raise ValidationError(f"Window size must be a positive integer: {spec}")
+        if value < 1:
+            raise ValidationError(f"Window size must be a positive integer: {spec}")
+        return mode, value
+
+    def consume(self, chunk: str) -> None:
+        """Add the next chunk of text, emitting every window it closes.
+
+        Args:
+            chunk (str): Next consecutive part of the text
+        """
+        feed = 0
+        position = 0
+        length = len(chunk)
+        while position < length:
+            newline = chunk.find('\n', position)
+            end = length if newline < 0 else newline + 1
+            if self._line_blank and NON_SPACE_PATTERN.search(chunk, position, end):
+                self._line_blank = False
+                if self._pending:
+                    self._feed(self._pending)
+                    self._pending = ''
+            if not self._line_started and not (self._paragraphs and self._line_blank):
+                self._line_started = True
+                if not self._lines:
+                    self._start_line = self._line
+            if self.mode == "bytes":
+                self._bytes += len(chunk[position:end].encode(self.encoding, 'replace'))
+
+            if newline < 0:
+                if self._paragraphs and self._line_blank:
+                    # Hold back whitespace until the line turns out to be blank or not
+                    self._feed(chunk[feed:position])
+                    self._pending += chunk[position:end]
+                    feed = end
+                break
+
+            line_start, position = position, end
+            if self._paragraphs and self._line_blank:
+                self._feed(chunk[feed:line_start])
+                feed = position
+                self._pending = ''
+                if self._lines:
+                    self._close(self._line - 1)
+            else:
+                self._lines += 1
+                if ((self.mode == "lines" and self._lines >= self.size)
+                        or (self.mode == "bytes" and self._bytes >= self.size)):
+                    self._feed(chunk[feed:position])
+                    feed = position
+                    self._close(self._line)
+            self._line += 1
+            self._line_blank = True
+            self._line_started = False
+        self._feed(chunk[feed:])
+
+    def finish(self) -> None:
+        """Emit the last window, including a last line without a line break."""
+        self._pending = ''
+        if self._line_started:
+            self._lines += 1
+            self._line_started = False
+            self._close(self._line)
+        elif self._lines:
+            self._close(self._line - 1)
+
+    def _feed(self, text: str) -> None:
+        """Add text to the current window, opening it if needed.
+
+        Args:
+            text (str): Consecutive text of the current window
+        """
+        if not text:
+            return
+        if self._window is None:
+            self._window = TextStatistics(sentences=SentenceSegmenter(self.rules))
+        self._window.consume(text)
+
+    def _close(self, end_line: int) -> None:
+        """Emit the current window and start a new one.
+
+        Args:
+            end_line (int): Number of the last line of the window
+        """
+        window = self._window or TextStatistics()
+        window.finish()
+        self.count += 1
+        words = window.word_total
+        self.sink({
+            "window": self.count,
+            "start-line": self._start_line,
+            "end-line": end_line,
+            "line-count": self._lines,
+            "char-count": window.char_count,
+            "word-count": words,
+            "average-word-length": round(window.length_sum / words, 2) if words else 0.0,
+            "sentence-count": window.sentence_count,
+            "sentences-per-line": round(window.sentence_count / self._lines, 2)
+        })
+        window.close()
+        self._window = None
+        self._lines = 0
+        self._bytes = 0
+
+
+class NDJSONWriter:
+    """Writes records as newline-delimited JSON, one line per record.
+
+    Attributes:
+        path (str): Location of the output file
+        count (int): Number of records written
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open the output file, replacing an existing one.
+
+        Args:
+            path (str): Location of the output file
+
+        Raises:
+            FileError: If the file cannot be opened
+        """
+        self.path = path
+        self.count = 0
+        try:
+            self._file = open(path, 'w', encoding='utf-8')
+        except OSError as e:
+            raise FileError(f"Error saving window statistics: {e}", {"path": path})
+
+    def __call__(self, record: WindowRecord) -> None:
+        """Write a record.
+
+        Args:
+            record (WindowRecord): JSON-serializable record
+
+        Raises:
+            FileError: If the record cannot be written
+        """
+        try:
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        except OSError as e:
+            raise FileError(f"Error saving window statistics: {e}", {"path": self.path})
+        self.count += 1
+
+    def __enter__(self) -> "NDJSONWriter":
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the file when leaving the runtime context."""
+        self.close()
+
+    def close(self) -> None:
+        """Flush and close the output file."""
+        self._file.close()
@@ -0,0 +1,320 @@
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+from .exceptions import ValidationError
+from .sentence_segmenter import DEFAULT_LANGUAGE
+
+# Normalizations of word forms besides stopword removal
+MODES = ("stem", "lemma")
+
+STOPWORDS: Dict[str, FrozenSet[str]] = {
+    "en": frozenset((
+        "a", "about", "above", "after", "again", "against", "all", "am", "an", "and", "any",
+        "are", "as", "at", "be", "because", "been", "before", "being", "below", "between",
+        "both", "but", "by", "can", "could", "did", "do", "does", "doing", "down", "during",
+        "each", "few", "for", "from", "further", "had", "has", "have", "having", "he", "her",
+        "here", "hers", "herself", "him", "himself", "his", "how", "i", "if", "in", "into",
+        "is", "it", "its", "itself", "just", "me", "more", "most", "my", "myself", "no",
+        "nor", "not", "now", "of", "off", "on", "once", "only", "or", "other", "our", "ours",
+        "ourselves", "out", "over", "own", "same", "she", "should", "so", "some", "such",
+        "than", "that", "the", "their", "theirs", "them", "themselves", "then", "there",
+        "these", "they", "this", "those", "through", "to", "too", "under", "until", "up",
+        "very", "was", "we", "were", "what", "when", "where", "which", "while", "who",
+        "whom", "why", "will", "with", "would", "you", "your", "yours", "yourself",
+        "yourselves", "s", "t", "d", "ll", "m", "re", "ve"
+    )),
+    "uk": frozenset((
+        "а", "аби", "але", "б", "би", "бо", "був", "була", "були", "було", "бути", "в",
+        "вам", "вас", "весь", "вже", "ви", "від", "він", "вона", "вони", "воно", "все",
+        "всі", "всього", "г", "де", "для", "до", "же", "з", "за", "зі", "і", "із", "її",
+        "їй", "їм", "їх", "й", "його", "йому", "к", "коли", "котрий", "крім", "лише",
+        "мене", "мені", "ми", "мій", "міг", "мною", "моя", "на", "над", "нам", "нас", "наш",
+        "не", "нею", "неї", "ним", "них", "ні", "ніж", "но", "о", "об", "однак", "от", "по",
+        "при", "про", "під", "с", "та", "так", "також", "там", "те", "тебе", "ти", "то",
+        "тобі", "тоді", "той", "тому", "ту", "тут", "у", "хоча", "це", "цей", "ці", "цих",
+        "цього", "цьому", "ця", "чи", "чого", "що", "щоб", "як", "який", "яка", "які",
+        "якщо", "є", "я"
+    )),
+    "de": frozenset((
+        "aber", "alle", "allem", "allen", "aller", "als", "also", "am", "an", "auch", "auf",
+        "aus", "bei", "bin", "bis", "bist", "da", "damit", "dann", "das", "dass", "dem",
+        "den", "denn", "der", "des", "die", "dies", "diese", "diesem", "diesen", "dieser",
+        "doch", "dort", "du", "durch", "ein", "eine", "einem", "einen", "einer", "eines",
+        "er", "es", "euch", "für", "hat", "hatte", "hier", "ich", "ihm", "ihn", "ihr",
+        "ihre", "im", "in", "ist", "ja", "jede", "jedem", "jeden", "jeder", "kann", "kein",
+        "keine", "man", "mich", "mir", "mit", "nach", "nicht", "noch", "nun", "nur", "ob",
+        "oder", "ohne", "sehr", "sein", "seine", "sich", "sie", "sind", "so", "über", "um",
+        "und", "uns", "unter", "vom", "von", "vor", "war", "waren", "was", "weil", "wenn",
+        "wer", "wie", "wir", "wird", "wo", "zu", "zum", "zur"
+    )),
+}
+
+
+class SuffixStemmer:
+    """Light stemmer stripping one inflectional or derivational suffix.
+
+    The longest listed suffix leaving a stem of at least ``min_stem``
+    characters is replaced, so every form of a word sharing that suffix
+    maps to the same stem. Stems are not dictionary words.
+
+    Attributes:
+        suffixes (Tuple[Tuple[str, str], ...]): (suffix, replacement)
+            pairs, longest suffix first
+        min_stem (int): Shortest stem left after stripping a suffix
+        keep (Tuple[str, ...]): Word endings that no shorter suffix is
+            stripped from, such as 'ss' in 'class'
+        undouble (bool): Whether a doubled final consonant left by
+            stripping a suffix starting with a vowel is reduced, as in
+            'running' to 'run'
+    """
+
+    def __init__(self, suffixes: Iterable[Tuple[str, str]], min_stem: int = 3,
+                 keep: Sequence[str] = (), undouble: bool = False) -> None:
+        """Initialize SuffixStemmer.
+
+        Args:
+            suffixes (Iterable[Tuple[str, str]]): (suffix, replacement) pairs
+            min_stem (int): Shortest stem left after stripping a suffix
+            keep (Sequence[str]): Word endings protected from shorter suffixes
+            undouble (bool): Reduce a doubled final consonant of the stem
+        """
+        self.suffixes = tuple(sorted(suffixes, key=lambda rule: -len(rule[0])))
+        self.min_stem = min_stem
+        self.keep = tuple(keep)
+        self.undouble = undouble
+
+    def stem(self, word: str) -> str:
+        """Get the stem of a lowercase word.
+
+        Args:
+            word (str): Word to stem
+
+        Returns:
+            str: Stem of the word, the word itself if no suffix applies
+        """
+        kept = max((len(ending) for ending in self.keep if word.endswith(ending)), default=0)
+        for suffix, replacement in self.suffixes:
+            if len(suffix) <= kept:
+                break
+            if word.endswith(suffix) and len(word) - len(suffix) >= self.min_stem:
+                stem = word[:len(word) - len(suffix)]
+                if (self.undouble and not replacement and len(suffix) > 1
+                        and suffix[0] in "aeiou" and stem[-1] == stem[-2]
+                        and stem[-1] not in "aeioulsz"):
+                    stem = stem[:-1]
+                return stem + replacement
+        return word
+
+
+class Lemmatizer:
+    """Lexicon-based lemmatizer with conservative inflection rules.
+
+    Irregular forms are looked up in a lexicon. Other words are reduced
+    by the first matching rule, which only covers regular inflections
+    whose base form is unambiguous, and are kept as they are otherwise.
+
+    Attributes:
+        lexicon (Mapping[str, str]): Irregular forms and their lemmas
+        rules (SuffixStemmer): Regular inflections and their base endings
+    """
+
+    def __init__(self, lexicon: Mapping[str, str],
+                 rules: Optional[SuffixStemmer] = None) -> None:
+        """Initialize Lemmatizer.
+
+        Args:
+            lexicon (Mapping[str, str]): Irregular forms and their lemmas
+            rules (Optional[SuffixStemmer]): Regular inflection rules, None
+                to lemmatize lexicon entries only
+        """
+        self.lexicon = lexicon
+        self.rules = rules or SuffixStemmer(())
+
+    def lemmatize(self, word: str) -> str:
+        """Get the lemma of a lowercase word.
+
+        Args:
+            word (str): Word to lemmatize
+
+        Returns:
+            str: Lemma of the word, the word itself if unknown
+        """
+        lemma = self.lexicon.get(word)
+        return lemma if lemma is not None else self.rules.stem(word)
+
+
+def _forms(entries: Mapping[str, str]) -> Dict[str, str]:
+    """Expand 'form form ...' -> lemma entries into a form lexicon."""
+    return {form: lemma for forms, lemma in entries.items() for form in forms.split()}
+
+
+STEMMERS: Dict[str, SuffixStemmer] = {
+    "en": SuffixStemmer((
+        ("ational", "ate"), ("tional", "tion"), ("ization", "ize"), ("fulness", "ful"),
+        ("iveness", "ive"), ("ousness", "ous"), ("ations", "ate"), ("ation", "ate"),
+        ("ments", ""), ("ment", ""), ("nesses", ""), ("ness", ""), ("ingly", ""),
+        ("edly", ""), ("ings", ""), ("ing", ""), ("ions", ""), ("ion", ""), ("ies", "y"), ("ied", "y"),
+        ("sses", "ss"), ("ed", ""), ("es", ""), ("s", ""), ("e", "")
+    ), keep=("ss", "us", "is"), undouble=True),
+    "uk": SuffixStemmer((
+        ("ами", ""), ("ями", ""), ("ові", ""), ("еві", ""), ("ах", ""), ("ях", ""),
+        ("ом", ""), ("ем", ""), ("єм", ""), ("ою", ""), ("ею", ""), ("єю", ""), ("ів", ""),
+        ("їв", ""), ("ого", ""), ("ому", ""), ("ими", ""), ("іми", ""), ("ий", ""),
+        ("ій", ""), ("их", ""), ("іх", ""), ("ої", ""), ("им", ""), ("ім", ""), ("ати", ""),
+        ("яти", ""), ("ити", ""), ("іти", ""), ("ться", ""), ("тися", ""), ("тись", ""),
+        ("лася", ""), ("лися", ""), ("лося", ""), ("вся", ""), ("ючи", ""), ("ячи", ""),
+        ("ють", ""), ("ять", ""), ("уть", ""), ("ить", ""), ("ать", ""), ("ємо", ""),
+        ("емо", ""), ("имо", ""), ("ете", ""), ("єте", ""), ("ите", ""), ("еш", ""),
+        ("єш", ""), ("иш", ""), ("ла", ""), ("ло", ""), ("ли", ""), ("ти", ""), ("а", ""),
+        ("я", ""), ("о", ""), ("е", ""), ("є", ""), ("у", ""), ("ю", ""), ("і", ""),
+        ("и", ""), ("ї", ""), ("й", ""), ("ь", ""), ("в", "")
+    )),
+    "de": SuffixStemmer((
+        ("ungen", "ung"), ("heiten", "heit"), ("keiten", "keit"), ("ern", ""), ("em", ""),
+        ("er", ""), ("en", ""), ("es", ""), ("nd", ""), ("e", ""), ("s", ""), ("n", "")
+    )),
+}
+
+LEMMATIZERS: Dict[str, Lemmatizer] = {
+    "en": Lemmatizer(_forms({
+        "am is are was were been being": "be", "has had having": "have",
+        "does did done doing": "do", "goes went gone going": "go", "said says": "say",
+        "made making": "make", "took taken taking": "take", "came coming": "come",
+        "saw seen seeing": "see", "got gotten getting": "get", "gave given giving": "give",
+        "knew known": "know", "thought": "think", "told": "tell", "became becoming": "become",
+        "found": "find", "left": "leave", "felt": "feel", "brought": "bring",
+        "began begun beginning": "begin", "kept": "keep", "held": "hold",
+        "wrote written writing": "write", "stood": "stand", "heard": "hear", "meant": "mean",
+        "ran running": "run", "sat sitting": "sit", "spoke spoken": "speak", "led": "lead",
+        "grew grown": "grow", "lost": "lose", "fell fallen": "fall", "sent": "send",
+        "built": "build", "understood": "understand", "drew drawn": "draw",
+        "broke broken": "break", "spent": "spend", "rose risen": "rise", "drove driven": "drive",
+        "bought": "buy", "wore worn": "wear", "chose chosen": "choose", "sought": "seek",
+        "threw thrown": "throw", "caught": "catch", "taught": "teach", "ate eaten": "eat",
+        "fought": "fight", "flew flown": "fly", "forgot forgotten": "forget", "sang sung": "sing",
+        "men": "man", "women": "woman", "children": "child", "people": "person",
+        "feet": "foot", "teeth": "tooth", "mice": "mouse", "geese": "goose",
+        "lives": "life", "wives": "wife", "knives": "knife", "leaves": "leaf",
+        "better best": "good", "worse worst": "bad"
+    }), SuffixStemmer((
+        ("ies", "y"), ("sses", "ss"), ("xes", "x"), ("ches", "ch"), ("shes", "sh"), ("s", "")
+    ), keep=("ss", "us", "is"))),
+    "uk": Lemmatizer(_forms({
+        "є був була було були буде будуть будемо будеш буду": "бути",
+        "мене мені мною": "я", "тебе тобі тобою": "ти", "його йому ним": "він",
+        "її їй нею неї": "вона", "нас нам нами": "ми", "вас вам вами": "ви",
+        "їх їм ними них": "вони", "люди людей людям людьми": "людина",
+        "діти дітей дітям дітьми": "дитина", "очі очей": "око", "вуха вух": "вухо",
+        "мав мала мало мали має мають": "мати", "міг могла могло могли може можуть": "могти",
+        "йшов йшла йшло йшли йде йдуть": "йти", "сказав сказала сказали": "сказати"
+    })),
+    "de": Lemmatizer(_forms({
+        "bin bist ist sind seid war warst waren wart gewesen": "sein",
+        "habe hast hat haben habt hatte hatten gehabt": "haben",
+        "werde wirst wird werden werdet wurde wurden geworden": "werden",
+        "kann kannst können konnte konnten": "können", "muss musst müssen musste": "müssen",
+        "will willst wollen wollte wollten": "wollen", "ging gingen gegangen": "gehen",
+        "kam kamen gekommen": "kommen", "sah sahen gesehen": "sehen",
+        "gab gaben gegeben": "geben", "nahm nahmen genommen": "nehmen",
+        "sagte sagten gesagt": "sagen", "machte machten gemacht": "machen",
+        "kinder kindern": "kind", "männer männern": "mann", "frauen": "frau",
+        "häuser häusern": "haus", "jahre jahren": "jahr", "tage tagen": "tag"
+    })),
+}
+
+
+class WordNormalizer:
+    """Memoized normalizer of word forms counted as word frequencies.
+
+    Stopwords of the language are dropped, and the remaining words are
+    optionally reduced to their stems or lemmas. Every distinct form is
+    normalized once: results are memoized in an LRU cache, which texts
+    following Zipf's law hit for nearly every token. A normalizer is
+    pickled by its settings, so worker processes start with an empty
+    cache of their own.
+
+    Attributes:
+        language (str): Code of the language of the stopwords and rules
+        stopwords (bool): Whether stopwords are dropped
+        mode (Optional[str]): 'stem' or 'lemma', None to keep word forms
+        cache_size (int): Maximum number of memoized forms
+        normalize (Callable[[str], Optional[str]]): Memoized normalizer of
+            one lowercase word, returning None for a stopword
+    """
+
+    def __init__(self, language: str = DEFAULT_LANGUAGE, stopwords: bool = True,
+                 mode: Optional[str] = None, cache_size: int = 65536) -> None:
+        """Initialize WordNormalizer.
+
+        Args:
+            language (str): Language code, a key of STOPWORDS
+            stopwords (bool): Drop stopwords of the language
+            mode (Optional[str]): 'stem' or 'lemma' to reduce word forms,
+                None to keep them
+            cache_size (int): Maximum number of memoized forms
+
+        Raises:
+            ValidationError: If the language, mode or cache size is not
+                supported
+        """
+        if language not in STOPWORDS:
+            raise ValidationError(f"Unsupported normalization language: {language}")
+        if mode is not None and mode not in MODES:
+            raise ValidationError(f"Unsupported normalization mode: {mode}")
+        if cache_size < 1:
+            raise ValidationError("Normalizer cache size must be a positive integer")
+        self.language = language
+        self.stopwords = stopwords
+        self.mode = mode
+        self.cache_size = cache_size
+        self._stopwords = STOPWORDS[language] if stopwords else frozenset()
+        if mode == "stem":
+            self._reduce = STEMMERS[language].stem
+        elif mode == "lemma":
+            self._reduce = LEMMATIZERS[language].lemmatize
+        else:
+            self._reduce = None
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+
+    def __reduce__(self):
+        """Pickle the normalizer by its settings, without the cache."""
+        return WordNormalizer, (self.language, self.stopwords, self.mode, self.cache_size)
+
+    def normalize_all(self, words: Iterable[str]) -> List[str]:
+        """Normalize lowercase words, dropping stopwords.
+
+        Args:
+            words (Iterable[str]): Lowercase words in text order
+
+        Returns:
+            List[str]: Normalized forms of the words that are kept
+        """
+        return [form for form in map(self.normalize, words) if form is not None]
+
+    def cache_info(self):
+        """Get hit and miss counts of the memoized forms.
+
+        Returns:
+            CacheInfo: Hits, misses, maximum and current size of the cache
+        """
+        return self.normalize.cache_info()
+
+    def describe(self) -> Dict[str, Any]:
+        """Describe the normalization for saved results.
+
+        Returns:
+            Dict[str, Any]: Language, whether stopwords are dropped, and the mode
+        """
+        return {"language": self.language, "stopwords": self.stopwords, "mode": self.mode}
+
+    def _normalize(self, word: str) -> Optional[str]:
+        """Normalize one lowercase word form, without memoization.
+
+        Args:
+            word (str): Lowercase word
+
+        Returns:
+            Optional[str]: Normalized form, None for a stopword
+        """
+        if word in self._stopwords:
+            return None
+        return self._reduce(word) if self._reduce is not None else word
@@ -0,0 +1,141 @@
+import heapq
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class WordTable:
+    """Compact word frequency table with interned vocabulary ids.
+
+    Every distinct word is stored once and mapped to an integer id assigned
+    in order of first occurrence; counts live in a typed array indexed by
+    id instead of one boxed int per word. The total number of words and the
+    sum of their lengths are accumulated while counting, so no list of
+    tokens has to be kept.
+
+    Attributes:
+        vocabulary (Dict[str, int]): Word to id mapping in first-occurrence order
+        counts (array): Count of every word, indexed by id
+        total (int): Total number of counted words
+        length_sum (int): Sum of lengths of all counted words
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty WordTable."""
+        self.vocabulary: Dict[str, int] = {}
+        self.counts = array('Q')
+        self.total = 0
+        self.length_sum = 0
+
+    def __len__(self) -> int:
+        """Get the number of distinct words."""
+        return len(self.vocabulary)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over distinct words in first-occurrence order."""
+        return iter(self.vocabulary)
+
+    def __contains__(self, word: str) -> bool:
+        """Check whether a word was counted."""
+        return word in self.vocabulary
+
+    def count(self, word: str) -> int:
+        """Get the frequency of a word.
+
+        Args:
+            word (str): Word to look up
+
+        Returns:
+            int: Number of occurrences, 0 for unknown words
+        """
+        index = self.vocabulary.get(word)
+        return 0 if index is None else self.counts[index]
+
+    def update(self, words: Iterable[str]) -> None:
+        """Count a batch of words.
+
+        The batch is pre-aggregated so the table is touched once per
+        distinct word rather than once per token.
+
+        Args:
+            words (Iterable[str]): Words in text order
+        """
+        self._add_counts(Counter(words).items())
+
+    def merge(self, other: "WordTable") -> None:
+        """Add counts of a table built from the text following this one.
+
+        Args:
+            other (WordTable): Table of the following part of the text
+        """
+        self._add_counts(other.pairs())
+
+    def pairs(self) -> Iterator[Tuple[str, int]]:
+        """Iterate over words and counts in first-occurrence order.
+
+        Returns:
+            Iterator[Tuple[str, int]]: Word and its count
+        """
+        counts = self.counts
+        for word, index in self.vocabulary.items():
+            yield word, counts[index]
+
+    def items(self) -> Iterator[Tuple[str, int, Tuple[int, int]]]:
+        """Iterate over counts in word order.
+
+        Returns:
+            Iterator[Tuple[str, int, Tuple[int, int]]]: Word, its count and
+                its first-occurrence key
+        """
+        counts = self.counts
+        for word, index in sorted(self.vocabulary.items()):
+            yield word, counts[index], (0, index)
+
+    def most_common(self, n: int) -> List[Tuple[str, int]]:
+        """Get the N most common words.
+
+        Ties are broken by first occurrence, as in Counter.most_common.
+
+        Args:
+            n (int): Number of words to return
+
+        Returns:
+            List[Tuple[str, int]]: Words and their counts
+        """
+        top = heapq.nlargest(n, range(len(self.counts)), key=self.counts.__getitem__)
+        words = list(self.vocabulary)
+        return [(words[index], self.counts[index]) for index in top]
+
+    def iter_most_common(self) -> Iterator[Tuple[str, int]]:
+        """Iterate over all words in the order of most_common.
+
+        Returns:
+            Iterator[Tuple[str, int]]: Words and their counts
+        """
+        return iter(self.most_common(len(self.counts)))
+
+    def close(self) -> None:
+        """Release resources; the in-memory table holds none."""
+
+    def _add_counts(self, pairs: Iterable[Tuple[str, int]]) -> None:
+        """Add aggregated counts to the table.
+
+        Args:
+            pairs (Iterable[Tuple[str, int]]): Words and their counts in
+                first-occurrence order
+        """
+        vocabulary = self.vocabulary
+        counts = self.counts
+        total = 0
+        length_sum = 0
+        for word, count in pairs:
+            index = vocabulary.get(word)
+            if index is None:
+                vocabulary[word] = len(counts)
+                counts.append(count)
+            else:
+                counts[index] += count
+            total += count
+            length_sum += len(word) * count
+        self.total += total
+        self.length_sum += length_sum
@@ -1,6 +1,7 @@
 import pytest
 from pathlib import Path
 from typing import Dict, Any
+import hashlib
 import json
 
 
@@ -165,3 +166,292 @@ def json_output_file(tmp_path: Path, sample_analysis_results: Dict[str, Any]) ->
     with open(file_path, 'w') as f:
         json.dump(sample_analysis_results, f)
     return file_path
+
+
+class S3StandIn:
+    """Minimal S3-compatible server over a local directory, like a local MinIO.
+
+    Serves ListObjectsV2 with pagination, HEAD, ranged GET and PUT of
+    the objects of one bucket, checks the Signature Version 4 of every
+    request and counts the connections opened by clients.
+
+    Attributes:
+        root (Path): Directory holding the objects of the bucket
+        bucket (str): Name of the bucket
+        access_key (str): Accepted access key id
+        secret_key (str): Accepted secret access key
+        max_keys (int): Number of objects per listing page
+        connections (int): Number of connections accepted so far
+        requests (list): Method and path of every request served
+    """
+
+    def __init__(self, root: Path, bucket: str = "corpus") -> None:
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        import threading
+
+        self.root = root
+        self.bucket = bucket
+        self.access_key = "minio"
+        self.secret_key = "minio-secret"
+        self.max_keys = 2
+        self.connections = 0
+        self.requests = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                stand_in.connections += 1
+                super().setup()
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stand_in.handle(self, "GET")
+
+            def do_HEAD(self):
+                stand_in.handle(self, "HEAD")
+
+            def do_PUT(self):
+                stand_in.handle(self, "PUT")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       kwargs={"poll_interval": 0.05}, daemon=True)
+        self.thread.start()
+        self.endpoint = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def storage(self, prefix: str = "", **options):
+        """Create an S3Storage client of the bucket."""
+        from src.modules.storage import S3Storage
+
+        return S3Storage(self.endpoint, self.bucket, prefix, self.access_key,
+                         self.secret_key, **options)
+
+    def handle(self, request, method: str) -> None:
+        """Serve one request."""
+        from urllib.parse import parse_qsl, unquote, urlsplit
+        from src.modules.storage import sign_v4
+
+        parts = urlsplit(request.path)
+        path = unquote(parts.path)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        body = request.rfile.read(int(request.headers.get("Content-Length", 0)))
+        self.requests.append((method, path))
+
+        authorization = request.headers.get("Authorization", "")
+        signed = authorization.partition("SignedHeaders=")[2].partition(",")[0].split(";")
+        headers = {name: request.headers[name] for name in signed if name != "host"}
+        expected = sign_v4(method, request.headers["Host"], path, query, headers,
+                           request.headers["x-amz-content-sha256"], self.access_key,
+                           self.secret_key, "us-east-1", request.headers["x-amz-date"])
+        if authorization != expected:
+            return self.respond(request, 403, b"<Error><Code>SignatureDoesNotMatch</Code></Error>")
+
+        bucket, _, key = path.lstrip("/").partition("/")
+        if bucket != self.bucket:
+            return self.respond(request, 404)
+        if not key:
+            return self.respond(request, 200, self.listing(query), method == "HEAD")
+        target = self.root / key
+        if method == "PUT":
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(body)
+            return self.respond(request, 200)
+        if not target.is_file():
+            return self.respond(request, 404, b"<Error><Code>NoSuchKey</Code></Error>",
+                                method == "HEAD")
+        data = target.read_bytes()
+        if method == "HEAD":
+            etag = '"' + hashlib.md5(data).hexdigest() + '"'
+            return self.respond(request, 200, data, head=True, headers={"ETag": etag})
+        byte_range = request.headers.get("Range")
+        if byte_range is None:
+            return self.respond(request, 200, data)
+        first, _, last = byte_range[len("bytes="):].partition("-")
+        if int(first) >= len(data):
+            return self.respond(request, 416)
+        self.respond(request, 206, data[int(first):int(last) + 1])
+
+    def listing(self, query) -> bytes:
+        """Build a ListObjectsV2 page of the objects under the prefix."""
+        prefix = query.get("prefix", "")
+        keys = sorted(
+            str(path.relative_to(self.root)) for path in self.root.rglob("*") if path.is_file()
+        )
+        keys = [key for key in keys if key.startswith(prefix) and "/" not in key[len(prefix):]]
+        start = int(query.get("continuation-token", "0"))
+        page = keys[start:start + self.max_keys]
+        truncated = start + self.max_keys < len(keys)
+        contents = "".join(
+            f"<Contents><Key>{key}</Key><Size>{(self.root / key).stat().st_size}</Size></Contents>"
+            for key in page
+        )
+        token = f"<NextContinuationToken>{start + self.max_keys}</NextContinuationToken>"
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+            f"<Name>{self.bucket}</Name><Prefix>{prefix}</Prefix>{contents}"
+            f"<IsTruncated>{'true' if truncated else 'false'}</IsTruncated>"
+            f"{token if truncated else ''}</ListBucketResult>"
+        ).encode("utf-8")
+
+    @staticmethod
+    def respond(request, status: int, body: bytes = b"", head: bool = False,
+                headers=None) -> None:
+        """Send a response, without the body for HEAD requests."""
+        request.send_response(status)
+        request.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.end_headers()
+        if not head:
+            request.wfile.write(body)
+
+    def close(self) -> None:
+        """Stop the server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def s3_server(tmp_path: Path):
+    """Run an S3-compatible stand-in server for the duration of a test.
+
+    Args:
+        tmp_path: pytest fixture providing temporary directory
+
+    Yields:
+        S3StandIn: Server storing its bucket under tmp_path
+    """
+    root = tmp_path / "s3"
+    root.mkdir()
+    server = S3StandIn(root)
+    yield server
+    server.close()
+
+
+PERF_BASELINE_PATH = Path(__file__).parent / "perf_baseline.json"
+# Measurements compared against the baseline, by the direction of a regression
+PERF_HIGHER_IS_BETTER = ("mb-per-second", "tokens-per-second")
+PERF_LOWER_IS_BETTER = ("peak-memory-bytes",)
+
+
+def pytest_addoption(parser):
+    """Add the options running the performance tests."""
+    group = parser.getgroup("perf", "performance regression tests")
+    group.addoption("--perf", action="store_true",
+                    help="run the tests marked perf and compare them against the baseline")
+    group.addoption("--update-perf-baseline", action="store_true",
+                    help="run the tests marked perf and store their measurements as the baseline")
+
+
+def pytest_configure(config):
+    """Register the perf marker."""
+    config.addinivalue_line(
+        "markers", "perf: performance test compared against tests/perf_baseline.json, "
+                   "run with --perf"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip the performance tests unless they were asked for."""
+    if config.getoption("--perf") or config.getoption("--update-perf-baseline"):
+        return
+    skip = pytest.mark.skip(reason="performance test, run with --perf")
+    for item in items:
+        if "perf" in item.keywords:
+            item.add_marker(skip)
+
+
+class PerfBaseline:
+    """Stored performance measurements of pipeline stages.
+
+    Throughput may drop and peak memory may grow by the tolerances of
+    the baseline file before a stage counts as regressed. With
+    ``update``, measurements replace the stored ones instead.
+
+    Attributes:
+        path (Path): Location of the baseline file
+        update (bool): Store measurements instead of comparing them
+        tolerances (Dict[str, float]): Allowed relative 'throughput' drop
+            and 'memory' growth
+        stages (Dict[str, Dict[str, float]]): Stored measurements by stage
+        measured (Dict[str, Dict[str, float]]): Measurements of this session
+    """
+
+    def __init__(self, path: Path, update: bool = False) -> None:
+        self.path = path
+        self.update = update
+        baseline = json.loads(path.read_text()) if path.exists() else {}
+        self.tolerances = baseline.get("tolerances", {"throughput": 0.5, "memory": 0.25})
+        self.stages = baseline.get("stages", {})
+        self.measured = {}
+
+    def check(self, stage: str, measurement: Dict[str, float]) -> None:
+        """Compare the measurement of a stage against its baseline, failing on regressions."""
+        self.measured[stage] = measurement
+        if self.update:
+            self.stages[stage] = measurement
+            return
+        baseline = self.stages.get(stage)
+        if baseline is None:
+            pytest.skip(f"No baseline for {stage}, run with --update-perf-baseline")
+
+        regressions = []
+        for name in PERF_HIGHER_IS_BETTER:
+            limit = baseline[name] * (1 - self.tolerances["throughput"])
+            if measurement[name] < limit:
+                regressions.append(f"{name} {measurement[name]:,.0f} < {limit:,.0f}")
+        for name in PERF_LOWER_IS_BETTER:
+            limit = baseline[name] * (1 + self.tolerances["memory"])
+            if measurement[name] > limit:
+                regressions.append(f"{name} {measurement[name]:,.0f} > {limit:,.0f}")
+        if regressions:
+            pytest.fail(f"Performance regression in {stage}: {'; '.join(regressions)}")
+
+    def save(self) -> None:
+        """Write the baseline file with the machine it was measured on."""
+        import platform
+
+        baseline = {
+            "machine": {"python": platform.python_version(), "platform": platform.platform()},
+            "tolerances": self.tolerances,
+            "stages": dict(sorted(self.stages.items())),
+        }
+        self.path.write_text(json.dumps(baseline, indent=2) + "\n")
+
+
+@pytest.fixture(scope="session")
+def perf_baseline(pytestconfig):
+    """Provide the performance baseline, saved at the end of an update run.
+
+    Args:
+        pytestconfig: pytest fixture providing the session configuration
+
+    Yields:
+        PerfBaseline: Baseline stored in tests/perf_baseline.json
+    """
+    baseline = PerfBaseline(PERF_BASELINE_PATH, pytestconfig.getoption("--update-perf-baseline"))
+    pytestconfig.perf_measurements = baseline.measured
+    yield baseline
+    if baseline.update:
+        baseline.save()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Report the measurements of the performance tests that ran."""
+    measured = getattr(config, "perf_measurements", None)
+    if not measured:
+        return
+    terminalreporter.section("performance")
+    for stage, measurement in sorted(measured.items()):
+        terminalreporter.write_line(
+            f"{stage:<24} {measurement['mb-per-second']:8.2f} MB/s "
+            f"{measurement['tokens-per-second']:12,.0f} tokens/s "
+            f"{measurement['peak-memory-bytes'] / 2 ** 20:8.1f} MiB peak"
+        )
@@ -0,0 +1,301 @@
+# tests/test_analysis_engine.py
+import dataclasses
+import random
+import pytest
+from src.modules.analysis_engine import AnalysisEngine, scan_range
+from src.modules.deadline import Deadline
+from src.modules.file_handler import FileHandler
+from src.modules.memory_budget import MemoryBudget
+from src.modules.shared_transport import SharedWordTable
+from src.modules.text_analyzer import TextAnalyzer, TextStatistics
+from src.modules.validators import FileValidator
+from src.modules.window_statistics import WindowStatistics
+from src.modules.word_normalizer import WordNormalizer
+from src.modules.exceptions import AnalysisError, FileError
+
+
+@pytest.fixture
+def file_handler():
+    """Create a FileHandler with a real validator"""
+    return FileHandler(FileValidator())
+
+
+@pytest.fixture
+def corpus_file(tmp_path):
+    """Create a multi-line file with sentences and mixed scripts"""
+    rng = random.Random(11)
+    vocabulary = ["Alpha", "beta", "гамма", "delta", "епсилон", "zeta_2", "42"]
+    lines = []
+    for _ in range(400):
+        words = rng.choices(vocabulary, k=rng.randint(1, 12))
+        lines.append(" ".join(words) + rng.choice([".", "!", "?", ",", ""]))
+    path = tmp_path / "corpus.txt"
+    path.write_text("\r\n".join(lines), encoding='utf-8')
+    return path
+
+
+def results(analyzer):
+    """Collect every metric of an analyzer"""
+    return (
+        analyzer.get_symbol_counts(),
+        analyzer.get_sentence_count(),
+        analyzer.get_word_count(),
+        analyzer.get_most_frequent_words(),
+        analyzer.get_average_word_length(),
+        analyzer.get_symbol_frequency(),
+    )
+
+
+class TestAnalysisEngine:
+    """Test suite for AnalysisEngine class"""
+
+    def test_matches_in_memory_analysis(self, file_handler, corpus_file):
+        """Test that streamed analysis equals analysis of the whole text"""
+        expected = results(TextAnalyzer(file_handler.read_file(str(corpus_file)), n=5))
+        engine = AnalysisEngine(file_handler, MemoryBudget(1))
+
+        analyzer = engine.analyze_file(str(corpus_file), n=5)
+        try:
+            assert results(analyzer) == expected
+            assert analyzer.text is None
+        finally:
+            analyzer.close()
+
+    def test_sharded_scan_matches(self, file_handler, corpus_file, tmp_path):
+        """Test that merged shard statistics equal a single scan"""
+        expected = results(TextAnalyzer(file_handler.read_file(str(corpus_file)), n=5))
+        budget = MemoryBudget(1, str(tmp_path))
+
+        parts = [
+            scan_range(str(corpus_file), 'utf-8', start, end, budget)
+            for start, end in file_handler.shard_ranges(str(corpus_file), 7)
+        ]
+        statistics = parts[0]
+        for part in parts[1:]:
+            statistics.merge(part)
+
+        assert len(parts) == 7
+        assert results(TextAnalyzer.from_statistics(statistics, n=5)) == expected
+        statistics.close()
+
+    def test_parallel_workers(self, file_handler, corpus_file, mocker):
+        """Test analysis split across worker processes"""
+        expected = results(TextAnalyzer(file_handler.read_file(str(corpus_file)), n=5))
+        budget = MemoryBudget(2 ** 30)
+        mocker.patch.object(budget, 'worker_count', return_value=3)
+
+        analyzer = AnalysisEngine(file_handler, budget).analyze_file(str(corpus_file), n=5)
+        try:
+            assert results(analyzer) == expected
+        finally:
+            analyzer.close()
+
+    def test_parallel_shared_memory(self, file_handler, tmp_path, mocker):
+        """Test that word tables sent through shared memory merge exactly"""
+        rng = random.Random(5)
+        words = [f"w{index}" for index in range(5000)]
+        path = tmp_path / "wide.txt"
+        path.write_text(" ".join(rng.choices(words, k=40000)) + ".", encoding='utf-8')
+        expected = results(TextAnalyzer(file_handler.read_file(str(path)), n=5))
+        file_handler.config = dataclasses.replace(file_handler.config, SHARED_MEMORY_MIN_WORDS=1)
+        budget = MemoryBudget(2 ** 30)
+        mocker.patch.object(budget, 'worker_count', return_value=3)
+        close = mocker.spy(SharedWordTable, 'close')
+
+        analyzer = AnalysisEngine(file_handler, budget).analyze_file(str(path), n=5)
+        try:
+            assert results(analyzer) == expected
+            assert close.call_count == 3
+        finally:
+            analyzer.close()
+
+    def test_failed_merge_closes_all_shards(self, file_handler, tmp_path, mocker):
+        """Test that every shard segment, including the first, is removed when merging fails"""
+        path = tmp_path / "wide.txt"
+        path.write_text(" ".join(f"w{index}" for index in range(5000)) + ".", encoding='utf-8')
+        file_handler.config = dataclasses.replace(file_handler.config, SHARED_MEMORY_MIN_WORDS=1)
+        budget = MemoryBudget(2 ** 30)
+        mocker.patch.object(budget, 'worker_count', return_value=3)
+        mocker.patch.object(TextStatistics, 'merge', side_effect=AnalysisError("merge failed"))
+        close = mocker.spy(SharedWordTable, 'close')
+
+        with pytest.raises(AnalysisError):
+            AnalysisEngine(file_handler, budget).analyze_file(str(path), n=5)
+        assert close.call_count == 3
+
+    @pytest.mark.parametrize("encoding,expected", [
+        ('utf-8-sig', 'utf-8'), ('utf-16', 'utf-16-le'), ('cp1251', 'cp1251')
+    ])
+    def test_detected_encodings(self, file_handler, corpus_file, tmp_path, mocker,
+                                encoding, expected):
+        """Test analysis of files with byte order marks and other encodings"""
+        text = file_handler.read_file(str(corpus_file))
+        path = tmp_path / "encoded.txt"
+        path.write_bytes(text.encode(encoding))
+        budget = MemoryBudget(2 ** 30)
+        mocker.patch.object(budget, 'worker_count', return_value=3)
+
+        analyzer = AnalysisEngine(file_handler, budget).analyze_file(str(path), n=5)
+        try:
+            assert results(analyzer) == results(TextAnalyzer(text, n=5))
+            assert analyzer.get_encoding() == expected
+        finally:
+            analyzer.close()
+
+    def test_parallel_ngrams(self, file_handler, corpus_file, mocker):
+        """Test that n-grams of merged shards equal a single scan"""
+        text = file_handler.read_file(str(corpus_file))
+        expected = TextAnalyzer(text, n=5, ngram_order=3).get_ngram_statistics()
+        budget = MemoryBudget(2 ** 30)
+        mocker.patch.object(budget, 'worker_count', return_value=3)
+
+        engine = AnalysisEngine(file_handler, budget, ngram_order=3)
+        analyzer = engine.analyze_file(str(corpus_file), n=5)
+        try:
+            assert analyzer.get_ngram_statistics() == expected
+        finally:
+            analyzer.close()
+
+    def test_digest_while_scanning(self, file_handler, tmp_path, mocker):
+        """Test that a file read in one pass is hashed with its byte order mark"""
+        path = tmp_path / "bom.txt"
+        path.write_text("Alpha beta. Gamma delta!" * 50, encoding='utf-8-sig')
+        budget = MemoryBudget(2 ** 30)
+        engine = AnalysisEngine(file_handler, budget)
+
+        analyzer = engine.analyze_file(str(path), n=2, digest=True)
+        assert analyzer.statistics.content_digest == file_handler.hash_file(str(path))
+        assert engine.analyze_file(str(path), n=2).statistics.content_digest is None
+
+        mocker.patch.object(budget, 'worker_count', return_value=3)
+        analyzer = engine.analyze_file(str(path), n=2, digest=True)
+        try:
+            assert analyzer.statistics.content_digest is None
+        finally:
+            analyzer.close()
+
+    def test_parallel_concordance(self, file_handler, corpus_file, mocker, tmp_path):
+        """Test that the concordance of merged shards equals a single scan"""
+        budget = MemoryBudget(2 ** 30)
+        mocker.patch.object(budget, 'worker_count', return_value=3)
+        single = scan_range(str(corpus_file), 'utf-8', 0, None, budget, concordance=True)
+
+        engine = AnalysisEngine(file_handler, budget, concordance=True)
+        analyzer = engine.analyze_file(str(corpus_file), n=5)
+        try:
+            merged = analyzer.statistics.tokens
+            assert list(merged.vocabulary) == list(single.tokens.vocabulary)
+            assert merged.ids == single.tokens.ids
+        finally:
+            analyzer.close()
+            single.close()
+
+    def test_parallel_metrics(self, file_handler, corpus_file, mocker):
+        """Test that custom metrics of merged shards equal a single scan"""
+        names = ["line-count", "longest-word", "words-per-sentence"]
+        text = file_handler.read_file(str(corpus_file))
+        expected = TextAnalyzer(text, n=5, metrics=names).get_metric_results()
+        budget = MemoryBudget(2 ** 30)
+        mocker.patch.object(budget, 'worker_count', return_value=3)
+
+        analyzer = AnalysisEngine(file_handler, budget, metrics=names).analyze_file(
+            str(corpus_file), n=5
+        )
+        try:
+            assert analyzer.get_metric_results() == expected
+            assert expected["line-count"] == 400
+        finally:
+            analyzer.close()
+
+    def test_parallel_normalizer(self, file_handler, corpus_file, mocker):
+        """Test that workers normalize words like a single scan"""
+        normalizer = WordNormalizer("en", mode="stem")
+        text = file_handler.read_file(str(corpus_file))
+        expected = TextAnalyzer(text, n=5, normalizer=normalizer)
+        budget = MemoryBudget(2 ** 30)
+        mocker.patch.object(budget, 'worker_count', return_value=3)
+
+        analyzer = AnalysisEngine(file_handler, budget, normalizer=normalizer).analyze_file(
+            str(corpus_file), n=5
+        )
+        try:
+            assert results(analyzer) == results(expected)
+            assert "zeta_2" not in analyzer.get_most_frequent_words()
+            assert analyzer.get_normalization()["mode"] == "stem"
+        finally:
+            analyzer.close()
+
+    def test_parallel_from_object_storage(self, file_handler, corpus_file, s3_server, mocker):
+        """Test that shards of an object are read with ranged requests like a local file"""
+        expected = results(TextAnalyzer(file_handler.read_file(str(corpus_file)), n=5))
+        (s3_server.root / "corpus.txt").write_bytes(corpus_file.read_bytes())
+        file_handler.storage = s3_server.storage(pool_size=2)
+        budget = MemoryBudget(2 ** 30)
+        mocker.patch.object(budget, 'worker_count', return_value=3)
+
+        analyzer = AnalysisEngine(file_handler, budget).analyze_file("s3://corpus/corpus.txt", n=5)
+        try:
+            assert results(analyzer) == expected
+            assert analyzer.get_encoding() == "utf-8"
+            assert ("GET", "/corpus/corpus.txt") in s3_server.requests
+        finally:
+            analyzer.close()
+            file_handler.storage.close()
+
+    def test_windows_scan_sequentially(self, file_handler, corpus_file, mocker):
+        """Test that windows are emitted in file order despite parallel workers"""
+        budget = MemoryBudget(2 ** 30)
+        mocker.patch.object(budget, 'worker_count', return_value=3)
+        records = []
+        windows = WindowStatistics("lines", 100, sink=records.append)
+
+        analyzer = AnalysisEngine(file_handler, budget).analyze_file(str(corpus_file), 5, windows)
+        try:
+            assert [record["start-line"] for record in records] == [1, 101, 201, 301]
+            assert sum(record["word-count"] for record in records) == analyzer.get_word_count()
+        finally:
+            analyzer.close()
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_deadline_partial(self, file_handler, tmp_path, mocker, workers):
+        """Test that an expired deadline leaves the start of every shard"""
+        path = tmp_path / "long.txt"
+        path.write_text("alpha beta gamma. " * 20000, encoding='utf-8')
+        budget = MemoryBudget(1)
+        mocker.patch.object(budget, 'worker_count', return_value=workers)
+        deadline = Deadline(60)
+        deadline.expires_at = 0.0
+
+        analyzer = AnalysisEngine(file_handler, budget).analyze_file(str(path), n=2,
+                                                                     deadline=deadline)
+        try:
+            covered = workers * budget.chunk_size()
+            assert analyzer.is_partial()
+            assert analyzer.get_coverage() == round(covered / path.stat().st_size, 4)
+            assert analyzer.get_symbol_counts()["with_spaces"] == covered
+        finally:
+            analyzer.close()
+
+    def test_deadline_complete(self, file_handler, corpus_file):
+        """Test that analysis within the deadline is complete"""
+        expected = results(TextAnalyzer(file_handler.read_file(str(corpus_file)), n=5))
+        analyzer = AnalysisEngine(file_handler, MemoryBudget(1)).analyze_file(
+            str(corpus_file), n=5, deadline=Deadline(60))
+        try:
+            assert results(analyzer) == expected
+            assert not analyzer.is_partial()
+            assert analyzer.get_coverage() == 1.0
+        finally:
+            analyzer.close()
+
+    def test_no_words(self, file_handler, tmp_path):
+        """Test file without any words"""
+        path = tmp_path / "punctuation.txt"
+        path.write_text("... !!! ???", encoding='utf-8')
+        with pytest.raises(AnalysisError):
+            AnalysisEngine(file_handler, MemoryBudget(2 ** 20)).analyze_file(str(path), n=1)
+
+    def test_missing_file(self, file_handler):
+        """Test handling of nonexistent file"""
+        with pytest.raises(FileError):
+            AnalysisEngine(file_handler, MemoryBudget(2 ** 20)).analyze_file("/nonexistent.txt", n=1)
@@ -0,0 +1,288 @@
+# tests/test_batch_runner.py
+import json
+import os
+import pytest
+from src.modules.batch_runner import BatchRunner
+from src.modules.concordance import ConcordanceIndex
+from src.modules.exceptions import AnalysisError
+from src.modules.file_handler import FileHandler
+from src.modules.job_scheduler import JobScheduler
+from src.modules.memory_budget import MemoryBudget
+from src.modules.progress_journal import ProgressJournal
+from src.modules.validators import FileValidator
+
+
+@pytest.fixture
+def path_manager(tmp_path, mocker):
+    """Create a mock PathManager pointing at temporary directories"""
+    input_dir = tmp_path / "text-files"
+    output_dir = tmp_path / "text-analyzed"
+    input_dir.mkdir()
+    (input_dir / "a.txt").write_text("Alpha beta gamma. Beta gamma!", encoding='utf-8')
+    (input_dir / "b.txt").write_text("One two three. Two three?", encoding='utf-8')
+
+    manager = mocker.MagicMock()
+    manager.input_dir = str(input_dir)
+    manager.output_dir = str(output_dir)
+    manager.get_input_path.side_effect = lambda name: str(input_dir / name)
+    manager.get_result_path.side_effect = lambda name: str(output_dir / (name + ".json"))
+    manager.get_concordance_path.side_effect = lambda name: str(output_dir / (name + ".kwic"))
+    manager.get_frequency_run_path.side_effect = lambda name: str(output_dir / (name + ".freq"))
+    manager.get_windows_path.side_effect = lambda name: str(output_dir / (name + ".windows.ndjson"))
+    manager.ensure_output_dir_exists.side_effect = lambda: output_dir.mkdir(exist_ok=True)
+    return manager
+
+
+@pytest.fixture
+def journal(tmp_path):
+    """Create a ProgressJournal in a temporary directory"""
+    return ProgressJournal(str(tmp_path / "journal.jsonl"))
+
+
+@pytest.fixture
+def runner(path_manager, journal):
+    """Create a BatchRunner with real file handling"""
+    return BatchRunner(FileHandler(FileValidator()), path_manager, journal, max_retries=1)
+
+
+class TestBatchRunner:
+    """Test suite for BatchRunner class"""
+
+    def test_run_analyzes_all_files(self, runner, path_manager, journal, capsys):
+        """Test that every file is analyzed and journaled"""
+        summary = runner.run(n=2)
+
+        assert summary == {"completed": 2, "skipped": 0, "failed": 0}
+        entries = journal.load()
+        assert len(entries) == 2
+        for entry in entries.values():
+            assert entry["status"] == ProgressJournal.STATUS_DONE
+            with open(entry["output"], encoding='utf-8') as f:
+                assert json.load(f)["word-count"] == 5
+
+    def test_symbol_limit(self, path_manager, journal, capsys):
+        """Test that saved results keep only the most frequent symbols"""
+        runner = BatchRunner(FileHandler(FileValidator()), path_manager, journal,
+                             symbol_limit=3)
+        output_path, _ = runner.analyze_file("a.txt", n=2)
+
+        with open(output_path, encoding='utf-8') as f:
+            assert len(json.load(f)["symbols-frequency"]) == 3
+
+    @pytest.mark.parametrize("mode", ["report", "skip"])
+    def test_dedupe(self, path_manager, journal, mode, capsys):
+        """Test that near-duplicate files map to the canonical file"""
+        input_dir = path_manager.input_dir
+        text = " ".join(f"word{i}" for i in range(300)) + "."
+        with open(f"{input_dir}/c.txt", 'w', encoding='utf-8') as f:
+            f.write(text)
+        with open(f"{input_dir}/d.txt", 'w', encoding='utf-8') as f:
+            f.write(text + " One more sentence.")
+        runner = BatchRunner(FileHandler(FileValidator()), path_manager, journal, dedupe=mode)
+
+        assert runner.run(n=2) == {"completed": 4, "skipped": 0, "failed": 0}
+
+        with open(path_manager.get_result_path("d.txt"), encoding='utf-8') as f:
+            results = json.load(f)
+        assert results["duplicate-of"]["file"] == "c.txt"
+        assert ("word-count" in results) == (mode == "report")
+        with open(path_manager.get_result_path("c.txt"), encoding='utf-8') as f:
+            assert "duplicate-of" not in json.load(f)
+
+    def test_dedupe_resume_uses_persisted_index(self, path_manager, journal, capsys):
+        """Test that a resumed run finds duplicates of skipped files"""
+        input_dir = path_manager.input_dir
+        text = " ".join(f"word{i}" for i in range(300)) + "."
+        with open(f"{input_dir}/c.txt", 'w', encoding='utf-8') as f:
+            f.write(text)
+        handler = FileHandler(FileValidator())
+        BatchRunner(handler, path_manager, journal, dedupe="skip").run(n=2)
+
+        with open(f"{input_dir}/d.txt", 'w', encoding='utf-8') as f:
+            f.write(text)
+        summary = BatchRunner(handler, path_manager, journal, dedupe="skip").run(n=2, resume=True)
+
+        assert summary == {"completed": 1, "skipped": 3, "failed": 0}
+        with open(path_manager.get_result_path("d.txt"), encoding='utf-8') as f:
+            assert json.load(f) == {"duplicate-of": {"file": "c.txt", "similarity": 1.0}}
+
+    def test_concordance(self, path_manager, journal, capsys):
+        """Test that a concordance index is saved next to each result"""
+        runner = BatchRunner(FileHandler(FileValidator()), path_manager, journal,
+                             concordance=True)
+        runner.run(n=2)
+
+        with ConcordanceIndex(path_manager.get_concordance_path("a.txt")) as index:
+            assert index.count(["beta", "gamma"]) == 2
+        with ConcordanceIndex(path_manager.get_concordance_path("b.txt")) as index:
+            assert index.count(["three"]) == 2
+
+    def test_concordance_over_budget(self, path_manager, journal, capsys, mocker):
+        """Test that files too long to index keep their results without a concordance"""
+        mocker.patch.object(MemoryBudget, "concordance_limit", return_value=1)
+        runner = BatchRunner(FileHandler(FileValidator()), path_manager, journal,
+                             concordance=True)
+
+        assert runner.run(n=2)["failed"] == 0
+        assert "concordance of a.txt skipped" in capsys.readouterr().out
+        assert not os.path.exists(path_manager.get_concordance_path("a.txt"))
+        assert os.path.exists(path_manager.get_result_path("a.txt"))
+
+    def test_frequency_runs(self, path_manager, journal, capsys):
+        """Test that a frequency run is saved next to each result"""
+        runner = BatchRunner(FileHandler(FileValidator()), path_manager, journal,
+                             frequency_runs=True)
+        runner.run(n=2)
+
+        with open(path_manager.get_frequency_run_path("a.txt"), encoding='utf-8') as f:
+            assert f.read() == "alpha\t1\nbeta\t2\ngamma\t2\n"
+
+    def test_windows(self, path_manager, journal, capsys):
+        """Test that window statistics are streamed next to each result"""
+        runner = BatchRunner(FileHandler(FileValidator()), path_manager, journal,
+                             windows=("lines", 1))
+        runner.run(n=2)
+
+        with open(path_manager.get_windows_path("a.txt"), encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        assert [record["word-count"] for record in records] == [5]
+        with open(path_manager.get_result_path("a.txt"), encoding='utf-8') as f:
+            assert json.load(f)["windows"] == {"mode": "lines", "size": 1, "count": 1}
+
+    def test_invalid_dedupe_mode(self, path_manager, journal):
+        """Test rejection of unknown dedupe modes"""
+        with pytest.raises(ValueError):
+            BatchRunner(FileHandler(FileValidator()), path_manager, journal, dedupe="drop")
+
+    def test_resume_skips_completed(self, runner, capsys):
+        """Test that a resumed run skips files with unchanged content"""
+        runner.run(n=2)
+        summary = runner.run(n=2, resume=True)
+        assert summary == {"completed": 0, "skipped": 2, "failed": 0}
+
+    def test_resume_reprocesses_changed_file(self, runner, path_manager, capsys):
+        """Test that a changed content hash triggers re-analysis"""
+        runner.run(n=2)
+        with open(path_manager.get_input_path("a.txt"), 'a', encoding='utf-8') as f:
+            f.write(" Delta.")
+
+        summary = runner.run(n=2, resume=True)
+        assert summary == {"completed": 1, "skipped": 1, "failed": 0}
+
+    def test_resume_reprocesses_changed_settings(self, path_manager, journal, capsys):
+        """Test that files analyzed with other settings are analyzed again"""
+        file_handler = FileHandler(FileValidator())
+        BatchRunner(file_handler, path_manager, journal).run(n=2)
+
+        runner = BatchRunner(file_handler, path_manager, journal, symbol_limit=3)
+        assert runner.run(n=5, resume=True) == {"completed": 2, "skipped": 0, "failed": 0}
+        with open(path_manager.get_result_path("a.txt"), encoding='utf-8') as f:
+            assert "5-most-frequent-words" in json.load(f)
+        assert runner.run(n=5, resume=True) == {"completed": 0, "skipped": 2, "failed": 0}
+
+    def test_resume_does_not_read_unchanged_files(self, runner, mocker, capsys):
+        """Test that the resume check uses the file fingerprint, not its content"""
+        runner.run(n=2)
+        hash_file = mocker.spy(runner.file_handler, "hash_file")
+        analyze = mocker.spy(runner.engine, "analyze_file")
+
+        assert runner.run(n=2, resume=True) == {"completed": 0, "skipped": 2, "failed": 0}
+        assert hash_file.call_count == 0
+        assert analyze.call_count == 0
+
+    def test_resume_unversioned_files_by_content_hash(self, runner, mocker, capsys):
+        """Test that files without a version are matched by the hash taken during analysis"""
+        mocker.patch.object(runner.file_handler, "fingerprint",
+                            side_effect=lambda path: (os.path.getsize(path), None))
+        runner.run(n=2)
+        assert all(entry["sha256"] for entry in runner.journal.load().values())
+
+        assert runner.run(n=2, resume=True) == {"completed": 0, "skipped": 2, "failed": 0}
+
+    def test_without_resume_starts_over(self, runner, capsys):
+        """Test that a plain run ignores the previous journal"""
+        runner.run(n=2)
+        summary = runner.run(n=2)
+        assert summary == {"completed": 2, "skipped": 0, "failed": 0}
+
+    def test_retries_then_succeeds(self, runner, journal, mocker, capsys):
+        """Test that a transient failure is retried"""
+        original = runner.analyze_file
+        calls = {"count": 0}
+
+        def flaky(filename, n, **options):
+            calls["count"] += 1
+            if calls["count"] == 1:
+                raise OSError("transient")
+            return original(filename, n, **options)
+
+        mocker.patch.object(runner, "analyze_file", side_effect=flaky)
+        summary = runner.run(n=2)
+
+        assert summary == {"completed": 2, "skipped": 0, "failed": 0}
+        attempts = sorted(entry["attempts"] for entry in journal.load().values())
+        assert attempts == [1, 2]
+
+    def test_analysis_errors_not_retried(self, runner, journal, mocker, capsys):
+        """Test that a file that cannot be analyzed fails without further attempts"""
+        original = runner.analyze_file
+
+        def fail_a(filename, n, **options):
+            if filename == "a.txt":
+                raise AnalysisError("No valid words found")
+            return original(filename, n, **options)
+
+        patched = mocker.patch.object(runner, "analyze_file", side_effect=fail_a)
+        summary = runner.run(n=2)
+
+        assert summary == {"completed": 1, "skipped": 0, "failed": 1}
+        assert patched.call_count == 2
+        failed = [e for e in journal.load().values() if e["status"] == "failed"]
+        assert failed[0]["attempts"] == 1
+
+    def test_failure_recorded_and_retried_on_resume(self, runner, journal, mocker, capsys):
+        """Test that exhausted retries are journaled and resume retries only them"""
+        original = runner.analyze_file
+
+        def fail_a(filename, n, **options):
+            if filename == "a.txt":
+                raise OSError("disk error")
+            return original(filename, n, **options)
+
+        patched = mocker.patch.object(runner, "analyze_file", side_effect=fail_a)
+        summary = runner.run(n=2)
+
+        assert summary == {"completed": 1, "skipped": 0, "failed": 1}
+        failed = [e for e in journal.load().values() if e["status"] == "failed"]
+        assert len(failed) == 1
+        assert failed[0]["attempts"] == 2
+        assert failed[0]["error"] == "disk error"
+
+        patched.side_effect = original
+        summary = runner.run(n=2, resume=True)
+        assert summary == {"completed": 1, "skipped": 1, "failed": 0}
+
+    def test_scheduled_order_and_metrics(self, path_manager, journal, capsys):
+        """Test that small files run first and queue metrics are saved"""
+        input_dir = path_manager.input_dir
+        with open(f"{input_dir}/0-large.txt", 'w', encoding='utf-8') as f:
+            f.write("Large file words. " * 200)
+        runner = BatchRunner(FileHandler(FileValidator()), path_manager, journal,
+                             scheduler=JobScheduler(100))
+
+        assert runner.run(n=2) == {"completed": 3, "skipped": 0, "failed": 0}
+
+        analyzed = [line.split()[1] for line in capsys.readouterr().out.splitlines()
+                    if line.startswith("Analyzed")]
+        assert analyzed == ["b.txt", "a.txt", "0-large.txt"]
+        with open(runner.schedule_path(), encoding='utf-8') as f:
+            metrics = json.load(f)
+        assert metrics["jobs"] == 3
+        assert metrics["lanes"]["small"]["jobs"] == 2
+        assert metrics["lanes"]["large"]["service-seconds"]["max"] > 0
+
+    def test_journal_path(self, path_manager):
+        """Test that the journal is placed in the output directory"""
+        path = BatchRunner.journal_path(path_manager, ".journal.jsonl")
+        assert path.startswith(path_manager.output_dir)
+        assert path.endswith(".journal.jsonl")
@@ -0,0 +1,159 @@
+# tests/test_concordance.py
+import random
+import pytest
+from src.modules.concordance import ConcordanceIndex, TokenSequence, build_suffix_array
+
+
+@pytest.fixture
+def words():
+    """Provide a random word stream with repeated phrases"""
+    rng = random.Random(5)
+    vocabulary = ["the", "cat", "sat", "on", "mat", "дом", "42"]
+    return rng.choices(vocabulary, k=2000)
+
+
+@pytest.fixture
+def index_path(tmp_path, words):
+    """Build an index of the word stream"""
+    sequence = TokenSequence()
+    sequence.update(words)
+    path = str(tmp_path / "words.kwic")
+    ConcordanceIndex.build(sequence, path)
+    return path
+
+
+def occurrences(words, phrase):
+    """Find phrase positions by scanning the word list"""
+    size = len(phrase)
+    return [i for i in range(len(words) - size + 1) if words[i:i + size] == phrase]
+
+
+class TestTokenSequence:
+    """Test suite for TokenSequence class"""
+
+    def test_update(self):
+        """Test that repeated words share an id"""
+        sequence = TokenSequence()
+        sequence.update(["a", "b", "a"])
+        assert list(sequence.ids) == [0, 1, 0]
+        assert len(sequence) == 3
+
+    @pytest.mark.parametrize("cuts", [[1000], [0, 1, 1999]])
+    def test_merge_matches_single_pass(self, words, cuts):
+        """Test that merged shards decode to the same text"""
+        bounds = [0] + cuts + [len(words)]
+        merged = TokenSequence()
+        for start, end in zip(bounds, bounds[1:]):
+            part = TokenSequence()
+            part.update(words[start:end])
+            merged.merge(part)
+        vocabulary = list(merged.vocabulary)
+        assert [vocabulary[i] for i in merged.ids] == words
+
+    def test_sorted_vocabulary(self):
+        """Test renumbering by alphabetical word order"""
+        sequence = TokenSequence()
+        sequence.update(["b", "c", "a", "b"])
+        words, ids = sequence.sorted_vocabulary()
+        assert words == ["a", "b", "c"]
+        assert list(ids) == [1, 2, 0, 1]
+
+
+class TestBuildSuffixArray:
+    """Test suite for build_suffix_array function"""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_naive_sort(self, seed):
+        """Test against sorting the suffixes directly"""
+        rng = random.Random(seed)
+        tokens = [rng.randrange(3) for _ in range(rng.randint(1, 300))]
+        expected = sorted(range(len(tokens)), key=lambda i: tokens[i:])
+        assert list(build_suffix_array(tokens)) == expected
+
+    def test_repetitive_input(self):
+        """Test a run of one token, which needs every doubling round"""
+        assert list(build_suffix_array([7] * 9)) == list(range(8, -1, -1))
+
+    @pytest.mark.parametrize("prefix, repeats", [(0, 30), (500, 3)])
+    def test_repeated_passage(self, prefix, repeats):
+        """Test a repeated passage, which keeps its suffixes unsorted for many rounds"""
+        rng = random.Random(9)
+        passage = [rng.randrange(50) for _ in range(40)]
+        tokens = [rng.randrange(50) for _ in range(prefix)] + passage * repeats + passage[:17]
+        expected = sorted(range(len(tokens)), key=lambda i: tokens[i:])
+        assert list(build_suffix_array(tokens)) == expected
+
+    def test_empty(self):
+        """Test an empty sequence"""
+        assert len(build_suffix_array([])) == 0
+
+
+class TestConcordanceIndex:
+    """Test suite for ConcordanceIndex class"""
+
+    @pytest.mark.parametrize("phrase", [["the"], ["the", "cat"], ["дом", "42", "on"],
+                                        ["mat", "mat", "mat", "mat"]])
+    def test_count(self, index_path, words, phrase):
+        """Test phrase counts against a linear scan"""
+        with ConcordanceIndex(index_path) as index:
+            assert index.count(phrase) == len(occurrences(words, phrase))
+
+    def test_unknown_phrase(self, index_path):
+        """Test phrases with unknown or no words"""
+        with ConcordanceIndex(index_path) as index:
+            assert index.count(["dog"]) == 0
+            assert index.count(["the", "dog"]) == 0
+            assert index.count([]) == 0
+            assert index.search(["dog"]) == []
+
+    def test_search(self, index_path, words):
+        """Test keyword-in-context lines in text order"""
+        phrase = ["cat", "sat"]
+        expected = occurrences(words, phrase)
+        with ConcordanceIndex(index_path) as index:
+            matches = index.search(phrase, context=2, limit=3)
+        assert [match["position"] for match in matches] == expected[:3]
+        first = expected[0]
+        assert matches[0]["left"] == " ".join(words[max(0, first - 2):first])
+        assert matches[0]["match"] == "cat sat"
+        assert matches[0]["right"] == " ".join(words[first + 2:first + 4])
+
+    def test_context_at_text_edges(self, tmp_path):
+        """Test that context is cut at the start and end of the text"""
+        sequence = TokenSequence()
+        sequence.update(["one", "two", "three"])
+        path = str(tmp_path / "short.kwic")
+        ConcordanceIndex.build(sequence, path)
+        with ConcordanceIndex(path) as index:
+            assert index.search(["one"], context=5) == [
+                {"position": 0, "left": "", "match": "one", "right": "two three"}
+            ]
+            assert index.search(["three"], context=1)[0]["left"] == "two"
+            assert index.token_count == 3
+            assert index.vocabulary_size == 3
+
+    def test_empty_text(self, tmp_path):
+        """Test an index of a text without words"""
+        path = str(tmp_path / "empty.kwic")
+        ConcordanceIndex.build(TokenSequence(), path)
+        with ConcordanceIndex(path) as index:
+            assert index.count(["word"]) == 0
+
+    def test_rebuild_replaces_index(self, tmp_path):
+        """Test that building over an existing index replaces it"""
+        path = str(tmp_path / "text.kwic")
+        for text in (["old", "text"], ["new", "text"]):
+            sequence = TokenSequence()
+            sequence.update(text)
+            ConcordanceIndex.build(sequence, path)
+        with ConcordanceIndex(path) as index:
+            assert index.count(["old"]) == 0
+            assert index.count(["new", "text"]) == 1
+
+    @pytest.mark.parametrize("content", [b"", b"JSON{}", b"KWIC" + bytes(20)])
+    def test_invalid_file(self, tmp_path, content):
+        """Test rejection of empty, foreign and truncated files"""
+        path = tmp_path / "bad.kwic"
+        path.write_bytes(content)
+        with pytest.raises(ValueError):
+            ConcordanceIndex(str(path))
@@ -7,7 +7,8 @@ from src.config.config import (
     DevelopmentConfig,
     ProductionConfig,
     TestingConfig,
-    ConfigFactory
+    ConfigFactory,
+    SNAPSHOT_ENV_VAR
 )
 
 # Base Config Tests
@@ -15,9 +16,13 @@ def test_base_config_initialization():
     settings = BaseConfig.get_settings()
     assert isinstance(settings.SRC_DIR, Path)
     assert isinstance(settings.PROJECT_ROOT, Path)
-    assert settings.SUPPORTED_ENCODINGS == ('utf-8', 'cp1251')
+    assert settings.SUPPORTED_ENCODINGS == ('utf-8', 'utf-16', 'cp1251', 'koi8-r', 'latin-1')
+    assert settings.FALLBACK_ENCODING in settings.SUPPORTED_ENCODINGS
     assert settings.SUPPORTED_FILE_TYPES == ('.txt',)
     assert settings.MAX_FILE_SIZE == 1024 * 1024 * 10
+    assert settings.MAX_MEMORY == 1024 * 1024 * 256
+    assert settings.MAX_RETRIES == 2
+    assert settings.JOURNAL_FSYNC_INTERVAL > 0
 
 def test_base_config_error_messages():
     settings = BaseConfig.get_settings()
@@ -109,3 +114,49 @@ def test_config_factory_caching(reset_env):
     config1 = ConfigFactory.get_config()
     config2 = ConfigFactory.get_config()
     assert config1 is config2  # Test LRU cache is working
+
+# Deferred environment and snapshot Tests
+def test_config_factory_loads_dotenv_once(reset_env, mocker):
+    """Test that .env is read on first use only."""
+    load_dotenv = mocker.patch('dotenv.load_dotenv')
+    mocker.patch.object(ConfigFactory, '_environment_loaded', False)
+    ConfigFactory.get_config()
+    ConfigFactory.reset_config()
+    ConfigFactory.get_config()
+    load_dotenv.assert_called_once_with()
+
+def test_config_snapshot_round_trip(reset_env, tmp_path):
+    """Test that a snapshot restores equal settings."""
+    os.environ['ENV'] = 'production'
+    config = ConfigFactory.get_config()
+    path = tmp_path / "config.json"
+    ConfigFactory.save_snapshot(str(path))
+
+    restored = ConfigFactory.load_snapshot(str(path))
+    assert isinstance(restored, ProductionConfig.Settings)
+    assert restored == config
+
+def test_config_factory_uses_snapshot(reset_env, tmp_path, mocker):
+    """Test that a snapshot named in the environment skips .env loading."""
+    os.environ['ENV'] = 'testing'
+    path = tmp_path / "config.json"
+    ConfigFactory.save_snapshot(str(path))
+    ConfigFactory.reset_config()
+    os.environ['ENV'] = 'production'
+    os.environ[SNAPSHOT_ENV_VAR] = str(path)
+    load_environment = mocker.patch.object(ConfigFactory, 'load_environment')
+
+    assert isinstance(ConfigFactory.get_config(), TestingConfig.Settings)
+    load_environment.assert_not_called()
+
+@pytest.mark.parametrize("content", [None, "not json", '{"environment": "development"}',
+                                     '{"environment": "development", "settings": {"DEBUG": true}}'])
+def test_config_snapshot_unusable(reset_env, tmp_path, content):
+    """Test that missing, malformed or stale snapshots are ignored."""
+    path = tmp_path / "config.json"
+    if content is not None:
+        path.write_text(content, encoding='utf-8')
+    assert ConfigFactory.load_snapshot(str(path)) is None
+
+    os.environ[SNAPSHOT_ENV_VAR] = str(path)
+    assert isinstance(ConfigFactory.get_config(), DevelopmentConfig.Settings)
@@ -0,0 +1,75 @@
+# tests/test_corpus_vocabulary.py
+import pytest
+from src.modules.corpus_vocabulary import CorpusVocabulary
+from src.modules.file_handler import FileHandler
+from src.modules.output_formatter import OutputFormatter
+from src.modules.path_manager import PathManager
+from src.modules.text_analyzer import TextAnalyzer
+from src.modules.validators import FileValidator
+
+
+def saved_results(text, n=1):
+    """Format results of a text the way they are saved"""
+    return OutputFormatter(TextAnalyzer(text, n=n), n=n).format_results()
+
+
+class TestCorpusVocabulary:
+    """Test suite for CorpusVocabulary class"""
+
+    def test_merges_distinct_words(self):
+        """Test corpus counts from saved results of several files"""
+        corpus = CorpusVocabulary()
+        assert corpus.add(saved_results("alpha beta gamma."))
+        assert corpus.add(saved_results("beta gamma delta epsilon."))
+
+        summary = corpus.summary()
+        assert summary["files"] == 2
+        assert summary["word-count"] == 7
+        assert summary["distinct-word-count"] == 5
+        assert summary["type-token-ratio"] == round(5 / 7, 4)
+        assert summary["exact"] is True
+
+    def test_results_with_several_n_count_once(self, tmp_path):
+        """Test corpus totals of the output directory after analyzing one file with two N values"""
+        manager = PathManager(str(tmp_path / "in"), str(tmp_path / "out"), fan_out=1)
+        file_handler = FileHandler(FileValidator())
+        for n in (1, 2):
+            path = manager.get_result_path("a.txt", n)
+            manager.prepare_output("a.txt", path)
+            file_handler.save_json(saved_results("alpha beta gamma.", n), path)
+
+        corpus = CorpusVocabulary()
+        for path in manager.list_results():
+            corpus.add(file_handler.load_json(path))
+
+        summary = corpus.summary()
+        assert summary["files"] == 1
+        assert summary["word-count"] == 3
+        assert summary["distinct-word-count"] == 3
+
+    def test_summary_can_be_merged_again(self):
+        """Test that corpus summaries are themselves mergeable"""
+        first = CorpusVocabulary()
+        first.add(saved_results("one two three."))
+        corpus = CorpusVocabulary()
+        corpus.add(first.summary())
+        corpus.add(saved_results("three four."))
+        assert corpus.summary()["distinct-word-count"] == 4
+
+    def test_skips_results_without_sketch(self):
+        """Test that estimates and old results are skipped"""
+        corpus = CorpusVocabulary()
+        assert not corpus.add({"estimated": True, "word-count": 100})
+        assert corpus.summary() == {
+            "files": 0,
+            "word-count": 0,
+            "distinct-word-count": 0,
+            "type-token-ratio": 0.0,
+            "exact": True,
+            "vocabulary-sketch": {"exact": True, "hashes": []},
+        }
+
+    def test_malformed_sketch(self):
+        """Test rejection of a malformed sketch"""
+        with pytest.raises(ValueError):
+            CorpusVocabulary().add({"vocabulary-sketch": {"exact": False}})
@@ -0,0 +1,34 @@
+# tests/test_deadline.py
+import pickle
+import time
+import pytest
+from src.modules.deadline import Deadline
+from src.modules.exceptions import ValidationError
+
+
+class TestDeadline:
+    """Test suite for Deadline class"""
+
+    def test_remaining(self):
+        """Test that a fresh deadline has its budget left"""
+        deadline = Deadline(60)
+        assert not deadline.expired()
+        assert 59 < deadline.remaining() <= 60
+
+    def test_expired(self):
+        """Test that a deadline expires after its budget"""
+        deadline = Deadline(0.01)
+        time.sleep(0.02)
+        assert deadline.expired()
+        assert deadline.remaining() == 0.0
+
+    @pytest.mark.parametrize("seconds", [0, -1, "5", None, True])
+    def test_invalid_budget(self, seconds):
+        """Test rejection of budgets that are not positive numbers"""
+        with pytest.raises(ValidationError):
+            Deadline(seconds)
+
+    def test_pickle(self):
+        """Test that workers receive the same point in time"""
+        deadline = Deadline(30)
+        assert pickle.loads(pickle.dumps(deadline)).expires_at == deadline.expires_at
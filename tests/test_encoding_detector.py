@@ -0,0 +1,101 @@
+# tests/test_encoding_detector.py
+import codecs
+import pytest
+from src.modules.encoding_detector import (
+    DetectedEncoding, EncodingDetector, fallback_errors
+)
+
+CANDIDATES = ('utf-8', 'utf-16', 'cp1251', 'koi8-r', 'latin-1')
+UKRAINIAN = "Ще не вмерла України і слава, і воля. Ще нам, браття молодії, усміхнеться доля."
+RUSSIAN = "Привет, как дела? Всё хорошо, спасибо большое. Увидимся завтра."
+FRENCH = "Le café est très bon à Paris. Déjà vu, naïve façade, à bientôt!"
+
+
+@pytest.fixture
+def detector():
+    """Create an EncodingDetector with the default candidates"""
+    return EncodingDetector(CANDIDATES)
+
+
+class TestEncodingDetector:
+    """Test suite for EncodingDetector class"""
+
+    @pytest.mark.parametrize("encoding,expected,bom", [
+        ('utf-8-sig', 'utf-8', 3),
+        ('utf-16', 'utf-16-le', 2),
+        ('utf-16-be', 'utf-16-be', 0),
+        ('utf-32', 'utf-32-le', 4),
+    ])
+    def test_byte_order_marks(self, detector, encoding, expected, bom):
+        """Test that byte order marks decide the encoding"""
+        data = RUSSIAN.encode(encoding)
+        if encoding == 'utf-16-be':
+            data = codecs.BOM_UTF16_BE + data
+            bom = 2
+        detected = detector.detect_bytes(data)
+        assert (detected.encoding, detected.bom, detected.source) == (expected, bom, 'bom')
+
+    @pytest.mark.parametrize("encoding", ['utf-16-le', 'utf-16-be'])
+    def test_utf16_without_mark(self, detector, encoding):
+        """Test recognizing UTF-16 from the position of NUL bytes"""
+        detected = detector.detect_bytes(UKRAINIAN.encode(encoding))
+        assert (detected.encoding, detected.bom) == (encoding, 0)
+        assert not detected.ascii_compatible
+
+    @pytest.mark.parametrize("text,encoding", [
+        (UKRAINIAN, 'utf-8'), (UKRAINIAN, 'cp1251'),
+        (RUSSIAN, 'utf-8'), (RUSSIAN, 'cp1251'), (RUSSIAN, 'koi8-r'),
+        (FRENCH, 'utf-8'), (FRENCH, 'latin-1'),
+    ])
+    def test_byte_statistics(self, detector, text, encoding):
+        """Test telling single-byte encodings apart by the decoded text"""
+        detected = detector.detect_bytes(text.encode(encoding))
+        assert detected.encoding == codecs.lookup(encoding).name
+        assert detected.source == 'sample'
+
+    def test_ascii_is_utf8(self, detector):
+        """Test that plain ASCII and empty files are read as UTF-8"""
+        assert detector.detect_bytes(b"plain text").encoding == 'utf-8'
+        assert detector.detect_bytes(b"").encoding == 'utf-8'
+
+    def test_cut_character_in_sample(self, detector):
+        """Test that a character cut at the end of a partial sample is valid"""
+        data = "привіт".encode('utf-8')[:-1]
+        assert detector.detect_bytes(data, complete=False).encoding == 'utf-8'
+        assert detector.detect_bytes(data, complete=True).encoding != 'utf-8'
+
+    def test_no_candidate_fits(self):
+        """Test that None is returned if no candidate decodes the sample"""
+        assert EncodingDetector(('utf-8',)).detect_bytes(b"\xff\xfe\xfd"[1:]) is None
+
+    def test_reads_only_sample(self, tmp_path):
+        """Test that bytes after the sample do not affect detection"""
+        path = tmp_path / "mixed.txt"
+        path.write_bytes(b"a " * 50 + "привіт".encode('cp1251'))
+        assert EncodingDetector(CANDIDATES, sample_size=100).detect(str(path)).encoding == 'utf-8'
+        assert EncodingDetector(CANDIDATES, sample_size=200).detect(str(path)).encoding == 'cp1251'
+
+    def test_fallback(self, detector):
+        """Test that UTF-8 falls back to the configured legacy encoding"""
+        assert detector.detect_bytes(b"text").fallback == 'cp1251'
+        assert detector.detect_bytes("текст".encode('koi8-r')).fallback == 'latin-1'
+
+
+class TestFallbackErrors:
+    """Test suite for fallback_errors function"""
+
+    def test_decodes_invalid_bytes(self):
+        """Test that invalid bytes are decoded in the fallback encoding"""
+        data = "так ".encode('utf-8') + "ні".encode('cp1251')
+        assert data.decode('utf-8', fallback_errors('cp1251')) == "так ні"
+
+    def test_incremental_decoding(self):
+        """Test the error handler across chunks of an incremental decoder"""
+        decoder = codecs.getincrementaldecoder('utf-8')(DetectedEncoding('utf-8', fallback='koi8-r').errors)
+        data = "ёж ".encode('utf-8') + "ёж".encode('koi8-r')
+        text = "".join(decoder.decode(data[i:i + 1]) for i in range(len(data)))
+        assert text + decoder.decode(b"", final=True) == "ёж ёж"
+
+    def test_strict_without_fallback(self):
+        """Test that no fallback keeps strict decoding"""
+        assert fallback_errors(None) == 'strict'
@@ -0,0 +1,121 @@
+# tests/test_estimate_analyzer.py
+import random
+import pytest
+from src.modules.estimate_analyzer import EstimateAnalyzer
+from src.modules.file_handler import FileHandler
+from src.modules.text_analyzer import TextAnalyzer
+from src.modules.validators import FileValidator
+from src.modules.exceptions import AnalysisError, ValidationError
+
+
+@pytest.fixture
+def file_handler():
+    """Create a FileHandler with a real validator"""
+    return FileHandler(FileValidator())
+
+
+@pytest.fixture
+def large_text_file(tmp_path):
+    """Create a file with a known random word distribution"""
+    rng = random.Random(7)
+    vocabulary = ["alpha", "beta", "gamma", "delta", "слово", "мир", "x"]
+    weights = [30, 20, 15, 10, 10, 10, 5]
+    words = rng.choices(vocabulary, weights=weights, k=40000)
+    text = " ".join(words) + "."
+    path = tmp_path / "large.txt"
+    path.write_text(text, encoding='utf-8')
+    return path
+
+
+class TestEstimateAnalyzer:
+    """Test suite for EstimateAnalyzer class"""
+
+    def test_choose_blocks_sample(self):
+        """Test that sampled block indices are distinct, sorted and in range"""
+        indices, total = EstimateAnalyzer.choose_blocks(10_000, 100, 10, seed=1)
+        assert total == 100
+        assert len(indices) == 10
+        assert indices == sorted(set(indices))
+        assert all(0 <= i < total for i in indices)
+
+    def test_choose_blocks_whole_file(self):
+        """Test that a sample larger than the file covers every block"""
+        indices, total = EstimateAnalyzer.choose_blocks(250, 100, 10)
+        assert indices == [0, 1, 2]
+        assert total == 3
+
+    def test_choose_blocks_invalid(self):
+        """Test rejection of non-positive sizes"""
+        with pytest.raises(ValidationError):
+            EstimateAnalyzer.choose_blocks(0, 100, 10)
+
+    def test_words_cut_by_boundaries_counted_once(self):
+        """Test that a word spanning two blocks belongs to the first one"""
+        blocks = [("", "hello wo", "rld"), ("hello wo", "rld again", "")]
+        analyzer = EstimateAnalyzer(blocks, total_blocks=2, n=3)
+        assert analyzer.get_word_count() == 3
+        assert analyzer.get_most_frequent_words() == {"hello": 1, "world": 1, "again": 1}
+
+    def test_full_coverage_matches_exact_analysis(self, file_handler, large_text_file):
+        """Test that sampling every block reproduces the exact statistics"""
+        exact = TextAnalyzer(large_text_file.read_text(encoding='utf-8'), n=3)
+        estimate = EstimateAnalyzer.from_file(
+            file_handler, str(large_text_file), n=3,
+            sample_blocks=10_000, block_size=1000
+        )
+
+        assert estimate.get_word_count() == exact.get_word_count()
+        assert estimate.get_average_word_length() == exact.get_average_word_length()
+        assert estimate.get_most_frequent_words() == exact.get_most_frequent_words()
+        intervals = estimate.get_confidence_intervals()
+        assert intervals["word-count"] == [exact.get_word_count()] * 2
+
+    def test_sample_estimate_within_interval(self, file_handler, large_text_file):
+        """Test that a partial sample gives a close estimate with a valid interval"""
+        exact = TextAnalyzer(large_text_file.read_text(encoding='utf-8'), n=3)
+        estimate = EstimateAnalyzer.from_file(
+            file_handler, str(large_text_file), n=3,
+            sample_blocks=40, block_size=1000, seed=3
+        )
+
+        low, high = estimate.get_confidence_intervals()["word-count"]
+        assert low <= estimate.get_word_count() <= high
+        assert abs(estimate.get_word_count() - exact.get_word_count()) < 0.05 * exact.get_word_count()
+        low, high = estimate.get_confidence_intervals()["average-word-length"]
+        assert low <= estimate.get_average_word_length() <= high
+        assert list(estimate.get_most_frequent_words())[0] == "alpha"
+
+        info = estimate.get_sample_info()
+        assert info["sampled-blocks"] == 40
+        assert 0 < info["coverage"] < 1
+
+    def test_single_block_interval_unavailable(self):
+        """Test that one block out of many gives no interval"""
+        analyzer = EstimateAnalyzer([("", "some words here", "")], total_blocks=10, n=1)
+        assert analyzer.get_confidence_intervals() == {
+            "word-count": None, "average-word-length": None
+        }
+
+    def test_multibyte_boundaries(self, file_handler, tmp_path):
+        """Test that UTF-8 characters split by block boundaries are not lost"""
+        path = tmp_path / "cyrillic.txt"
+        path.write_text("мир " * 1000, encoding='utf-8')
+        estimate = EstimateAnalyzer.from_file(
+            file_handler, str(path), n=1, sample_blocks=1000, block_size=333
+        )
+        assert estimate.get_most_frequent_words() == {"мир": 1000}
+
+    @pytest.mark.parametrize("blocks,total,confidence", [
+        ([], 1, 0.95),
+        ([("", "a", "")], 0, 0.95),
+        ([("", "a", "")], 1, 1.5),
+    ])
+    def test_invalid_parameters(self, blocks, total, confidence):
+        """Test validation of constructor parameters"""
+        with pytest.raises(ValidationError):
+            EstimateAnalyzer(blocks, total, n=1, confidence=confidence)
+
+    def test_no_words_in_sample(self):
+        """Test sample without any words"""
+        with pytest.raises(AnalysisError):
+            EstimateAnalyzer([("", "... !!!", "")], total_blocks=1, n=1)
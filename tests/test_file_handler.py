@@ -1,8 +1,13 @@
 # tests/test_file_handler.py
+import os
 import pytest
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+import hashlib
 import json
-from src.modules.file_handler import FileHandler
+import threading
+from src.modules.file_handler import FileHandler, atomic_write
 from src.modules.exceptions import FileError
 
 
@@ -86,6 +91,24 @@ def test_save_json_creates_directories(file_handler, tmp_path, sample_analysis_r
     assert deep_path.exists()
 
 
+def test_load_json_round_trip(file_handler, output_dir, sample_analysis_results):
+    """Test loading saved results"""
+    output_file = output_dir / "results.json"
+    file_handler.save_json(sample_analysis_results, str(output_file))
+    assert file_handler.load_json(str(output_file)) == sample_analysis_results
+
+
+@pytest.mark.parametrize("content", [None, "{not json"])
+def test_load_json_errors(file_handler, output_dir, content):
+    """Test loading missing or malformed results"""
+    path = output_dir / "broken.json"
+    if content is not None:
+        path.write_text(content, encoding='utf-8')
+    with pytest.raises(FileError) as exc_info:
+        file_handler.load_json(str(path))
+    assert "Error loading results" in str(exc_info.value)
+
+
 def test_save_json_invalid_path(file_handler, sample_analysis_results):
     """Test handling of invalid save path"""
     # Use a path that will definitely be invalid on Windows
@@ -117,3 +140,262 @@ def test_validator_integration(file_handler, sample_text_file):
     """Test integration with file validator"""
     file_handler.read_file(str(sample_text_file))
     file_handler.validator.validate_file_path.assert_called_once_with(Path(sample_text_file))
+
+
+def test_hash_file(file_handler, sample_text_file):
+    """Test content hashing of a file"""
+    import hashlib
+    expected = hashlib.sha256(sample_text_file.read_bytes()).hexdigest()
+    assert file_handler.hash_file(str(sample_text_file), chunk_size=7) == expected
+
+
+def test_fingerprint(file_handler, sample_text_file):
+    """Test that the fingerprint of a file changes with its modification time"""
+    size, version = file_handler.fingerprint(str(sample_text_file))
+    assert size == sample_text_file.stat().st_size
+    os.utime(sample_text_file, ns=(1, 1))
+    assert file_handler.fingerprint(str(sample_text_file)) == (size, "1")
+    with pytest.raises(FileError):
+        file_handler.fingerprint("/nonexistent/file.txt")
+
+
+def test_hash_nonexistent_file(file_handler):
+    """Test hashing of a missing file"""
+    with pytest.raises(FileError):
+        file_handler.hash_file("/nonexistent/file.txt")
+
+
+def test_get_available_files_include_oversized(file_handler, input_dir_with_files, mocker):
+    """Test listing files above the size limit when requested"""
+    file_handler.config = mocker.Mock(
+        SUPPORTED_FILE_TYPES=('.txt',), MAX_FILE_SIZE=1, ERROR_MESSAGES={}
+    )
+    assert file_handler.get_available_files(input_dir_with_files) == []
+    assert [name for name, _ in file_handler.oversized] == ["file1.txt", "file2.txt"]
+    assert file_handler.get_available_files(
+        input_dir_with_files, include_oversized=True
+    ) == ["file1.txt", "file2.txt"]
+    assert file_handler.oversized == []
+
+
+def test_read_sample_blocks(file_handler, tmp_path):
+    """Test reading selected blocks with surrounding context"""
+    path = tmp_path / "blocks.txt"
+    path.write_text("aaaa bbbb cccc dddd", encoding='utf-8')
+
+    blocks = file_handler.read_sample_blocks(str(path), [1, 3], block_size=5, context=2)
+
+    assert blocks == [("a ", "bbbb ", "cc"), ("c ", "dddd", "")]
+
+
+def test_read_sample_blocks_utf8_alignment(file_handler, tmp_path):
+    """Test that block boundaries never split multibyte characters"""
+    path = tmp_path / "utf8.txt"
+    path.write_text("ммм ммм", encoding='utf-8')
+
+    blocks = file_handler.read_sample_blocks(str(path), range(5), block_size=3, context=4)
+
+    assert "".join(core for _, core, _ in blocks) == "ммм ммм"
+    assert all("\ufffd" not in part for block in blocks for part in block)
+
+
+def test_read_sample_blocks_cp1251(file_handler, tmp_path):
+    """Test sampling blocks of a file in a single-byte encoding"""
+    path = tmp_path / "cp1251.txt"
+    path.write_bytes("привіт світ".encode('cp1251'))
+
+    blocks = file_handler.read_sample_blocks(str(path), [0], block_size=100)
+
+    assert blocks == [("", "привіт світ", "")]
+
+
+def test_read_sample_blocks_utf16(file_handler, tmp_path):
+    """Test that blocks of UTF-16 files skip the mark and keep code units whole"""
+    path = tmp_path / "utf16.txt"
+    path.write_text("ab 😀 cd", encoding='utf-16')
+
+    blocks = file_handler.read_sample_blocks(str(path), range(6), block_size=3, context=4)
+
+    assert "".join(core for _, core, _ in blocks) == "ab 😀 cd"
+
+
+def test_detect_encoding(file_handler, tmp_path):
+    """Test detection of the encoding from the first bytes of the file"""
+    utf8 = tmp_path / "utf8.txt"
+    utf8.write_text("привіт", encoding='utf-8')
+    cp1251 = tmp_path / "cp1251.txt"
+    cp1251.write_bytes("привіт".encode('cp1251'))
+    utf16 = tmp_path / "utf16.txt"
+    utf16.write_text("привіт", encoding='utf-16')
+
+    assert file_handler.detect_encoding(str(utf8)).encoding == 'utf-8'
+    assert file_handler.detect_encoding(str(cp1251)).encoding == 'cp1251'
+    detected = file_handler.detect_encoding(str(utf16))
+    assert (detected.encoding, detected.bom, detected.source) == ('utf-16-le', 2, 'bom')
+
+
+@pytest.mark.parametrize("encoding", ['utf-8-sig', 'utf-16', 'utf-32', 'cp1251', 'koi8-r'])
+def test_read_file_encodings(file_handler, tmp_path, encoding):
+    """Test reading files in every supported encoding"""
+    text = "Привет, мир!\nКак дела?"
+    path = tmp_path / "text.txt"
+    path.write_bytes(text.encode(encoding))
+    assert file_handler.read_file(str(path)) == text
+
+
+def test_read_file_mixed_encoding(file_handler, tmp_path):
+    """Test that bytes invalid in the detected encoding use the fallback"""
+    path = tmp_path / "mixed.txt"
+    prefix = "ascii text " * (file_handler.config.ENCODING_SAMPLE_SIZE // 10)
+    path.write_bytes(prefix.encode('utf-8') + "привіт".encode('cp1251'))
+
+    assert file_handler.detect_encoding(str(path)).encoding == 'utf-8'
+    assert file_handler.read_file(str(path)) == prefix + "привіт"
+
+
+def test_iter_chunks_matches_read_file(file_handler, tmp_path):
+    """Test that streamed chunks equal the text read_file returns"""
+    path = tmp_path / "lines.txt"
+    path.write_bytes("перший\r\nдругий\rтретій\n".encode('utf-8') * 5)
+
+    for chunk_size in (1, 2, 3, 7, 1024):
+        chunks = list(FileHandler.iter_chunks(str(path), 'utf-8', chunk_size))
+        assert "".join(chunks) == file_handler.read_file(str(path))
+
+
+def test_iter_chunks_range(tmp_path):
+    """Test streaming a byte range of a file"""
+    path = tmp_path / "range.txt"
+    path.write_text("alpha beta gamma", encoding='utf-8')
+    assert "".join(FileHandler.iter_chunks(str(path), 'utf-8', 4, 6, 10)) == "beta"
+
+
+def test_iter_chunk_offsets(tmp_path):
+    """Test that every chunk reports the offset reached in the file"""
+    path = tmp_path / "offsets.txt"
+    path.write_text("alpha beta gamma", encoding='utf-8')
+    chunks = list(FileHandler.iter_chunk_offsets(str(path), 'utf-8', 4, 6))
+    assert chunks == [("beta", 10), (" gam", 14), ("ma", 16)]
+
+
+def test_shard_ranges(file_handler, tmp_path):
+    """Test that shards cover the file and start after whitespace"""
+    path = tmp_path / "shards.txt"
+    data = "word " * 100 + "\r\n" + "слово " * 100
+    path.write_text(data, encoding='utf-8')
+    raw = path.read_bytes()
+
+    ranges = file_handler.shard_ranges(str(path), 5)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(raw)
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    assert all(raw[start - 1:start] in (b" ", b"\n") for start, _ in ranges[1:])
+
+
+def test_shard_ranges_without_whitespace(file_handler, tmp_path):
+    """Test that a file without split points stays a single shard"""
+    path = tmp_path / "single.txt"
+    path.write_text("x" * 1000, encoding='utf-8')
+    assert file_handler.shard_ranges(str(path), 4) == [(0, 1000)]
+
+
+def test_object_storage_input(file_handler, s3_server):
+    """Test listing, reading and hashing objects of a storage backend"""
+    (s3_server.root / "a.txt").write_bytes("Привіт світ\r\nhello".encode('cp1251'))
+    (s3_server.root / "b.doc").write_bytes(b"skipped")
+    file_handler.storage = s3_server.storage(read_ahead=2)
+    local = FileHandler(file_handler.validator)
+    path = s3_server.root / "a.txt"
+
+    assert file_handler.get_available_files("ignored") == ["a.txt"]
+    assert file_handler.detect_encoding("s3://corpus/a.txt").encoding == 'cp1251'
+    assert file_handler.read_file("s3://corpus/a.txt") == "Привіт світ\nhello"
+    assert file_handler.hash_file("s3://corpus/a.txt") == local.hash_file(str(path))
+    assert FileHandler.get_size("s3://corpus/a.txt", file_handler.storage) == 18
+    etag = '"' + hashlib.md5(path.read_bytes()).hexdigest() + '"'
+    assert file_handler.fingerprint("s3://corpus/a.txt") == (18, etag)
+    file_handler.storage.close()
+
+
+def test_object_storage_shards_and_samples(file_handler, s3_server, tmp_path):
+    """Test that object shards and sampled blocks match those of a local file"""
+    data = ("word " * 100 + "\r\n" + "слово " * 100).encode('utf-8')
+    path = tmp_path / "shards.txt"
+    path.write_bytes(data)
+    (s3_server.root / "shards.txt").write_bytes(data)
+    file_handler.storage = s3_server.storage()
+    local = FileHandler(file_handler.validator)
+
+    assert (file_handler.shard_ranges("s3://corpus/shards.txt", 5) ==
+            local.shard_ranges(str(path), 5))
+    assert (file_handler.read_sample_blocks("s3://corpus/shards.txt", [1, 7], 64) ==
+            local.read_sample_blocks(str(path), [1, 7], 64))
+    file_handler.storage.close()
+
+
+def test_object_storage_size_limits(file_handler, s3_server):
+    """Test that streamed objects may exceed the file size limit up to the object size limit"""
+    (s3_server.root / "large.txt").write_bytes(b"word " * 4)
+    (s3_server.root / "huge.txt").write_bytes(b"word " * 8)
+    file_handler.storage = s3_server.storage()
+    file_handler.config = replace(file_handler.config, MAX_FILE_SIZE=10, MAX_OBJECT_SIZE=30)
+
+    assert file_handler.get_available_files("ignored") == ["large.txt"]
+    assert file_handler.oversized == [("huge.txt", 40)]
+    assert file_handler.detect_encoding("s3://corpus/large.txt").encoding == 'utf-8'
+    with pytest.raises(FileError):
+        file_handler.detect_encoding("s3://corpus/huge.txt")
+    with pytest.raises(FileError):
+        file_handler.read_file("s3://corpus/large.txt")
+    file_handler.storage.close()
+
+
+def test_object_storage_missing(file_handler, s3_server):
+    """Test that a missing object raises FileError"""
+    file_handler.storage = s3_server.storage()
+    with pytest.raises(FileError):
+        file_handler.detect_encoding("s3://corpus/missing.txt")
+
+
+def test_save_json_concurrent_writers(file_handler, output_dir):
+    """Test that concurrent saves of one path leave one whole result and no temporary files"""
+    output_file = output_dir / "results.json"
+    payloads = [{"writer": index, "words": ["word"] * 2000} for index in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda data: file_handler.save_json(data, str(output_file)), payloads))
+
+    assert file_handler.load_json(str(output_file)) in payloads
+    assert os.listdir(output_dir) == ["results.json"]
+
+
+def test_atomic_write_concurrent_writers(tmp_path):
+    """Test that overlapping writers of one path each leave a whole file"""
+    path = str(tmp_path / "index.kwic")
+    started = threading.Barrier(4)
+    payloads = [bytes([index]) * 100000 for index in range(4)]
+
+    def write(data):
+        with atomic_write(path, 'wb') as f:
+            f.write(data[:50000])
+            started.wait()
+            f.write(data[50000:])
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(write, payloads))
+
+    assert Path(path).read_bytes() in payloads
+    assert os.listdir(tmp_path) == ["index.kwic"]
+
+
+def test_atomic_write_failure_keeps_target(tmp_path):
+    """Test that a failed write leaves the previous file and no temporary file"""
+    path = tmp_path / "a.freq"
+    path.write_text("old", encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        with atomic_write(str(path)) as f:
+            f.write("new")
+            raise ValueError("interrupted")
+
+    assert path.read_text(encoding='utf-8') == "old"
+    assert os.listdir(tmp_path) == ["a.freq"]
@@ -0,0 +1,120 @@
+# tests/test_frequency_runs.py
+import random
+from collections import Counter
+import pytest
+from src.modules.frequency_runs import (
+    CorpusTopWords, merge_frequency_runs, read_frequency_run, write_frequency_run
+)
+
+
+def write_run(tmp_path, name, counts):
+    """Write a run of word counts and return its path"""
+    path = str(tmp_path / (name + ".freq"))
+    write_frequency_run(sorted(counts.items()), path)
+    return path
+
+
+class TestFrequencyRuns:
+    """Test suite for frequency run files"""
+
+    def test_round_trip(self, tmp_path):
+        """Test writing and reading a run"""
+        path = str(tmp_path / "a.freq")
+        items = [("alpha", 3), ("beta", 1), ("état", 2)]
+        assert write_frequency_run(items, path) == 3
+        assert list(read_frequency_run(path)) == items
+        assert [entry.name for entry in tmp_path.iterdir()] == ["a.freq"]
+
+    def test_write_unsorted(self, tmp_path):
+        """Test that unsorted words are rejected without leaving a run"""
+        path = tmp_path / "a.freq"
+        with pytest.raises(ValueError):
+            write_frequency_run([("beta", 1), ("alpha", 2)], str(path))
+        assert not path.exists()
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.parametrize("content", ["alpha\n", "alpha\tx\n", "\t3\n", "beta\t1\nalpha\t1\n"])
+    def test_read_malformed(self, tmp_path, content):
+        """Test that malformed or unsorted runs are rejected"""
+        path = tmp_path / "a.freq"
+        path.write_text(content, encoding='utf-8')
+        with pytest.raises(ValueError):
+            list(read_frequency_run(str(path)))
+
+    def test_merge_sums_counts(self):
+        """Test that the merge sums the counts of shared words in word order"""
+        merged = merge_frequency_runs([
+            [("a", 1), ("c", 2)],
+            [("b", 5), ("c", 3)],
+            [],
+            [("a", 4)]
+        ])
+        assert list(merged) == [("a", 5), ("b", 5), ("c", 5)]
+
+
+class TestCorpusTopWords:
+    """Test suite for CorpusTopWords class"""
+
+    def test_invalid_settings(self):
+        """Test rejection of invalid N and fan-in"""
+        with pytest.raises(ValueError):
+            CorpusTopWords(0)
+        with pytest.raises(ValueError):
+            CorpusTopWords(5, fan_in=1)
+        with pytest.raises(ValueError):
+            CorpusTopWords(5).merge([])
+
+    def test_exact_top_words(self, tmp_path):
+        """Test that the top words equal those of counting the whole corpus"""
+        generator = random.Random(7)
+        vocabulary = [f"w{i}" for i in range(300)]
+        total = Counter()
+        paths = []
+        for number in range(12):
+            counts = Counter(generator.choices(vocabulary, weights=range(300, 0, -1), k=2000))
+            total.update(counts)
+            paths.append(write_run(tmp_path, f"file{number}", counts))
+
+        summary = CorpusTopWords(15).merge(paths)
+
+        expected = sorted(total.items(), key=lambda item: (-item[1], item[0]))[:15]
+        assert summary["15-most-frequent-words"] == dict(expected)
+        assert list(summary["15-most-frequent-words"]) == [word for word, _ in expected]
+        assert summary["files"] == 12
+        assert summary["word-count"] == 24000
+        assert summary["distinct-word-count"] == len(total)
+        assert summary["merge-passes"] == 1
+
+    def test_word_outside_file_top_words(self, tmp_path):
+        """Test finding a word that is in no file's own top words"""
+        paths = [
+            write_run(tmp_path, "a", {"a": 10, "b": 9, "shared": 8}),
+            write_run(tmp_path, "b", {"c": 10, "d": 9, "shared": 8})
+        ]
+        summary = CorpusTopWords(1).merge(paths)
+        assert summary["1-most-frequent-words"] == {"shared": 16}
+
+    def test_ties_alphabetical(self, tmp_path):
+        """Test that ties are broken alphabetically"""
+        path = write_run(tmp_path, "a", {"delta": 2, "beta": 2, "alpha": 1, "gamma": 2})
+        summary = CorpusTopWords(2).merge([path])
+        assert list(summary["2-most-frequent-words"].items()) == [("beta", 2), ("delta", 2)]
+
+    def test_multi_pass_merge(self, tmp_path):
+        """Test that more runs than the fan-in are merged in several passes"""
+        temp_dir = tmp_path / "merge"
+        temp_dir.mkdir()
+        total = Counter()
+        paths = []
+        for number in range(9):
+            counts = Counter({f"w{i}": number + i for i in range(number, number + 20)})
+            total.update(counts)
+            paths.append(write_run(tmp_path, f"file{number}", counts))
+
+        summary = CorpusTopWords(5, fan_in=2, temp_dir=str(temp_dir)).merge(paths)
+
+        expected = sorted(total.items(), key=lambda item: (-item[1], item[0]))[:5]
+        assert summary["5-most-frequent-words"] == dict(expected)
+        assert summary["word-count"] == sum(total.values())
+        assert summary["merge-passes"] == 4
+        assert list(temp_dir.iterdir()) == []
@@ -0,0 +1,147 @@
+# tests/test_job_scheduler.py
+import pytest
+from src.modules.exceptions import ValidationError
+from src.modules.job_scheduler import JobScheduler, percentiles
+
+
+class FakeClock:
+    """Clock advanced by hand"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Create a clock starting at zero"""
+    return FakeClock()
+
+
+def drain(scheduler, clock, cost=lambda job: job.size / 100):
+    """Run every queued job, spending time proportional to its size"""
+    order = []
+    while True:
+        job = scheduler.next_job()
+        if job is None:
+            return order
+        clock.now += cost(job)
+        scheduler.finish(job)
+        order.append(job.name)
+
+
+class TestJobScheduler:
+    """Test suite for JobScheduler class"""
+
+    def test_shortest_small_job_first(self, clock):
+        """Test that small files run in order of size, ties in submission order"""
+        scheduler = JobScheduler(1000, clock=clock)
+        for name, size in [("c", 300), ("a", 10), ("b", 300), ("d", 20)]:
+            scheduler.submit(name, size)
+
+        assert len(scheduler) == 4
+        assert drain(scheduler, clock) == ["a", "d", "c", "b"]
+        assert len(scheduler) == 0
+
+    def test_large_lane_share(self, clock):
+        """Test that large files get their share of bytes without blocking small ones"""
+        scheduler = JobScheduler(1000, large_share=0.5, clock=clock)
+        scheduler.submit("big1", 10000)
+        scheduler.submit("big2", 10000)
+        for index in range(30):
+            scheduler.submit(f"small{index:02}", 1000)
+
+        order = drain(scheduler, clock)
+
+        # Each large file waits until small files of the same size were served
+        assert order.index("big1") == 10
+        assert order.index("big2") == 21
+        assert scheduler.metrics()["lanes"]["large"]["jobs"] == 2
+
+    def test_large_files_in_submission_order(self, clock):
+        """Test that the large lane is served first in, first out"""
+        scheduler = JobScheduler(10, clock=clock)
+        for name, size in [("x", 500), ("y", 100), ("z", 300)]:
+            scheduler.submit(name, size)
+        assert drain(scheduler, clock) == ["x", "y", "z"]
+
+    def test_tenant_fairness(self, clock):
+        """Test that tenants alternate despite submitting in bulk"""
+        scheduler = JobScheduler(1000, tenant_pattern=r"^([a-z]+)-", clock=clock)
+        for index in range(4):
+            scheduler.submit(f"alice-{index}.txt", 100)
+        for index in range(4):
+            scheduler.submit(f"bob-{index}.txt", 100)
+        scheduler.submit("shared.txt", 100)
+
+        order = drain(scheduler, clock)
+
+        assert [name.split("-")[0] for name in order[:6]] == ["alice", "bob", "shared.txt",
+                                                              "alice", "bob", "alice"]
+        assert set(scheduler.metrics()["tenants"]) == {"alice", "bob", "default"}
+
+    def test_tenant_weights(self, clock):
+        """Test that a heavier tenant is served proportionally more"""
+        scheduler = JobScheduler(1000, tenant_pattern=r"^([a-z]+)-",
+                                 tenant_weights={"alice": 3}, clock=clock)
+        for index in range(8):
+            scheduler.submit(f"alice-{index}.txt", 100)
+            scheduler.submit(f"bob-{index}.txt", 100)
+
+        order = drain(scheduler, clock)
+
+        assert sum(name.startswith("alice") for name in order[:8]) == 6
+
+    def test_metrics(self, clock):
+        """Test queue wait and service time metrics"""
+        scheduler = JobScheduler(1000, clock=clock)
+        scheduler.submit("a", 100)
+        scheduler.submit("b", 300)
+        clock.now = 5.0
+
+        drain(scheduler, clock)
+        metrics = scheduler.metrics()
+
+        small = metrics["lanes"]["small"]
+        assert metrics["jobs"] == 2
+        assert small["wait-seconds"] == {"mean": 5.5, "p50": 5.0, "p95": 6.0, "max": 6.0}
+        assert small["service-seconds"]["max"] == 3.0
+        assert metrics["lanes"]["large"]["jobs"] == 0
+        assert [job.wait_time for job in scheduler.finished] == [5.0, 6.0]
+
+    def test_reset(self, clock):
+        """Test that a reset drops queued and finished jobs"""
+        scheduler = JobScheduler(1000, clock=clock)
+        scheduler.submit("a", 1)
+        drain(scheduler, clock)
+        scheduler.submit("b", 1)
+        scheduler.reset()
+        assert len(scheduler) == 0
+        assert scheduler.next_job() is None
+        assert scheduler.metrics()["jobs"] == 0
+
+    @pytest.mark.parametrize("options", [
+        {"small_file_size": -1},
+        {"small_file_size": 1, "large_share": 1.0},
+        {"small_file_size": 1, "tenant_pattern": "("},
+        {"small_file_size": 1, "tenant_weights": {"a": 0}},
+    ])
+    def test_invalid_settings(self, options):
+        """Test that invalid settings are rejected"""
+        with pytest.raises(ValidationError):
+            JobScheduler(**options)
+
+    def test_parse_weights(self):
+        """Test parsing of tenant weights"""
+        assert JobScheduler.parse_weights("alice=2,bob=0.5") == {"alice": 2.0, "bob": 0.5}
+        for spec in ("alice", "alice=x", "=2", "alice=-1"):
+            with pytest.raises(ValidationError):
+                JobScheduler.parse_weights(spec)
+
+
+def test_percentiles():
+    """Test nearest-rank percentiles of durations"""
+    assert percentiles(list(range(1, 21))) == {"mean": 10.5, "p50": 10, "p95": 19, "max": 20}
+    assert percentiles([]) == {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
@@ -0,0 +1,128 @@
+# tests/test_memory_budget.py
+import os
+import random
+import pytest
+from collections import Counter
+from src.modules.memory_budget import MemoryBudget, SpillingCounter
+
+
+@pytest.fixture
+def words():
+    """Provide a random word stream with many ties"""
+    rng = random.Random(5)
+    vocabulary = [f"w{i}" for i in range(300)]
+    return [rng.choice(vocabulary[:rng.randint(1, 300)]) for _ in range(5000)]
+
+
+class TestMemoryBudget:
+    """Test suite for MemoryBudget class"""
+
+    def test_chunk_size_bounds(self):
+        """Test chunk size scaling and clamping"""
+        assert MemoryBudget(1).chunk_size() == MemoryBudget.MIN_CHUNK_SIZE
+        assert MemoryBudget(10 ** 12).chunk_size() == MemoryBudget.MAX_CHUNK_SIZE
+        assert MemoryBudget(64 * 1024 * 1024).chunk_size() == 1024 * 1024
+
+    def test_counter_limit_scales_with_budget(self):
+        """Test that a larger budget allows a larger in-memory table"""
+        assert MemoryBudget(1).counter_limit() == MemoryBudget.MIN_COUNTER_LIMIT
+        assert MemoryBudget(2 ** 30).counter_limit() > MemoryBudget(2 ** 26).counter_limit()
+
+    @pytest.mark.parametrize("file_size,max_memory,cpus,expected", [
+        (1024, 2 ** 30, 8, 1),
+        (64 * 1024 * 1024, 2 ** 30, 8, 8),
+        (64 * 1024 * 1024, 64 * 1024 * 1024, 8, 2),
+        (64 * 1024 * 1024, 2 ** 30, 2, 2),
+    ])
+    def test_worker_count(self, mocker, file_size, max_memory, cpus, expected):
+        """Test worker count limited by CPUs, file size and memory"""
+        mocker.patch('src.modules.memory_budget.os.cpu_count', return_value=cpus)
+        assert MemoryBudget(max_memory).worker_count(file_size) == expected
+
+    def test_split(self, tmp_path):
+        """Test splitting the budget between workers"""
+        budget = MemoryBudget(1000, str(tmp_path)).split(4)
+        assert budget.max_memory == 250
+        assert budget.temp_dir == str(tmp_path)
+
+    def test_concordance_limit(self):
+        """Test that the indexable token count scales with the budget"""
+        budget = MemoryBudget(256 * 1024 * 1024)
+        assert budget.concordance_limit() == 8 * 1024 * 1024
+        assert budget.split(4).concordance_limit() == 2 * 1024 * 1024
+
+    def test_ngram_counters_of_split_budgets_merge(self):
+        """Test that worker n-gram counters share the sketch shape"""
+        budget = MemoryBudget(2 ** 30)
+        first = budget.create_ngram_counter(2)
+        second = budget.split(4).create_ngram_counter(2)
+        assert first.max_entries > second.max_entries >= MemoryBudget.MIN_NGRAM_LIMIT
+        first.merge(second)
+
+
+class TestSpillingCounter:
+    """Test suite for SpillingCounter class"""
+
+    def test_no_spill_below_limit(self, tmp_path):
+        """Test that a small table stays in memory"""
+        counter = SpillingCounter(10, str(tmp_path))
+        counter.update(["a", "b", "a"])
+        assert not counter.spilled
+        assert counter.most_common(1) == [("a", 2)]
+        assert os.listdir(tmp_path) == []
+
+    def test_spilled_matches_counter(self, tmp_path, words):
+        """Test that spilled counts and tie order match Counter exactly"""
+        counter = SpillingCounter(20, str(tmp_path))
+        for start in range(0, len(words), 97):
+            counter.update(words[start:start + 97])
+
+        assert counter.spilled
+        expected = Counter(words)
+        assert counter.most_common(50) == expected.most_common(50)
+        assert {word: count for word, count, _ in counter.items()} == dict(expected)
+        counter.close()
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.parametrize("limit", [20, 1000])
+    def test_iter_most_common_streams_all_words(self, tmp_path, words, limit):
+        """Test that all words stream in most_common order and ranked runs are removed"""
+        counter = SpillingCounter(limit, str(tmp_path))
+        for start in range(0, len(words), 97):
+            counter.update(words[start:start + 97])
+        runs = set(os.listdir(tmp_path))
+
+        assert list(counter.iter_most_common()) == Counter(words).most_common()
+        assert set(os.listdir(tmp_path)) == runs
+        counter.close()
+
+    def test_merge_preserves_order(self, tmp_path, words):
+        """Test merging tables of consecutive text parts"""
+        middle = len(words) // 2
+        first = SpillingCounter(20, str(tmp_path))
+        second = SpillingCounter(20, str(tmp_path))
+        first.update(words[:middle])
+        second.update(words[middle:])
+
+        first.merge(second)
+
+        assert first.most_common(40) == Counter(words).most_common(40)
+        first.close()
+
+    def test_merge_in_memory(self):
+        """Test merging small tables without spilling"""
+        first = SpillingCounter(10)
+        second = SpillingCounter(10)
+        first.update(["b", "a"])
+        second.update(["a", "c"])
+        first.merge(second)
+        assert not first.spilled
+        assert first.most_common(3) == [("a", 2), ("b", 1), ("c", 1)]
+
+    def test_items_sorted_by_word(self, tmp_path):
+        """Test that merged items are streamed in word order"""
+        counter = SpillingCounter(2, str(tmp_path))
+        counter.update(["c", "b", "a"])
+        counter.update(["a", "d"])
+        assert [word for word, _, _ in counter.items()] == ["a", "b", "c", "d"]
+        counter.close()
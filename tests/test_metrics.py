@@ -0,0 +1,173 @@
+# tests/test_metrics.py
+import pytest
+from src.modules.exceptions import AnalysisError, ValidationError
+from src.modules.metrics import (
+    LineCountMetric, LongestWordMetric, Metric, MetricRegistry, WordsPerSentenceMetric, registry
+)
+from src.modules.text_analyzer import TextStatistics
+
+
+class CharCountMetric(Metric):
+    """Counts characters, used to test references to metric classes"""
+
+    name = "char-count"
+    streams = frozenset(("chars",))
+
+    def __init__(self):
+        self.count = 0
+
+    def consume_chars(self, chunk):
+        self.count += len(chunk)
+
+    def merge(self, other):
+        self.count += other.count
+
+    def result(self):
+        return self.count
+
+
+class BrokenMetric(CharCountMetric):
+    """Declares a stream that does not exist"""
+
+    streams = frozenset(("paragraphs",))
+
+
+class IncompleteMetric(Metric):
+    """Lacks merge and result"""
+
+    streams = frozenset(("chars",))
+
+
+def collect(text, names, cuts=()):
+    """Collect statistics of consecutive parts of a text and merge them"""
+    bounds = [0, *cuts, len(text)]
+    parts = [
+        TextStatistics.from_chunks([text[start:end]], metrics=names)
+        for start, end in zip(bounds, bounds[1:])
+    ]
+    statistics = parts[0]
+    for part in parts[1:]:
+        statistics.merge(part)
+    return statistics
+
+
+class TestMetricRegistry:
+    """Test suite for MetricRegistry class"""
+
+    def test_builtin_metrics(self):
+        """Test that built-in metrics are registered"""
+        assert {"line-count", "longest-word", "words-per-sentence"} <= set(registry.names())
+
+    def test_create_returns_fresh_instances(self):
+        """Test that every call creates a metric with empty state"""
+        first = registry.create("longest-word")
+        first.consume_tokens(["word"])
+        assert registry.create("longest-word").result() == ""
+
+    def test_register_reference(self):
+        """Test lazy import of a module:attribute reference"""
+        metrics = MetricRegistry(entry_point_group=None)
+        metrics.register("characters", "tests.test_metrics:CharCountMetric")
+        metric = metrics.create("characters")
+        assert isinstance(metric, CharCountMetric)
+        assert metric.name == "characters"
+
+    def test_register_duplicate(self):
+        """Test rejection of an already registered name"""
+        metrics = MetricRegistry(entry_point_group=None)
+        metrics.register("lines", LineCountMetric)
+        with pytest.raises(ValueError):
+            metrics.register("lines", LineCountMetric)
+
+    def test_unknown_metric(self):
+        """Test that unknown names raise ValidationError"""
+        with pytest.raises(ValidationError):
+            MetricRegistry(entry_point_group=None).create("missing")
+
+    @pytest.mark.parametrize("reference", ["no.such.module:Metric", "tests.test_metrics:Missing"])
+    def test_broken_reference(self, reference):
+        """Test that unresolvable references raise AnalysisError"""
+        metrics = MetricRegistry(entry_point_group=None)
+        metrics.register("broken", reference)
+        with pytest.raises(AnalysisError):
+            metrics.create("broken")
+
+    def test_unknown_stream(self):
+        """Test rejection of metrics consuming unknown streams"""
+        metrics = MetricRegistry(entry_point_group=None)
+        metrics.register("broken", BrokenMetric)
+        with pytest.raises(AnalysisError):
+            metrics.create("broken")
+
+    def test_incomplete_metric(self):
+        """Test rejection of metrics missing abstract methods"""
+        metrics = MetricRegistry(entry_point_group=None)
+        metrics.register("incomplete", IncompleteMetric)
+        with pytest.raises(AnalysisError, match="cannot be created"):
+            metrics.create("incomplete")
+
+    def test_validate_repeated(self):
+        """Test rejection of repeated metric names"""
+        with pytest.raises(ValidationError):
+            registry.validate(["line-count", "line-count"])
+
+    def test_discovery_is_lazy(self, mocker):
+        """Test that entry points are scanned only for unregistered names"""
+        entry_points = mocker.patch('importlib.metadata.entry_points', return_value=[])
+        metrics = MetricRegistry()
+        metrics.register("lines", LineCountMetric)
+        metrics.create("lines")
+        entry_points.assert_not_called()
+
+        with pytest.raises(ValidationError):
+            metrics.create("plugin")
+        metrics.names()
+        entry_points.assert_called_once_with(group="text_analyzer.metrics")
+
+    def test_discovered_entry_point(self, mocker):
+        """Test that entry point plugins are loaded by name"""
+        entry_point = mocker.Mock(value="tests.test_metrics:CharCountMetric")
+        entry_point.name = "plugin"
+        mocker.patch('importlib.metadata.entry_points', return_value=[entry_point])
+        assert MetricRegistry().create("plugin").name == "plugin"
+
+
+class TestBuiltinMetrics:
+    """Test suite for the built-in metrics"""
+
+    TEXT = "First line. Still\nthe first sentence!\nA third line without end"
+
+    @pytest.mark.parametrize("cuts", [(), (17,), (5, 21, 37)])
+    def test_merged_shards_match_single_pass(self, cuts):
+        """Test that metrics of merged shards equal a single pass"""
+        names = ["line-count", "longest-word", "words-per-sentence"]
+        statistics = collect(self.TEXT, names, cuts)
+        results = {metric.name: metric.result() for metric in statistics.metrics}
+        assert results == {
+            "line-count": 3,
+            "longest-word": "sentence",
+            "words-per-sentence": 3.67
+        }
+        assert statistics.sentence_count == 3
+
+    def test_line_count(self):
+        """Test lines with and without a final line break"""
+        metric = LineCountMetric()
+        assert metric.result() == 0
+        metric.consume_chars("a\nb\n")
+        assert metric.result() == 2
+        metric.consume_chars("c")
+        assert metric.result() == 3
+
+    def test_longest_word_keeps_first(self):
+        """Test that the first of equally long words is kept"""
+        metric = LongestWordMetric()
+        metric.consume_tokens(["abc", "xyz"])
+        other = LongestWordMetric()
+        other.consume_tokens(["def"])
+        metric.merge(other)
+        assert metric.result() == "abc"
+
+    def test_words_per_sentence_without_sentences(self):
+        """Test the average of a text without sentences"""
+        assert WordsPerSentenceMetric().result() == 0.0
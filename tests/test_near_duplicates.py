@@ -0,0 +1,113 @@
+# tests/test_near_duplicates.py
+import random
+import pytest
+from src.modules.near_duplicates import EMPTY_BIN, LSHIndex, MinHashSketch
+
+
+@pytest.fixture
+def words():
+    """Provide a random word stream"""
+    rng = random.Random(9)
+    return [f"w{rng.randint(0, 3000)}" for _ in range(3000)]
+
+
+def signature(words, **kwargs):
+    """Build the signature of a word list in one batch"""
+    sketch = MinHashSketch(**kwargs)
+    sketch.update(words)
+    return sketch.to_list()
+
+
+class TestMinHashSketch:
+    """Test suite for MinHashSketch class"""
+
+    def test_invalid_parameters(self):
+        """Test rejection of invalid bins and shingle sizes"""
+        with pytest.raises(ValueError):
+            MinHashSketch(bins=100)
+        with pytest.raises(ValueError):
+            MinHashSketch(shingle_size=0)
+
+    @pytest.mark.parametrize("batch", [1, 2, 7, 3000])
+    def test_batches_match_single_pass(self, words, batch):
+        """Test that shingles spanning batches are added exactly once"""
+        sketch = MinHashSketch()
+        for start in range(0, len(words), batch):
+            sketch.update(words[start:start + batch])
+        assert sketch.to_list() == signature(words)
+
+    @pytest.mark.parametrize("cuts", [[1500], [1, 2], [0, 3, 4, 2999]])
+    def test_merge_matches_single_pass(self, words, cuts):
+        """Test merging sketches of consecutive parts, including tiny ones"""
+        bounds = [0] + cuts + [len(words)]
+        parts = []
+        for start, end in zip(bounds, bounds[1:]):
+            part = MinHashSketch()
+            part.update(words[start:end])
+            parts.append(part)
+
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+        assert merged.to_list() == signature(words)
+
+    def test_similarity(self, words):
+        """Test similarity of identical, edited and unrelated texts"""
+        edited = words[:2900] + ["new"] * 100
+        unrelated = [word + "x" for word in words]
+
+        assert MinHashSketch.similarity(signature(words), signature(words)) == 1.0
+        assert MinHashSketch.similarity(signature(words), signature(edited)) > 0.8
+        assert MinHashSketch.similarity(signature(words), signature(unrelated)) < 0.1
+
+    def test_short_text_is_empty(self):
+        """Test that texts shorter than a shingle leave the signature empty"""
+        sketch = MinHashSketch()
+        sketch.update(["only", "two"])
+        assert sketch.empty
+        assert set(sketch.to_list()) == {EMPTY_BIN}
+
+
+class TestLSHIndex:
+    """Test suite for LSHIndex class"""
+
+    def test_maps_duplicates_to_canonical(self, words):
+        """Test that near-duplicates map to the first similar file"""
+        index = LSHIndex()
+        assert index.add("a.txt", signature(words)) is None
+        match = index.add("b.txt", signature(words[:2950] + ["tail"] * 50))
+        assert match[0] == "a.txt" and match[1] >= 0.8
+        assert index.add("c.txt", signature([w + "x" for w in words])) is None
+        assert index.documents["b.txt"]["canonical"] == "a.txt"
+
+    def test_readding_replaces_entry(self, words):
+        """Test that a file is not reported as a duplicate of itself"""
+        index = LSHIndex()
+        index.add("a.txt", signature(words))
+        assert index.add("a.txt", signature(words)) is None
+        assert list(index.documents) == ["a.txt"]
+
+    def test_round_trip(self, words):
+        """Test restoring a serialized index"""
+        index = LSHIndex(bands=32, threshold=0.7)
+        index.add("a.txt", signature(words))
+        index.add("b.txt", signature(words))
+
+        restored = LSHIndex.from_dict(index.to_dict())
+        assert restored.documents == index.documents
+        assert restored.query(signature(words))[0] == "a.txt"
+
+    def test_invalid_bands(self):
+        """Test rejection of bands not dividing the signature"""
+        with pytest.raises(ValueError):
+            LSHIndex(bands=7)
+
+    @pytest.mark.parametrize("data", [
+        {},
+        {"bands": 16, "threshold": 0.8, "bins": 128, "shingle-size": 3,
+         "documents": {"a.txt": {"signature": [1, 2], "canonical": "a.txt"}}},
+    ])
+    def test_from_dict_malformed(self, data):
+        """Test rejection of malformed serialized indexes"""
+        with pytest.raises(ValueError):
+            LSHIndex.from_dict(data)
@@ -0,0 +1,162 @@
+# tests/test_ngram_counter.py
+import math
+import random
+import pytest
+from collections import Counter
+from src.modules.ngram_counter import NGramCounter
+
+
+@pytest.fixture
+def words():
+    """Provide a random word stream with repeated phrases"""
+    rng = random.Random(7)
+    vocabulary = ["new", "york", "the", "of", "a", "city", "big", "apple"]
+    return [rng.choice(vocabulary) for _ in range(2000)]
+
+
+def reference(words, k):
+    """Count n-grams of a word list directly"""
+    return Counter(" ".join(words[i:i + k]) for i in range(len(words) - k + 1))
+
+
+class TestNGramCounter:
+    """Test suite for NGramCounter class"""
+
+    def test_invalid_order(self):
+        """Test rejection of orders below 2"""
+        with pytest.raises(ValueError):
+            NGramCounter(order=1)
+
+    @pytest.mark.parametrize("batch", [1, 2, 5, 2000])
+    def test_batches_match_single_pass(self, words, batch):
+        """Test that n-grams spanning batches are counted exactly"""
+        counter = NGramCounter(order=3)
+        for start in range(0, len(words), batch):
+            counter.update(words[start:start + batch])
+
+        for k in (2, 3):
+            expected = reference(words, k)
+            assert counter.most_common(k, 20) == expected.most_common(20)
+
+    @pytest.mark.parametrize("cuts", [[1000], [1, 2], [3, 4, 5, 1500], [0, 1999]])
+    def test_merge_matches_single_pass(self, words, cuts):
+        """Test merging counters of consecutive parts, including tiny ones"""
+        bounds = [0] + cuts + [len(words)]
+        parts = []
+        for start, end in zip(bounds, bounds[1:]):
+            part = NGramCounter(order=3)
+            part.update(words[start:end])
+            parts.append(part)
+
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+
+        for k in (2, 3):
+            expected = reference(words, k)
+            assert merged.most_common(k, 50) == expected.most_common(50)
+        assert merged.head == words[:2]
+        assert merged.unigrams.total == len(words)
+
+    def test_merge_different_orders(self):
+        """Test rejection of merging counters of different orders"""
+        with pytest.raises(ValueError):
+            NGramCounter(order=2).merge(NGramCounter(order=3))
+
+    def test_unknown_length(self):
+        """Test querying a length that was not counted"""
+        with pytest.raises(ValueError):
+            NGramCounter(order=2).most_common(3, 1)
+
+    def test_pruning_bounds_entries(self, words):
+        """Test that pruning caps the tables and keeps frequent n-grams"""
+        counter = NGramCounter(order=3, max_entries=100)
+        counter.update(words)
+
+        assert counter.pruned
+        assert sum(len(table) for table in counter.tables.values()) <= 100
+        top, count = counter.most_common(2, 1)[0]
+        assert top == reference(words, 2).most_common(1)[0][0]
+        assert count <= reference(words, 2)[top]
+
+    def test_pruning_keeps_half_despite_ties(self):
+        """Test that pruning n-grams of equal count keeps half of the limit"""
+        counter = NGramCounter(order=2, max_entries=100)
+        counter.update([f"w{index}" for index in range(1000)] + ["w0", "w1"])
+
+        assert counter.pruned
+        assert 45 <= len(counter.tables[2]) + len(counter.unigrams) <= 100
+        assert counter.most_common(2, 1)[0] == ("w0 w1", 2)
+
+    def test_pruning_bounds_vocabulary(self):
+        """Test that the interned vocabulary counts against the limit of a wide stream"""
+        rng = random.Random(3)
+        words = [f"w{rng.randrange(100000)}" for _ in range(20000)]
+        counter = NGramCounter(order=3, max_entries=500)
+        for start in range(0, len(words), 100):
+            counter.update(words[start:start + 100])
+            size = len(counter.unigrams) + sum(len(table) for table in counter.tables.values())
+            assert size <= 500
+
+        assert counter.unigrams.total == len(words)
+        bigram, count = counter.most_common(2, 1)[0]
+        assert count <= reference(words, 2)[bigram]
+
+    def test_pruning_keeps_tail_after_merge(self, words):
+        """Test that pruned counters still count n-grams across merge boundaries"""
+        first = NGramCounter(order=3, max_entries=60)
+        first.update(words[:1000])
+        second = NGramCounter(order=3, max_entries=60)
+        second.update(words[1000:])
+        first.merge(second)
+        first.update(words[:10])
+
+        assert first.pruned
+        assert first.unigrams.total == len(words) + 10
+        expected = reference(words + words[:10], 2)
+        for bigram, count in first.most_common(2, 5):
+            assert count <= expected[bigram]
+
+    def test_sketch_restores_pruned_word_counts(self, words):
+        """Test that collocations never undercount words pruned from the vocabulary"""
+        rng = random.Random(9)
+        stream = [word if rng.random() < 0.5 else f"x{rng.randrange(5000)}" for word in words]
+        counter = NGramCounter(order=2, max_entries=200, sketch_width=4096)
+        for start in range(0, len(stream), 50):
+            counter.update(stream[start:start + 50])
+
+        exact = Counter(stream)
+        assert counter.pruned
+        for bigram, count, pmi, _ in counter.collocations(10, min_count=2):
+            first, second = bigram.split()
+            total = len(stream) - 1
+            assert 2 ** pmi <= count * total / (exact[first] * exact[second]) + 1e-9
+
+    def test_sketch_restores_pruned_counts(self, words):
+        """Test that sketch estimates never undercount pruned n-grams"""
+        counter = NGramCounter(order=2, max_entries=40, sketch_width=1024)
+        for start in range(0, len(words), 50):
+            counter.update(words[start:start + 50])
+
+        expected = reference(words, 2)
+        assert counter.pruned
+        for bigram, count in counter.most_common(2, 10):
+            assert count >= expected[bigram]
+
+    def test_collocations(self):
+        """Test collocation scores of a strongly associated pair"""
+        counter = NGramCounter(order=2)
+        counter.update("new york is big and new york is old and a cat is old".split())
+
+        bigram, count, pmi, log_likelihood = counter.collocations(1, min_count=2)[0]
+        assert bigram == "new york"
+        assert count == 2
+        # 13 bigram positions, "new" and "york" both occur twice
+        assert pmi == pytest.approx(math.log2(2 * 13 / (2 * 2)))
+        assert log_likelihood > 0
+
+    def test_collocations_min_count(self):
+        """Test that rare bigrams are not scored"""
+        counter = NGramCounter(order=2)
+        counter.update("a b c d".split())
+        assert counter.collocations(5, min_count=2) == []
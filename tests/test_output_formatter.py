@@ -1,6 +1,7 @@
 # tests/test_output_formatter.py
 import pytest
 from unittest.mock import MagicMock
+from src.modules.exceptions import AnalysisError
 from src.modules.output_formatter import OutputFormatter
 
 
@@ -16,11 +17,22 @@ def mock_analyzer():
     }
     analyzer.get_sentence_count.return_value = 5
     analyzer.get_word_count.return_value = 20
+    analyzer.get_distinct_word_count.return_value = 12
+    analyzer.get_type_token_ratio.return_value = 0.6
+    analyzer.get_vocabulary_sketch.return_value.to_dict.return_value = {
+        "exact": True,
+        "hashes": []
+    }
     analyzer.get_most_frequent_words.return_value = {
         "test": 3,
         "example": 2
     }
     analyzer.get_average_word_length.return_value = 4.5
+    analyzer.get_metric_results.return_value = {}
+    analyzer.get_encoding.return_value = None
+    analyzer.get_normalization.return_value = None
+    analyzer.is_partial.return_value = False
+    analyzer.get_coverage.return_value = 1.0
     analyzer.get_symbol_frequency.return_value = {
         "t": 10,
         "e": 8,
@@ -56,9 +68,12 @@ class TestOutputFormatter:
             "total_symbols",
             "sentence-count",
             "word-count",
+            "distinct-word-count",
+            "type-token-ratio",
             "5-most-frequent-words",
             "average-word-length",
-            "symbols-frequency"
+            "symbols-frequency",
+            "vocabulary-sketch"
         }
         assert set(results.keys()) == expected_keys
 
@@ -68,12 +83,15 @@ class TestOutputFormatter:
         mock_analyzer.get_word_count.assert_called_once()
         mock_analyzer.get_most_frequent_words.assert_called_once()
         mock_analyzer.get_average_word_length.assert_called_once()
-        mock_analyzer.get_symbol_frequency.assert_called_once()
+        mock_analyzer.get_symbol_frequency.assert_called_once_with(None)
 
         # Verify the returned values match the mock analyzer's returns
         assert results["total_symbols"] == {"with_spaces": 100, "without_spaces": 80}
         assert results["sentence-count"] == 5
         assert results["word-count"] == 20
+        assert results["distinct-word-count"] == 12
+        assert results["type-token-ratio"] == 0.6
+        assert results["vocabulary-sketch"] == {"exact": True, "hashes": []}
         assert results["5-most-frequent-words"] == {"test": 3, "example": 2}
         assert results["average-word-length"] == 4.5
         assert results["symbols-frequency"] == {"t": 10, "e": 8, "s": 6}
@@ -123,3 +141,83 @@ class TestOutputFormatter:
         assert results["5-most-frequent-words"] == {}
         assert results["average-word-length"] == 0.0
         assert results["symbols-frequency"] == {}
+
+    def test_format_results_symbol_limit(self, mock_analyzer):
+        """Test that the symbol limit is passed to the analyzer"""
+        OutputFormatter(mock_analyzer, n=5, symbol_limit=2).format_results()
+        mock_analyzer.get_symbol_frequency.assert_called_once_with(2)
+
+    def test_format_results_ngrams(self, mock_analyzer):
+        """Test the opt-in n-gram section"""
+        mock_analyzer.get_ngram_statistics.return_value = {"2-grams": {"new york": 2}}
+
+        assert "ngrams" not in OutputFormatter(mock_analyzer, n=5).format_results()
+        results = OutputFormatter(mock_analyzer, n=5, ngrams=True).format_results()
+        assert results["ngrams"] == {"2-grams": {"new york": 2}}
+
+    def test_format_results_metrics(self, mock_analyzer):
+        """Test that custom metrics are added under their names"""
+        mock_analyzer.get_metric_results.return_value = {"line-count": 3}
+        results = OutputFormatter(mock_analyzer, n=5).format_results()
+        assert results["line-count"] == 3
+
+    def test_format_results_metric_clash(self, mock_analyzer):
+        """Test that a metric cannot replace a built-in result"""
+        mock_analyzer.get_metric_results.return_value = {"word-count": 0}
+        with pytest.raises(AnalysisError):
+            OutputFormatter(mock_analyzer, n=5).format_results()
+
+    def test_format_results_encoding(self, mock_analyzer):
+        """Test that the detected encoding of a file is recorded"""
+        mock_analyzer.get_encoding.return_value = "koi8-r"
+        results = OutputFormatter(mock_analyzer, n=5).format_results()
+        assert results["encoding"] == "koi8-r"
+
+    def test_format_results_normalization(self, mock_analyzer):
+        """Test that the normalization of counted word forms is recorded"""
+        assert "normalization" not in OutputFormatter(mock_analyzer, n=5).format_results()
+        normalization = {"language": "en", "stopwords": True, "mode": "stem"}
+        mock_analyzer.get_normalization.return_value = normalization
+        results = OutputFormatter(mock_analyzer, n=5).format_results()
+        assert results["normalization"] == normalization
+
+    def test_format_results_partial(self, mock_analyzer):
+        """Test that results stopped by the deadline are marked partial"""
+        mock_analyzer.is_partial.return_value = True
+        mock_analyzer.get_coverage.return_value = 0.25
+        results = OutputFormatter(mock_analyzer, n=5).format_results()
+        assert results["partial"] == {"coverage": 0.25, "skipped": []}
+        assert results["symbols-frequency"] == {"t": 10, "e": 8, "s": 6}
+
+    def test_format_results_deadline_priority(self, mock_analyzer):
+        """Test that counts are kept and expensive sections skipped after the deadline"""
+        deadline = MagicMock()
+        deadline.expired.side_effect = [False, False, True, True, True]
+        results = OutputFormatter(mock_analyzer, n=5, ngrams=True,
+                                  deadline=deadline).format_results()
+
+        assert list(results) == ["total_symbols", "sentence-count", "word-count",
+                                 "distinct-word-count", "type-token-ratio",
+                                 "5-most-frequent-words", "average-word-length",
+                                 "vocabulary-sketch", "partial"]
+        assert results["partial"] == {"coverage": 1.0,
+                                      "skipped": ["metrics", "symbols-frequency", "ngrams"]}
+        mock_analyzer.get_symbol_frequency.assert_not_called()
+        mock_analyzer.get_ngram_statistics.assert_not_called()
+
+    def test_format_estimate_results(self):
+        """Test formatting of sampling-based estimates"""
+        estimator = MagicMock()
+        estimator.get_sample_info.return_value = {"sampled-blocks": 2, "total-blocks": 10}
+        estimator.get_word_count.return_value = 1000
+        estimator.get_most_frequent_words.return_value = {"test": 50}
+        estimator.get_average_word_length.return_value = 4.2
+        estimator.get_confidence_intervals.return_value = {"word-count": [900, 1100]}
+
+        results = OutputFormatter(estimator, n=1).format_estimate_results()
+
+        assert results["estimated"] is True
+        assert results["word-count"] == 1000
+        assert results["1-most-frequent-words"] == {"test": 50}
+        assert results["confidence-intervals"] == {"word-count": [900, 1100]}
+        assert results["sample"]["total-blocks"] == 10
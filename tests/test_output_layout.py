@@ -0,0 +1,96 @@
+# tests/test_output_layout.py
+import os
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from src.modules.exceptions import ValidationError
+from src.modules.output_layout import MANIFEST_FILENAME, OutputLayout
+
+
+class TestOutputLayout:
+    """Test suite for OutputLayout class"""
+
+    def test_flat_layout(self, tmp_path):
+        """Test that the flat layout keeps input names in the root"""
+        layout = OutputLayout(str(tmp_path))
+        assert layout.path("/in/a.txt", "a.txt", ".json") == str(tmp_path / "a.txt.json")
+
+    def test_fan_out(self, tmp_path):
+        """Test that outputs are spread by the digest of the input location"""
+        layout = OutputLayout(str(tmp_path), fan_out=2)
+        digest = OutputLayout.digest("/in/a.txt")
+
+        path = layout.path("/in/a.txt", "a.txt", ".n5.json")
+
+        assert path == str(tmp_path / digest[:2] / digest[2:4] / f"a.txt.{digest[:12]}.n5.json")
+
+    def test_same_name_from_different_trees(self, tmp_path):
+        """Test that inputs of the same name from different trees get distinct outputs"""
+        layout = OutputLayout(str(tmp_path), fan_out=1)
+        first = layout.path("/in/x/a.txt", "a.txt", ".json")
+        second = layout.path("s3://corpus/y/a.txt", "a.txt", ".json")
+        assert first != second
+        assert layout.path("/in/x/a.txt", "a.txt", ".json") == first
+
+    def test_prepare_creates_directories_once(self, tmp_path):
+        """Test that directories are created once and outputs recorded once"""
+        layout = OutputLayout(str(tmp_path), fan_out=2)
+        paths = [layout.path("/in/a.txt", "a.txt", suffix) for suffix in (".json", ".kwic")]
+
+        layout.prepare("/in/a.txt", paths[0])
+        with patch("os.makedirs") as makedirs:
+            for path in paths + paths:
+                layout.prepare("/in/a.txt", path)
+
+        makedirs.assert_not_called()
+        assert os.path.isdir(os.path.dirname(paths[0]))
+        assert layout.manifest() == {
+            "/in/a.txt": [os.path.relpath(path, str(tmp_path)) for path in paths]
+        }
+
+    def test_manifest_skips_torn_lines(self, tmp_path):
+        """Test that interrupted and duplicate manifest entries are ignored"""
+        layout = OutputLayout(str(tmp_path))
+        assert layout.manifest() == {}
+        layout.prepare("/in/a.txt", layout.path("/in/a.txt", "a.txt", ".json"))
+        # Another writer recording the same output, then dying mid-line
+        with open(tmp_path / MANIFEST_FILENAME, "a", encoding="utf-8") as f:
+            f.write('{"input": "/in/a.txt", "output": "a.txt.json"}\n{"input": "/in/b')
+
+        assert layout.manifest() == {"/in/a.txt": ["a.txt.json"]}
+
+    def test_concurrent_writers(self, tmp_path):
+        """Test that concurrent writers record every output in whole lines"""
+        layouts = [OutputLayout(str(tmp_path), fan_out=1) for _ in range(4)]
+        locations = [f"/in/{index}.txt" for index in range(50)]
+
+        def write(layout):
+            for location in locations:
+                layout.prepare(location, layout.path(location, os.path.basename(location), ".json"))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(write, layouts))
+
+        with open(tmp_path / MANIFEST_FILENAME, encoding="utf-8") as f:
+            assert sum(1 for _ in f) == 200
+        assert sorted(layouts[0].manifest()) == sorted(locations)
+
+    def test_list(self, tmp_path):
+        """Test listing outputs across levels without hidden files"""
+        layout = OutputLayout(str(tmp_path), fan_out=1)
+        path = layout.path("/in/a.txt", "a.txt", ".freq")
+        layout.prepare("/in/a.txt", path)
+        open(path, "w").close()
+        (tmp_path / "b.txt.freq").write_text("")
+        (tmp_path / ".result-cache").mkdir()
+        (tmp_path / ".result-cache" / "c.freq").write_text("")
+
+        assert layout.list(".freq") == sorted([path, str(tmp_path / "b.txt.freq")])
+        with pytest.raises(OSError):
+            OutputLayout(str(tmp_path / "missing")).list(".freq")
+
+    @pytest.mark.parametrize("fan_out", [-1, 5, 1.5])
+    def test_invalid_fan_out(self, tmp_path, fan_out):
+        """Test that unsupported fan-out levels are rejected"""
+        with pytest.raises(ValidationError):
+            OutputLayout(str(tmp_path), fan_out)
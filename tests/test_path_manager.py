@@ -46,6 +46,12 @@ class TestPathManager:
         assert path_manager.input_dir == os.path.join('/fake', 'src', 'text-files')
         assert path_manager.output_dir == os.path.join('/fake', 'src', 'text-analyzed')
 
+    def test_custom_directories(self, tmp_path):
+        """Test that input locations of storage backends are joined with slashes"""
+        manager = PathManager("s3://corpus/texts/", str(tmp_path / "out"))
+        assert manager.get_input_path("a.txt") == "s3://corpus/texts/a.txt"
+        assert manager.get_output_path("a.txt") == str(tmp_path / "out" / "a.txt.json")
+
     def test_get_input_path(self, path_manager):
         """Test input path resolution"""
         filename = "test.txt"
@@ -62,6 +68,26 @@ class TestPathManager:
         result = path_manager.get_output_path(filename)
         assert result == expected_path
 
+    def test_get_concordance_path(self, path_manager):
+        """Test concordance index path resolution"""
+        result = path_manager.get_concordance_path("test.txt")
+        assert result == os.path.join('/fake', 'src', 'text-analyzed', 'test.txt.kwic')
+
+    def test_get_windows_path(self, path_manager):
+        """Test window statistics path resolution"""
+        result = path_manager.get_windows_path("test.txt")
+        assert result == os.path.join('/fake', 'src', 'text-analyzed', 'test.txt.windows.ndjson')
+
+    def test_get_frequency_run_path(self, path_manager):
+        """Test frequency run path resolution"""
+        result = path_manager.get_frequency_run_path("test.txt")
+        assert result == os.path.join('/fake', 'src', 'text-analyzed', 'test.txt.freq')
+
+    def test_get_profile_path(self, path_manager):
+        """Test collapsed stack profile path resolution"""
+        result = path_manager.get_profile_path("profile-1")
+        assert result == os.path.join('/fake', 'src', 'text-analyzed', 'profile-1.collapsed')
+
     def test_ensure_output_dir_exists_success(self, path_manager):
         """Test successful output directory creation"""
         with patch('os.makedirs') as mock_makedirs:
@@ -153,3 +179,61 @@ class TestPathManager:
             assert error_context["path"] == path_manager.output_dir
             assert error_context["error"] == "Permission denied"
             assert error_context["error_code"] == 13
+
+    def test_output_path_with_n(self, tmp_path):
+        """Test that N is part of result names and the newest result is found"""
+        manager = PathManager(output_dir=str(tmp_path))
+        assert manager.get_output_path("a", 10) == os.path.join(str(tmp_path), "a.n10.json")
+        assert manager.find_output_path("a") is None
+
+        (tmp_path / "a.n10.json").write_text("{}")
+        (tmp_path / "a.n5.json").write_text("{}")
+        os.utime(tmp_path / "a.n10.json", (1, 1))
+        assert manager.find_output_path("a") == os.path.join(str(tmp_path), "a.n5.json")
+
+        (tmp_path / "a.json").write_text("{}")
+        assert manager.find_output_path("a") == os.path.join(str(tmp_path), "a.json")
+        assert manager.get_cache_dir() == os.path.join(str(tmp_path), ".result-cache")
+
+    def test_list_results_one_per_input(self, tmp_path):
+        """Test that only one result of every input file is listed"""
+        manager = PathManager(output_dir=str(tmp_path))
+        for name in ("a.txt.n10.json", "a.txt.n5.json", "b.txt.estimate.n5.json",
+                     "c.txt.estimate.n5.json", "c.txt.n5.json", "corpus-vocabulary.json"):
+            (tmp_path / name).write_text("{}")
+        os.utime(tmp_path / "a.txt.n10.json", (1, 1))
+
+        assert manager.list_results() == [
+            os.path.join(str(tmp_path), name)
+            for name in ("a.txt.n5.json", "b.txt.estimate.n5.json", "c.txt.n5.json",
+                         "corpus-vocabulary.json")
+        ]
+        (tmp_path / "a.txt.json").write_text("{}")
+        assert os.path.join(str(tmp_path), "a.txt.json") in manager.list_results()
+
+    def test_ensure_output_dir_exists_once(self, path_manager):
+        """Test that the output directory is checked only until it exists"""
+        with patch('os.makedirs') as mock_makedirs:
+            with patch('os.access', return_value=True):
+                path_manager.ensure_output_dir_exists()
+                path_manager.ensure_output_dir_exists()
+        mock_makedirs.assert_called_once()
+
+    def test_sharded_results(self, tmp_path):
+        """Test that results of input files are fanned out and recorded in the manifest"""
+        manager = PathManager(str(tmp_path / "in"), str(tmp_path / "out"), fan_out=2)
+        path = manager.get_result_path("a.txt", 5)
+        assert os.path.dirname(os.path.dirname(os.path.dirname(path))) == manager.output_dir
+        assert os.path.basename(path).startswith("a.txt.")
+        assert path.endswith(".n5.json")
+        assert manager.get_result_path("a.txt", 5, "estimate").endswith(".estimate.n5.json")
+
+        manager.prepare_output("a.txt", path)
+        with open(path, "w") as f:
+            f.write("{}")
+
+        assert manager.find_output_path("a.txt") == path
+        assert manager.list_outputs(".json") == [path]
+        assert manager.layout.manifest() == {
+            manager.get_input_path("a.txt"): [os.path.relpath(path, manager.output_dir)]
+        }
@@ -0,0 +1,147 @@
+# tests/test_performance.py
+"""Performance regression tests of pipeline stages on generated corpora.
+
+Opt-in: ``python -m pytest --perf`` compares throughput and peak memory
+against tests/perf_baseline.json, and
+``python -m pytest --update-perf-baseline`` measures the stages again
+and stores them as the new baseline.
+"""
+import gc
+import random
+import time
+import tracemalloc
+import pytest
+from src.modules.analysis_engine import AnalysisEngine
+from src.modules.file_handler import FileHandler
+from src.modules.memory_budget import MemoryBudget
+from src.modules.output_formatter import OutputFormatter
+from src.modules.text_analyzer import TextAnalyzer
+from src.modules.validators import FileValidator
+from src.modules.word_normalizer import WordNormalizer
+from tests.conftest import PerfBaseline
+
+CORPUS_WORDS = 200_000
+REPEATS = 3
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    """Generate a text of Zipf-distributed words in sentences"""
+    rng = random.Random(7)
+    syllables = ["ka", "lo", "mi", "ne", "ru", "sta", "ver", "ing", "ed", "tion"]
+    vocabulary = ["".join(rng.choices(syllables, k=rng.randint(1, 4))) for _ in range(20_000)]
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    words = rng.choices(vocabulary, weights, k=CORPUS_WORDS)
+    sentences = []
+    for start in range(0, len(words), 12):
+        sentence = " ".join(words[start:start + 12])
+        sentences.append(sentence.capitalize() + rng.choice([".", "!", "?", "."]))
+    return " ".join(sentences)
+
+
+@pytest.fixture(scope="module")
+def corpus_file(corpus, tmp_path_factory):
+    """Write the generated text to a file"""
+    path = tmp_path_factory.mktemp("perf") / "corpus.txt"
+    path.write_text(corpus, encoding='utf-8')
+    return path
+
+
+def measure(run, size):
+    """Measure the best throughput of a stage and its peak memory of a separate run"""
+    elapsed = []
+    for _ in range(REPEATS):
+        gc.collect()
+        start = time.perf_counter()
+        tokens = run()
+        elapsed.append(time.perf_counter() - start)
+    best = min(elapsed)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"mb-per-second": round(size / 1e6 / best, 3),
+            "tokens-per-second": round(tokens / best),
+            "peak-memory-bytes": peak}
+
+
+def analyze(text, **options):
+    """Analyze a text and format every section, returning the number of words"""
+    ngrams = options.get("ngram_order", 0) > 0
+    analyzer = TextAnalyzer(text, n=10, **options)
+    OutputFormatter(analyzer, 10, ngrams=ngrams).format_results()
+    return analyzer.get_word_count()
+
+
+@pytest.mark.perf
+class TestPerformance:
+    """Performance regression tests of pipeline stages"""
+
+    def test_text_analyzer(self, corpus, perf_baseline):
+        """Test in-memory analysis of all default statistics"""
+        perf_baseline.check("text-analyzer",
+                            measure(lambda: analyze(corpus), len(corpus.encode('utf-8'))))
+
+    def test_text_analyzer_ngrams(self, corpus, perf_baseline):
+        """Test in-memory analysis with bigrams and collocations"""
+        perf_baseline.check("text-analyzer-ngrams",
+                            measure(lambda: analyze(corpus, ngram_order=2),
+                                    len(corpus.encode('utf-8'))))
+
+    def test_normalized_words(self, corpus, perf_baseline):
+        """Test in-memory analysis of stemmed words without stopwords"""
+        perf_baseline.check("normalized-words",
+                            measure(lambda: analyze(corpus, normalizer=WordNormalizer(mode="stem")),
+                                    len(corpus.encode('utf-8'))))
+
+    def test_streaming_engine(self, corpus_file, perf_baseline, tmp_path):
+        """Test streamed analysis of a file within a memory budget"""
+        engine = AnalysisEngine(FileHandler(FileValidator()),
+                                MemoryBudget(64 * 1024 * 1024, str(tmp_path)))
+
+        def run():
+            analyzer = engine.analyze_file(str(corpus_file), n=10)
+            try:
+                OutputFormatter(analyzer, 10).format_results()
+                return analyzer.get_word_count()
+            finally:
+                analyzer.close()
+
+        perf_baseline.check("streaming-engine", measure(run, corpus_file.stat().st_size))
+
+
+class TestPerfBaseline:
+    """Test suite for the comparison against the stored baseline"""
+
+    @pytest.fixture
+    def baseline(self, tmp_path):
+        """Create a baseline with one stage"""
+        baseline = PerfBaseline(tmp_path / "baseline.json", update=True)
+        baseline.check("stage", {"mb-per-second": 10.0, "tokens-per-second": 1000,
+                                 "peak-memory-bytes": 1000})
+        baseline.save()
+        return PerfBaseline(tmp_path / "baseline.json")
+
+    def test_within_tolerance(self, baseline):
+        """Test that measurements within the tolerances pass"""
+        baseline.check("stage", {"mb-per-second": 6.0, "tokens-per-second": 600,
+                                 "peak-memory-bytes": 1200})
+
+    def test_regression_fails(self, baseline):
+        """Test that a large throughput drop or memory growth fails"""
+        with pytest.raises(pytest.fail.Exception, match="mb-per-second"):
+            baseline.check("stage", {"mb-per-second": 1.0, "tokens-per-second": 600,
+                                     "peak-memory-bytes": 1000})
+        with pytest.raises(pytest.fail.Exception, match="peak-memory-bytes"):
+            baseline.check("stage", {"mb-per-second": 10.0, "tokens-per-second": 1000,
+                                     "peak-memory-bytes": 2000})
+
+    def test_missing_stage_skipped(self, baseline):
+        """Test that stages without a baseline are skipped"""
+        with pytest.raises(pytest.skip.Exception):
+            baseline.check("other", {"mb-per-second": 1.0, "tokens-per-second": 1,
+                                     "peak-memory-bytes": 1})
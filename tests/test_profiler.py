@@ -0,0 +1,182 @@
+# tests/test_profiler.py
+import json
+import time
+import tracemalloc
+import pytest
+from src.modules import profiler as profiler_module
+from src.modules.analysis_engine import AnalysisEngine
+from src.modules.file_handler import FileHandler
+from src.modules.memory_budget import MemoryBudget
+from src.modules.profiler import PipelineProfiler, function_label, profile_worker, stage
+from src.modules.text_analyzer import TextAnalyzer
+from src.modules.validators import FileValidator
+
+
+def leaf(size):
+    """Allocate and sum a list"""
+    return sum(list(range(size)))
+
+
+def branch(size):
+    """Call leaf twice"""
+    return leaf(size) + leaf(size)
+
+
+def busy(seconds):
+    """Spin in Python code for a while"""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        leaf(100)
+
+
+@pytest.fixture(autouse=True)
+def no_active_profiler():
+    """Make sure no test leaves a profiler active"""
+    yield
+    assert profiler_module.active_profiler() is None
+
+
+class TestPipelineProfiler:
+    """Test suite for PipelineProfiler class"""
+
+    def test_invalid_settings(self):
+        """Test rejection of unknown modes and intervals"""
+        with pytest.raises(ValueError):
+            PipelineProfiler("tracing")
+        with pytest.raises(ValueError):
+            PipelineProfiler("sampling", interval=0)
+
+    def test_single_active_profiler(self):
+        """Test that only one profiler runs in a process"""
+        with PipelineProfiler(memory=False):
+            with pytest.raises(RuntimeError):
+                PipelineProfiler(memory=False).start()
+
+    def test_stage_without_profiler(self):
+        """Test that stages are no-ops when not profiling"""
+        with stage("idle"):
+            value = branch(10)
+        assert value == 90
+
+    def test_collapsed_stacks(self):
+        """Test that collapsed stacks follow the call graph"""
+        with PipelineProfiler(memory=False) as profiler:
+            for _ in range(50):
+                branch(2000)
+        stacks = profiler.collapsed()
+        leaf_label = function_label((leaf.__code__.co_filename, leaf.__code__.co_firstlineno, "leaf"))
+        branch_label = function_label((branch.__code__.co_filename,
+                                       branch.__code__.co_firstlineno, "branch"))
+        assert leaf_label == f"leaf (test_profiler.py:{leaf.__code__.co_firstlineno})"
+        paths = [stack.split(";") for stack in stacks]
+        assert any(path[-2:] == [branch_label, leaf_label] for path in paths)
+        assert all(weight > 0 for weight in stacks.values())
+
+    def test_hot_functions(self):
+        """Test that hot functions are sorted by their own time"""
+        with PipelineProfiler(memory=False) as profiler:
+            for _ in range(20):
+                branch(5000)
+        hot = profiler.hot_functions(3)
+        assert len(hot) == 3
+        assert [entry["self-seconds"] for entry in hot] == sorted(
+            (entry["self-seconds"] for entry in hot), reverse=True)
+        assert any(entry["function"].startswith("leaf ") and entry["calls"] == 40
+                   for entry in profiler.hot_functions(20))
+
+    def test_stage_memory(self):
+        """Test recording time, allocations and peak of nested stages"""
+        with PipelineProfiler() as profiler:
+            with stage("outer"):
+                kept = [bytearray(1024) for _ in range(100)]
+                with stage("inner"):
+                    temporary = bytearray(1024 * 1024)
+                    del temporary
+        assert not tracemalloc.is_tracing()
+        stages = profiler.summary()["stages"]
+        assert stages["inner"]["count"] == 1
+        assert stages["inner"]["peak-bytes"] >= 1000 * 1024
+        assert stages["inner"]["allocated-bytes"] < 1024 * 1024
+        assert stages["outer"]["peak-bytes"] >= 1000 * 1024
+        assert stages["outer"]["allocated-bytes"] >= 100 * 1024
+        assert stages["outer"]["top-allocations"][0]["site"].startswith("test_profiler.py:")
+        assert len(kept) == 100
+
+    def test_analyzer_stages(self):
+        """Test that TextAnalyzer reports its stages"""
+        with PipelineProfiler() as profiler:
+            analyzer = TextAnalyzer("One two two. Three three three!", n=2)
+            analyzer.get_most_frequent_words()
+            analyzer.get_symbol_frequency()
+            analyzer.get_distinct_word_count()
+        stages = profiler.summary()["stages"]
+        for name in ("collect-statistics", "most-frequent-words",
+                     "symbol-frequency", "vocabulary-sketch"):
+            assert stages[name]["count"] == 1
+            assert "peak-bytes" in stages[name]
+
+    def test_sampling(self):
+        """Test that the sampling mode records stacks of the profiled thread"""
+        with PipelineProfiler("sampling", interval=0.001, memory=False) as profiler:
+            busy(0.2)
+        stacks = profiler.collapsed()
+        assert sum(stacks.values()) > 10
+        assert any("busy (test_profiler.py" in stack for stack in stacks)
+        hot = profiler.hot_functions(5)
+        assert hot[0]["total-samples"] >= hot[0]["self-samples"]
+        assert profiler.summary()["interval"] == 0.001
+
+    @pytest.mark.parametrize("mode", PipelineProfiler.MODES)
+    def test_add_worker(self, mode):
+        """Test aggregating profiles of workers"""
+        settings = PipelineProfiler(mode, interval=0.001).worker_settings()
+        result, profile = profile_worker(settings, busy, 0.05)
+        assert result is None
+        with PipelineProfiler(mode, interval=0.001, memory=False) as profiler:
+            leaf(10)
+        before = sum(profiler.collapsed().values())
+        profiler.add_worker(profile)
+        profiler.add_worker(profile)
+        assert profiler.workers == 2
+        assert sum(profiler.collapsed().values()) > before
+        assert any("busy (test_profiler.py" in stack for stack in profiler.collapsed())
+        other = "sampling" if mode == "cprofile" else "cprofile"
+        with pytest.raises(ValueError):
+            profiler.add_worker({**profile, "mode": other})
+
+    def test_parallel_workers(self, tmp_path, mocker):
+        """Test that profiles of shard workers are added to the active profiler"""
+        path = tmp_path / "large.txt"
+        path.write_text("alpha beta gamma. " * 20000, encoding='utf-8')
+        budget = MemoryBudget(2 ** 30)
+        mocker.patch.object(budget, 'worker_count', return_value=3)
+        engine = AnalysisEngine(FileHandler(FileValidator()), budget)
+        with PipelineProfiler() as profiler:
+            analyzer = engine.analyze_file(str(path), n=2)
+        try:
+            assert analyzer.get_word_count() == 60000
+        finally:
+            analyzer.close()
+        summary = profiler.summary()
+        assert summary["workers"] == 3
+        assert summary["stages"]["scan-shard"]["count"] == 3
+        assert summary["stages"]["merge-shards"]["count"] == 1
+        assert any("scan_shard (analysis_engine.py" in stack for stack in profiler.collapsed())
+
+    def test_save(self, tmp_path):
+        """Test writing collapsed stacks and the summary"""
+        with PipelineProfiler(memory=False) as profiler:
+            with stage("work"):
+                branch(1000)
+        collapsed_path = tmp_path / "run.collapsed"
+        summary_path = tmp_path / "run.json"
+        profiler.save(str(collapsed_path), str(summary_path), FileHandler(FileValidator()))
+        lines = collapsed_path.read_text(encoding='utf-8').splitlines()
+        assert lines
+        for line in lines:
+            stack, weight = line.rsplit(" ", 1)
+            assert stack and int(weight) > 0
+        summary = json.loads(summary_path.read_text(encoding='utf-8'))
+        assert summary["mode"] == "cprofile"
+        assert summary["stages"]["work"]["count"] == 1
+        assert summary["hot-functions"]
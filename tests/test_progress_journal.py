@@ -0,0 +1,113 @@
+# tests/test_progress_journal.py
+import json
+import pytest
+from src.modules.progress_journal import ProgressJournal
+
+SETTINGS = {"n": 5, "symbol-limit": None}
+
+
+@pytest.fixture
+def journal(tmp_path):
+    """Create a ProgressJournal in a temporary directory"""
+    return ProgressJournal(str(tmp_path / "journal.jsonl"), fsync_interval=2)
+
+
+class TestProgressJournal:
+    """Test suite for ProgressJournal class"""
+
+    def test_load_missing_journal(self, journal):
+        """Test loading a journal that doesn't exist yet"""
+        assert journal.load() == {}
+
+    def test_record_and_load(self, journal, tmp_path):
+        """Test that recorded entries are loaded back"""
+        output = tmp_path / "a.json"
+        output.write_text("{}")
+
+        with journal:
+            journal.record_success("a.txt", (2, "v1"), {"n": 2}, str(output))
+            journal.record_failure("b.txt", (3, "v2"), 3, "boom")
+
+        entries = journal.load()
+        assert entries["a.txt"]["status"] == ProgressJournal.STATUS_DONE
+        assert entries["a.txt"]["output"] == str(output)
+        assert entries["a.txt"]["version"] == "v1"
+        assert entries["a.txt"]["settings"] == {"n": 2}
+        assert entries["b.txt"]["status"] == ProgressJournal.STATUS_FAILED
+        assert entries["b.txt"]["attempts"] == 3
+        assert entries["b.txt"]["error"] == "boom"
+
+    def test_latest_entry_wins(self, journal):
+        """Test that a later entry for the same path replaces earlier ones"""
+        with journal:
+            journal.record_failure("a.txt", None, 1, "boom")
+            journal.record_success("a.txt", (1, "v"), {}, "a.json", attempts=2)
+
+        assert journal.load()["a.txt"]["status"] == ProgressJournal.STATUS_DONE
+
+    def test_entries_flushed_before_close(self, journal):
+        """Test that entries are visible on disk without closing the journal"""
+        journal.record_success("a.txt", (1, "v"), {}, "a.json")
+        try:
+            assert "a.txt" in journal.load()
+        finally:
+            journal.close()
+
+    def test_truncated_line_ignored(self, journal):
+        """Test that a partially written last line is skipped"""
+        with journal:
+            journal.record_success("a.txt", (1, "v"), {}, "a.json")
+        with journal.path.open('a', encoding='utf-8') as f:
+            f.write('{"path": "b.txt", "sta')
+
+        entries = journal.load()
+        assert list(entries) == ["a.txt"]
+
+    def test_reset(self, journal):
+        """Test that reset removes previous entries"""
+        with journal:
+            journal.record_success("a.txt", (1, "v"), {}, "a.json")
+        journal.reset()
+        assert not journal.path.exists()
+        assert journal.load() == {}
+
+    def test_entries_are_json_lines(self, journal):
+        """Test the on-disk journal format"""
+        with journal:
+            journal.record_success("a.txt", (1, None), {}, "a.json", content_hash="hash")
+        lines = journal.path.read_text(encoding='utf-8').splitlines()
+        assert json.loads(lines[0])["sha256"] == "hash"
+
+    @pytest.mark.parametrize("entry,fingerprint,content_hash,expected", [
+        (None, (1, "v"), None, False),
+        ({"status": "failed", "size": 1, "version": "v", "settings": SETTINGS,
+          "output": None}, (1, "v"), None, False),
+        ({"status": "done", "size": 1, "version": "old", "settings": SETTINGS,
+          "output": "OUTPUT"}, (1, "v"), None, False),
+        ({"status": "done", "size": 2, "version": "v", "settings": SETTINGS,
+          "output": "OUTPUT"}, (1, "v"), None, False),
+        ({"status": "done", "size": 1, "version": "v", "settings": {"n": 2},
+          "output": "OUTPUT"}, (1, "v"), None, False),
+        ({"status": "done", "size": 1, "version": "v", "settings": SETTINGS,
+          "output": "OUTPUT"}, (1, "v"), None, True),
+        ({"status": "done", "size": 1, "version": None, "sha256": "hash",
+          "settings": SETTINGS, "output": "OUTPUT"}, (1, None), None, False),
+        ({"status": "done", "size": 1, "version": None, "sha256": "old",
+          "settings": SETTINGS, "output": "OUTPUT"}, (1, None), "hash", False),
+        ({"status": "done", "size": 1, "version": None, "sha256": "hash",
+          "settings": SETTINGS, "output": "OUTPUT"}, (1, None), "hash", True),
+    ])
+    def test_is_completed(self, tmp_path, entry, fingerprint, content_hash, expected):
+        """Test completion check against version, hash, settings, status and output presence"""
+        output = tmp_path / "out.json"
+        output.write_text("{}")
+        if entry and entry["output"] == "OUTPUT":
+            entry = dict(entry, output=str(output))
+        assert ProgressJournal.is_completed(entry, fingerprint, SETTINGS,
+                                            content_hash) is expected
+
+    def test_is_completed_missing_output(self, tmp_path):
+        """Test that a deleted output file forces re-analysis"""
+        entry = {"status": "done", "size": 1, "version": "v", "settings": SETTINGS,
+                 "output": str(tmp_path / "gone.json")}
+        assert ProgressJournal.is_completed(entry, (1, "v"), SETTINGS) is False
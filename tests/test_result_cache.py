@@ -0,0 +1,147 @@
+# tests/test_result_cache.py
+import os
+import pytest
+from src.modules.exceptions import AnalysisError, ValidationError
+from src.modules.memory_budget import MemoryBudget
+from src.modules.output_formatter import OutputFormatter
+from src.modules.result_cache import ResultCache
+from src.modules.text_analyzer import TextAnalyzer
+
+SAMPLE_TEXT = ("The cat sat on the mat. A dog sat on the log! "
+               "The cat and the dog met. Was it a cat?")
+METRICS = ["longest-word", "words-per-sentence"]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a ResultCache in a temporary directory"""
+    return ResultCache(str(tmp_path / "cache"), max_entries=2)
+
+
+@pytest.fixture
+def key():
+    """Provide the cache key of the sample text"""
+    return ResultCache.key("0" * 64, "en")
+
+
+class TestResultCache:
+    """Test suite for ResultCache class"""
+
+    @pytest.mark.parametrize("n", [1, 3, 7])
+    def test_serves_any_n(self, cache, key, n):
+        """Test that one cached state formats like a fresh analysis for any N"""
+        cache.store(key, TextAnalyzer(SAMPLE_TEXT, n=2, metrics=METRICS))
+
+        cached = cache.load(key, n, METRICS)
+        expected = OutputFormatter(TextAnalyzer(SAMPLE_TEXT, n=n, metrics=METRICS),
+                                   n, symbol_limit=5).format_results()
+
+        assert OutputFormatter(cached, n, symbol_limit=5).format_results() == expected
+
+    def test_n_larger_than_words(self, cache, key):
+        """Test that N beyond the word count is rejected like a fresh analysis"""
+        cache.store(key, TextAnalyzer(SAMPLE_TEXT, n=2))
+        with pytest.raises(ValidationError):
+            cache.load(key, 1000).get_most_frequent_words()
+
+    def test_metrics_subset(self, cache, key):
+        """Test that requests for uncached metrics miss and extend the state when stored"""
+        cache.store(key, TextAnalyzer(SAMPLE_TEXT, n=2, metrics=["longest-word"]))
+
+        assert cache.load(key, 2, ["longest-word"]).get_metric_results().keys() == {
+            "longest-word"
+        }
+        assert cache.load(key, 2, METRICS) is None
+        assert cache.load(key, 2).get_metric_results() == {}
+
+        cache.store(key, TextAnalyzer(SAMPLE_TEXT, n=2, metrics=["words-per-sentence"]))
+        assert cache.load(key, 2, METRICS).get_metric_results().keys() == set(METRICS)
+
+    def test_options_change_key(self):
+        """Test that language and normalization are part of the key"""
+        keys = {ResultCache.key("0" * 64, "en"), ResultCache.key("0" * 64, "de"),
+                ResultCache.key("0" * 64, "en", {"stem": "porter"})}
+        assert len(keys) == 3
+
+    def test_partial_rejected(self, cache, key, mocker):
+        """Test that partial analyses are not cached"""
+        analyzer = mocker.MagicMock()
+        analyzer.is_partial.return_value = True
+        with pytest.raises(ValueError):
+            cache.store(key, analyzer)
+        assert cache.load(key, 1) is None
+
+    def test_missing_or_corrupt_state(self, cache, key):
+        """Test that missing word lists and unreadable states are misses"""
+        cache.store(key, TextAnalyzer(SAMPLE_TEXT, n=2))
+        state_path = os.path.join(cache.directory, key + ".json")
+
+        os.remove(os.path.join(cache.directory, key + ".words"))
+        assert cache.load(key, 1) is None
+
+        cache.store(key, TextAnalyzer(SAMPLE_TEXT, n=2))
+        with open(state_path, "w") as f:
+            f.write("{")
+        assert cache.load(key, 1) is None
+
+    def test_evicts_least_recently_used(self, cache):
+        """Test that the least recently used state is evicted beyond the limit"""
+        keys = [ResultCache.key(str(index) * 64, "en") for index in range(3)]
+        cache.store(keys[0], TextAnalyzer(SAMPLE_TEXT, n=1))
+        cache.store(keys[1], TextAnalyzer(SAMPLE_TEXT, n=1))
+        os.utime(os.path.join(cache.directory, keys[0] + ".json"), (1, 1))
+        os.utime(os.path.join(cache.directory, keys[1] + ".json"), (2, 2))
+        cache.load(keys[0], 1)
+
+        cache.store(keys[2], TextAnalyzer(SAMPLE_TEXT, n=1))
+
+        assert cache.load(keys[1], 1) is None
+        assert cache.load(keys[0], 1) is not None
+        assert sorted(os.listdir(cache.directory)) == sorted(
+            key + suffix for key in (keys[0], keys[2]) for suffix in (".json", ".words")
+        )
+
+    def test_ngrams_not_cached(self, cache, key):
+        """Test that cached analyses have no n-gram statistics"""
+        cache.store(key, TextAnalyzer(SAMPLE_TEXT, n=2))
+        with pytest.raises(AnalysisError):
+            cache.load(key, 2).get_ngram_statistics()
+
+    def test_spilled_word_list(self, cache, key, tmp_path):
+        """Test that the word list of a spilled table is written in frequency order"""
+        words = [f"w{index % 1500}" for index in range(4000)] + ["top"] * 5
+        analyzer = TextAnalyzer(" ".join(words), n=3,
+                                memory_budget=MemoryBudget(1, str(tmp_path)))
+        analyzer.get_word_count()
+        assert analyzer.statistics.words.spilled
+
+        cache.store(key, analyzer)
+        analyzer.close()
+
+        assert cache.load(key, 3).get_most_frequent_words() == {"top": 5, "w0": 3, "w1": 3}
+        with open(cache._paths(key)[1], encoding='utf-8') as f:
+            assert sum(1 for _ in f) == 1501
+
+    def test_fingerprint_index(self, cache):
+        """Test that digests are found by location, size and version only while unchanged"""
+        assert cache.lookup("/in/a.txt", 10, "1") is None
+        assert not cache.has_content_size(10)
+
+        cache.record("/in/a.txt", 10, "1", "a" * 64)
+        cache.record("/in/b.txt", 20, "1", cache.location_digest("/in/b.txt", 20, "1"),
+                     content=False)
+
+        assert cache.lookup("/in/a.txt", 10, "1") == "a" * 64
+        assert cache.lookup("/in/a.txt", 10, "2") is None
+        assert cache.lookup("/in/a.txt", 11, "1") is None
+        assert cache.has_content_size(10)
+        assert not cache.has_content_size(20)
+
+        cache.record("/in/c.txt", 30, "1", "c" * 64)
+        assert cache.lookup("/in/a.txt", 10, "1") is None
+        assert cache.lookup("/in/c.txt", 30, "1") == "c" * 64
+
+    def test_invalid_size(self, tmp_path):
+        """Test that the cache size must be positive"""
+        with pytest.raises(ValidationError):
+            ResultCache(str(tmp_path), max_entries=0)
@@ -0,0 +1,177 @@
+# tests/test_result_comparison.py
+import json
+import pytest
+from src.modules.file_handler import FileHandler
+from src.modules.output_formatter import OutputFormatter
+from src.modules.path_manager import PathManager
+from src.modules.result_comparison import (
+    FrequencyProfile, ResultComparison, compare_frequencies, merge_join
+)
+from src.modules.text_analyzer import TextAnalyzer
+from src.modules.validators import FileValidator
+
+
+def saved_results(text, n=2):
+    """Format results of a text the way they are saved"""
+    return OutputFormatter(TextAnalyzer(text, n=n), n=n).format_results()
+
+
+def profile_of(*texts, n=2):
+    """Build a profile from the saved results of texts"""
+    profile = FrequencyProfile()
+    for text in texts:
+        profile.add(saved_results(text, n))
+    return profile
+
+
+class TestMergeJoin:
+    """Test suite for merge_join function"""
+
+    def test_full_outer_join(self):
+        """Test that keys of both sides are joined in key order"""
+        left = [("a", 1), ("c", 3), ("e", 5)]
+        right = [("b", 2), ("c", 4), ("f", 6)]
+        assert list(merge_join(left, right)) == [
+            ("a", 1, 0), ("b", 0, 2), ("c", 3, 4), ("e", 5, 0), ("f", 0, 6)
+        ]
+
+    def test_empty_side(self):
+        """Test joining with an empty sequence"""
+        assert list(merge_join([], [("a", 1)])) == [("a", 0, 1)]
+        assert list(merge_join([("a", 1)], [])) == [("a", 1, 0)]
+
+
+class TestCompareFrequencies:
+    """Test suite for compare_frequencies function"""
+
+    def test_identical_distributions(self):
+        """Test that identical distributions have no distance"""
+        items = [("a", 2), ("b", 3)]
+        result = compare_frequencies(items, items, 5, 5)
+        assert result["cosine"] == 1.0
+        assert result["jensen-shannon"] == 0.0
+        assert result["shared"] == 2
+        assert result["gainers"] == [] and result["losers"] == []
+
+    def test_disjoint_distributions(self):
+        """Test that disjoint distributions have the largest distance"""
+        result = compare_frequencies([("a", 2)], [("b", 3)], 2, 3)
+        assert result["cosine"] == 0.0
+        assert result["jensen-shannon"] == 1.0
+        assert (result["only-left"], result["only-right"]) == (1, 1)
+
+    def test_gainers_and_losers(self):
+        """Test ordering of changes by size, then key, limited to top"""
+        left = [("a", 1), ("b", 5), ("c", 1), ("d", 4), ("e", 9)]
+        right = [("a", 4), ("b", 2), ("c", 4), ("d", 1), ("f", 2)]
+        result = compare_frequencies(left, right, 20, 13, top=2)
+        assert [(change["key"], change["delta"]) for change in result["gainers"]] == [
+            ("a", 3), ("c", 3)
+        ]
+        assert [(change["key"], change["delta"]) for change in result["losers"]] == [
+            ("e", -9), ("b", -3)
+        ]
+        assert result["losers"][0] == {"key": "e", "left": 9, "right": 0, "delta": -9}
+
+
+class TestFrequencyProfile:
+    """Test suite for FrequencyProfile class"""
+
+    def test_add_sums_frequencies(self):
+        """Test that profiles sum the frequencies of all results"""
+        profile = profile_of("one two two.", "two three.")
+        assert profile.file_count == 2
+        assert profile.words == {"one": 1, "two": 3, "three": 1}
+        assert profile.scalars()["word-count"] == 5
+        assert profile.scalars()["distinct-word-count"] == 3
+
+    def test_skips_results_without_words(self):
+        """Test that results without word frequencies are not added"""
+        profile = FrequencyProfile()
+        assert not profile.add({"files": 2, "distinct-word-count": 5})
+        assert profile.file_count == 0
+
+    def test_rejects_malformed_frequencies(self):
+        """Test that malformed frequencies raise and leave the profile unchanged"""
+        profile = FrequencyProfile()
+        results = saved_results("one two.")
+        results["symbols-frequency"] = {"o": "many"}
+        with pytest.raises(ValueError):
+            profile.add(results)
+        assert not profile.words and profile.file_count == 0
+
+    def test_load_store(self, tmp_path):
+        """Test loading a directory of results, skipping other files"""
+        file_handler = FileHandler(FileValidator())
+        file_handler.save_json(saved_results("alpha beta."), str(tmp_path / "a.txt.json"))
+        file_handler.save_json(saved_results("beta gamma."), str(tmp_path / "b.txt.json"))
+        file_handler.save_json({"files": 2}, str(tmp_path / "corpus-vocabulary.json"))
+        (tmp_path / "broken.json").write_text("{", encoding="utf-8")
+
+        profile = FrequencyProfile.load(file_handler, str(tmp_path))
+        assert profile.file_count == 2
+        assert profile.words["beta"] == 2
+        assert profile.skipped == ["broken.json", "corpus-vocabulary.json"]
+
+    def test_load_store_with_several_n(self, tmp_path):
+        """Test that a file analyzed with two N values counts once in the store totals"""
+        file_handler = FileHandler(FileValidator())
+        text = "alpha beta beta gamma."
+        file_handler.save_json(saved_results(text, n=2), str(tmp_path / "a.txt.n2.json"))
+        file_handler.save_json(saved_results(text, n=3), str(tmp_path / "a.txt.n3.json"))
+        file_handler.save_json(saved_results("beta delta."), str(tmp_path / "b.txt.json"))
+
+        profile = FrequencyProfile.load(file_handler, str(tmp_path))
+        assert profile.file_count == 2
+        assert profile.scalars()["word-count"] == 6
+        assert profile.scalars()["distinct-word-count"] == 4
+        assert profile.words["beta"] == 3
+
+    def test_load_fanned_out_store(self, tmp_path):
+        """Test loading a store whose results are fanned out into sub-directories"""
+        file_handler = FileHandler(FileValidator())
+        manager = PathManager(str(tmp_path / "in"), str(tmp_path / "out"), fan_out=2)
+        for name, text in (("a.txt", "alpha beta."), ("b.txt", "beta gamma.")):
+            path = manager.get_result_path(name, 2)
+            manager.prepare_output(name, path)
+            file_handler.save_json(saved_results(text), path)
+
+        profile = FrequencyProfile.load(file_handler, manager.output_dir)
+        assert profile.file_count == 2
+        assert profile.words == {"alpha": 1, "beta": 2, "gamma": 1}
+
+    def test_load_without_frequencies(self, tmp_path):
+        """Test that a result file without word frequencies is rejected"""
+        path = tmp_path / "summary.json"
+        path.write_text(json.dumps({"files": 1}), encoding="utf-8")
+        with pytest.raises(ValueError):
+            FrequencyProfile.load(FileHandler(FileValidator()), str(path))
+        with pytest.raises(ValueError):
+            FrequencyProfile.load(FileHandler(FileValidator()), str(tmp_path))
+
+
+class TestResultComparison:
+    """Test suite for ResultComparison class"""
+
+    def test_compare(self):
+        """Test deltas and distances of two profiles"""
+        left = profile_of("red red blue. Green!", n=3)
+        right = profile_of("red blue blue blue yellow.", n=3)
+        comparison = ResultComparison(left, right).compare(top=1)
+
+        assert comparison["files"] == {"left": 1, "right": 1}
+        assert comparison["deltas"]["word-count"] == {"left": 4, "right": 5, "delta": 1}
+        assert comparison["deltas"]["sentence-count"]["delta"] == -1
+        assert comparison["words"]["gainers"] == [
+            {"key": "blue", "left": 1, "right": 3, "delta": 2}
+        ]
+        assert len(comparison["words"]["losers"]) == 1
+        assert 0.0 < comparison["words"]["jensen-shannon"] < 1.0
+
+    def test_compare_with_itself(self):
+        """Test that a profile compared with itself has no changes"""
+        profile = profile_of("one two two. Three.", n=3)
+        comparison = ResultComparison(profile, profile).compare()
+        assert comparison["words"]["cosine"] == 1.0
+        assert comparison["symbols"]["jensen-shannon"] == 0.0
+        assert all(delta["delta"] == 0 for delta in comparison["deltas"].values())
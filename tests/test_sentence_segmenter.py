@@ -0,0 +1,134 @@
+# tests/test_sentence_segmenter.py
+import os
+import random
+import re
+import time
+import pytest
+from src.modules.sentence_segmenter import SentenceSegmenter, get_rules
+from src.modules.exceptions import ValidationError
+
+# Minimum throughput of the segmenter relative to the former re.split count
+MIN_RELATIVE_THROUGHPUT = float(os.environ.get("SEGMENTER_MIN_RELATIVE_THROUGHPUT", 0.1))
+
+MESSY_TEXT = (
+    'Dr. Smith paid $3.14 at 10 a.m. on Monday, e.g. for coffee... and left. '
+    'See https://example.com/index.html. "Really?" she asked. "Yes!" '
+    'Wait... What? J. R. R. Tolkien wrote it (see fig. 2). The end'
+)
+
+
+def segment(text, language="en", chunk_size=None):
+    """Count sentences of a text fed in chunks"""
+    segmenter = SentenceSegmenter(get_rules(language))
+    chunk_size = chunk_size or len(text) or 1
+    for start in range(0, len(text), chunk_size):
+        segmenter.consume(text[start:start + chunk_size])
+    segmenter.finish()
+    return segmenter
+
+
+def split_count(text):
+    """Count sentences the way TextAnalyzer did before the segmenter"""
+    return len([part for part in re.split('[.!?]', text) if part.strip()])
+
+
+class TestSentenceSegmenter:
+    """Test suite for SentenceSegmenter class"""
+
+    @pytest.mark.parametrize("text,expected", [
+        ("One. Two! Three?", 3),
+        ("No terminator at all", 1),
+        ("", 0),
+        ("  ...  !?  ", 0),
+        ("Pi is 3.14 exactly.", 1),
+        ("Visit example.com/a.b today. Then leave.", 2),
+        ("Use e.g. this one. Or i.e. that one.", 2),
+        ("Mr. and Mrs. Smith arrived.", 1),
+        ("J. K. Rowling wrote it.", 1),
+        ("Wait... and see. Wait... Then go.", 3),
+        ("Wait… and see.", 1),
+        ('"Stop!" he said. "Go?" She went.', 3),
+        ('He said "stop." Then he left.', 2),
+        ("Really?! Yes.", 2),
+        ("Ends with an abbreviation etc.", 1),
+    ])
+    def test_sentence_count(self, text, expected):
+        """Test counting of sentences in messy text"""
+        assert segment(text).sentence_count == expected
+
+    def test_language_rules(self):
+        """Test that rules differ between languages"""
+        text = "Am 3. Oktober kam er, z.B. mit dem Zug. Dann ging er."
+        assert segment(text, "de").sentence_count == 2
+        assert segment(text, "en").sentence_count == 4
+        assert segment("Живу на вул. Шевченка. Гарно.", "uk").sentence_count == 2
+
+    def test_unknown_language(self):
+        """Test rejection of languages without rules"""
+        with pytest.raises(ValidationError):
+            get_rules("xx")
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 16])
+    def test_chunk_size_invariance(self, chunk_size):
+        """Test that state carried across chunks gives the same count"""
+        expected = segment(MESSY_TEXT).sentence_count
+        assert segment(MESSY_TEXT, chunk_size=chunk_size).sentence_count == expected
+
+    def test_consume_reports_completed_sentences(self):
+        """Test that consume and finish return the sentences they complete"""
+        segmenter = SentenceSegmenter()
+        completed = [segmenter.consume(chunk) for chunk in ("One. Tw", "o! Thr", "ee")]
+        assert completed == [1, 1, 0]
+        assert segmenter.finish() == 1
+        assert segmenter.sentence_count == 3
+
+    def test_merge_matches_whole_text(self):
+        """Test merging counts of parts split at every whitespace"""
+        expected = segment(MESSY_TEXT).sentence_count
+        for split in (match.end() for match in re.finditer(r'\s', MESSY_TEXT)):
+            merged = segment(MESSY_TEXT[:split])
+            merged.merge(segment(MESSY_TEXT[split:]))
+            assert merged.sentence_count == expected, MESSY_TEXT[:split]
+
+    @pytest.mark.parametrize("second,expected", [("and more.", 1), ("More.", 2), ("   ", 1)])
+    def test_merge_pending_ellipsis(self, second, expected):
+        """Test that an ellipsis ending a part is decided by the next part"""
+        first = segment("Wait... ")
+        retracted = first.merge(segment(second))
+        assert first.sentence_count == expected
+        assert retracted == (-1 if expected == 1 and second.strip() else 0)
+
+    def test_fixes_split_miscounts(self):
+        """Test that abbreviations, decimals and ellipses are not split"""
+        assert split_count(MESSY_TEXT) > 20
+        assert segment(MESSY_TEXT).sentence_count == 8
+
+
+class TestThroughput:
+    """Throughput benchmark of the segmenter against re.split"""
+
+    def test_relative_throughput(self):
+        """Test that the segmenter keeps up with the former re.split count"""
+        rng = random.Random(7)
+        words = ["alpha", "beta", "gamma", "delta", "epsilon", "e.g.", "3.14", "Mr.", "world"]
+        text = " ".join(
+            " ".join(rng.choices(words, k=rng.randint(4, 20))) + rng.choice([".", "!", "?", "..."])
+            for _ in range(20000)
+        )
+
+        def best_time(function):
+            """Best of three timings of a function over the text"""
+            timings = []
+            for _ in range(3):
+                start = time.perf_counter()
+                function(text)
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        baseline = best_time(split_count)
+        measured = best_time(lambda value: segment(value, chunk_size=65536))
+        relative = baseline / measured
+        assert relative >= MIN_RELATIVE_THROUGHPUT, (
+            f"segmenter ran at {relative:.2f}x the re.split throughput, "
+            f"minimum is {MIN_RELATIVE_THROUGHPUT}x"
+        )
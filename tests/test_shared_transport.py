@@ -0,0 +1,192 @@
+# tests/test_shared_transport.py
+import pickle
+import subprocess
+import sys
+from multiprocessing import shared_memory
+from pathlib import Path
+import pytest
+from src.modules.memory_budget import SpillingCounter
+from src.modules.shared_transport import (
+    SharedWordTable, benchmark_transport, find_crossover, share_table
+)
+from src.modules.word_table import WordTable
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# Parallel analysis with word tables sent through shared memory
+PARALLEL_SCRIPT = '''
+import dataclasses, random, sys
+from src.modules.analysis_engine import AnalysisEngine
+from src.modules.file_handler import FileHandler
+from src.modules.memory_budget import MemoryBudget
+from src.modules.validators import FileValidator
+
+rng = random.Random(5)
+with open(sys.argv[1], "w", encoding="utf-8") as f:
+    f.write(" ".join(rng.choices([f"w{i}" for i in range(5000)], k=40000)) + ".")
+file_handler = FileHandler(FileValidator())
+file_handler.config = dataclasses.replace(file_handler.config, SHARED_MEMORY_MIN_WORDS=1)
+budget = MemoryBudget(2 ** 30)
+budget.worker_count = lambda size: 3
+analyzer = AnalysisEngine(file_handler, budget).analyze_file(sys.argv[1], n=5)
+print(analyzer.get_word_count())
+analyzer.close()
+'''
+
+# Parallel analysis in which the second of four shards fails
+FAILING_SHARD_SCRIPT = '''
+import dataclasses, multiprocessing, random, sys
+from src.modules import analysis_engine
+from src.modules.file_handler import FileHandler
+from src.modules.memory_budget import MemoryBudget
+from src.modules.validators import FileValidator
+
+rng = random.Random(5)
+with open(sys.argv[1], "w", encoding="utf-8") as f:
+    f.write(" ".join(rng.choices([f"w{i}" for i in range(5000)], k=40000)) + ".")
+file_handler = FileHandler(FileValidator())
+file_handler.config = dataclasses.replace(file_handler.config, SHARED_MEMORY_MIN_WORDS=1)
+failing = file_handler.shard_ranges(sys.argv[1], 4)[1][0]
+scan_range = analysis_engine.scan_range
+
+def failing_scan(path, encoding, start, *options):
+    if start == failing:
+        raise OSError("shard failed")
+    return scan_range(path, encoding, start, *options)
+
+# Workers are forked so that they inherit the failing scan
+multiprocessing.set_start_method("fork")
+analysis_engine.scan_range = failing_scan
+budget = MemoryBudget(2 ** 30)
+budget.worker_count = lambda size: 4
+try:
+    analysis_engine.AnalysisEngine(file_handler, budget).analyze_file(sys.argv[1], n=5)
+except OSError as e:
+    print(e)
+'''
+
+WORDS = ["ще", "не", "вмерла", "alpha", "beta", "не", "alpha", "не", "word_2"]
+
+
+@pytest.fixture
+def table():
+    """Create a word table with repeated and non-ASCII words"""
+    table = WordTable()
+    table.update(WORDS)
+    return table
+
+
+class TestSharedWordTable:
+    """Test suite for SharedWordTable class"""
+
+    def test_pickled_table_reads_segment(self, table):
+        """Test that a pickled shared table yields the original counts"""
+        shared = SharedWordTable.create(table)
+        try:
+            received = pickle.loads(pickle.dumps(shared))
+            assert list(received.pairs()) == list(table.pairs())
+            assert list(received.items()) == list(table.items())
+            assert received.most_common(2) == table.most_common(2)
+            assert (len(received), received.total, received.length_sum) == (
+                len(table), table.total, table.length_sum
+            )
+        finally:
+            received.close()
+
+    def test_close_removes_segment(self, table):
+        """Test that closing the receiving side unlinks the segment"""
+        shared = SharedWordTable.create(table)
+        name = shared.name
+        pickle.loads(pickle.dumps(shared)).close()
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+        shared.close()
+
+    def test_empty_table(self):
+        """Test sharing a table without words"""
+        shared = SharedWordTable.create(WordTable())
+        try:
+            assert list(shared.pairs()) == [] and len(shared) == 0
+        finally:
+            shared.close()
+
+
+class TestShareTable:
+    """Test suite for share_table function"""
+
+    def test_small_tables_are_pickled(self, table):
+        """Test that tables below the crossover are left as they are"""
+        assert share_table(table, len(table) + 1) is table
+        assert share_table(table, 0) is table
+
+    def test_large_tables_are_shared(self, table):
+        """Test that tables at the crossover go through shared memory"""
+        shared = share_table(table, len(table))
+        try:
+            assert isinstance(shared, SharedWordTable)
+        finally:
+            shared.close()
+
+    @pytest.mark.parametrize("limit", [2, 100])
+    def test_merge_shared_counter(self, limit):
+        """Test merging spilling counters received through shared memory"""
+        expected = SpillingCounter(limit)
+        expected.update(WORDS + WORDS[::-1])
+        first, second = SpillingCounter(limit), SpillingCounter(limit)
+        first.update(WORDS)
+        second.update(WORDS[::-1])
+        first.share(1)
+        second.share(1)
+        first, second = pickle.loads(pickle.dumps(first)), pickle.loads(pickle.dumps(second))
+        try:
+            first.merge(second)
+            assert list(first.items()) == list(expected.items())
+            assert first.most_common(3) == expected.most_common(3)
+        finally:
+            first.close()
+            second.close()
+            expected.close()
+
+
+class TestCrossover:
+    """Test suite for the transport benchmark"""
+
+    def test_benchmark_rows(self):
+        """Test that the benchmark times both transports per size"""
+        rows = benchmark_transport([10, 20], repeat=1)
+        assert [row["words"] for row in rows] == [10, 20]
+        assert all(row["pickle"] > 0 and row["shared"] > 0 for row in rows)
+
+    def test_find_crossover(self):
+        """Test that the crossover is where shared memory stays faster"""
+        rows = [
+            {"words": 10, "pickle": 1, "shared": 2},
+            {"words": 100, "pickle": 2, "shared": 1},
+            {"words": 1000, "pickle": 3, "shared": 4},
+            {"words": 10000, "pickle": 9, "shared": 5},
+            {"words": 100000, "pickle": 90, "shared": 50},
+        ]
+        assert find_crossover(rows) == 10000
+        assert find_crossover(rows[:3]) is None
+
+
+def test_parallel_analysis_leaves_no_segments(tmp_path):
+    """Test that workers hand their segments over without resource tracker warnings"""
+    result = subprocess.run(
+        [sys.executable, "-c", PARALLEL_SCRIPT, str(tmp_path / "wide.txt")],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "40000"
+    assert "resource_tracker" not in result.stderr
+
+
+@pytest.mark.skipif(not Path("/dev/shm").is_dir() or sys.platform != "linux",
+                    reason="needs forked workers and /dev/shm")
+def test_failed_shard_leaves_no_segments(tmp_path):
+    """Test that segments of finished shards are removed when another shard fails"""
+    before = set(Path("/dev/shm").glob("psm_*"))
+    result = subprocess.run(
+        [sys.executable, "-c", FAILING_SHARD_SCRIPT, str(tmp_path / "wide.txt")],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "shard failed"
+    assert set(Path("/dev/shm").glob("psm_*")) - before == set()
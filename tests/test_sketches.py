@@ -0,0 +1,135 @@
+# tests/test_sketches.py
+import random
+import pytest
+from collections import Counter
+from src.modules.sketches import CountMinSketch, DistinctCounter, HyperLogLog, hash64
+
+
+class TestCountMinSketch:
+    """Test suite for CountMinSketch class"""
+
+    def test_never_underestimates(self):
+        """Test that estimates are upper bounds of true counts"""
+        rng = random.Random(1)
+        keys = [f"key{rng.randint(0, 500)}" for _ in range(5000)]
+        sketch = CountMinSketch(width=128, depth=4)
+        for key in keys:
+            sketch.add(key)
+
+        for key, count in Counter(keys).items():
+            assert sketch.estimate(key) >= count
+
+    def test_exact_without_collisions(self):
+        """Test exact counts in a sparse sketch"""
+        sketch = CountMinSketch(width=4096)
+        sketch.add("new york", 5)
+        sketch.add("big apple")
+        assert sketch.estimate("new york") == 5
+        assert sketch.estimate("big apple") == 1
+        assert sketch.estimate("missing") == 0
+
+    def test_merge(self):
+        """Test that merged sketches equal a sketch of all keys"""
+        first, second, whole = (CountMinSketch(width=64) for _ in range(3))
+        for i in range(200):
+            (first if i % 2 else second).add(f"k{i % 17}")
+            whole.add(f"k{i % 17}")
+
+        first.merge(second)
+        assert first.cells == whole.cells
+
+    def test_merge_shape_mismatch(self):
+        """Test rejection of merging sketches of different shapes"""
+        with pytest.raises(ValueError):
+            CountMinSketch(width=64).merge(CountMinSketch(width=32))
+
+
+class TestHyperLogLog:
+    """Test suite for HyperLogLog class"""
+
+    @pytest.mark.parametrize("cardinality", [10, 1000, 50000])
+    def test_estimate_accuracy(self, cardinality):
+        """Test estimates within a few standard errors"""
+        sketch = HyperLogLog(precision=12)
+        for i in range(cardinality):
+            sketch.add_hash(hash64(f"word{i}"))
+            sketch.add_hash(hash64(f"word{i}"))
+
+        assert sketch.estimate() == pytest.approx(cardinality, rel=0.05)
+
+    def test_merge_equals_union(self):
+        """Test that merged registers equal a sketch of the union"""
+        first, second, union = (HyperLogLog(precision=8) for _ in range(3))
+        for i in range(3000):
+            value = hash64(str(i))
+            (first if i < 2000 else second).add_hash(value)
+            if i >= 1000:
+                second.add_hash(value)
+            union.add_hash(value)
+
+        first.merge(second)
+        assert first.registers == union.registers
+
+    def test_invalid_precision(self):
+        """Test rejection of out-of-range precision"""
+        with pytest.raises(ValueError):
+            HyperLogLog(precision=3)
+
+    def test_merge_precision_mismatch(self):
+        """Test rejection of merging sketches of different precisions"""
+        with pytest.raises(ValueError):
+            HyperLogLog(precision=8).merge(HyperLogLog(precision=10))
+
+
+class TestDistinctCounter:
+    """Test suite for DistinctCounter class"""
+
+    def test_exact_below_limit(self):
+        """Test exact counting of small inputs"""
+        counter = DistinctCounter(exact_limit=10)
+        for word in ["a", "b", "a", "c"]:
+            counter.add(word)
+        assert counter.exact
+        assert counter.count() == 3
+
+    def test_switches_above_limit(self):
+        """Test switching to a sketch above the limit"""
+        counter = DistinctCounter(exact_limit=100)
+        for i in range(5000):
+            counter.add(f"w{i}")
+        assert not counter.exact
+        assert counter.count() == pytest.approx(5000, rel=0.05)
+
+    def test_merge_exact_and_sketch(self):
+        """Test merging an exact counter with a switched one"""
+        small, large = DistinctCounter(exact_limit=100), DistinctCounter(exact_limit=100)
+        for i in range(50):
+            small.add(f"s{i}")
+        for i in range(3000):
+            large.add(f"l{i}")
+
+        small.merge(large)
+        assert not small.exact
+        assert small.count() == pytest.approx(3050, rel=0.05)
+
+    @pytest.mark.parametrize("size", [5, 2000])
+    def test_serialization_round_trip(self, size):
+        """Test restoring exact and sketched counters"""
+        counter = DistinctCounter(exact_limit=100)
+        for i in range(size):
+            counter.add(f"w{i}")
+
+        restored = DistinctCounter.from_dict(counter.to_dict(), exact_limit=100)
+        assert restored.exact == counter.exact
+        assert restored.count() == counter.count()
+
+    @pytest.mark.parametrize("data", [
+        {},
+        {"exact": True, "hashes": ["zz"]},
+        {"exact": False, "precision": 12, "registers": "AAAA"},
+        {"exact": False, "precision": 2, "registers": ""},
+    ])
+    def test_from_dict_malformed(self, data):
+        """Test rejection of malformed serialized counters"""
+        with pytest.raises(ValueError):
+            DistinctCounter.from_dict(data)
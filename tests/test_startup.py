@@ -0,0 +1,85 @@
+# tests/test_startup.py
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Cumulative `-X importtime` budget of `import analyzer`, in microseconds:
+# the measured median of about 66 ms plus 20%
+STARTUP_BUDGET_US = int(os.environ.get("STARTUP_BUDGET_US", 80_000))
+STARTUP_RUNS = 5
+
+# Modules whose import is deferred until a command needs them
+DEFERRED_MODULES = (
+    "dotenv",
+    "config.config",
+    "multiprocessing",
+    "concurrent.futures.process",
+    "tempfile",
+    "statistics",
+    "modules.estimate_analyzer",
+    "modules.corpus_vocabulary",
+    "modules.storage",
+    "modules.analysis_engine",
+    "modules.batch_runner",
+    "modules.concordance",
+    "modules.job_scheduler",
+    "modules.memory_budget",
+    "modules.metrics",
+    "modules.near_duplicates",
+    "modules.ngram_counter",
+    "modules.profiler",
+    "modules.progress_journal",
+    "modules.result_cache",
+    "modules.text_analyzer",
+    "modules.window_statistics",
+    "modules.word_normalizer",
+)
+
+
+def import_times():
+    """Import the CLI module in a fresh interpreter and parse -X importtime output
+
+    Returns:
+        Dict[str, int]: Cumulative import time of every module in microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import analyzer"],
+        cwd=SRC_DIR, capture_output=True, text=True, check=True,
+        env={key: value for key, value in os.environ.items() if key != "PYTHONPATH"}
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup:
+    """Startup benchmark of the CLI entry point"""
+
+    def test_deferred_modules_not_imported(self):
+        """Test that mode-specific and slow modules are not imported at startup"""
+        imported = set(import_times())
+        assert not imported & set(DEFERRED_MODULES)
+
+    def test_import_time_budget(self):
+        """Test that the median CLI import time stays within the budget"""
+        median = statistics.median(import_times()["analyzer"] for _ in range(STARTUP_RUNS))
+        assert median <= STARTUP_BUDGET_US, (
+            f"import analyzer took {median} us, budget is {STARTUP_BUDGET_US} us"
+        )
+
+    def test_config_import_does_not_load_dotenv(self):
+        """Test that importing the configuration does not read the .env file"""
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, config.config; print('dotenv' in sys.modules)"],
+            cwd=SRC_DIR, capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "False"
@@ -1,7 +1,11 @@
 # tests/test_text_analyzer.py
 import pytest
 from unittest.mock import patch
-from src.modules.text_analyzer import TextAnalyzer
+from src.modules.concordance import ConcordanceIndex
+from src.modules.deadline import Deadline
+from src.modules.text_analyzer import TextAnalyzer, TextStatistics
+from src.modules.memory_budget import MemoryBudget
+from src.modules.word_normalizer import WordNormalizer
 from src.modules.exceptions import AnalysisError, ValidationError
 
 
@@ -25,7 +29,7 @@ class TestTextAnalyzer:
         analyzer = TextAnalyzer(sample_text, n=3)
         assert analyzer.text == sample_text
         assert analyzer.n == 3
-        assert len(analyzer.words) > 0
+        assert analyzer.get_word_count() > 0
 
     @pytest.mark.parametrize("invalid_text,error_msg", [
         (None, "Text must be a string"),
@@ -58,6 +62,17 @@ class TestTextAnalyzer:
         assert count == 4  # Sample text has 4 sentences
         assert isinstance(count, int)
 
+    def test_sentence_count_language(self):
+        """Test that sentence rules of the language are applied"""
+        text = "Am 3. Oktober kam er an. Dann ging er."
+        assert TextAnalyzer(text, n=1).get_sentence_count() == 3
+        assert TextAnalyzer(text, n=1, language="de").get_sentence_count() == 2
+
+    def test_invalid_language(self):
+        """Test rejection of languages without sentence rules"""
+        with pytest.raises(ValidationError):
+            TextAnalyzer("Some text.", n=1, language="xx")
+
     def test_get_sentence_count_error(self):
         """Test sentence counting error handling"""
         # Mock a scenario that would cause re.split to fail
@@ -74,7 +89,7 @@ class TestTextAnalyzer:
 
         assert count == 12  # Sample text has 12 words
         assert isinstance(count, int)
-        assert count == len(analyzer.words)
+        assert count == analyzer.statistics.words.total
 
     def test_get_most_frequent_words(self, analyzer):
         """Test most frequent words calculation"""
@@ -99,7 +114,7 @@ class TestTextAnalyzer:
         avg_length = analyzer.get_average_word_length()
 
         assert isinstance(avg_length, float)
-        assert 0 <= avg_length <= max(len(word) for word in analyzer.words)
+        assert 0 <= avg_length <= max(len(word) for word in analyzer.statistics.words.vocabulary)
         # Verify rounding to 2 decimal places
         assert str(avg_length).split('.')[-1] <= '99'
 
@@ -117,6 +132,20 @@ class TestTextAnalyzer:
             assert (curr_freq > next_freq or
                     (curr_freq == next_freq and curr_symbol < next_symbol))
 
+    @pytest.mark.parametrize("limit", [1, 3, 10, 1000])
+    def test_get_symbol_frequency_limit(self, limit):
+        """Test that limited selection is a prefix of the full ordering"""
+        analyzer = TextAnalyzer("ccc bb aa d. 世界 世界 界", n=1)
+        full = list(analyzer.get_symbol_frequency().items())
+
+        assert list(analyzer.get_symbol_frequency(limit).items()) == full[:limit]
+
+    @pytest.mark.parametrize("limit", [0, -1, 2.5])
+    def test_get_symbol_frequency_invalid_limit(self, analyzer, limit):
+        """Test rejection of invalid symbol limits"""
+        with pytest.raises(ValidationError):
+            analyzer.get_symbol_frequency(limit)
+
     def test_get_symbol_frequency_error(self):
         """Test symbol frequency error handling"""
         analyzer = TextAnalyzer("Test", n=3)  # Create analyzer first
@@ -136,6 +165,191 @@ class TestTextAnalyzer:
         """Test support for Unicode characters"""
         text = "Hello мир! こんにちは world!"
         analyzer = TextAnalyzer(text, n=3)
-        assert len(analyzer.words) > 0
-        assert "мир" in analyzer.words
-        assert "world" in analyzer.words
+        assert analyzer.get_word_count() > 0
+        assert "мир" in analyzer.statistics.words
+        assert "world" in analyzer.statistics.words
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 5, 13])
+    def test_from_chunks_matches_text(self, sample_text, chunk_size):
+        """Test that chunked input gives the same results as the whole text"""
+        chunks = [sample_text[i:i + chunk_size] for i in range(0, len(sample_text), chunk_size)]
+        streamed = TextAnalyzer.from_chunks(chunks, n=3)
+        whole = TextAnalyzer(sample_text, n=3)
+
+        assert streamed.text is None
+        assert streamed.get_symbol_counts() == whole.get_symbol_counts()
+        assert streamed.get_sentence_count() == whole.get_sentence_count()
+        assert streamed.get_word_count() == whole.get_word_count()
+        assert streamed.get_most_frequent_words() == whole.get_most_frequent_words()
+        assert streamed.get_average_word_length() == whole.get_average_word_length()
+        assert streamed.get_symbol_frequency() == whole.get_symbol_frequency()
+
+    def test_memory_budget_matches_unbounded(self, tmp_path):
+        """Test that a spilling word table gives exactly the unbounded results"""
+        words = [f"w{i % 37}" for i in range(3000)] + [f"u{i}" for i in range(3000)]
+        text = " ".join(words) + "."
+        budget = MemoryBudget(1, str(tmp_path))
+
+        bounded = TextAnalyzer(text, n=50, memory_budget=budget)
+        unbounded = TextAnalyzer(text, n=50)
+
+        assert bounded.statistics.words.spilled
+        assert bounded.get_most_frequent_words() == unbounded.get_most_frequent_words()
+        assert bounded.get_word_count() == unbounded.get_word_count()
+        assert bounded.get_average_word_length() == unbounded.get_average_word_length()
+        bounded.close()
+
+    def test_statistics_merge(self):
+        """Test merging statistics of consecutive parts of a text"""
+        # Parts are split at whitespace, as shards are
+        first, second = "One two. Three ", "four five! Six"
+        merged = TextStatistics.from_chunks([first]).merge(TextStatistics.from_chunks([second]))
+        whole = TextStatistics.from_chunks([first + second])
+
+        assert merged.sentence_count == whole.sentence_count == 3
+        assert list(merged.words.pairs()) == list(whole.words.pairs())
+        assert merged.word_total == whole.word_total
+        assert merged.symbols == whole.symbols
+
+    def test_get_distinct_word_count(self):
+        """Test vocabulary size and type/token ratio"""
+        analyzer = TextAnalyzer("The cat and the dog. The end!", n=1)
+        assert analyzer.get_distinct_word_count() == 5
+        assert analyzer.get_type_token_ratio() == round(5 / 7, 4)
+        assert analyzer.get_vocabulary_sketch().exact
+
+    def test_distinct_word_count_above_sketch_limit(self):
+        """Test that large vocabularies are counted exactly, with an estimating sketch"""
+        analyzer = TextAnalyzer(" ".join(f"w{i}" for i in range(4000)), n=1)
+        assert analyzer.get_distinct_word_count() == 4000
+        assert analyzer.get_type_token_ratio() == 1.0
+        assert not analyzer.get_vocabulary_sketch().exact
+
+    def test_distinct_word_count_spilled(self, tmp_path):
+        """Test vocabulary size of a spilled table"""
+        text = " ".join(f"w{i % 1500}" for i in range(6000))
+        analyzer = TextAnalyzer(text, n=1, memory_budget=MemoryBudget(1, str(tmp_path)))
+        try:
+            assert analyzer.statistics.words.spilled
+            assert analyzer.get_distinct_word_count() == 1500
+            assert not analyzer.get_vocabulary_sketch().exact
+        finally:
+            analyzer.close()
+
+    def test_get_ngram_statistics(self):
+        """Test n-gram section collected alongside the other statistics"""
+        text = "New York is big. New York is old. A cat is old."
+        analyzer = TextAnalyzer(text, n=2, ngram_order=3)
+
+        results = analyzer.get_ngram_statistics(min_count=2)
+
+        assert results["approximate"] is False
+        assert results["2-grams"] == {"new york": 2, "york is": 2}
+        assert results["3-grams"] == {"new york is": 2, "york is big": 1}
+        assert list(results["collocations"]) == ["new york", "york is"]
+        assert results["collocations"]["new york"]["count"] == 2
+
+    def test_get_minhash_signature_not_collected(self, analyzer):
+        """Test signature of an analyzer without MinHash"""
+        with pytest.raises(AnalysisError):
+            analyzer.get_minhash_signature()
+
+    def test_get_ngram_statistics_not_collected(self, analyzer):
+        """Test n-gram section of an analyzer without n-grams"""
+        with pytest.raises(AnalysisError):
+            analyzer.get_ngram_statistics()
+
+    def test_get_metric_results(self, sample_text):
+        """Test custom metrics computed with the built-in statistics"""
+        analyzer = TextAnalyzer(sample_text, n=3, metrics=["longest-word", "words-per-sentence"])
+        assert analyzer.get_metric_results() == {
+            "longest-word": "hello",
+            "words-per-sentence": 3.0
+        }
+        assert TextAnalyzer(sample_text, n=3).get_metric_results() == {}
+
+    def test_normalized_frequencies(self, tmp_path):
+        """Test counting normalized forms while totals cover every word"""
+        text = "The cats and the dog. A cat chased the dogs!"
+        normalizer = WordNormalizer("en", mode="lemma")
+        analyzer = TextAnalyzer(text, n=2, normalizer=normalizer)
+        plain = TextAnalyzer(text, n=2)
+
+        assert analyzer.get_most_frequent_words() == {"cat": 2, "dog": 2}
+        assert analyzer.get_word_count() == plain.get_word_count() == 10
+        assert analyzer.get_average_word_length() == plain.get_average_word_length()
+        assert analyzer.get_distinct_word_count() == 3
+        assert analyzer.get_normalization() == {"language": "en", "stopwords": True,
+                                                "mode": "lemma"}
+        assert plain.get_normalization() is None
+
+        chunked = TextAnalyzer(text, n=2, normalizer=normalizer,
+                               memory_budget=MemoryBudget(1, str(tmp_path)))
+        assert chunked.get_most_frequent_words() == {"cat": 2, "dog": 2}
+        assert chunked.get_word_count() == 10
+
+    def test_save_frequency_run(self, tmp_path):
+        """Test saving full word frequencies from a spilled table as a sorted run"""
+        words = [f"w{i % 37}" for i in range(3000)] + [f"u{i}" for i in range(3000)]
+        analyzer = TextAnalyzer(" ".join(words) + ".", n=1,
+                                memory_budget=MemoryBudget(1, str(tmp_path)))
+        path = str(tmp_path / "text.freq")
+        try:
+            assert analyzer.statistics.words.spilled
+            assert analyzer.save_frequency_run(path) == 3037
+        finally:
+            analyzer.close()
+        with open(path, encoding='utf-8') as f:
+            entries = [line.rstrip('\n').split('\t') for line in f]
+        assert [word for word, _ in entries] == sorted(set(words))
+        assert dict(entries)["w0"] == "82"
+
+    def test_save_concordance(self, tmp_path):
+        """Test building a concordance of words split across chunks"""
+        statistics = TextStatistics.from_chunks(["New Yo", "rk is big. New York!"], tokens=True)
+        path = str(tmp_path / "text.kwic")
+        TextAnalyzer.from_statistics(statistics, n=3).save_concordance(path)
+        with ConcordanceIndex(path) as index:
+            assert index.count(["new", "york"]) == 2
+            assert index.search(["is"], context=2)[0]["left"] == "new york"
+
+    def test_save_concordance_over_budget(self, tmp_path):
+        """Test that a text longer than the token limit is not indexed"""
+        statistics = TextStatistics.from_chunks(["New York is big. New York!"], tokens=True)
+        path = tmp_path / "text.kwic"
+        analyzer = TextAnalyzer.from_statistics(statistics, n=3)
+        with pytest.raises(AnalysisError):
+            analyzer.save_concordance(str(path), max_tokens=5)
+        assert not path.exists()
+        analyzer.save_concordance(str(path), max_tokens=6)
+        assert path.exists()
+
+    def test_save_concordance_not_collected(self, analyzer, tmp_path):
+        """Test that saving requires the token sequence"""
+        with pytest.raises(AnalysisError):
+            analyzer.save_concordance(str(tmp_path / "text.kwic"))
+
+    def test_deadline_partial(self):
+        """Test that an expired deadline stops the analysis between chunks"""
+        text = "alpha beta. " * 1000
+        deadline = Deadline(60)
+        deadline.expires_at = 0.0
+        analyzer = TextAnalyzer(text, n=2, memory_budget=MemoryBudget(1), deadline=deadline)
+        chunk_size = MemoryBudget(1).chunk_size()
+        assert analyzer.is_partial()
+        assert analyzer.get_symbol_counts()["with_spaces"] == chunk_size
+        assert analyzer.get_coverage() == round(chunk_size / len(text), 4)
+        assert analyzer.get_word_count() == 2 * (chunk_size // 12) + 1
+
+    def test_deadline_complete(self, sample_text):
+        """Test that results within the deadline are complete"""
+        analyzer = TextAnalyzer(sample_text, n=3, memory_budget=MemoryBudget(1),
+                                deadline=Deadline(60))
+        assert not analyzer.is_partial()
+        assert analyzer.get_coverage() == 1.0
+
+    def test_from_chunks_no_words(self):
+        """Test streamed input without words"""
+        with pytest.raises(AnalysisError) as exc_info:
+            TextAnalyzer.from_chunks(["...", "!!!"], n=1)
+        assert str(exc_info.value) == "No valid words found in text"
@@ -102,6 +102,15 @@ class TestInputValidator:
         with pytest.raises(ValidationError):
             validator.validate_n_value(invalid_value)
 
+    def test_validate_n_value_configured_limit(self):
+        """Test N value validation against a configured limit"""
+        validator = InputValidator(max_n=1000)
+        assert validator.validate_n_value("1000") == 1000
+        with pytest.raises(ValidationError, match="between 1 and 1000"):
+            validator.validate_n_value("1001")
+        with pytest.raises(ValidationError):
+            InputValidator(max_n=0)
+
     def test_validate_file_choice_valid(self, validator):
         """Test file choice validation with valid input"""
         files = ["file1.txt", "file2.txt"]
@@ -0,0 +1,130 @@
+# tests/test_window_statistics.py
+import json
+import pytest
+from src.modules.window_statistics import NDJSONWriter, WindowStatistics
+from src.modules.exceptions import FileError, ValidationError
+
+TEXT = (
+    "Alpha beta. Beta\n"
+    "gamma!\n"
+    "\n"
+    "\n"
+    "  \n"
+    "Zeta eta. Theta\n"
+    "iota\n"
+    "\n"
+    "last line"
+)
+
+
+def collect(mode, size=1, text=TEXT, chunk_size=None):
+    """Feed a text in chunks and collect the emitted windows"""
+    records = []
+    windows = WindowStatistics(mode, size, sink=records.append)
+    chunk_size = chunk_size or len(text) or 1
+    for start in range(0, len(text), chunk_size):
+        windows.consume(text[start:start + chunk_size])
+    windows.finish()
+    return records
+
+
+def spans(records):
+    """Get the line span of every window"""
+    return [(record["start-line"], record["end-line"]) for record in records]
+
+
+class TestWindowStatistics:
+    """Test suite for WindowStatistics class"""
+
+    def test_lines(self):
+        """Test windows of a fixed number of lines"""
+        records = collect("lines", 2)
+        assert spans(records) == [(1, 2), (3, 4), (5, 6), (7, 8), (9, 9)]
+        assert [record["window"] for record in records] == [1, 2, 3, 4, 5]
+        assert records[0]["word-count"] == 4
+        assert records[0]["sentence-count"] == 2
+        assert records[0]["sentences-per-line"] == 1.0
+        assert records[0]["average-word-length"] == 4.5
+
+    def test_paragraphs(self):
+        """Test that blank lines separate paragraphs and belong to none"""
+        records = collect("paragraphs")
+        assert spans(records) == [(1, 2), (6, 7), (9, 9)]
+        assert [record["line-count"] for record in records] == [2, 2, 1]
+        assert records[1]["char-count"] == len("Zeta eta. Theta\niota\n")
+
+    def test_bytes(self):
+        """Test that byte windows close at the end of the filling line"""
+        assert spans(collect("bytes", 20)) == [(1, 2), (3, 6), (7, 9)]
+
+    def test_bytes_use_encoding(self):
+        """Test that bytes are measured in the encoding of the text"""
+        text = "ёж\nёж\nёж\n"
+        assert spans(collect("bytes", 5, text)) == [(1, 1), (2, 2), (3, 3)]
+        assert spans(collect("bytes", 6, text)) == [(1, 2), (3, 3)]
+
+    @pytest.mark.parametrize("mode,size", [("lines", 1), ("lines", 3),
+                                           ("bytes", 10), ("paragraphs", 1)])
+    @pytest.mark.parametrize("chunk_size", [1, 2, 5, 7])
+    def test_chunk_size_invariance(self, mode, size, chunk_size):
+        """Test that windows do not depend on chunk boundaries"""
+        assert collect(mode, size, chunk_size=chunk_size) == collect(mode, size)
+
+    def test_windows_add_up_to_whole_text(self):
+        """Test that line windows partition the words of the text"""
+        records = collect("lines", 3)
+        assert sum(record["word-count"] for record in records) == 10
+        assert sum(record["line-count"] for record in records) == 9
+
+    def test_trailing_newline(self):
+        """Test that a final line break does not open another window"""
+        assert spans(collect("lines", 1, "one\ntwo\n")) == [(1, 1), (2, 2)]
+
+    def test_empty_text(self):
+        """Test that an empty text emits no window"""
+        assert collect("lines", 1, "") == []
+        assert collect("paragraphs", 1, "\n  \n") == []
+
+    @pytest.mark.parametrize("spec,expected", [
+        ("lines:100", ("lines", 100)),
+        ("bytes:65536", ("bytes", 65536)),
+        ("paragraphs", ("paragraphs", 1)),
+    ])
+    def test_parse_spec(self, spec, expected):
+        """Test parsing of window specifications"""
+        assert WindowStatistics.parse_spec(spec) == expected
+
+    @pytest.mark.parametrize("spec", ["lines", "lines:0", "bytes:x", "pages:2", "paragraphs:3"])
+    def test_parse_spec_invalid(self, spec):
+        """Test rejection of invalid window specifications"""
+        with pytest.raises(ValidationError):
+            WindowStatistics.parse_spec(spec)
+
+    def test_invalid_arguments(self):
+        """Test rejection of unknown modes and sizes"""
+        with pytest.raises(ValidationError):
+            WindowStatistics("pages")
+        with pytest.raises(ValidationError):
+            WindowStatistics("lines", 0)
+
+
+class TestNDJSONWriter:
+    """Test suite for NDJSONWriter class"""
+
+    def test_writes_one_record_per_line(self, tmp_path):
+        """Test that records are written as JSON lines"""
+        path = str(tmp_path / "windows.ndjson")
+        with NDJSONWriter(path) as writer:
+            windows = WindowStatistics("paragraphs", sink=writer)
+            windows.consume(TEXT)
+            windows.finish()
+
+        assert writer.count == 3
+        with open(path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        assert lines == collect("paragraphs")
+
+    def test_invalid_path(self, tmp_path):
+        """Test that an unwritable path raises FileError"""
+        with pytest.raises(FileError):
+            NDJSONWriter(str(tmp_path / "missing" / "windows.ndjson"))
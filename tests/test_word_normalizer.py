@@ -0,0 +1,107 @@
+# tests/test_word_normalizer.py
+import pickle
+import pytest
+from src.modules.exceptions import ValidationError
+from src.modules.word_normalizer import (
+    LEMMATIZERS, STEMMERS, STOPWORDS, SuffixStemmer, WordNormalizer
+)
+
+
+class TestSuffixStemmer:
+    """Test suite for SuffixStemmer class"""
+
+    @pytest.mark.parametrize("words,stem", [
+        (["connect", "connected", "connecting", "connection", "connections"], "connect"),
+        (["run", "runs", "running"], "run"),
+        (["class", "classes"], "class"),
+        (["egg", "eggs"], "egg"),
+        (["study", "studies", "studied"], "study")
+    ])
+    def test_english_forms_share_stem(self, words, stem):
+        """Test that inflected English forms map to one stem"""
+        assert {STEMMERS["en"].stem(word) for word in words} == {stem}
+
+    def test_ukrainian_forms_share_stem(self):
+        """Test that case forms of a Ukrainian noun map to one stem"""
+        forms = ["мова", "мови", "мовою", "мовами", "мовах"]
+        assert {STEMMERS["uk"].stem(word) for word in forms} == {"мов"}
+
+    def test_kept_endings_and_short_words(self):
+        """Test that kept endings and the minimum stem are respected"""
+        stemmer = SuffixStemmer([("s", ""), ("ness", "")], min_stem=3, keep=("ss",))
+        assert stemmer.stem("status") == "statu"
+        assert stemmer.stem("glass") == "glass"
+        assert stemmer.stem("darkness") == "dark"
+        assert stemmer.stem("gas") == "gas"
+
+
+class TestLemmatizer:
+    """Test suite for Lemmatizer class"""
+
+    @pytest.mark.parametrize("language,word,lemma", [
+        ("en", "children", "child"),
+        ("en", "were", "be"),
+        ("en", "cities", "city"),
+        ("en", "churches", "church"),
+        ("en", "glass", "glass"),
+        ("uk", "людей", "людина"),
+        ("de", "häusern", "haus"),
+        ("de", "unbekannt", "unbekannt")
+    ])
+    def test_lemmatize(self, language, word, lemma):
+        """Test lexicon lookups, regular inflections and unknown words"""
+        assert LEMMATIZERS[language].lemmatize(word) == lemma
+
+
+class TestWordNormalizer:
+    """Test suite for WordNormalizer class"""
+
+    def test_stopwords_per_language(self):
+        """Test that stopword sets exist for the same languages as the rules"""
+        assert set(STOPWORDS) == set(STEMMERS) == set(LEMMATIZERS)
+        assert "the" in STOPWORDS["en"] and "та" in STOPWORDS["uk"] and "und" in STOPWORDS["de"]
+
+    def test_normalize_all(self):
+        """Test dropping stopwords and reducing the remaining words"""
+        words = ["the", "children", "were", "running", "to", "the", "cities"]
+        assert WordNormalizer("en").normalize_all(words) == ["children", "running", "cities"]
+        assert WordNormalizer("en", mode="stem").normalize_all(words) == ["children", "run", "city"]
+        assert WordNormalizer("en", mode="lemma").normalize_all(words) == ["child", "run", "city"]
+        assert WordNormalizer("en", stopwords=False, mode="lemma").normalize_all(words) == [
+            "the", "child", "be", "run", "to", "the", "city"
+        ]
+
+    def test_memoized_per_form(self, mocker):
+        """Test that every distinct form is normalized once"""
+        normalizer = WordNormalizer("en", mode="stem")
+        spy = mocker.patch.object(normalizer, "_reduce", wraps=normalizer._reduce)
+        normalizer.normalize_all(["cats", "dogs", "cats", "the", "cats", "dogs"])
+        assert spy.call_count == 2
+        info = normalizer.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (3, 3, 3)
+
+    def test_cache_bounded(self):
+        """Test that the cache keeps at most its size"""
+        normalizer = WordNormalizer("en", mode="stem", cache_size=2)
+        normalizer.normalize_all(["alpha", "beta", "gamma", "delta"])
+        assert normalizer.cache_info().currsize == 2
+
+    def test_pickle_settings_only(self):
+        """Test that a pickled normalizer keeps its settings with an empty cache"""
+        normalizer = WordNormalizer("uk", mode="lemma", cache_size=10)
+        normalizer.normalize_all(["люди", "та", "діти"])
+        copy = pickle.loads(pickle.dumps(normalizer))
+        assert copy.describe() == {"language": "uk", "stopwords": True, "mode": "lemma"}
+        assert copy.cache_size == 10
+        assert copy.cache_info().currsize == 0
+        assert copy.normalize_all(["люди", "та", "діти"]) == ["людина", "дитина"]
+
+    @pytest.mark.parametrize("settings", [
+        {"language": "fr"},
+        {"mode": "soundex"},
+        {"cache_size": 0}
+    ])
+    def test_invalid_settings(self, settings):
+        """Test rejection of unsupported languages, modes and cache sizes"""
+        with pytest.raises(ValidationError):
+            WordNormalizer(**settings)
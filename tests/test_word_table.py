@@ -0,0 +1,69 @@
+# tests/test_word_table.py
+import random
+import pytest
+from collections import Counter
+from src.modules.word_table import WordTable
+
+
+@pytest.fixture
+def words():
+    """Provide a random word stream with many ties"""
+    rng = random.Random(3)
+    vocabulary = [f"w{i}" for i in range(200)]
+    return [rng.choice(vocabulary[:rng.randint(1, 200)]) for _ in range(3000)]
+
+
+class TestWordTable:
+    """Test suite for WordTable class"""
+
+    def test_empty_table(self):
+        """Test an empty table"""
+        table = WordTable()
+        assert len(table) == 0
+        assert table.total == 0
+        assert table.most_common(3) == []
+
+    def test_counts_and_totals(self):
+        """Test counting words and accumulating totals"""
+        table = WordTable()
+        table.update(["hello", "world", "hello"])
+        table.update(["hi"])
+
+        assert len(table) == 3
+        assert table.count("hello") == 2
+        assert table.count("missing") == 0
+        assert "world" in table
+        assert table.total == 4
+        assert table.length_sum == 5 + 5 + 5 + 2
+
+    @pytest.mark.parametrize("batch", [1, 7, 3000])
+    def test_most_common_matches_counter(self, words, batch):
+        """Test that counts and tie order match Counter.most_common"""
+        table = WordTable()
+        for start in range(0, len(words), batch):
+            table.update(words[start:start + batch])
+
+        expected = Counter(words)
+        for n in (1, 10, 200):
+            assert table.most_common(n) == expected.most_common(n)
+
+    def test_merge_preserves_first_occurrence(self, words):
+        """Test merging tables of consecutive text parts"""
+        middle = len(words) // 2
+        first, second = WordTable(), WordTable()
+        first.update(words[:middle])
+        second.update(words[middle:])
+
+        first.merge(second)
+
+        assert first.most_common(200) == Counter(words).most_common(200)
+        assert list(first.vocabulary) == list(Counter(words))
+        assert first.total == len(words)
+
+    def test_items_sorted_by_word(self):
+        """Test that items are streamed in word order with their ids"""
+        table = WordTable()
+        table.update(["c", "a", "c", "b"])
+        assert list(table.items()) == [
+            ("a", 1, (0, 1)), ("b", 1, (0, 2)), ("c", 2, (0, 0)),
+        ]